@@ -0,0 +1,81 @@
+"""
+Benchmark point_bulk serialization: per-point DTO + json.dumps vs the batch serializer.
+
+Run from apps/bms-iot-app:
+
+    PYTHONPATH=../..:. python benchmarks/point_bulk_serialization.py --points 1000
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from src.dto import ControllerPointDTO
+from src.dto.controller_point_serializer import encode_points_json
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import ControllerPointsModel
+
+PRIORITY_ARRAY = json.dumps([None] * 8 + [50.0] + [None] * 7)
+EVENT_BITS = json.dumps({"toFault": True, "toNormal": True, "toOffnormal": False})
+
+
+def make_points(count: int, distinct_points: int) -> list[ControllerPointsModel]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        ControllerPointsModel(
+            id=index,
+            controller_id="controller-1",
+            controller_ip_address="192.168.1.100",
+            bacnet_object_type=BacnetObjectTypeEnum.ANALOG_VALUE,
+            point_id=index % distinct_points,
+            iot_device_point_id=f"point-{index % distinct_points}",
+            controller_device_id="device-1",
+            units="degrees-celsius",
+            present_value=str(20.0 + index / 100),
+            status_flags="[0, 0, 0, 0]",
+            priority_array=PRIORITY_ARRAY,
+            event_enable=EVENT_BITS,
+            acked_transitions=EVENT_BITS,
+            event_time_stamps=json.dumps(["2024-01-01T00:00:00Z", None, None]),
+            event_message_texts=json.dumps(["High", "Normal", "Low"]),
+            high_limit=30.0,
+            low_limit=10.0,
+            created_at=start + timedelta(seconds=index),
+            updated_at=start + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def dto_path(points: list[ControllerPointsModel]) -> bytes:
+    """The previous path: DTO per point, model_dump, json.dumps of the batch."""
+    rows = [ControllerPointDTO.from_model(point).model_dump() for point in points]
+    return json.dumps({"points": rows}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--distinct-points", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    points = make_points(args.points, args.distinct_points)
+    assert json.loads(dto_path(points)) == json.loads(encode_points_json(points))
+
+    results = {}
+    for name, function in (("dto", dto_path), ("batch", encode_points_json)):
+        seconds = min(
+            timeit.repeat(lambda: function(points), number=1, repeat=args.repeat)
+        )
+        results[name] = seconds
+        print(
+            f"{name:>5}: {seconds * 1000:8.2f} ms/batch "
+            f"{seconds / args.points * 1e6:7.2f} us/point"
+        )
+    print(f"speedup: {results['dto'] / results['batch']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
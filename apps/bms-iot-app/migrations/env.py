@@ -39,20 +39,30 @@ if config.config_file_name is not None:
 # Import SQLModel models for Alembic migration coverage
 try:
     # Core models managed by Alembic
-    from src.models.controller_points import ControllerPointsModel
+    from src.models.controller_points import PointMetadataModel, PointSampleModel
     from src.models.iot_device_status import IotDeviceStatusModel
     from src.models.deployment_config import DeploymentConfigModel
+    from src.models.point_state import PointStateModel
 
     # BACnet config models - now that MQTT dependency issues are resolved
-    from src.models.bacnet_config import BacnetConfigModel, BacnetReaderConfigModel
+    from src.models.bacnet_config import (
+        BacnetConfigModel,
+        BacnetConfigControllerModel,
+        BacnetConfigObjectModel,
+        BacnetReaderConfigModel,
+    )
 
     print("Successfully imported all models for Alembic migrations")
     print(
         "Models imported:",
-        ControllerPointsModel.__name__,
+        PointMetadataModel.__name__,
+        PointSampleModel.__name__,
         IotDeviceStatusModel.__name__,
         DeploymentConfigModel.__name__,
+        PointStateModel.__name__,
         BacnetConfigModel.__name__,
+        BacnetConfigControllerModel.__name__,
+        BacnetConfigObjectModel.__name__,
         BacnetReaderConfigModel.__name__,
     )
 
@@ -95,7 +105,17 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # Point samples live in a separate outbox file (see sqlmodel_client)
+    connection.exec_driver_sql(
+        "ATTACH DATABASE ? AS outbox", (settings.OUTBOX_DATABASE_PATH,)
+    )
+    # End the implicit transaction so begin_transaction() below owns the commit
+    connection.commit()
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_schemas=True,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
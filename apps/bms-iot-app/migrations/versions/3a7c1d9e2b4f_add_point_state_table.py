@@ -0,0 +1,105 @@
+"""add point_state latest-value table
+
+Revision ID: 3a7c1d9e2b4f
+Revises: f249787e8106
+Create Date: 2026-10-19 09:12:41.204417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a7c1d9e2b4f"
+down_revision: Union[str, Sequence[str], None] = "f249787e8106"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATE_COLUMNS = "iot_device_point_id, controller_id, controller_device_id, bacnet_object_type, point_id, units, present_value, status_flags, event_state, out_of_service, reliability, error_info"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "point_state",
+        sa.Column(
+            "iot_device_point_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("controller_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "controller_device_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column(
+            "bacnet_object_type",
+            sa.Enum(
+                "ANALOG_INPUT",
+                "ANALOG_OUTPUT",
+                "ANALOG_VALUE",
+                "BINARY_INPUT",
+                "BINARY_OUTPUT",
+                "BINARY_VALUE",
+                "MULTI_STATE_INPUT",
+                "MULTI_STATE_OUTPUT",
+                "MULTI_STATE_VALUE",
+                name="bacnetobjecttypeenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("point_id", sa.Integer(), nullable=False),
+        sa.Column("units", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("present_value", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("status_flags", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_state", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("out_of_service", sa.Boolean(), nullable=True),
+        sa.Column("reliability", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("error_info", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("iot_device_point_id"),
+    )
+    op.create_index(
+        op.f("ix_point_state_controller_id"),
+        "point_state",
+        ["controller_id"],
+        unique=False,
+    )
+
+    # Latest sample per point; changed_at is the last sample whose value
+    # differed from the one before it
+    op.execute(
+        f"""
+        INSERT INTO point_state ({STATE_COLUMNS}, updated_at, changed_at)
+        SELECT
+            {", ".join("c." + name for name in STATE_COLUMNS.split(", "))},
+            c.created_at,
+            COALESCE(changes.changed_at, c.created_at)
+        FROM controller_points c
+        LEFT JOIN (
+            SELECT iot_device_point_id, MAX(created_at) AS changed_at
+            FROM (
+                SELECT
+                    iot_device_point_id,
+                    created_at,
+                    present_value IS NOT LAG(present_value) OVER points AS changed,
+                    ROW_NUMBER() OVER points AS sample_number
+                FROM controller_points
+                WINDOW points AS (PARTITION BY iot_device_point_id ORDER BY id)
+            )
+            WHERE changed OR sample_number = 1
+            GROUP BY iot_device_point_id
+        ) changes ON changes.iot_device_point_id = c.iot_device_point_id
+        WHERE c.id IN (
+            SELECT MAX(id) FROM controller_points GROUP BY iot_device_point_id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_point_state_controller_id"), table_name="point_state")
+    op.drop_table("point_state")
@@ -0,0 +1,207 @@
+"""normalize bacnet_config into versioned controller and object rows
+
+Revision ID: 5f0b8c3d1e72
+Revises: c41d7a0e9f23
+Create Date: 2026-10-19 12:48:55.902114
+
+"""
+
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f0b8c3d1e72"
+down_revision: Union[str, Sequence[str], None] = "c41d7a0e9f23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "bacnet_config_controllers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("config_version", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("controller_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("vendor_id", sa.Integer(), nullable=False),
+        sa.Column("device_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "controller_ip_address", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["config_version"], ["bacnet_config.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_bacnet_config_controllers_version_controller",
+        "bacnet_config_controllers",
+        ["config_version", "controller_id"],
+        unique=True,
+    )
+    op.create_table(
+        "bacnet_config_objects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("config_version", sa.Integer(), nullable=False),
+        sa.Column("controller_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("type", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("point_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "iot_device_point_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("properties", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["config_version"], ["bacnet_config.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_bacnet_config_objects_version_controller",
+        "bacnet_config_objects",
+        ["config_version", "controller_id"],
+        unique=False,
+    )
+
+    with op.batch_alter_table("bacnet_config") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "controller_count", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+        batch_op.add_column(
+            sa.Column("object_count", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    # Only the latest blob is still relevant; explode it and drop the rest
+    bind = op.get_bind()
+    latest = bind.execute(
+        sa.text(
+            "SELECT id, bacnet_devices FROM bacnet_config ORDER BY created_at DESC LIMIT 1"
+        )
+    ).first()
+    if latest is not None:
+        version, raw_devices = latest
+        devices = json.loads(raw_devices) if raw_devices else []
+        object_count = 0
+        for device_position, device in enumerate(devices):
+            bind.execute(
+                sa.text(
+                    "INSERT INTO bacnet_config_controllers (config_version, position, "
+                    "controller_id, vendor_id, device_id, controller_ip_address) "
+                    "VALUES (:version, :position, :controller_id, :vendor_id, "
+                    ":device_id, :controller_ip_address)"
+                ),
+                {
+                    "version": version,
+                    "position": device_position,
+                    "controller_id": device["controller_id"],
+                    "vendor_id": device["vendor_id"],
+                    "device_id": device["device_id"],
+                    "controller_ip_address": device["controller_ip_address"],
+                },
+            )
+            for object_position, obj in enumerate(device.get("object_list", [])):
+                bind.execute(
+                    sa.text(
+                        "INSERT INTO bacnet_config_objects (config_version, "
+                        "controller_id, position, type, point_id, "
+                        "iot_device_point_id, properties) VALUES (:version, "
+                        ":controller_id, :position, :type, :point_id, "
+                        ":iot_device_point_id, :properties)"
+                    ),
+                    {
+                        "version": version,
+                        "controller_id": device["controller_id"],
+                        "position": object_position,
+                        "type": obj["type"],
+                        "point_id": obj["point_id"],
+                        "iot_device_point_id": obj["iot_device_point_id"],
+                        "properties": json.dumps(obj.get("properties")),
+                    },
+                )
+                object_count += 1
+        bind.execute(
+            sa.text(
+                "UPDATE bacnet_config SET controller_count = :controllers, "
+                "object_count = :objects WHERE id = :version"
+            ),
+            {"controllers": len(devices), "objects": object_count, "version": version},
+        )
+        bind.execute(
+            sa.text("DELETE FROM bacnet_config WHERE id != :version"),
+            {"version": version},
+        )
+
+    with op.batch_alter_table("bacnet_config") as batch_op:
+        batch_op.drop_column("bacnet_devices")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("bacnet_config") as batch_op:
+        batch_op.add_column(sa.Column("bacnet_devices", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    versions = bind.execute(sa.text("SELECT id FROM bacnet_config")).scalars().all()
+    for version in versions:
+        controllers = bind.execute(
+            sa.text(
+                "SELECT controller_id, vendor_id, device_id, controller_ip_address "
+                "FROM bacnet_config_controllers WHERE config_version = :version "
+                "ORDER BY position"
+            ),
+            {"version": version},
+        ).all()
+        devices = []
+        for controller_id, vendor_id, device_id, ip_address in controllers:
+            objects = bind.execute(
+                sa.text(
+                    "SELECT type, point_id, iot_device_point_id, properties "
+                    "FROM bacnet_config_objects WHERE config_version = :version "
+                    "AND controller_id = :controller_id ORDER BY position"
+                ),
+                {"version": version, "controller_id": controller_id},
+            ).all()
+            devices.append(
+                {
+                    "vendor_id": vendor_id,
+                    "device_id": device_id,
+                    "controller_ip_address": ip_address,
+                    "controller_id": controller_id,
+                    "object_list": [
+                        {
+                            "type": obj_type,
+                            "point_id": point_id,
+                            "iot_device_point_id": iot_device_point_id,
+                            "properties": (
+                                json.loads(properties) if properties else None
+                            ),
+                        }
+                        for obj_type, point_id, iot_device_point_id, properties in objects
+                    ],
+                }
+            )
+        bind.execute(
+            sa.text(
+                "UPDATE bacnet_config SET bacnet_devices = :devices WHERE id = :id"
+            ),
+            {"devices": json.dumps(devices), "id": version},
+        )
+
+    with op.batch_alter_table("bacnet_config") as batch_op:
+        batch_op.drop_column("object_count")
+        batch_op.drop_column("controller_count")
+
+    op.drop_index(
+        "ix_bacnet_config_objects_version_controller",
+        table_name="bacnet_config_objects",
+    )
+    op.drop_table("bacnet_config_objects")
+    op.drop_index(
+        "ix_bacnet_config_controllers_version_controller",
+        table_name="bacnet_config_controllers",
+    )
+    op.drop_table("bacnet_config_controllers")
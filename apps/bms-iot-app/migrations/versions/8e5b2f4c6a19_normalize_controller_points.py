@@ -0,0 +1,287 @@
+"""normalize controller_points into point_metadata and point_samples
+
+Revision ID: 8e5b2f4c6a19
+Revises: 3a7c1d9e2b4f
+Create Date: 2026-10-19 10:04:18.551930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e5b2f4c6a19"
+down_revision: Union[str, Sequence[str], None] = "3a7c1d9e2b4f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METADATA_COLUMNS = "controller_ip_address, controller_port, bacnet_object_type, point_id, iot_device_point_id, controller_id, units, controller_device_id, min_pres_value, max_pres_value, high_limit, low_limit, resolution, priority_array, relinquish_default, cov_increment, time_delay, time_delay_normal, notification_class, notify_type, deadband, limit_enable, event_enable, acked_transitions, event_time_stamps, event_message_texts, event_message_texts_config, event_detection_enable, event_algorithm_inhibit_ref, event_algorithm_inhibit, reliability_evaluation_inhibit"
+SAMPLE_COLUMNS = "is_uploaded, created_at, status_flags, event_state, out_of_service, reliability, error_info"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "point_metadata",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "controller_ip_address", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("controller_port", sa.Integer(), nullable=False),
+        sa.Column(
+            "bacnet_object_type",
+            sa.Enum(
+                "ANALOG_INPUT",
+                "ANALOG_OUTPUT",
+                "ANALOG_VALUE",
+                "BINARY_INPUT",
+                "BINARY_OUTPUT",
+                "BINARY_VALUE",
+                "MULTI_STATE_INPUT",
+                "MULTI_STATE_OUTPUT",
+                "MULTI_STATE_VALUE",
+                name="bacnetobjecttypeenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("point_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "iot_device_point_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("controller_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("units", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "controller_device_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("min_pres_value", sa.Float(), nullable=True),
+        sa.Column("max_pres_value", sa.Float(), nullable=True),
+        sa.Column("high_limit", sa.Float(), nullable=True),
+        sa.Column("low_limit", sa.Float(), nullable=True),
+        sa.Column("resolution", sa.Float(), nullable=True),
+        sa.Column("priority_array", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("relinquish_default", sa.Float(), nullable=True),
+        sa.Column("cov_increment", sa.Float(), nullable=True),
+        sa.Column("time_delay", sa.Integer(), nullable=True),
+        sa.Column("time_delay_normal", sa.Integer(), nullable=True),
+        sa.Column("notification_class", sa.Integer(), nullable=True),
+        sa.Column("notify_type", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("deadband", sa.Float(), nullable=True),
+        sa.Column("limit_enable", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_enable", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "acked_transitions", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column(
+            "event_time_stamps", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column(
+            "event_message_texts", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column(
+            "event_message_texts_config",
+            sqlmodel.sql.sqltypes.AutoString(),
+            nullable=True,
+        ),
+        sa.Column("event_detection_enable", sa.Boolean(), nullable=True),
+        sa.Column(
+            "event_algorithm_inhibit_ref",
+            sqlmodel.sql.sqltypes.AutoString(),
+            nullable=True,
+        ),
+        sa.Column("event_algorithm_inhibit", sa.Boolean(), nullable=True),
+        sa.Column("reliability_evaluation_inhibit", sa.Boolean(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_point_metadata_iot_device_point_id"),
+        "point_metadata",
+        ["iot_device_point_id"],
+        unique=True,
+    )
+    op.create_table(
+        "point_samples",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("point_metadata_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("value_text", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("is_uploaded", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("status_flags", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_state", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("out_of_service", sa.Boolean(), nullable=True),
+        sa.Column("reliability", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("error_info", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.ForeignKeyConstraint(["point_metadata_id"], ["point_metadata.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_point_samples_point_metadata_id"),
+        "point_samples",
+        ["point_metadata_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_point_samples_pending",
+        "point_samples",
+        ["is_uploaded", "created_at"],
+        unique=False,
+    )
+
+    # Latest row per point becomes its metadata
+    op.execute(
+        f"""
+        INSERT INTO point_metadata ({METADATA_COLUMNS}, updated_at)
+        SELECT {METADATA_COLUMNS}, updated_at FROM controller_points
+        WHERE id IN (
+            SELECT MAX(id) FROM controller_points GROUP BY iot_device_point_id
+        )
+        """
+    )
+    # Numeric values go to the REAL column. Like encode_present_value, the
+    # text is only kept when str(value) would not give it back; SQLite and
+    # Python format exponents differently, so those keep their text.
+    op.execute(
+        f"""
+        INSERT INTO point_samples (
+            id, point_metadata_id, value, value_text, {SAMPLE_COLUMNS}
+        )
+        SELECT
+            c.id,
+            m.id,
+            CASE
+                WHEN c.present_value GLOB '*[0-9]*'
+                    AND c.present_value NOT GLOB '*[^0-9.eE+-]*'
+                THEN CAST(c.present_value AS REAL)
+            END,
+            CASE
+                WHEN c.present_value GLOB '*[0-9]*'
+                    AND c.present_value NOT GLOB '*[^0-9.+-]*'
+                    AND CAST(CAST(c.present_value AS REAL) AS TEXT) = c.present_value
+                THEN NULL
+                ELSE c.present_value
+            END,
+            {", ".join("c." + name for name in SAMPLE_COLUMNS.split(", "))}
+        FROM controller_points c
+        JOIN point_metadata m ON m.iot_device_point_id = c.iot_device_point_id
+        """
+    )
+    op.drop_table("controller_points")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "controller_points",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "controller_ip_address", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("controller_port", sa.Integer(), nullable=False),
+        sa.Column(
+            "bacnet_object_type",
+            sa.Enum(
+                "ANALOG_INPUT",
+                "ANALOG_OUTPUT",
+                "ANALOG_VALUE",
+                "BINARY_INPUT",
+                "BINARY_OUTPUT",
+                "BINARY_VALUE",
+                "MULTI_STATE_INPUT",
+                "MULTI_STATE_OUTPUT",
+                "MULTI_STATE_VALUE",
+                name="bacnetobjecttypeenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("point_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "iot_device_point_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("controller_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("units", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("present_value", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "controller_device_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("is_uploaded", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("status_flags", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_state", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("out_of_service", sa.Boolean(), nullable=True),
+        sa.Column("reliability", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("min_pres_value", sa.Float(), nullable=True),
+        sa.Column("max_pres_value", sa.Float(), nullable=True),
+        sa.Column("high_limit", sa.Float(), nullable=True),
+        sa.Column("low_limit", sa.Float(), nullable=True),
+        sa.Column("resolution", sa.Float(), nullable=True),
+        sa.Column("priority_array", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("relinquish_default", sa.Float(), nullable=True),
+        sa.Column("cov_increment", sa.Float(), nullable=True),
+        sa.Column("time_delay", sa.Integer(), nullable=True),
+        sa.Column("time_delay_normal", sa.Integer(), nullable=True),
+        sa.Column("notification_class", sa.Integer(), nullable=True),
+        sa.Column("notify_type", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("deadband", sa.Float(), nullable=True),
+        sa.Column("limit_enable", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_enable", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "acked_transitions", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column(
+            "event_time_stamps", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column(
+            "event_message_texts", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column(
+            "event_message_texts_config",
+            sqlmodel.sql.sqltypes.AutoString(),
+            nullable=True,
+        ),
+        sa.Column("event_detection_enable", sa.Boolean(), nullable=True),
+        sa.Column(
+            "event_algorithm_inhibit_ref",
+            sqlmodel.sql.sqltypes.AutoString(),
+            nullable=True,
+        ),
+        sa.Column("event_algorithm_inhibit", sa.Boolean(), nullable=True),
+        sa.Column("reliability_evaluation_inhibit", sa.Boolean(), nullable=True),
+        sa.Column("error_info", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "created_at_unix_milli_timestamp",
+            sa.BigInteger(),
+            sa.Computed("(strftime('%s', created_at) * 1000)", persisted=True),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        f"""
+        INSERT INTO controller_points (
+            id, present_value, updated_at, {METADATA_COLUMNS}, {SAMPLE_COLUMNS}
+        )
+        SELECT
+            s.id,
+            COALESCE(s.value_text, CAST(s.value AS TEXT)),
+            s.created_at,
+            {", ".join("m." + name for name in METADATA_COLUMNS.split(", "))},
+            {", ".join("s." + name for name in SAMPLE_COLUMNS.split(", "))}
+        FROM point_samples s
+        JOIN point_metadata m ON m.id = s.point_metadata_id
+        """
+    )
+    op.drop_index("ix_point_samples_pending", table_name="point_samples")
+    op.drop_index(
+        op.f("ix_point_samples_point_metadata_id"), table_name="point_samples"
+    )
+    op.drop_table("point_samples")
+    op.drop_index(
+        op.f("ix_point_metadata_iot_device_point_id"), table_name="point_metadata"
+    )
+    op.drop_table("point_metadata")
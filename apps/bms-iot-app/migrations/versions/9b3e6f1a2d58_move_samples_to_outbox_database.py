@@ -0,0 +1,153 @@
+"""move point_samples and point_state to the outbox database
+
+Revision ID: 9b3e6f1a2d58
+Revises: 5f0b8c3d1e72
+Create Date: 2026-10-19 14:02:37.118254
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e6f1a2d58"
+down_revision: Union[str, Sequence[str], None] = "5f0b8c3d1e72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Attached by migrations/env.py
+OUTBOX_SCHEMA = "outbox"
+
+SAMPLE_COLUMNS = "id, point_metadata_id, value, value_text, is_uploaded, is_manual_write, created_at, status_flags, event_state, out_of_service, reliability, error_info"
+STATE_COLUMNS = "iot_device_point_id, controller_id, controller_device_id, bacnet_object_type, point_id, units, present_value, status_flags, event_state, out_of_service, reliability, error_info, updated_at, changed_at"
+
+
+def _index_prefix(schema: Union[str, None]) -> str:
+    # Column-label index names include the schema, e.g. ix_outbox_point_state_...
+    return f"ix_{schema}_" if schema else "ix_"
+
+
+def _create_point_samples(schema: Union[str, None]) -> None:
+    # SQLite foreign keys cannot reference point_metadata from another file
+    foreign_keys = (
+        []
+        if schema
+        else [sa.ForeignKeyConstraint(["point_metadata_id"], ["point_metadata.id"])]
+    )
+    op.create_table(
+        "point_samples",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("point_metadata_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("value_text", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("is_uploaded", sa.Boolean(), nullable=False),
+        sa.Column(
+            "is_manual_write",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("status_flags", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_state", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("out_of_service", sa.Boolean(), nullable=True),
+        sa.Column("reliability", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("error_info", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        *foreign_keys,
+        sa.PrimaryKeyConstraint("id"),
+        schema=schema,
+    )
+    op.create_index(
+        op.f(f"{_index_prefix(schema)}point_samples_point_metadata_id"),
+        "point_samples",
+        ["point_metadata_id"],
+        unique=False,
+        schema=schema,
+    )
+    op.create_index(
+        "ix_point_samples_pending",
+        "point_samples",
+        ["is_uploaded", "created_at"],
+        unique=False,
+        schema=schema,
+    )
+
+
+def _create_point_state(schema: Union[str, None]) -> None:
+    op.create_table(
+        "point_state",
+        sa.Column(
+            "iot_device_point_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("controller_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "controller_device_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column(
+            "bacnet_object_type",
+            sa.Enum(
+                "ANALOG_INPUT",
+                "ANALOG_OUTPUT",
+                "ANALOG_VALUE",
+                "BINARY_INPUT",
+                "BINARY_OUTPUT",
+                "BINARY_VALUE",
+                "MULTI_STATE_INPUT",
+                "MULTI_STATE_OUTPUT",
+                "MULTI_STATE_VALUE",
+                name="bacnetobjecttypeenum",
+            ),
+            nullable=False,
+        ),
+        sa.Column("point_id", sa.Integer(), nullable=False),
+        sa.Column("units", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("present_value", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("status_flags", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("event_state", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("out_of_service", sa.Boolean(), nullable=True),
+        sa.Column("reliability", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("error_info", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("iot_device_point_id"),
+        schema=schema,
+    )
+    op.create_index(
+        op.f(f"{_index_prefix(schema)}point_state_controller_id"),
+        "point_state",
+        ["controller_id"],
+        unique=False,
+        schema=schema,
+    )
+
+
+def _move_tables(source: str, target: Union[str, None]) -> None:
+    target = target or "main"
+    for table, columns in (
+        ("point_samples", SAMPLE_COLUMNS),
+        ("point_state", STATE_COLUMNS),
+    ):
+        op.execute(
+            f"INSERT INTO {target}.{table} ({columns}) "
+            f"SELECT {columns} FROM {source}.{table}"
+        )
+        op.execute(f"DROP TABLE {source}.{table}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_point_samples(OUTBOX_SCHEMA)
+    _create_point_state(OUTBOX_SCHEMA)
+    _move_tables("main", OUTBOX_SCHEMA)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Unqualified CREATE TABLE always targets main; keeps the foreign key
+    _create_point_samples(None)
+    _create_point_state(None)
+    _move_tables(OUTBOX_SCHEMA, None)
@@ -0,0 +1,38 @@
+"""add is_manual_write to point_samples
+
+Revision ID: c41d7a0e9f23
+Revises: 8e5b2f4c6a19
+Create Date: 2026-10-19 11:26:03.417952
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7a0e9f23"
+down_revision: Union[str, Sequence[str], None] = "8e5b2f4c6a19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("point_samples") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "is_manual_write",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.false(),
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("point_samples") as batch_op:
+        batch_op.drop_column("is_manual_write")
@@ -11,11 +11,7 @@ from src.actors.messages.message_type import (
     MonitoringControlResponsePayload,
     ForceHeartbeatPayload,
 )
-from src.models.iot_device_status import (
-    upsert_iot_device_status,
-    get_latest_iot_device_status,
-    update_connection_status,
-)
+from src.models.device_status_service import device_status_service
 from src.models.device_status_enums import MonitoringStatusEnum, ConnectionStatusEnum
 from src.models.bacnet_config import save_bacnet_readers, get_bacnet_readers
 from src.utils.logger import logger
@@ -53,8 +49,9 @@ class BacnetMonitoringActor:
         )
 
         try:
-            await update_connection_status(
-                self.iot_device_id, "bacnet", ConnectionStatusEnum.ERROR
+            await device_status_service.update(
+                self.iot_device_id,
+                {"bacnet_connection_status": ConnectionStatusEnum.ERROR},
             )
             logger.info(
                 f"Updated BACnet connection status to ERROR for device {self.iot_device_id}"
@@ -76,15 +73,14 @@ class BacnetMonitoringActor:
         await self._run_monitor_loop()
 
     async def _run_monitor_loop(self):
-        queue = self.actor_queue_registry.get_queue(self.actor_name)
+        mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
         logger.info("BACnet Monitoring Actor started, waiting for configuration...")
         logger.info(
             f"Monitoring enabled: {self.monitoring_enabled}, Monitor initialized: {self._monitor_initialized}"
         )
 
-        # Initialize monitoring status in local database
-        # Get monitoring status from local database
-        latest_status = await get_latest_iot_device_status(self.iot_device_id)
+        # Get monitoring status from the status service (seeded from local database)
+        latest_status = await device_status_service.get(self.iot_device_id)
         if not latest_status:
             raise Exception(
                 f"No monitoring status found for device {self.iot_device_id}"
@@ -101,10 +97,8 @@ class BacnetMonitoringActor:
         async def handle_messages_loop():
             logger.info("Message handler loop started")
             while self.keep_running:
-                if not queue.empty():
-                    msg: ActorMessage = await queue.get()
-                    await self._handle_message(msg)
-                await asyncio.sleep(0)
+                msg: ActorMessage = await mailbox.receive()
+                await self._handle_message(msg)
 
         async def monitor_loop():
             logger.info("Monitor loop started")
@@ -357,7 +351,7 @@ class BacnetMonitoringActor:
                 "site_id": self.site_id,
                 "monitoring_status": status,
             }
-            await upsert_iot_device_status(self.iot_device_id, status_data)
+            await device_status_service.update(self.iot_device_id, status_data)
             logger.debug(
                 f"[BacnetMonitoringActor] Updated monitoring status to: {status}"
             )
@@ -383,7 +377,7 @@ class BacnetMonitoringActor:
                 "bacnet_points_monitored": monitored_points,
             }
 
-            await upsert_iot_device_status(self.iot_device_id, status_data)
+            await device_status_service.update(self.iot_device_id, status_data)
             logger.debug("[BacnetMonitoringActor] Updated BACnet status")
         except Exception as e:
             logger.error(f"[BacnetMonitoringActor] Failed to update BACnet status: {e}")
@@ -397,7 +391,7 @@ class BacnetMonitoringActor:
                 "site_id": self.site_id,
                 "bacnet_connection_status": status,
             }
-            await upsert_iot_device_status(self.iot_device_id, status_data)
+            await device_status_service.update(self.iot_device_id, status_data)
             logger.debug(
                 f"[BacnetMonitoringActor] Updated BACnet connection status to: {status}"
             )
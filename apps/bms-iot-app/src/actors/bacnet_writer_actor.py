@@ -27,16 +27,12 @@ class BacnetWriterActor:
         await self._run_message_loop()
 
     async def _run_message_loop(self):
-        queue = self.actor_queue_registry.get_queue(self.actor_name)
+        mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
 
         while self.keep_running:
             try:
-                # Check for incoming messages (non-blocking)
-                while not queue.empty():
-                    msg: ActorMessage = await queue.get()
-                    await self._handle_message(msg)
-
-                await asyncio.sleep(0.1)  # Small delay to prevent busy waiting
+                msg: ActorMessage = await mailbox.receive()
+                await self._handle_message(msg)
 
             except Exception as e:
                 logger.error(f"BacnetWriterActor error: {e}")
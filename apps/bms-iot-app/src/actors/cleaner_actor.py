@@ -2,7 +2,20 @@ from src.utils.logger import logger
 import asyncio
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
 from src.actors.messages.message_type import ActorName
-from src.models.controller_points import delete_uploaded_points
+from src.models.controller_points import (
+    delete_uploaded_points,
+    enforce_outbox_retention,
+    flush_sample_buffer,
+)
+from src.config.settings import settings
+from src.network.sqlmodel_client import get_writer_stats, run_database_maintenance
+
+# Retention runs less often than uploaded-point cleanup
+RETENTION_EVERY_N_CYCLES = 6
+
+# SQLite maintenance every 5 minutes, with a full ANALYZE once a day
+MAINTENANCE_EVERY_N_CYCLES = 30
+ANALYZE_EVERY_N_MAINTENANCE_RUNS = 288
 
 
 class CleanerActor:
@@ -10,6 +23,7 @@ class CleanerActor:
         self.actor_queue_registry = actor_queue_registry
         self.actor_name = ActorName.CLEANER
         self.keep_running = True
+        self.maintenance_runs = 0
 
     async def start(self):
         await self._run_monitor_loop()
@@ -17,10 +31,26 @@ class CleanerActor:
     async def _run_monitor_loop(self):
         logger.info("CleanerActor started")
 
+        cycle = 0
         while self.keep_running:
+            await self.flush_sample_buffer()
             await self.delete_uploaded_points()
+            if cycle % RETENTION_EVERY_N_CYCLES == 0:
+                await self.enforce_outbox_retention()
+            if cycle % MAINTENANCE_EVERY_N_CYCLES == MAINTENANCE_EVERY_N_CYCLES - 1:
+                await self.run_database_maintenance()
+            cycle += 1
             await asyncio.sleep(10)  # Run every 10 seconds
 
+    async def flush_sample_buffer(self):
+        """Write samples buffered in batched durability mode, even when monitoring is idle."""
+        try:
+            flushed_count = await flush_sample_buffer()
+            if flushed_count:
+                logger.info(f"CleanerActor flushed {flushed_count} buffered samples.")
+        except Exception as e:
+            logger.error(f"CleanerActor failed to flush buffered samples: {e}")
+
     async def delete_uploaded_points(self):
         deleted_count = await delete_uploaded_points()
         if deleted_count:
@@ -29,3 +59,27 @@ class CleanerActor:
             )
         else:
             logger.info("CleanerActor found no uploaded points to delete.")
+
+    async def enforce_outbox_retention(self):
+        removed = await enforce_outbox_retention(
+            max_rows=settings.OUTBOX_MAX_ROWS,
+            max_age_seconds=settings.OUTBOX_MAX_AGE_HOURS * 3600,
+            full_resolution_seconds=settings.OUTBOX_FULL_RESOLUTION_MINUTES * 60,
+            downsample_interval_seconds=settings.OUTBOX_DOWNSAMPLE_INTERVAL_SECONDS,
+        )
+        if any(removed.values()):
+            logger.info(f"CleanerActor applied outbox retention: {removed}")
+
+    async def run_database_maintenance(self):
+        """Checkpoint, vacuum and analyze at a quiet point; skip if writes are queued."""
+        if get_writer_stats()["queue_depth"]:
+            logger.info("CleanerActor postponed database maintenance: writes queued")
+            return
+        try:
+            report = await run_database_maintenance(
+                analyze=self.maintenance_runs % ANALYZE_EVERY_N_MAINTENANCE_RUNS == 0
+            )
+            self.maintenance_runs += 1
+            logger.info(f"CleanerActor ran database maintenance: {report}")
+        except Exception as e:
+            logger.error(f"CleanerActor database maintenance failed: {e}")
@@ -1,7 +1,8 @@
 from src.utils.logger import logger
 import asyncio
-import time
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.mailbox import PeriodicTimer
+from src.actors.supervisor import actor_supervisor
 from src.actors.messages.message_type import (
     ActorName,
     ActorMessage,
@@ -9,6 +10,8 @@ from src.actors.messages.message_type import (
     ForceHeartbeatPayload,
 )
 from src.controllers.heartbeat_controller.heartbeat import HeartbeatController
+from src.utils.loop_monitor import loop_lag_monitor
+from src.utils.performance import get_performance_summary
 
 logging = logger
 
@@ -41,24 +44,20 @@ class HeartbeatActor:
         await self._run_heartbeat_loop()
 
     async def _run_heartbeat_loop(self):
-        queue = self.actor_queue_registry.get_queue(self.actor_name)
-        last_heartbeat = 0
+        mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
+        heartbeat_timer = PeriodicTimer(self.heartbeat_interval)
 
         while self.keep_running:
             try:
-                current_time = time.time()
-
-                # Check for incoming messages (non-blocking)
-                while not queue.empty():
-                    msg: ActorMessage = await queue.get()
+                # Sleep until a message arrives or the next heartbeat is due
+                msg = await mailbox.receive(timeout=heartbeat_timer.remaining())
+                if msg is not None:
                     await self._handle_message(msg)
 
                 # Send heartbeat every interval
-                if current_time - last_heartbeat >= self.heartbeat_interval:
+                if heartbeat_timer.due():
+                    heartbeat_timer.reset()
                     await self._send_heartbeat()
-                    last_heartbeat = current_time
-
-                await asyncio.sleep(1)  # Check messages every second
 
             except Exception as e:
                 logger.error(f"HeartbeatActor error: {e}")
@@ -90,6 +89,12 @@ class HeartbeatActor:
         try:
             # Delegate to the heartbeat controller for data collection
             heartbeat_payload = await self.heartbeat_controller.collect_heartbeat_data()
+            heartbeat_payload.actor_mailbox_depths = (
+                self.actor_queue_registry.get_mailbox_depths()
+            )
+            heartbeat_payload.event_loop_lag = loop_lag_monitor.get_lag_summary()
+            heartbeat_payload.actor_crashes = actor_supervisor.get_crash_counts()
+            heartbeat_payload.performance_summary = get_performance_summary()
 
             # Send to MQTT actor for publishing
             await self.actor_queue_registry.send_from(
@@ -115,6 +120,12 @@ class HeartbeatActor:
 
             # Delegate to the heartbeat controller for force heartbeat
             heartbeat_payload = await self.heartbeat_controller.force_heartbeat(reason)
+            heartbeat_payload.actor_mailbox_depths = (
+                self.actor_queue_registry.get_mailbox_depths()
+            )
+            heartbeat_payload.event_loop_lag = loop_lag_monitor.get_lag_summary()
+            heartbeat_payload.actor_crashes = actor_supervisor.get_crash_counts()
+            heartbeat_payload.performance_summary = get_performance_summary()
 
             # Send to MQTT actor for publishing
             await self.actor_queue_registry.send_from(
@@ -1,6 +1,6 @@
-import asyncio
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional
 
+from src.actors.messages.mailbox import Mailbox, OverflowPolicy
 from src.actors.messages.message_type import (
     ActorName,
     ActorMessage,
@@ -8,25 +8,48 @@ from src.actors.messages.message_type import (
     AllowedPayloadTypes,
 )
 
+from src.config.settings import settings
 from src.utils.logger import logger
 
 
 # --- Registry supporting one-to-one and broadcast messaging ---
 class ActorQueueRegistry:
     def __init__(self) -> None:
-        self.queues: Dict[ActorName, asyncio.Queue] = {}
+        self.queues: Dict[ActorName, Mailbox] = {}
 
-    def register(self, name: ActorName):
+    def register(
+        self,
+        name: ActorName,
+        capacity: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        coalesce_types: Iterable[ActorMessageType] = (),
+    ):
+        """
+        Create the actor's mailbox.
+
+        capacity defaults to ACTOR_MAILBOX_CAPACITY; 0 means unbounded.
+        """
         if name in self.queues:
             raise ValueError(f"Actor {name} already registered.")
-        self.queues[name] = asyncio.Queue()
+        if capacity is None:
+            capacity = settings.ACTOR_MAILBOX_CAPACITY
+        self.queues[name] = Mailbox(capacity, overflow, coalesce_types)
         logger.info(f"[Registry] Registered actor: {name}")
 
-    def get_queue(self, name: ActorName) -> asyncio.Queue:
+    def get_mailbox(self, name: ActorName) -> Mailbox:
         if name not in self.queues:
             raise KeyError(f"No queue registered for actor {name}")
         return self.queues[name]
 
+    def get_queue(self, name: ActorName) -> Mailbox:
+        return self.get_mailbox(name)
+
+    def get_mailbox_depths(self) -> Dict[str, int]:
+        return {name.value: mailbox.qsize() for name, mailbox in self.queues.items()}
+
+    def get_mailbox_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name.value: mailbox.stats() for name, mailbox in self.queues.items()}
+
     async def send_from(
         self,
         sender: ActorName,
@@ -48,7 +71,7 @@ class ActorQueueRegistry:
     ):
         base_msg = ActorMessage(
             sender=sender,
-            receiver=ActorName.MQTT,  # gets overwritten per actor
+            receiver=ActorName.BROADCAST,
             message_type=type,
             payload=payload,
         )
@@ -61,10 +84,15 @@ class ActorQueueRegistry:
         logger.info(f"[Registry] Sent message to {message.receiver}")
 
     async def broadcast(self, message: ActorMessage, exclude: List[ActorName] = []):
+        # Messages are immutable, so every receiver shares the same instance
+        if message.receiver != ActorName.BROADCAST:
+            message = message.model_copy(update={"receiver": ActorName.BROADCAST})
         for actor_name, queue in self.queues.items():
-            if actor_name == message.sender or actor_name in exclude:
+            if actor_name in (message.sender, ActorName.BROADCAST) or (
+                actor_name in exclude
+            ):
                 continue
-            await queue.put(message.model_copy(update={"receiver": actor_name}))
+            await queue.put(message)
             logger.info(
                 f"[Registry] Broadcast message to {actor_name}: {message.message_type}"
             )
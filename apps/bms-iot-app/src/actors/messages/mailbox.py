@@ -0,0 +1,246 @@
+"""
+Actor mailboxes and timers.
+
+An actor awaits its mailbox instead of polling it, so an idle actor does no
+work and a message is handled as soon as it is sent. Periodic work is driven
+by a PeriodicTimer whose remaining time is the receive timeout:
+
+    timer = PeriodicTimer(30)
+    while self.keep_running:
+        message = await mailbox.receive(timeout=timer.remaining())
+        if message is not None:
+            await self._handle_message(message)
+        if timer.due():
+            timer.reset()
+            await self._do_periodic_work()
+
+A mailbox has a capacity. When it is full, its overflow policy either makes
+the sender wait (backpressure) or drops the oldest waiting message. Message
+types listed in coalesce_types keep only their latest waiting message, e.g.
+a newer HEARTBEAT_STATUS replaces one the MQTT actor has not published yet.
+
+Messages are received by priority class, then in the order they were sent.
+Interactive commands and their responses overtake bulk traffic, so a write
+response is not stuck behind a backlog of point batches. The time messages
+wait in the mailbox is recorded per class.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum, IntEnum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.actors.messages.message_type import ActorMessage, ActorMessageType
+from src.utils.logger import logger
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"  # The sender waits for room
+    DROP_OLDEST = "drop_oldest"  # The oldest waiting message is discarded
+
+
+class MessagePriority(IntEnum):
+    INTERACTIVE = 0  # Operator commands and their responses
+    NORMAL = 1
+    BULK = 2  # Periodic data that can wait
+
+
+# Message types not listed here are NORMAL. Interactive traffic is small and
+# operator-driven, so it cannot starve the bulk lane for long.
+MESSAGE_PRIORITIES: Dict[ActorMessageType, MessagePriority] = {
+    ActorMessageType.SET_VALUE_TO_POINT_REQUEST: MessagePriority.INTERACTIVE,
+    ActorMessageType.SET_VALUE_TO_POINT_RESPONSE: MessagePriority.INTERACTIVE,
+    ActorMessageType.START_MONITORING_REQUEST: MessagePriority.INTERACTIVE,
+    ActorMessageType.START_MONITORING_RESPONSE: MessagePriority.INTERACTIVE,
+    ActorMessageType.STOP_MONITORING_REQUEST: MessagePriority.INTERACTIVE,
+    ActorMessageType.STOP_MONITORING_RESPONSE: MessagePriority.INTERACTIVE,
+    ActorMessageType.CONFIG_UPLOAD_REQUEST: MessagePriority.INTERACTIVE,
+    ActorMessageType.CONFIG_UPLOAD_RESPONSE: MessagePriority.INTERACTIVE,
+    ActorMessageType.DEVICE_REBOOT: MessagePriority.INTERACTIVE,
+    ActorMessageType.FORCE_HEARTBEAT_REQUEST: MessagePriority.INTERACTIVE,
+    ActorMessageType.POINT_PUBLISH_REQUEST: MessagePriority.BULK,
+    ActorMessageType.HEARTBEAT_STATUS: MessagePriority.BULK,
+}
+
+
+@dataclass
+class QueueTime:
+    """How long received messages of one priority class waited."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        mean = self.total_seconds / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class Mailbox(asyncio.Queue):
+    """An actor's incoming messages; still usable as a plain asyncio.Queue."""
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        coalesce_types: Iterable[ActorMessageType] = (),
+        priorities: Mapping[ActorMessageType, MessagePriority] = MESSAGE_PRIORITIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.priorities = priorities
+        self._clock = clock
+        super().__init__(maxsize)
+        self.overflow = overflow
+        self.coalesce_types = frozenset(coalesce_types)
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+        self.queue_times = {priority: QueueTime() for priority in MessagePriority}
+
+    # asyncio.Queue storage hooks: one FIFO lane of (sent at, message) per
+    # priority class instead of a single deque
+
+    def _init(self, maxsize: int) -> None:
+        self._lanes: Dict[MessagePriority, Deque[Tuple[float, Any]]] = {
+            priority: deque() for priority in MessagePriority
+        }
+
+    def _put(self, item: Any) -> None:
+        self._lanes[self.priority_of(item)].append((self._clock(), item))
+
+    def _get(self) -> Any:
+        for priority, lane in self._lanes.items():
+            if lane:
+                sent_at, item = lane.popleft()
+                self.queue_times[priority].record(self._clock() - sent_at)
+                return item
+        raise asyncio.QueueEmpty
+
+    def qsize(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def empty(self) -> bool:
+        return not any(self._lanes.values())
+
+    def priority_of(self, item: Any) -> MessagePriority:
+        message_type = getattr(item, "message_type", None)
+        return self.priorities.get(message_type, MessagePriority.NORMAL)
+
+    async def put(self, item: ActorMessage) -> None:
+        if self._replace_waiting(item):
+            return
+        if self.overflow == OverflowPolicy.DROP_OLDEST:
+            self.put_nowait(item)
+            return
+        await super().put(item)
+
+    def put_nowait(self, item: ActorMessage) -> None:
+        if self._replace_waiting(item):
+            return
+        if self.overflow == OverflowPolicy.DROP_OLDEST and self.full():
+            oldest = self._drop_oldest()
+            self.dropped += 1
+            logger.warning(
+                f"[Mailbox] Full ({self.maxsize}), dropped oldest "
+                f"{getattr(oldest, 'message_type', oldest)}"
+            )
+        super().put_nowait(item)
+        self.high_water = max(self.high_water, self.qsize())
+
+    def _replace_waiting(self, item: ActorMessage) -> bool:
+        """Coalesce item into a waiting message of the same type, if any."""
+        message_type = getattr(item, "message_type", None)
+        if message_type not in self.coalesce_types:
+            return False
+        lane = self._lanes[self.priority_of(item)]
+        for index, (sent_at, waiting) in enumerate(lane):
+            if waiting.message_type == message_type:
+                # Keeps the original send time, so queue time is not hidden
+                lane[index] = (sent_at, item)
+                self.coalesced += 1
+                return True
+        return False
+
+    def _drop_oldest(self) -> Any:
+        """Discard the oldest message of the lowest non-empty priority class."""
+        for lane in reversed(self._lanes.values()):
+            if lane:
+                return lane.popleft()[1]
+        raise asyncio.QueueEmpty
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.qsize(),
+            "capacity": self.maxsize,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "queue_time": {
+                priority.name: queue_time.as_dict()
+                for priority, queue_time in self.queue_times.items()
+            },
+        }
+
+    async def receive(self, timeout: Optional[float] = None) -> Optional[ActorMessage]:
+        """
+        Wait for the next message.
+
+        Returns None if none arrives within timeout seconds; a timeout of
+        None waits indefinitely.
+        """
+        if timeout is None:
+            return await self.get()
+        if timeout <= 0:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        try:
+            return await asyncio.wait_for(self.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain_nowait(self) -> List[ActorMessage]:
+        """Remove and return the messages already waiting, in receive order."""
+        messages: List[ActorMessage] = []
+        while True:
+            try:
+                messages.append(self.get_nowait())
+            except asyncio.QueueEmpty:
+                return messages
+
+
+class PeriodicTimer:
+    """Deadline of work repeated every interval seconds."""
+
+    def __init__(
+        self,
+        interval: float,
+        start_due: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = interval
+        self._clock = clock
+        self._deadline = clock() if start_due else clock() + interval
+
+    def remaining(self) -> float:
+        """Seconds until the work is due; 0 when it already is."""
+        return max(0.0, self._deadline - self._clock())
+
+    def due(self) -> bool:
+        return self._clock() >= self._deadline
+
+    def reset(self) -> None:
+        """Schedule the next run one interval from now."""
+        self._deadline = self._clock() + self.interval
@@ -1,16 +1,37 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, model_serializer
 from enum import Enum
-from typing import Union, Optional
+from typing import Dict, Union, Optional
 from src.models.controller_points import ControllerPointsModel
 from packages.mqtt_topics.topics_loader import CommandNameEnum
 from src.models.device_status_enums import MonitoringStatusEnum, ConnectionStatusEnum
 from pydantic import Field
 
 
+class ConfigUploadProgress(BaseModel):
+    uploadId: str
+    chunksUploaded: int
+    totalChunks: int
+    pointsUploaded: int
+    totalPoints: int
+
+
 class ConfigUploadResponsePayload(BaseModel):
     success: bool
+    # True on the progress responses sent while a chunked upload runs
+    inProgress: bool = False
+    progress: Optional[ConfigUploadProgress] = None
     correlationData: Optional[bytes] = Field(default=None, exclude=True)
 
+    @model_serializer(mode="wrap")
+    def _omit_unused_progress(self, handler):
+        # Plain responses stay {"success": ...} for existing consumers
+        data = handler(self)
+        if not self.inProgress:
+            data.pop("inProgress", None)
+        if self.progress is None:
+            data.pop("progress", None)
+        return data
+
 
 class BacnetReaderConfig(BaseModel):
     id: str
@@ -35,6 +56,13 @@ class ConfigUploadPayload(BaseModel):
 
 class PointPublishPayload(BaseModel):
     points: list[ControllerPointsModel]
+    # Set by the uploader to match responses to in-flight batches
+    batch_id: Optional[int] = None
+    # False when the broker did not acknowledge the batch
+    success: bool = True
+    # True when the batch was not sent because MQTT is offline; its rows
+    # stay in the outbox and are sent again once the broker is back
+    offline: bool = False
 
 
 class DeviceRebootPayload(BaseModel):
@@ -64,6 +92,10 @@ class SetValueToPointResponsePayload(BaseModel):
     commandId: str
 
 
+# Sent by the MQTT actor when the broker connection is (re)established
+MQTT_CONNECTED_UPLOAD_REASON = "mqtt_connected"
+
+
 class ImmediateUploadTriggerPayload(BaseModel):
     reason: str = "manual_write"  # Reason for immediate upload
 
@@ -102,6 +134,26 @@ class HeartbeatStatusPayload(BaseModel):
     bacnet_devices_connected: Optional[int] = None
     bacnet_points_monitored: Optional[int] = None
 
+    # Local store-and-forward outbox
+    outbox_pending_points: Optional[int] = None
+    outbox_oldest_age_seconds: Optional[float] = None
+    outbox_drain_rate_points_per_second: Optional[float] = None
+    database_size_bytes: Optional[int] = None
+    database_wal_bytes: Optional[int] = None
+    database_freelist_bytes: Optional[int] = None
+
+    # Messages waiting in each actor's mailbox
+    actor_mailbox_depths: Optional[Dict[str, int]] = None
+
+    # Event loop scheduling delay (p50_ms, p99_ms, max_ms) and stall count
+    event_loop_lag: Optional[Dict[str, int]] = None
+
+    # Crashes per actor since the app started
+    actor_crashes: Optional[Dict[str, int]] = None
+
+    # Calls, failures and p50/p99 duration per instrumented operation
+    performance_summary: Optional[Dict[str, Dict[str, float]]] = None
+
 
 class ActorName(str, Enum):
     MQTT = "MQTT"
@@ -148,6 +200,9 @@ AllowedPayloadTypes = Union[
 
 
 class ActorMessage(BaseModel):
+    # Immutable, so one broadcast message can be shared by every receiver
+    model_config = ConfigDict(frozen=True)
+
     sender: ActorName
     receiver: ActorName
     message_type: ActorMessageType
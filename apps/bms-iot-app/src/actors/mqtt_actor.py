@@ -3,13 +3,17 @@ from typing import Optional
 from src.network.mqtt_config import MQTTConfig
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
 from src.actors.messages.message_type import (
+    MQTT_CONNECTED_UPLOAD_REASON,
     ActorName,
     ActorMessage,
     ActorMessageType,
+    ImmediateUploadTriggerPayload,
 )
+from src.config.settings import settings
 from src.controllers.mqtt.mqtt_controller import MQTTHandler
+from src.network.reconnect_backoff import ReconnectBackoff
 from packages.mqtt_topics.topics_loader import CommandNameEnum
-from src.models.iot_device_status import upsert_iot_device_status
+from src.models.device_status_service import device_status_service
 from src.models.device_status_enums import ConnectionStatusEnum
 
 from src.utils.logger import logger
@@ -18,6 +22,9 @@ logging = logger
 
 
 class MQTTActor:
+    # How often the connection state is checked while connected
+    CONNECTION_CHECK_SECONDS = 1.0
+
     def __init__(
         self,
         mqtt_config: MQTTConfig,
@@ -48,66 +55,111 @@ class MQTTActor:
     async def start(self):
         self.mqtt_handler.setup(self.actor_queue_registry, self.actor_name)
 
-        # Initialize connection status
-        await self._update_connection_status(ConnectionStatusEnum.CONNECTED)
-
         async def handle_messages_loop():
+            mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
             while True:
-                await self._handle_messages()
-                await asyncio.sleep(0)  # Yield control to event loop
+                await self._handle_message(await mailbox.receive())
 
         handle_messages_task = asyncio.create_task(handle_messages_loop())
 
         try:
-            while True:
-                if not self.mqtt_handler.mqtt_client.client.is_connected():
-                    await self._update_connection_status(
-                        ConnectionStatusEnum.DISCONNECTED
-                    )
-                    await self.stop()
-                    handle_messages_task.cancel()
-                    raise RuntimeError("MQTT client disconnected")
-                await asyncio.sleep(5)
+            await self._maintain_connection()
         except Exception:
             await self._update_connection_status(ConnectionStatusEnum.ERROR)
             handle_messages_task.cancel()
             raise
 
-    async def _handle_messages(self):
-        queue = self.actor_queue_registry.get_queue(self.actor_name)
-
-        while not queue.empty():
-            logger.info(f"Handling messages for {self.actor_name}")
-            message: ActorMessage = await queue.get()
-            if message.message_type == ActorMessageType.CONFIG_UPLOAD_RESPONSE:
-                logger.info(f"Handling CONFIG_UPLOAD_RESPONSE for {self.actor_name}")
-                # Extract correlation data from payload and pass to publish_response
-                correlation_data = getattr(message.payload, "correlationData", None)
-                self.mqtt_handler.publish_response(
-                    command=CommandNameEnum.get_config,
-                    payload=message.payload,
-                    correlation_data=correlation_data,
-                )
-            elif message.message_type == ActorMessageType.POINT_PUBLISH_REQUEST:
-                await self.mqtt_handler.publish_point_bulk(message.payload.points)
-            elif message.message_type == ActorMessageType.SET_VALUE_TO_POINT_RESPONSE:
-                self.mqtt_handler.publish_response(
-                    CommandNameEnum.set_value_to_point, message.payload
-                )
-            elif message.message_type == ActorMessageType.HEARTBEAT_STATUS:
-                await self.mqtt_handler.publish_heartbeat_status(message.payload)
-            elif message.message_type == ActorMessageType.START_MONITORING_RESPONSE:
-                self.mqtt_handler.publish_response(
-                    CommandNameEnum.start_monitoring, message.payload
-                )
-            elif message.message_type == ActorMessageType.STOP_MONITORING_RESPONSE:
-                self.mqtt_handler.publish_response(
-                    CommandNameEnum.stop_monitoring, message.payload
-                )
-            else:
-                logger.error(
-                    f"Unknown message type: {message.message_type}. Please implement the handler for this message type."
+    async def _maintain_connection(self):
+        """
+        Keep the broker connection up for as long as the actor runs.
+
+        A lost connection is retried at once and then with jittered
+        exponential backoff, instead of crashing the actor. Meanwhile
+        heartbeats and responses wait in the client's offline buffer, and
+        point batches stay in the outbox.
+        """
+        mqtt_client = self.mqtt_handler.mqtt_client
+        assert mqtt_client is not None
+        backoff = ReconnectBackoff(
+            initial_delay=self.mqtt_config.reconnect_delay,
+            max_delay=settings.MQTT_RECONNECT_MAX_DELAY_SECONDS,
+        )
+        was_connected = False
+
+        while True:
+            if mqtt_client.connected:
+                if not was_connected:
+                    was_connected = True
+                    backoff.reset()
+                    await self._update_connection_status(ConnectionStatusEnum.CONNECTED)
+                    await self._notify_uploader_connected()
+                await asyncio.sleep(self.CONNECTION_CHECK_SECONDS)
+                continue
+
+            if was_connected:
+                was_connected = False
+                await self._update_connection_status(ConnectionStatusEnum.DISCONNECTED)
+
+            logger.info("Connecting to MQTT broker...")
+            if not await mqtt_client.connect_async():
+                delay = backoff.next_delay()
+                logger.warning(
+                    f"MQTT connection failed (attempt {backoff.attempts}); "
+                    f"retrying in {delay:.1f}s"
                 )
+                await asyncio.sleep(delay)
+
+    async def _notify_uploader_connected(self):
+        """Let the uploader send outbox batches that failed while offline."""
+        try:
+            await self.actor_queue_registry.send_from(
+                sender=self.actor_name,
+                receiver=ActorName.UPLOADER,
+                type=ActorMessageType.IMMEDIATE_UPLOAD_TRIGGER,
+                payload=ImmediateUploadTriggerPayload(
+                    reason=MQTT_CONNECTED_UPLOAD_REASON
+                ),
+            )
+        except ValueError as e:
+            logger.debug(f"Uploader not notified of MQTT connection: {e}")
+
+    async def _handle_messages(self):
+        """Handle the messages already waiting, without blocking."""
+        mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
+        for message in mailbox.drain_nowait():
+            await self._handle_message(message)
+
+    async def _handle_message(self, message: ActorMessage):
+        logger.info(f"Handling {message.message_type} for {self.actor_name}")
+        if message.message_type == ActorMessageType.CONFIG_UPLOAD_RESPONSE:
+            logger.info(f"Handling CONFIG_UPLOAD_RESPONSE for {self.actor_name}")
+            # Extract correlation data from payload and pass to publish_response
+            correlation_data = getattr(message.payload, "correlationData", None)
+            self.mqtt_handler.publish_response(
+                command=CommandNameEnum.get_config,
+                payload=message.payload,
+                correlation_data=correlation_data,
+            )
+        elif message.message_type == ActorMessageType.POINT_PUBLISH_REQUEST:
+            await self.mqtt_handler.publish_point_bulk(message.payload)
+        elif message.message_type == ActorMessageType.SET_VALUE_TO_POINT_RESPONSE:
+            self.mqtt_handler.publish_response(
+                CommandNameEnum.set_value_to_point, message.payload
+            )
+        elif message.message_type == ActorMessageType.HEARTBEAT_STATUS:
+            await self.mqtt_handler.publish_heartbeat_status(message.payload)
+        elif message.message_type == ActorMessageType.START_MONITORING_RESPONSE:
+            self.mqtt_handler.publish_response(
+                CommandNameEnum.start_monitoring, message.payload
+            )
+        elif message.message_type == ActorMessageType.STOP_MONITORING_RESPONSE:
+            self.mqtt_handler.publish_response(
+                CommandNameEnum.stop_monitoring, message.payload
+            )
+        else:
+            logger.error(
+                f"Unknown message type: {message.message_type}. Please implement the handler for this message type."
+            )
 
     async def stop(self):
         logger.info("Stopping MQTTActor...")
@@ -123,7 +175,7 @@ class MQTTActor:
                 "site_id": self.site_id,
                 "mqtt_connection_status": status,
             }
-            await upsert_iot_device_status(self.iot_device_id, status_data)
+            await device_status_service.update(self.iot_device_id, status_data)
             logger.debug(f"[MQTTActor] Updated MQTT connection status to: {status}")
         except Exception as e:
             logger.error(f"[MQTTActor] Failed to update connection status: {e}")
@@ -0,0 +1,223 @@
+"""
+Actor supervision.
+
+Each actor runs as a child of the Supervisor, which restarts it when it
+crashes:
+
+- Restarts back off exponentially (with jitter), so a fault that persists
+  does not turn into a restart storm, while the first restart after a
+  transient fault is quick.
+- Crashes are counted in a sliding window. A child that crashes more than
+  max_restarts times within window_seconds is escalated: the supervisor
+  stops and the exception ends the app, leaving recovery to the service
+  manager. Once a child has no crashes left in the window its backoff
+  starts over.
+- ONE_FOR_ONE restarts only the crashed child. RESTART_DEPENDENTS also
+  stops the children that depend on its state and starts them again once
+  it is back.
+
+Time from a crash to the restart of the child is recorded per child.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+from src.config.settings import settings
+from src.network.reconnect_backoff import ReconnectBackoff
+from src.utils.logger import logger
+from src.utils.performance_monitor import StreamingHistogram
+
+
+class RestartStrategy(str, Enum):
+    ONE_FOR_ONE = "one_for_one"  # Restart only the crashed child
+    RESTART_DEPENDENTS = "restart_dependents"  # Also restart its dependents
+
+
+@dataclass
+class _Child:
+    name: str
+    start_fn: Callable[[], Awaitable[None]]
+    strategy: RestartStrategy
+    dependents: Sequence[str]
+    backoff: ReconnectBackoff
+    crash_times: Deque[float] = field(default_factory=deque)
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+    restart_requested: bool = False
+    starts: int = 0
+    crashes: int = 0
+    dependency_restarts: int = 0
+    recovery_ms: StreamingHistogram = field(default_factory=StreamingHistogram)
+    last_recovery_seconds: Optional[float] = None
+
+
+class Supervisor:
+    def __init__(
+        self,
+        max_restarts: int,
+        window_seconds: float,
+        initial_delay: float,
+        max_delay: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_restarts = max_restarts
+        self.window_seconds = window_seconds
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._children: Dict[str, _Child] = {}
+
+    def add(
+        self,
+        name: str,
+        start_fn: Callable[[], Awaitable[None]],
+        strategy: RestartStrategy = RestartStrategy.ONE_FOR_ONE,
+        dependents: Sequence[str] = (),
+    ) -> None:
+        """
+        Register a child; start_fn runs the actor until it stops or crashes.
+
+        dependents are restarted with this child under RESTART_DEPENDENTS.
+        """
+        self._children[name] = _Child(
+            name=name,
+            start_fn=start_fn,
+            strategy=strategy,
+            dependents=tuple(dependents),
+            backoff=ReconnectBackoff(self.initial_delay, self.max_delay),
+        )
+
+    async def run(self) -> None:
+        """Run every child; raises when one exhausts its crash budget."""
+        runners = [
+            asyncio.create_task(self._supervise(child), name=f"supervise-{name}")
+            for name, child in self._children.items()
+        ]
+        try:
+            await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
+            await asyncio.gather(*runners, return_exceptions=True)
+
+    async def _supervise(self, child: _Child) -> None:
+        crashed_at: Optional[float] = None
+        while True:
+            await self._wait_for_providers(child.name)
+            logger.info(f"[Supervisor] Starting {child.name}")
+            child.task = asyncio.create_task(child.start_fn(), name=child.name)
+            child.starts += 1
+            child.started.set()
+            if crashed_at is not None:
+                self._record_recovery(child, self._clock() - crashed_at)
+                crashed_at = None
+
+            try:
+                await child.task
+                if not child.restart_requested:
+                    logger.warning(f"[Supervisor] {child.name} stopped, restarting")
+                    await asyncio.sleep(self.initial_delay)
+                    continue
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not child.restart_requested or (current and current.cancelling()):
+                    child.task.cancel()
+                    raise
+            except Exception as e:
+                crashed_at = self._clock()
+                child.restart_requested = False
+                child.started.clear()
+                delay = self._on_crash(child, crashed_at, e)
+                if child.strategy == RestartStrategy.RESTART_DEPENDENTS:
+                    for name in child.dependents:
+                        self._stop_for_restart(name)
+                await asyncio.sleep(delay)
+                continue
+
+            # Stopped because a child it depends on crashed
+            child.restart_requested = False
+            child.dependency_restarts += 1
+            crashed_at = self._clock()
+
+    def _on_crash(self, child: _Child, crashed_at: float, error: Exception) -> float:
+        """Count the crash and return the restart delay, or escalate."""
+        child.crashes += 1
+        crash_times = child.crash_times
+        while crash_times and crashed_at - crash_times[0] > self.window_seconds:
+            crash_times.popleft()
+        if not crash_times:
+            # Healthy for a whole window: treat this as a first fault
+            child.backoff.reset()
+        crash_times.append(crashed_at)
+
+        if len(crash_times) > self.max_restarts:
+            logger.error(
+                f"[Supervisor] {child.name} crashed {len(crash_times)} times in "
+                f"{self.window_seconds:.0f}s, exiting"
+            )
+            raise error
+
+        delay = child.backoff.next_delay()
+        logger.opt(exception=error).error(
+            f"[Supervisor] {child.name} crashed: {error}; "
+            f"restarting in {delay:.1f}s ({len(crash_times)}/{self.max_restarts} "
+            f"in window)"
+        )
+        return delay
+
+    def _stop_for_restart(self, name: str) -> None:
+        child = self._children.get(name)
+        if child is None or child.task is None or child.task.done():
+            return
+        logger.info(f"[Supervisor] Restarting {name} with the child it depends on")
+        child.restart_requested = True
+        child.started.clear()
+        child.task.cancel()
+
+    async def _wait_for_providers(self, name: str) -> None:
+        """Wait until every child that restarts this one is running."""
+        for provider in self._providers(name):
+            await provider.started.wait()
+
+    def _providers(self, name: str) -> List[_Child]:
+        return [
+            child
+            for child in self._children.values()
+            if child.strategy == RestartStrategy.RESTART_DEPENDENTS
+            and name in child.dependents
+        ]
+
+    def _record_recovery(self, child: _Child, seconds: float) -> None:
+        child.last_recovery_seconds = seconds
+        child.recovery_ms.record(int(seconds * 1000))
+        logger.info(f"[Supervisor] {child.name} recovered in {seconds:.2f}s")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Starts, crashes and time to recover per child."""
+        return {
+            name: {
+                "starts": child.starts,
+                "crashes": child.crashes,
+                "crashes_in_window": len(child.crash_times),
+                "dependency_restarts": child.dependency_restarts,
+                "last_recovery_seconds": child.last_recovery_seconds,
+                "p99_recovery_ms": child.recovery_ms.quantile(0.99),
+            }
+            for name, child in self._children.items()
+        }
+
+    def get_crash_counts(self) -> Dict[str, int]:
+        return {name: child.crashes for name, child in self._children.items()}
+
+
+# Global supervisor instance; main adds the actors
+actor_supervisor = Supervisor(
+    max_restarts=settings.SUPERVISOR_MAX_RESTARTS,
+    window_seconds=settings.SUPERVISOR_WINDOW_SECONDS,
+    initial_delay=settings.SUPERVISOR_INITIAL_DELAY_SECONDS,
+    max_delay=settings.SUPERVISOR_MAX_DELAY_SECONDS,
+)
@@ -5,8 +5,10 @@ import time
 from typing import Dict, Any
 
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.mailbox import PeriodicTimer
 from src.actors.messages.message_type import ActorName, ActorMessage
-from src.models.iot_device_status import update_system_metrics
+from src.models.device_status_service import device_status_service
+from src.utils.blocking import run_blocking
 
 logging = logger
 
@@ -27,6 +29,8 @@ class SystemMetricsActor:
         self.iot_device_id = iot_device_id
         self.collection_interval = 30  # Collect metrics every 30 seconds
         self.app_start_time = time.time()  # Track when app started
+        # CPU usage is measured between calls; this first call starts the window
+        psutil.cpu_percent(interval=None)
 
     async def start(self):
         await self._run_metrics_loop()
@@ -35,24 +39,24 @@ class SystemMetricsActor:
         logger.info(
             f"[SystemMetricsActor] Starting metrics collection for device: {self.iot_device_id}"
         )
-        queue = self.actor_queue_registry.get_queue(self.actor_name)
+        mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
+        collection_timer = PeriodicTimer(self.collection_interval)
 
         while self.keep_running:
             try:
-                # 1. Collect system metrics
-                await self._collect_and_store_metrics()
-
-                # 2. Check for incoming messages (non-blocking)
-                while not queue.empty():
-                    msg: ActorMessage = await queue.get()
+                # 1. Collect system metrics when due
+                if collection_timer.due():
+                    collection_timer.reset()
+                    await self._collect_and_store_metrics()
+
+                # 2. Handle messages as they arrive until the next collection
+                msg = await mailbox.receive(timeout=collection_timer.remaining())
+                if msg is not None:
                     await self._handle_message(msg)
 
-                await asyncio.sleep(0)  # Yield control to event loop
-
             except Exception as e:
                 logger.error(f"SystemMetricsActor error: {e}")
-
-            await asyncio.sleep(self.collection_interval)
+                await asyncio.sleep(1)
 
     async def _collect_and_store_metrics(self):
         """Collect system metrics and store them in local iot_device_status."""
@@ -63,8 +67,8 @@ class SystemMetricsActor:
             metrics["organization_id"] = self.organization_id
             metrics["site_id"] = self.site_id
 
-            # Store in local database
-            await update_system_metrics(self.iot_device_id, metrics)
+            # Merge into in-memory status; persisted on the debounce interval
+            await device_status_service.update(self.iot_device_id, metrics)
 
             logger.debug(
                 f"[SystemMetricsActor] Updated system metrics for device: {self.iot_device_id}"
@@ -74,12 +78,16 @@ class SystemMetricsActor:
             logger.error(f"[SystemMetricsActor] Failed to collect/store metrics: {e}")
 
     async def _collect_system_metrics(self) -> Dict[str, Any]:
-        """Collect system metrics using psutil."""
+        """Collect system metrics without blocking the event loop."""
+        return await run_blocking(self._read_system_metrics)
+
+    def _read_system_metrics(self) -> Dict[str, Any]:
+        """Read system metrics using psutil; blocks on file and sensor reads."""
         metrics = {}
 
         try:
-            # CPU usage
-            metrics["cpu_usage_percent"] = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous collection, without sleeping
+            metrics["cpu_usage_percent"] = psutil.cpu_percent(interval=None)
 
             # Memory usage
             memory = psutil.virtual_memory()
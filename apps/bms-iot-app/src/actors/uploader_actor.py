@@ -1,87 +1,292 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
 from typing import Optional
+from src.config.settings import settings
 from src.utils.logger import logger
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
 from src.actors.messages.message_type import (
+    MQTT_CONNECTED_UPLOAD_REASON,
     ActorMessageType,
     ActorName,
     ConfigUploadPayload,
     ActorMessage,
     PointPublishPayload,
+    ConfigUploadProgress,
     ConfigUploadResponsePayload,
     ImmediateUploadTriggerPayload,
 )
+from src.controllers.uploader.adaptive_batch import (
+    AdaptiveBatchSizer,
+    drain_rate_meter,
+)
 from src.controllers.uploader.upload import upload_config, get_points_to_publish
-import asyncio
 from src.controllers.uploader.upload import mark_points_as_uploaded_in_db
+from src.dto.controller_point_dto import ControllerPointDTO
+from src.models.controller_points import get_outbox_stats
+
+
+@dataclass
+class InFlightBatch:
+    """A published batch waiting for its POINT_PUBLISH_RESPONSE."""
+
+    payload: PointPublishPayload
+    requested: int
+    sent_at: float
+    # Resent (or first sent) when the acknowledgement is overdue
+    deadline: float
+    attempts: int = 1
 
 
 class UploaderActor:
+    # Poll interval while the outbox is empty (triggers wake it earlier)
+    IDLE_POLL_SECONDS = 2.0
+    # Delay before resending a batch the broker did not acknowledge
+    RESEND_DELAY_SECONDS = 5.0
+    # How often backlog depth and drain rate are logged
+    STATS_LOG_INTERVAL_SECONDS = 60.0
+
     def __init__(self, actor_queue_registry: ActorQueueRegistry):
         self.actor_queue_registry = actor_queue_registry
         self.actor_name = ActorName.UPLOADER
         self.keep_running = True
+        self.batch_sizer = AdaptiveBatchSizer()
+        self.drain_rate_meter = drain_rate_meter
+        self.inflight_window = max(1, settings.UPLOAD_INFLIGHT_WINDOW)
+        self.ack_timeout_seconds = settings.UPLOAD_ACK_TIMEOUT_SECONDS
+        self._in_flight: dict[int, InFlightBatch] = {}
+        self._batch_ids = itertools.count(1)
+        # Highest row id handed out while batches are in flight
+        self._cursor: Optional[int] = None
+        self._last_stats_log = time.monotonic()
+        # Chunked config upload, run beside point publishing
+        self._config_upload_task: Optional[asyncio.Task] = None
 
     async def start(self):
         await self._run_monitor_loop()
 
     async def _run_monitor_loop(self):
         logger.info("UploaderActor started")
-        queue = self.actor_queue_registry.get_queue(self.actor_name)
+        mailbox = self.actor_queue_registry.get_mailbox(self.actor_name)
 
         while self.keep_running:
-            await self.publish_points()
-
-            while not queue.empty():
-                message: ActorMessage = await queue.get()
-                logger.info(f"UploaderActor received message: {message.message_type}")
-                if message.message_type == ActorMessageType.CONFIG_UPLOAD_RESPONSE:
-                    await self.on_upload_request(message.payload)
-                elif message.message_type == ActorMessageType.POINT_PUBLISH_RESPONSE:
-                    await self.on_point_publish_response(message.payload)
-                elif message.message_type == ActorMessageType.IMMEDIATE_UPLOAD_TRIGGER:
-                    await self.on_immediate_upload_trigger(message.payload)
-            await asyncio.sleep(2)  # Yield control to event loop
+            await self._fill_window()
+
+            message = await mailbox.receive(timeout=self._wait_timeout())
+            if message is not None:
+                await self._handle_message(message)
+                for message in mailbox.drain_nowait():
+                    await self._handle_message(message)
+
+            await self._resend_overdue()
+            await self._log_stats_if_due()
+
+    async def _fill_window(self):
+        """Publish batches until the window is full or the outbox is drained."""
+        while len(self._in_flight) < self.inflight_window:
+            if not await self.publish_points():
+                return
+
+    def _wait_timeout(self) -> float:
+        """Wait until the next overdue batch, polling while the window has room."""
+        timeout = (
+            self.IDLE_POLL_SECONDS
+            if len(self._in_flight) < self.inflight_window
+            else float("inf")
+        )
+        if self._in_flight:
+            next_deadline = min(batch.deadline for batch in self._in_flight.values())
+            timeout = min(timeout, next_deadline - time.monotonic())
+        return max(0.0, timeout)
+
+    async def _resend_overdue(self):
+        now = time.monotonic()
+        for batch_id, batch in list(self._in_flight.items()):
+            if batch.deadline > now:
+                continue
+            logger.warning(
+                f"UploaderActor resending batch {batch_id} "
+                f"({len(batch.payload.points)} points, attempt {batch.attempts + 1})"
+            )
+            batch.attempts += 1
+            await self._send_batch(batch_id, batch)
+
+    async def _send_batch(self, batch_id: int, batch: InFlightBatch):
+        batch.sent_at = time.monotonic()
+        batch.deadline = batch.sent_at + self.ack_timeout_seconds
+        await self.actor_queue_registry.send_from(
+            sender=self.actor_name,
+            receiver=ActorName.MQTT,
+            type=ActorMessageType.POINT_PUBLISH_REQUEST,
+            payload=batch.payload,
+        )
+
+    async def _handle_message(self, message: ActorMessage):
+        logger.info(f"UploaderActor received message: {message.message_type}")
+        if message.message_type == ActorMessageType.CONFIG_UPLOAD_RESPONSE:
+            await self.on_upload_request(message.payload)
+        elif message.message_type == ActorMessageType.POINT_PUBLISH_RESPONSE:
+            await self.on_point_publish_response(message.payload)
+        elif message.message_type == ActorMessageType.IMMEDIATE_UPLOAD_TRIGGER:
+            await self.on_immediate_upload_trigger(message.payload)
 
     async def on_upload_request(self, payload: ConfigUploadPayload):
+        """Start the config upload without holding up point publishing."""
+        if self._config_upload_task and not self._config_upload_task.done():
+            logger.warning("Cancelling config upload superseded by a new request")
+            self._config_upload_task.cancel()
+        self._config_upload_task = asyncio.create_task(self._upload_config(payload))
+
+    async def _upload_config(self, payload: ConfigUploadPayload):
         urlToUploadConfig: str = payload.urlToUploadConfig
         jwtToken: str = payload.jwtToken
         correlation_data: Optional[bytes] = payload.correlationData
 
+        async def report_progress(progress: ConfigUploadProgress):
+            await self._send_config_upload_response(
+                correlation_data, success=True, in_progress=True, progress=progress
+            )
+
         logger.info(f"Uploading config to {urlToUploadConfig} with jwtToken {jwtToken}")
-        await upload_config(urlToUploadConfig, jwtToken)
+        try:
+            progress = await upload_config(
+                urlToUploadConfig, jwtToken, on_progress=report_progress
+            )
+        except asyncio.CancelledError:
+            await self._send_config_upload_response(correlation_data, success=False)
+            raise
+        except Exception as e:
+            logger.error(f"Config upload failed: {e}", exc_info=True)
+            await self._send_config_upload_response(correlation_data, success=False)
+            return
+
+        # No stored config means there was nothing to upload
+        success = progress is None or progress.chunksUploaded == progress.totalChunks
+        await self._send_config_upload_response(
+            correlation_data, success=success, progress=progress
+        )
+
+    async def _send_config_upload_response(
+        self,
+        correlation_data: Optional[bytes],
+        success: bool,
+        in_progress: bool = False,
+        progress: Optional[ConfigUploadProgress] = None,
+    ):
         await self.actor_queue_registry.send_from(
             sender=self.actor_name,
             receiver=ActorName.MQTT,
             type=ActorMessageType.CONFIG_UPLOAD_RESPONSE,
             payload=ConfigUploadResponsePayload(
-                success=True, correlationData=correlation_data
+                success=success,
+                inProgress=in_progress,
+                progress=progress,
+                correlationData=correlation_data,
             ),
         )
 
-    async def publish_points(self):
-        points = await get_points_to_publish()
+    async def publish_points(self) -> int:
+        """Send the next adaptive batch to MQTT; returns the number of points sent."""
+        if not self._in_flight:
+            # Nothing outstanding: start over from the oldest pending row
+            self._cursor = None
+        batch_size = self.batch_sizer.next_batch_size
+        points = await get_points_to_publish(limit=batch_size, after_id=self._cursor)
         if not points:
-            logger.warning("No points found to publish.")
-            return None
+            logger.debug("No points found to publish.")
+            return 0
 
-        payload = PointPublishPayload(points=points)
+        self._cursor = max(
+            [point.id for point in points if point.id is not None],
+            default=self._cursor,
+        )
+        self.batch_sizer.record_point_bytes(
+            len(ControllerPointDTO.from_model(points[0]).model_dump_json())
+        )
+        batch_id = next(self._batch_ids)
+        batch = InFlightBatch(
+            payload=PointPublishPayload(points=points, batch_id=batch_id),
+            requested=batch_size,
+            sent_at=0.0,
+            deadline=0.0,
+        )
+        self._in_flight[batch_id] = batch
 
         logger.info(
             f"Sending POINT_PUBLISH_REQUEST to MQTT with payload: {len(points)} points"
         )
-        await self.actor_queue_registry.send_from(
-            sender=self.actor_name,
-            receiver=ActorName.MQTT,
-            type=ActorMessageType.POINT_PUBLISH_REQUEST,
-            payload=payload,
-        )
+        await self._send_batch(batch_id, batch)
+        return len(points)
 
     async def on_point_publish_response(self, payload: PointPublishPayload):
         logger.info(
             f"UploaderActor received point publish response: {len(payload.points)}"
         )
+        batch = (
+            self._in_flight.get(payload.batch_id)
+            if payload.batch_id is not None
+            else None
+        )
+
+        if not payload.success and payload.offline:
+            # Not a sign of an oversized batch: wait for the reconnect trigger,
+            # with the ack timeout as a fallback
+            logger.info(
+                f"UploaderActor batch {payload.batch_id} deferred until MQTT reconnects"
+            )
+            if batch is not None:
+                batch.deadline = time.monotonic() + self.ack_timeout_seconds
+            return
+
+        if not payload.success:
+            logger.warning(
+                f"UploaderActor batch {payload.batch_id} was not acknowledged; "
+                f"resending in {self.RESEND_DELAY_SECONDS}s"
+            )
+            if batch is not None:
+                batch.deadline = time.monotonic() + self.RESEND_DELAY_SECONDS
+                self.batch_sizer.record_timeout()
+            return
+
+        # Rows are marked even for a late duplicate acknowledgement: they were delivered
         await mark_points_as_uploaded_in_db(payload.points)
         logger.info(f"UploaderActor marked points as uploaded: {len(payload.points)}")
+        self.drain_rate_meter.record(len(payload.points))
+
+        if batch is not None:
+            del self._in_flight[payload.batch_id]
+            self.batch_sizer.record_ack(
+                len(payload.points), batch.requested, time.monotonic() - batch.sent_at
+            )
+
+    async def get_stats(self) -> dict:
+        """Backlog depth, drain rate and the current batch sizing."""
+        outbox_stats = await get_outbox_stats()
+        return {
+            "backlog_points": outbox_stats["pending_points"],
+            "drain_rate_points_per_second": self.drain_rate_meter.rate(),
+            "uploaded_points_total": self.drain_rate_meter.total_points,
+            "batch_size": self.batch_sizer.next_batch_size,
+            "in_flight_batches": len(self._in_flight),
+            "publish_latency_seconds": self.batch_sizer.latency_seconds,
+        }
+
+    async def _log_stats_if_due(self):
+        now = time.monotonic()
+        if now - self._last_stats_log < self.STATS_LOG_INTERVAL_SECONDS:
+            return
+        self._last_stats_log = now
+        try:
+            stats = await self.get_stats()
+        except Exception as e:
+            logger.warning(f"UploaderActor could not read upload stats: {e}")
+            return
+        logger.info(
+            f"UploaderActor backlog={stats['backlog_points']} points, "
+            f"drain_rate={stats['drain_rate_points_per_second']:.1f} points/s, "
+            f"batch_size={stats['batch_size']}"
+        )
 
     async def on_immediate_upload_trigger(self, payload: ImmediateUploadTriggerPayload):
         """
@@ -93,8 +298,14 @@ class UploaderActor:
                 f"UploaderActor received immediate upload trigger: reason={payload.reason}"
             )
 
-            # Perform immediate upload cycle (same logic as regular publish_points)
-            await self.publish_points()
+            if payload.reason == MQTT_CONNECTED_UPLOAD_REASON:
+                # Batches deferred while offline go out at once
+                now = time.monotonic()
+                for batch in self._in_flight.values():
+                    batch.deadline = min(batch.deadline, now)
+                await self._resend_overdue()
+
+            await self._fill_window()
 
             logger.info(
                 f"UploaderActor completed immediate upload cycle for reason: {payload.reason}"
@@ -8,6 +8,7 @@ from typing import Optional
 
 import typer
 from rich.console import Console
+from rich.table import Table
 
 from src.utils.logger import logger
 
@@ -34,6 +35,12 @@ from src.models.deployment_config import (
 )
 from src.utils.id_generator import generate_org_id, generate_site_id, generate_device_id
 from src.utils.config_formatter import print_config_summary
+from src.models.point_state import get_point_state, get_point_states
+from src.network.sqlmodel_client import (
+    enable_incremental_auto_vacuum,
+    get_database_stats,
+    run_database_maintenance,
+)
 
 # Set up rich console for direct output
 console = Console()
@@ -42,8 +49,10 @@ console = Console()
 app = typer.Typer()
 mqtt_app = typer.Typer()
 config_app = typer.Typer()
+db_app = typer.Typer()
 app.add_typer(mqtt_app, name="mqtt", help="MQTT client commands and configuration")
 app.add_typer(config_app, name="config", help="Deployment configuration management")
+app.add_typer(db_app, name="db", help="Local SQLite database maintenance")
 
 
 # Helper functions to consolidate repetitive MQTT logic
@@ -585,6 +594,91 @@ def config_setup(
     asyncio.run(_interactive_setup())
 
 
+@db_app.command("stats")
+def db_stats():
+    """Show file, WAL, page and freelist sizes of the main and outbox databases."""
+
+    async def _show_stats():
+        stats = await get_database_stats()
+        for label, prefix, size_key, wal_key in (
+            ("Database", "database", "database_bytes", "wal_bytes"),
+            ("Outbox", "outbox", "outbox_bytes", "outbox_wal_bytes"),
+        ):
+            console.print(f"{label} file: {stats[f'{prefix}_file']}")
+            console.print(f"  Size:       {stats[size_key]:,} bytes")
+            console.print(f"  WAL file:   {stats[wal_key]:,} bytes")
+            console.print(
+                f"  Pages:      {stats[f'{prefix}_page_count']:,} "
+                f"({stats[f'{prefix}_freelist_pages']:,} free)"
+            )
+        console.print(
+            f"Freelist:     {stats['freelist_bytes']:,} bytes "
+            f"({stats['freelist_pages']:,} pages)"
+        )
+
+    asyncio.run(_show_stats())
+
+
+@db_app.command("points")
+def db_points(
+    controller_id: Optional[str] = typer.Option(
+        None, "--controller", help="Only show points of this controller"
+    ),
+    iot_device_point_id: Optional[str] = typer.Option(
+        None, "--point", help="Only show this point"
+    ),
+):
+    """Show the latest value of each point, from the point_state table."""
+
+    async def _show_points():
+        if iot_device_point_id is not None:
+            state = await get_point_state(iot_device_point_id)
+            states = [state] if state is not None else []
+        else:
+            states = await get_point_states(controller_id)
+        if not states:
+            console.print("No point state recorded")
+            return
+        table = Table("Point", "Controller", "Value", "Units", "Updated", "Changed")
+        for state in sorted(states, key=lambda s: s.iot_device_point_id):
+            table.add_row(
+                state.iot_device_point_id,
+                state.controller_id,
+                state.present_value,
+                state.units,
+                f"{state.updated_at:%Y-%m-%d %H:%M:%S}",
+                f"{state.changed_at:%Y-%m-%d %H:%M:%S}",
+            )
+        console.print(table)
+
+    asyncio.run(_show_points())
+
+
+@db_app.command("maintain")
+def db_maintain(
+    analyze: bool = typer.Option(
+        False, "--analyze", help="Run a full ANALYZE instead of PRAGMA optimize"
+    ),
+    time_budget: float = typer.Option(
+        10.0, "--time-budget", help="Seconds to spend on vacuum and statistics"
+    ),
+):
+    """Checkpoint the WAL, release free pages and refresh planner statistics.
+
+    Databases created before incremental auto-vacuum was enabled are first
+    converted with a one-off full VACUUM.
+    """
+
+    async def _maintain():
+        await enable_incremental_auto_vacuum(convert_existing=True)
+        report = await run_database_maintenance(
+            time_budget_seconds=time_budget, analyze=analyze
+        )
+        console.print(f"[green]✓ Maintenance completed:[/green] {report}")
+
+    asyncio.run(_maintain())
+
+
 @app.command()
 def run_main():
     """Run the main MQTT and BACnet monitor event loop (from main.py)."""
@@ -19,3 +19,20 @@ LARGE_PAYLOAD_THRESHOLD_KB = 10.0  # 10KB - same threshold in KB for display
 
 # SQLite Performance Configuration
 SQLITE_CACHE_SIZE_PAGES = 10000  # Number of pages for SQLite cache optimization
+SQLITE_MMAP_SIZE_BYTES = 268435456  # 256MB memory map per connection
+SQLITE_BUSY_TIMEOUT_MS = 30000  # 30 second busy timeout per connection
+
+# SQLite Connection Pool Configuration
+SQLITE_POOL_SIZE = 5  # Persistent connections kept open (PRAGMAs applied once each)
+SQLITE_POOL_MAX_OVERFLOW = 10  # Extra short-lived connections under burst load
+SQLITE_POOL_TIMEOUT_SECONDS = 30  # Wait time for a free connection before failing
+SQLITE_POOL_RECYCLE_SECONDS = 3600  # Recycle pooled connections after 1 hour
+
+# SQLite Maintenance Configuration
+SQLITE_MAINTENANCE_TIME_BUDGET_SECONDS = 2.0  # Upper bound for one maintenance round
+SQLITE_INCREMENTAL_VACUUM_PAGES = 256  # Freelist pages released per vacuum step
+SQLITE_ANALYSIS_LIMIT = 1000  # Rows sampled per index by ANALYZE / PRAGMA optimize
+
+# BACnet Config Storage
+BACNET_CONFIG_VERSIONS_TO_KEEP = 2  # Latest discovery plus one previous version
+BACNET_CONFIG_UPLOAD_PAGE_SIZE = 500  # Objects read per query when paging a config
@@ -37,6 +37,11 @@ def get_database_file() -> str:
     return settings.DATABASE_PATH
 
 
+def get_outbox_database_file() -> str:
+    """Get point sample outbox database file path from centralized settings."""
+    return settings.OUTBOX_DATABASE_PATH
+
+
 def get_mqtt_config_file() -> str:
     """Get MQTT config file path from centralized settings."""
     return settings.MQTT_CONFIG_PATH
@@ -51,6 +56,7 @@ def get_config() -> Dict[str, Any]:
     """Get all configuration paths."""
     return {
         "database_file": settings.DATABASE_PATH,
+        "outbox_database_file": settings.OUTBOX_DATABASE_PATH,
         "mqtt_config_file": settings.MQTT_CONFIG_PATH,
         "cert_file": settings.CERT_PATH,
     }
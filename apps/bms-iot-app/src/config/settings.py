@@ -2,6 +2,7 @@
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -34,6 +35,14 @@ def load_environment(app_root: Path = None):
 load_environment()
 
 
+def default_outbox_database_path(database_path: str, durability: str) -> str:
+    """Outbox file next to the main database, or in RAM for volatile durability."""
+    if durability == "volatile":
+        ram_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        return os.path.join(ram_dir, "bms-iot-outbox.db")
+    return f"{os.path.splitext(database_path)[0]}-outbox.db"
+
+
 class Settings:
     """Application settings loaded from environment variables."""
 
@@ -48,5 +57,134 @@ class Settings:
 
     CERT_PATH = os.path.expanduser(os.getenv("BMS_IOT_CERT_PATH", "./emqxsl-ca.crt"))
 
+    # Outbox retention for offline store-and-forward (0 disables a limit)
+    OUTBOX_MAX_ROWS = int(os.getenv("BMS_IOT_OUTBOX_MAX_ROWS", "500000"))
+    OUTBOX_MAX_AGE_HOURS = float(os.getenv("BMS_IOT_OUTBOX_MAX_AGE_HOURS", "168"))
+    OUTBOX_FULL_RESOLUTION_MINUTES = float(
+        os.getenv("BMS_IOT_OUTBOX_FULL_RESOLUTION_MINUTES", "60")
+    )
+    OUTBOX_DOWNSAMPLE_INTERVAL_SECONDS = int(
+        os.getenv("BMS_IOT_OUTBOX_DOWNSAMPLE_INTERVAL_SECONDS", "300")
+    )
+
+    # Durability of point samples (config tables are always fully durable):
+    #   durable  - every batch is committed to the outbox file (synchronous=NORMAL)
+    #   batched  - samples are buffered in memory and flushed every N seconds or M rows
+    #   volatile - outbox file lives in RAM (/dev/shm) and is lost on reboot
+    SAMPLE_DURABILITY = os.getenv("BMS_IOT_SAMPLE_DURABILITY", "durable").lower()
+    OUTBOX_DATABASE_PATH = os.path.expanduser(
+        os.getenv(
+            "BMS_IOT_OUTBOX_DATABASE_PATH",
+            default_outbox_database_path(DATABASE_PATH, SAMPLE_DURABILITY),
+        )
+    )
+    OUTBOX_FLUSH_INTERVAL_SECONDS = float(
+        os.getenv("BMS_IOT_OUTBOX_FLUSH_INTERVAL_SECONDS", "5")
+    )
+    OUTBOX_FLUSH_ROWS = int(os.getenv("BMS_IOT_OUTBOX_FLUSH_ROWS", "1000"))
+
+    # Adaptive point upload: batches are sized to stay under the payload target
+    # and to be acknowledged within the latency target
+    UPLOAD_TARGET_PAYLOAD_BYTES = int(
+        os.getenv("BMS_IOT_UPLOAD_TARGET_PAYLOAD_BYTES", "262144")
+    )
+    UPLOAD_TARGET_LATENCY_SECONDS = float(
+        os.getenv("BMS_IOT_UPLOAD_TARGET_LATENCY_SECONDS", "1.0")
+    )
+    UPLOAD_MAX_BATCH_POINTS = int(os.getenv("BMS_IOT_UPLOAD_MAX_BATCH_POINTS", "5000"))
+    # Batches published but not yet acknowledged by the broker (PUBACK)
+    UPLOAD_INFLIGHT_WINDOW = int(os.getenv("BMS_IOT_UPLOAD_INFLIGHT_WINDOW", "4"))
+    UPLOAD_ACK_TIMEOUT_SECONDS = float(
+        os.getenv("BMS_IOT_UPLOAD_ACK_TIMEOUT_SECONDS", "30")
+    )
+
+    # Wire format of data.point_bulk: json (one object per point) or columnar
+    # (field names once, nulls omitted, integer timestamps; see point_bulk_encoding)
+    POINT_BULK_ENCODING = os.getenv("BMS_IOT_POINT_BULK_ENCODING", "json").lower()
+
+    # Publish compression (none or gzip) for topics matching the fnmatch patterns,
+    # applied only above the size threshold
+    MQTT_COMPRESSION = os.getenv("BMS_IOT_MQTT_COMPRESSION", "none").lower()
+    MQTT_COMPRESSION_MIN_BYTES = int(
+        os.getenv("BMS_IOT_MQTT_COMPRESSION_MIN_BYTES", "4096")
+    )
+    MQTT_COMPRESSION_TOPICS = os.getenv(
+        "BMS_IOT_MQTT_COMPRESSION_TOPICS", "*/bulk,*/command/get_config/response"
+    )
+
+    # Longest wait between MQTT reconnect attempts; the first retry waits
+    # MQTTConfig.reconnect_delay and each failure doubles it (with jitter)
+    MQTT_RECONNECT_MAX_DELAY_SECONDS = float(
+        os.getenv("BMS_IOT_MQTT_RECONNECT_MAX_DELAY_SECONDS", "120")
+    )
+    # Heartbeats and command responses held while the broker is unreachable;
+    # point batches are not buffered here, they stay in the outbox
+    MQTT_OFFLINE_BUFFER_MESSAGES = int(
+        os.getenv("BMS_IOT_MQTT_OFFLINE_BUFFER_MESSAGES", "1000")
+    )
+    MQTT_OFFLINE_BUFFER_BYTES = int(
+        os.getenv("BMS_IOT_MQTT_OFFLINE_BUFFER_BYTES", "1048576")
+    )
+
+    # Config uploads: gzip the streamed request body (Content-Encoding: gzip), and
+    # negotiate HTTP/2 on the pooled HTTP client (needs the optional h2 package)
+    CONFIG_UPLOAD_GZIP = (
+        os.getenv("BMS_IOT_CONFIG_UPLOAD_GZIP", "true").lower() == "true"
+    )
+    HTTP2_ENABLED = os.getenv("BMS_IOT_HTTP2_ENABLED", "false").lower() == "true"
+
+    # Config uploads are sent in chunks of at most this many points, each chunk
+    # retried with backoff before the upload is given up
+    CONFIG_UPLOAD_CHUNK_POINTS = int(
+        os.getenv("BMS_IOT_CONFIG_UPLOAD_CHUNK_POINTS", "500")
+    )
+    CONFIG_UPLOAD_CHUNK_RETRIES = int(
+        os.getenv("BMS_IOT_CONFIG_UPLOAD_CHUNK_RETRIES", "4")
+    )
+
+    # Minimum time between iot_device_status writes (ERROR transitions flush at once)
+    STATUS_FLUSH_INTERVAL_SECONDS = float(
+        os.getenv("BMS_IOT_STATUS_FLUSH_INTERVAL_SECONDS", "30")
+    )
+
+    # Messages an actor mailbox holds before its overflow policy applies
+    ACTOR_MAILBOX_CAPACITY = int(os.getenv("BMS_IOT_ACTOR_MAILBOX_CAPACITY", "1000"))
+
+    # Actor restarts: backoff between restarts, and the crash budget; more than
+    # SUPERVISOR_MAX_RESTARTS crashes of one actor within the window exit the app
+    SUPERVISOR_INITIAL_DELAY_SECONDS = float(
+        os.getenv("BMS_IOT_SUPERVISOR_INITIAL_DELAY_SECONDS", "1")
+    )
+    SUPERVISOR_MAX_DELAY_SECONDS = float(
+        os.getenv("BMS_IOT_SUPERVISOR_MAX_DELAY_SECONDS", "60")
+    )
+    SUPERVISOR_MAX_RESTARTS = int(os.getenv("BMS_IOT_SUPERVISOR_MAX_RESTARTS", "5"))
+    SUPERVISOR_WINDOW_SECONDS = float(
+        os.getenv("BMS_IOT_SUPERVISOR_WINDOW_SECONDS", "600")
+    )
+
+    # Metrics: [PERF_METRICS] log line per instrumented call (failures are always
+    # logged), and Prometheus text snapshots written to a file and/or served on
+    # 127.0.0.1:<port>/metrics; an empty path or port 0 disables that output
+    PERF_METRICS_LOG_ENABLED = (
+        os.getenv("BMS_IOT_PERF_METRICS_LOG_ENABLED", "true").lower() == "true"
+    )
+    METRICS_FILE_PATH = os.getenv("BMS_IOT_METRICS_FILE_PATH", "")
+    METRICS_FILE_INTERVAL_SECONDS = float(
+        os.getenv("BMS_IOT_METRICS_FILE_INTERVAL_SECONDS", "60")
+    )
+    METRICS_PORT = int(os.getenv("BMS_IOT_METRICS_PORT", "0"))
+
+    # Worker threads for blocking calls kept off the event loop
+    BLOCKING_EXECUTOR_WORKERS = int(os.getenv("BMS_IOT_BLOCKING_EXECUTOR_WORKERS", "4"))
+    # Event loop lag is sampled every interval; a loop blocked longer than the
+    # threshold gets the stack of the blocking call logged
+    LOOP_LAG_INTERVAL_SECONDS = float(
+        os.getenv("BMS_IOT_LOOP_LAG_INTERVAL_SECONDS", "0.5")
+    )
+    LOOP_STALL_THRESHOLD_SECONDS = float(
+        os.getenv("BMS_IOT_LOOP_STALL_THRESHOLD_SECONDS", "0.25")
+    )
+
 
 settings = Settings()
@@ -12,9 +12,10 @@ from src.models.bacnet_wrapper import BACnetWrapper
 from src.models.bacnet_config import (
     BacnetDeviceInfo,
     BacnetObjectInfo,
-    get_latest_bacnet_config_json_as_list,
+    get_bacnet_controller_config,
 )
 from src.models.controller_points import ControllerPointsModel, insert_controller_point
+from src.network.sqlmodel_client import WritePriority
 from src.config.config import DEFAULT_CONTROLLER_PORT
 
 from src.utils.logger import logger
@@ -103,18 +104,8 @@ class BACnetWriter:
         Raises:
             ValueError: If controller or point not found
         """
-        # Get the controller configuration
-        controllers = await get_latest_bacnet_config_json_as_list()
-        if not controllers:
-            raise ValueError("No controllers found in configuration")
-
-        # Find the specific controller
-        target_controller = None
-        for controller in controllers:
-            if controller.controller_id == controller_id:
-                target_controller = controller
-                break
-
+        # Load only the target controller's configuration
+        target_controller = await get_bacnet_controller_config(controller_id)
         if not target_controller:
             raise ValueError(f"Controller {controller_id} not found in configuration")
 
@@ -224,10 +215,11 @@ class BACnetWriter:
                 else None
             ),
             is_uploaded=False,  # Will be processed by uploader
+            is_manual_write=True,  # Exempt from outbox retention
         )
 
-        # Write to local database (same as bacnet_monitoring_actor does)
-        await insert_controller_point(write_record)
+        # Write to local database ahead of queued monitoring samples
+        await insert_controller_point(write_record, write_priority=WritePriority.HIGH)
         logger.info(
             f"Stored manual write to local DB: point_id={target_object.point_id}, value={written_value}"
         )
@@ -1,5 +1,8 @@
 from src.actors.messages.message_type import HeartbeatStatusPayload
-from src.models.iot_device_status import get_latest_iot_device_status
+from src.models.device_status_service import device_status_service
+from src.controllers.uploader.adaptive_batch import drain_rate_meter
+from src.models.controller_points import get_outbox_stats
+from src.network.sqlmodel_client import get_database_stats
 from src.models.device_status_enums import ConnectionStatusEnum
 
 from src.utils.logger import logger
@@ -31,8 +34,8 @@ class HeartbeatController:
                 f"[HeartbeatController] Collecting heartbeat data for device {self.iot_device_id}"
             )
 
-            # Read latest status from local database
-            status_record = await get_latest_iot_device_status(self.iot_device_id)
+            # Read current status from the in-memory status service
+            status_record = await device_status_service.get(self.iot_device_id)
 
             if status_record:
                 # Convert database record to HeartbeatStatusPayload
@@ -55,13 +58,16 @@ class HeartbeatController:
                 logger.debug(
                     "[HeartbeatController] Successfully collected heartbeat data from local cache"
                 )
-                return heartbeat_payload
             else:
                 # Fallback if no status record exists
                 logger.warning(
                     f"[HeartbeatController] No status record found for device {self.iot_device_id}"
                 )
-                return HeartbeatStatusPayload()
+                heartbeat_payload = HeartbeatStatusPayload()
+
+            await self._add_outbox_stats(heartbeat_payload)
+            await self._add_database_stats(heartbeat_payload)
+            return heartbeat_payload
 
         except Exception as e:
             logger.error(f"[HeartbeatController] Error collecting heartbeat data: {e}")
@@ -72,6 +78,30 @@ class HeartbeatController:
                 bacnet_connection_status=ConnectionStatusEnum.ERROR,
             )
 
+    async def _add_outbox_stats(self, heartbeat_payload: HeartbeatStatusPayload):
+        """Attach outbox depth and database size; never fails the heartbeat."""
+        try:
+            outbox_stats = await get_outbox_stats()
+            heartbeat_payload.outbox_pending_points = outbox_stats["pending_points"]
+            heartbeat_payload.outbox_oldest_age_seconds = outbox_stats[
+                "oldest_pending_age_seconds"
+            ]
+            heartbeat_payload.database_size_bytes = outbox_stats["database_size_bytes"]
+            heartbeat_payload.outbox_drain_rate_points_per_second = (
+                drain_rate_meter.rate()
+            )
+        except Exception as e:
+            logger.warning(f"[HeartbeatController] Could not read outbox stats: {e}")
+
+    async def _add_database_stats(self, heartbeat_payload: HeartbeatStatusPayload):
+        """Attach WAL and freelist sizes; never fails the heartbeat."""
+        try:
+            database_stats = await get_database_stats()
+            heartbeat_payload.database_wal_bytes = database_stats["wal_bytes"]
+            heartbeat_payload.database_freelist_bytes = database_stats["freelist_bytes"]
+        except Exception as e:
+            logger.warning(f"[HeartbeatController] Could not read database stats: {e}")
+
     async def force_heartbeat(self, reason: str) -> HeartbeatStatusPayload:
         """
         Immediately collect and return heartbeat data for force heartbeat requests.
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import time
 from typing import Optional, Any
@@ -17,7 +18,6 @@ from src.actors.messages.message_type import (
     MonitoringControlPayload,
 )
 from packages.mqtt_topics.topics_loader import CommandNameEnum
-from src.models.controller_points import ControllerPointsModel
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
 
 from src.utils.logger import logger
@@ -97,11 +97,9 @@ class MQTTHandler:
             ),
         )
         self.dispatcher.attach_to_client()
-        logger.info("Connecting to MQTT broker...")
-        if not self.mqtt_client.connect():
-            raise RuntimeError("Failed to connect to MQTT broker")
+        # Recorded now, sent on every connect; the owner connects with
+        # MQTTClient.connect_async and reconnects with backoff
         self.dispatcher.subscribe_all()
-        logger.info("Subscribed to all request topics.")
         return self.mqtt_client, self.dispatcher
 
     def publish_response(
@@ -119,20 +117,58 @@ class MQTTHandler:
                 command=command, payload=payload_dict, correlation_data=correlation_data
             )
 
-    async def publish_point_bulk(self, points: list[ControllerPointsModel]):
+    async def publish_point_bulk(self, payload: PointPublishPayload):
+        """
+        Publish a batch of points and answer the uploader once it is delivered.
+
+        POINT_PUBLISH_RESPONSE is sent when the broker acknowledges the batch
+        (success=True), or when publishing or delivery fails (success=False).
+        While disconnected the batch is not sent at all: it is answered with
+        offline=True and its rows stay in the outbox.
+        """
         assert self.actor_queue_registry is not None
         assert self.actor_name is not None
 
-        if self.dispatcher:
-            has_published = self.dispatcher.publish_point_bulk(points)
-            await self.actor_queue_registry.send_from(
-                sender=self.actor_name,
-                receiver=ActorName.UPLOADER,
-                type=ActorMessageType.POINT_PUBLISH_RESPONSE,
-                payload=PointPublishPayload(points=points),
+        if not self.dispatcher or not self.mqtt_client:
+            return False
+
+        if not self.mqtt_client.connected:
+            await self._send_point_publish_response(payload, False, offline=True)
+            return False
+
+        loop = asyncio.get_running_loop()
+        mqtt_client = self.mqtt_client
+
+        def on_ack(success: bool):
+            # Runs on the paho network thread; a failure while the connection
+            # is down means the batch was lost with it
+            asyncio.run_coroutine_threadsafe(
+                self._send_point_publish_response(
+                    payload, success, offline=not success and not mqtt_client.connected
+                ),
+                loop,
             )
-            return has_published
-        return False
+
+        has_published = self.dispatcher.publish_point_bulk(
+            payload.points, on_ack=on_ack
+        )
+        if not has_published:
+            await self._send_point_publish_response(
+                payload, False, offline=not self.mqtt_client.connected
+            )
+        return has_published
+
+    async def _send_point_publish_response(
+        self, payload: PointPublishPayload, success: bool, offline: bool = False
+    ):
+        assert self.actor_queue_registry is not None
+        assert self.actor_name is not None
+        await self.actor_queue_registry.send_from(
+            sender=self.actor_name,
+            receiver=ActorName.UPLOADER,
+            type=ActorMessageType.POINT_PUBLISH_RESPONSE,
+            payload=payload.model_copy(update={"success": success, "offline": offline}),
+        )
 
     async def publish_heartbeat_status(self, payload: HeartbeatStatusPayload):
         """Publish heartbeat status to MQTT heartbeat topic."""
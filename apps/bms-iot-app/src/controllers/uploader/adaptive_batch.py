@@ -0,0 +1,119 @@
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from src.config.settings import settings
+
+MIN_BATCH_POINTS = 10
+INITIAL_BATCH_POINTS = 100
+
+# Smoothing factor for the moving averages of point size and publish latency
+EWMA_ALPHA = 0.3
+
+# Bounds on how much one observation may resize the next batch
+MAX_GROWTH_FACTOR = 2.0
+MIN_SHRINK_FACTOR = 0.5
+
+
+def _ewma(previous: Optional[float], sample: float) -> float:
+    if previous is None:
+        return sample
+    return EWMA_ALPHA * sample + (1 - EWMA_ALPHA) * previous
+
+
+class AdaptiveBatchSizer:
+    """
+    Chooses the number of points per publish.
+
+    The batch is capped by the payload target divided by the average
+    serialized point size, and scaled towards the latency target from the
+    measured time between a publish request and its acknowledgement. Batches
+    only grow after a full batch was acknowledged, so a small backlog does not
+    inflate the size.
+    """
+
+    def __init__(
+        self,
+        target_payload_bytes: Optional[int] = None,
+        target_latency_seconds: Optional[float] = None,
+        max_batch_points: Optional[int] = None,
+        min_batch_points: int = MIN_BATCH_POINTS,
+    ):
+        self.target_payload_bytes = (
+            settings.UPLOAD_TARGET_PAYLOAD_BYTES
+            if target_payload_bytes is None
+            else target_payload_bytes
+        )
+        self.target_latency_seconds = (
+            settings.UPLOAD_TARGET_LATENCY_SECONDS
+            if target_latency_seconds is None
+            else target_latency_seconds
+        )
+        self.max_batch_points = (
+            settings.UPLOAD_MAX_BATCH_POINTS
+            if max_batch_points is None
+            else max_batch_points
+        )
+        self.min_batch_points = min(min_batch_points, self.max_batch_points)
+        self.batch_points = self._clamp(INITIAL_BATCH_POINTS)
+        self.point_bytes: Optional[float] = None
+        self.latency_seconds: Optional[float] = None
+
+    def _clamp(self, batch_points: float) -> int:
+        return max(self.min_batch_points, min(self.max_batch_points, int(batch_points)))
+
+    @property
+    def next_batch_size(self) -> int:
+        """Points to request for the next publish."""
+        if not self.point_bytes:
+            return self.batch_points
+        payload_cap = self.target_payload_bytes / self.point_bytes
+        return self._clamp(min(self.batch_points, payload_cap))
+
+    def record_point_bytes(self, point_bytes: int) -> None:
+        """Feed the serialized size of a representative point."""
+        self.point_bytes = _ewma(self.point_bytes, point_bytes)
+
+    def record_ack(self, points: int, requested: int, latency_seconds: float) -> None:
+        """Resize after a batch of points was acknowledged."""
+        self.latency_seconds = _ewma(self.latency_seconds, latency_seconds)
+        factor = self.target_latency_seconds / max(self.latency_seconds, 1e-3)
+        factor = max(MIN_SHRINK_FACTOR, min(MAX_GROWTH_FACTOR, factor))
+        if factor > 1 and points < requested:
+            return
+        self.batch_points = self._clamp(math.ceil(self.batch_points * factor))
+
+    def record_timeout(self) -> None:
+        """Halve the batch when an acknowledgement never arrived."""
+        self.batch_points = self._clamp(self.batch_points * MIN_SHRINK_FACTOR)
+
+
+class DrainRateMeter:
+    """Points acknowledged per second over a sliding window."""
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+        self.total_points = 0
+        self._events: deque[tuple[float, int]] = deque()
+
+    def _expire(self, now: float) -> None:
+        while self._events and now - self._events[0][0] > self.window_seconds:
+            self._events.popleft()
+
+    def record(self, points: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.total_points += points
+        self._events.append((now, points))
+        self._expire(now)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        if not self._events:
+            return 0.0
+        return sum(points for _, points in self._events) / self.window_seconds
+
+
+# Shared so the heartbeat can report the uploader's drain rate
+drain_rate_meter = DrainRateMeter()
@@ -1,65 +1,240 @@
-from src.models.bacnet_config import get_latest_bacnet_config_json
-from src.network.rest_client import RestClient
+import asyncio
+import math
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import orjson
+
+from src.actors.messages.message_type import ConfigUploadProgress
+from src.config.settings import settings
+from src.models.bacnet_config import (
+    BacnetConfigControllerModel,
+    BacnetConfigObjectModel,
+    count_bacnet_config_objects,
+    get_latest_bacnet_config_controllers,
+    iter_bacnet_config_objects,
+)
+from src.network.payload_compression import CompressionAlgorithm, compress_payload
+from src.network.reconnect_backoff import ReconnectBackoff
+from src.network.rest_client import get_shared_rest_client
 from src.models.controller_points import get_points_to_upload, mark_points_as_uploaded
 from src.models.controller_points import ControllerPointsModel
 from src.dto import BacnetDiscoveredPropertiesDTO
 
 from src.utils.logger import logger
 
+# Backoff between attempts at one chunk; the upload resumes from that chunk
+CHUNK_RETRY_INITIAL_DELAY_SECONDS = 1.0
+CHUNK_RETRY_MAX_DELAY_SECONDS = 30.0
+
+
+@dataclass
+class ConfigUploadChunk:
+    """One request of a chunked upload: a page of one controller's objects."""
+
+    sequence: int
+    controller: BacnetConfigControllerModel
+    objects: List[BacnetConfigObjectModel]
+    # False while later chunks carry more of this controller's objects
+    complete: bool
+
+
+def _transform_object(obj: BacnetConfigObjectModel) -> dict:
+    # Transform properties using DTO
+    properties_dto = BacnetDiscoveredPropertiesDTO.from_dict(obj.properties or {})
+    return {
+        "type": obj.type,
+        "point_id": obj.point_id,
+        "iot_device_point_id": obj.iot_device_point_id,
+        "properties": properties_dto.model_dump(exclude_none=True),
+    }
+
+
+def count_config_chunks(object_count: int, chunk_points: int) -> int:
+    # A controller without objects still gets a chunk, to update its device_id
+    return max(1, math.ceil(object_count / chunk_points))
+
+
+async def iter_config_chunks(
+    controllers: List[BacnetConfigControllerModel],
+    object_counts: Dict[str, int],
+    chunk_points: int,
+) -> AsyncIterator[ConfigUploadChunk]:
+    """Split the config into chunks of at most chunk_points objects, in order."""
+    sequence = 0
+    for controller in controllers:
+        remaining = object_counts.get(controller.controller_id, 0)
+        if not remaining:
+            yield ConfigUploadChunk(sequence, controller, [], complete=True)
+            sequence += 1
+            continue
+        async for page in iter_bacnet_config_objects(
+            controller.config_version, controller.controller_id, chunk_points
+        ):
+            remaining -= len(page)
+            yield ConfigUploadChunk(sequence, controller, page, complete=remaining <= 0)
+            sequence += 1
+
+
+def encode_config_chunk(
+    chunk: ConfigUploadChunk,
+    progress: ConfigUploadProgress,
+    started_at: Optional[str],
+) -> bytes:
+    """
+    The request body of one chunk, in ControllerPoint-compatible format.
+
+    started_at is the server's time for the first chunk, echoed on later
+    chunks so the server can soft-delete points missing from the config
+    once a controller's last chunk is in.
+    """
+    upload = {
+        "id": progress.uploadId,
+        "sequence": chunk.sequence,
+        "totalChunks": progress.totalChunks,
+    }
+    if started_at is not None:
+        upload["startedAt"] = started_at
+    controller = chunk.controller
+    return orjson.dumps(
+        {
+            "upload": upload,
+            "config": [
+                {
+                    "vendor_id": controller.vendor_id,
+                    "device_id": controller.device_id,
+                    "controller_ip_address": controller.controller_ip_address,
+                    "controller_id": controller.controller_id,
+                    "object_list": [_transform_object(obj) for obj in chunk.objects],
+                    "complete": chunk.complete,
+                }
+            ],
+        }
+    )
+
 
-async def upload_config(url: str, jwt_token: str):
+def _chunk_ack(
+    response: Optional[httpx.Response], upload_id: str, sequence: int
+) -> Optional[dict]:
+    """The server's acknowledgement of a chunk, or None if it was not accepted"""
+    if response is None:
+        return None
+    try:
+        ack = response.json()["data"]["upload"]
+    except (ValueError, KeyError, TypeError):
+        logger.error(f"Config chunk {sequence} response has no upload acknowledgement")
+        return None
+    if ack.get("id") != upload_id or ack.get("sequence") != sequence:
+        logger.error(f"Config chunk {sequence} acknowledged as {ack}")
+        return None
+    if not ack.get("startedAt"):
+        logger.error(f"Config chunk {sequence} acknowledged without startedAt")
+        return None
+    return ack
+
+
+async def _post_chunk(
+    url: str, jwt_token: str, body: bytes, upload_id: str, sequence: int
+) -> Optional[dict]:
+    """POST one chunk, retrying it with backoff until it is acknowledged."""
+    headers = {"Content-Type": "application/json"}
+    if settings.CONFIG_UPLOAD_GZIP:
+        body = compress_payload(body, CompressionAlgorithm.GZIP)
+        headers["Content-Encoding"] = "gzip"
+
+    # Requests go over the pooled keep-alive client
+    rest_client = await get_shared_rest_client()
+    backoff = ReconnectBackoff(
+        initial_delay=CHUNK_RETRY_INITIAL_DELAY_SECONDS,
+        max_delay=CHUNK_RETRY_MAX_DELAY_SECONDS,
+    )
+    attempts = 1 + max(0, settings.CONFIG_UPLOAD_CHUNK_RETRIES)
+    for attempt in range(attempts):
+        if attempt:
+            delay = backoff.next_delay()
+            logger.warning(
+                f"Retrying config chunk {sequence} in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{attempts})"
+            )
+            await asyncio.sleep(delay)
+        response = await rest_client.post(
+            url, content=body, headers=headers, jwt_token=jwt_token
+        )
+        ack = _chunk_ack(response, upload_id, sequence)
+        if ack is not None:
+            return ack
+    return None
+
+
+async def upload_config(
+    url: str,
+    jwt_token: str,
+    on_progress: Optional[Callable[[ConfigUploadProgress], Awaitable[None]]] = None,
+) -> Optional[ConfigUploadProgress]:
+    """
+    Upload the latest config in bounded-size chunks.
+
+    Each chunk is retried on its own, so a failure resumes from the last
+    acknowledged chunk instead of starting over. on_progress is awaited
+    after every acknowledged chunk but the last. Returns the final progress
+    (complete when chunksUploaded == totalChunks), or None if there is no
+    config to upload.
+    """
     logger.info(f"Uploading config to {url}")
-    config = await get_latest_bacnet_config_json()
+    controllers = await get_latest_bacnet_config_controllers()
 
-    if not config or not config.bacnet_devices:
+    if not controllers:
         logger.warning("No BACnet config found to upload.")
         return None
 
-    # Transform to ControllerPoint-compatible format
-    transformed_config = []
-    for device in config.bacnet_devices:
-        transformed_device = {
-            "vendor_id": device["vendor_id"],
-            "device_id": device["device_id"],
-            "controller_ip_address": device["controller_ip_address"],
-            "controller_id": device["controller_id"],
-            "object_list": [],
-        }
-
-        for obj in device.get("object_list", []):
-            # Transform properties using DTO
-            properties_dto = BacnetDiscoveredPropertiesDTO.from_dict(
-                obj.get("properties", {})
+    chunk_points = max(1, settings.CONFIG_UPLOAD_CHUNK_POINTS)
+    object_counts = await count_bacnet_config_objects(controllers[0].config_version)
+    progress = ConfigUploadProgress(
+        uploadId=uuid.uuid4().hex,
+        chunksUploaded=0,
+        totalChunks=sum(
+            count_config_chunks(object_counts.get(c.controller_id, 0), chunk_points)
+            for c in controllers
+        ),
+        pointsUploaded=0,
+        totalPoints=sum(object_counts.values()),
+    )
+    logger.info(
+        f"Config upload {progress.uploadId}: {len(controllers)} devices, "
+        f"{progress.totalPoints} points in {progress.totalChunks} chunks"
+    )
+
+    started_at: Optional[str] = None
+    async for chunk in iter_config_chunks(controllers, object_counts, chunk_points):
+        body = encode_config_chunk(chunk, progress, started_at)
+        ack = await _post_chunk(url, jwt_token, body, progress.uploadId, chunk.sequence)
+        if ack is None:
+            logger.error(
+                f"Config upload {progress.uploadId} failed at chunk "
+                f"{chunk.sequence + 1}/{progress.totalChunks}"
             )
+            return progress
 
-            transformed_obj = {
-                "type": obj["type"],
-                "point_id": obj["point_id"],
-                "iot_device_point_id": obj["iot_device_point_id"],
-                "properties": properties_dto.model_dump(exclude_none=True),
-            }
-            transformed_device["object_list"].append(transformed_obj)
-
-        transformed_config.append(transformed_device)
-
-    logger.info(f"Transformed config: {len(transformed_config)} devices")
-
-    # Upload transformed config
-    async with RestClient(jwt_token=jwt_token) as rest_client:
-        response = await rest_client.post(url, json={"config": transformed_config})
-        if response:
-            logger.info(f"Upload config response: {response.json()}")
-        else:
-            logger.error("Failed to upload config. No response received from server.")
+        started_at = started_at or ack["startedAt"]
+        progress.chunksUploaded += 1
+        progress.pointsUploaded += len(chunk.objects)
+        if on_progress and progress.chunksUploaded < progress.totalChunks:
+            await on_progress(progress.model_copy())
 
-    return response
+    logger.info(
+        f"Config upload {progress.uploadId} complete: "
+        f"{progress.pointsUploaded} points in {progress.chunksUploaded} chunks"
+    )
+    return progress
 
 
-async def get_points_to_publish():
+async def get_points_to_publish(limit: int = 100, after_id: Optional[int] = None):
     # 1. Fetch data from controller_points.py
-    points = await get_points_to_upload()
+    points = await get_points_to_upload(limit=limit, after_id=after_id)
     if not points:
-        logger.warning("No points found to publish.")
+        logger.debug("No points found to publish.")
         return None
 
     return points
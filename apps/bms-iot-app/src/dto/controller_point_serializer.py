@@ -0,0 +1,148 @@
+"""
+Fast batch serializer for point_bulk publishes.
+
+Produces the same JSON as ControllerPointDTO.from_model(point).model_dump()
+without building a DTO per point. Columns stored as JSON strings
+(priority_array, event_time_stamps, ...) are validated against the DTO field
+type once per distinct combination and then spliced into the output as
+cached bytes. These values come from point metadata, so they repeat across
+samples.
+"""
+
+from typing import Any, Optional
+
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.dto.controller_point_dto import ControllerPointDTO
+from src.models.controller_points import ControllerPointsModel
+from src.utils.logger import logger
+
+# (model attribute, DTO key) copied without conversion
+SCALAR_FIELDS: tuple[tuple[str, str], ...] = (
+    ("id", "id"),
+    ("controller_id", "controllerId"),
+    ("controller_ip_address", "controllerIpAddress"),
+    ("controller_port", "controllerPort"),
+    ("point_id", "pointId"),
+    ("iot_device_point_id", "iotDevicePointId"),
+    ("controller_device_id", "controllerDeviceId"),
+    ("units", "units"),
+    ("present_value", "presentValue"),
+    ("is_uploaded", "isUploaded"),
+    ("created_at_unix_milli_timestamp", "createdAtUnixMilliTimestamp"),
+    ("event_state", "eventState"),
+    ("out_of_service", "outOfService"),
+    ("reliability", "reliability"),
+    ("min_pres_value", "minPresValue"),
+    ("max_pres_value", "maxPresValue"),
+    ("high_limit", "highLimit"),
+    ("low_limit", "lowLimit"),
+    ("resolution", "resolution"),
+    ("relinquish_default", "relinquishDefault"),
+    ("cov_increment", "covIncrement"),
+    ("time_delay", "timeDelay"),
+    ("time_delay_normal", "timeDelayNormal"),
+    ("notification_class", "notificationClass"),
+    ("notify_type", "notifyType"),
+    ("deadband", "deadband"),
+    ("event_detection_enable", "eventDetectionEnable"),
+    ("event_algorithm_inhibit", "eventAlgorithmInhibit"),
+    ("reliability_evaluation_inhibit", "reliabilityEvaluationInhibit"),
+    ("error_info", "errorInfo"),
+)
+
+# (model attribute, DTO key) stored as JSON strings
+JSON_FRAGMENT_FIELDS: tuple[tuple[str, str], ...] = (
+    ("status_flags", "statusFlags"),
+    ("priority_array", "priorityArray"),
+    ("limit_enable", "limitEnable"),
+    ("event_enable", "eventEnable"),
+    ("acked_transitions", "ackedTransitions"),
+    ("event_time_stamps", "eventTimeStamps"),
+    ("event_message_texts", "eventMessageTexts"),
+    ("event_message_texts_config", "eventMessageTextsConfig"),
+    ("event_algorithm_inhibit_ref", "eventAlgorithmInhibitRef"),
+)
+
+# Object-typed fragments become null when empty, as in from_model
+_OBJECT_FRAGMENT_KEYS = {
+    "limitEnable",
+    "eventEnable",
+    "ackedTransitions",
+    "eventAlgorithmInhibitRef",
+}
+
+_FRAGMENT_ADAPTERS: dict[str, TypeAdapter] = {
+    key: TypeAdapter(ControllerPointDTO.model_fields[key].annotation)
+    for _, key in JSON_FRAGMENT_FIELDS
+}
+_FRAGMENT_PREFIXES: dict[str, bytes] = {
+    key: b',"' + key.encode() + b'":' for _, key in JSON_FRAGMENT_FIELDS
+}
+
+# Distinct fragment combinations kept; the cache is cleared when full
+FRAGMENT_CACHE_SIZE = 4096
+_fragment_cache: dict[tuple[Optional[str], ...], bytes] = {}
+
+
+def _normalize_fragment(key: str, raw: Optional[str]) -> bytes:
+    """Validate a stored JSON string against its DTO field, or null it."""
+    if not raw:
+        return b"null"
+    try:
+        parsed = orjson.loads(raw)
+        if key in _OBJECT_FRAGMENT_KEYS and not parsed:
+            return b"null"
+        value = _FRAGMENT_ADAPTERS[key].validate_python(parsed)
+    except (orjson.JSONDecodeError, ValidationError, TypeError) as e:
+        logger.warning(f"Failed to parse {key}: {raw} - {e}")
+        return b"null"
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    return orjson.dumps(value)
+
+
+def _fragment_tail(raw_values: tuple[Optional[str], ...]) -> bytes:
+    """The JSON-string fields of one point, ready to append to its scalars."""
+    tail = _fragment_cache.get(raw_values)
+    if tail is None:
+        if len(_fragment_cache) >= FRAGMENT_CACHE_SIZE:
+            _fragment_cache.clear()
+        parts = []
+        for (_, key), raw in zip(JSON_FRAGMENT_FIELDS, raw_values):
+            parts.append(_FRAGMENT_PREFIXES[key])
+            parts.append(_normalize_fragment(key, raw))
+        parts.append(b"}")
+        tail = _fragment_cache[raw_values] = b"".join(parts)
+    return tail
+
+
+def _scalars(point: ControllerPointsModel) -> dict[str, Any]:
+    # Pydantic keeps field values in __dict__; skips per-attribute lookups
+    fields = point.__dict__
+    values = {key: fields[attribute] for attribute, key in SCALAR_FIELDS}
+    object_type = point.bacnet_object_type
+    values["bacnetObjectType"] = (
+        object_type.value if hasattr(object_type, "value") else str(object_type)
+    )
+    values["createdAt"] = point.created_at.isoformat() if point.created_at else ""
+    values["updatedAt"] = point.updated_at.isoformat() if point.updated_at else ""
+    return values
+
+
+def encode_point_json(point: ControllerPointsModel) -> bytes:
+    """Serialize one point to camelCase JSON bytes."""
+    fields = point.__dict__
+    raw_values = tuple(fields[attribute] for attribute, _ in JSON_FRAGMENT_FIELDS)
+    return orjson.dumps(_scalars(point))[:-1] + _fragment_tail(raw_values)
+
+
+def encode_points_json(points: list[ControllerPointsModel]) -> bytes:
+    """Serialize a batch to the {"points": [...]} point_bulk message."""
+    return b'{"points":[' + b",".join(map(encode_point_json, points)) + b"]}"
+
+
+def serialize_points(points: list[ControllerPointsModel]) -> list[dict[str, Any]]:
+    """Serialized points as dicts, for encodings that restructure them."""
+    return orjson.loads(encode_points_json(points))["points"]
@@ -1,6 +1,3 @@
-import asyncio
-from typing import Callable, Awaitable
-
 from src.network.mqtt_config import load_config
 
 from src.actors.bacnet_monitoring_actor import BacnetMonitoringActor
@@ -9,12 +6,17 @@ from src.actors.mqtt_actor import MQTTActor
 from src.actors.heartbeat_actor import HeartbeatActor
 from src.actors.system_metrics_actor import SystemMetricsActor
 from src.actors.messages.actor_queue_registry import ActorQueueRegistry
-from src.actors.messages.message_type import ActorName
+from src.actors.messages.mailbox import OverflowPolicy
+from src.actors.messages.message_type import ActorMessageType, ActorName
+from src.actors.supervisor import RestartStrategy, actor_supervisor
 from src.actors.uploader_actor import UploaderActor
 from src.models.iot_device_status import (
     get_latest_iot_device_status,
     upsert_iot_device_status,
 )
+from src.models.device_status_service import device_status_service
+from src.models.controller_points import flush_sample_buffer
+from src.network.rest_client import close_shared_rest_client
 from src.actors.cleaner_actor import CleanerActor
 from src.models.device_status_enums import MonitoringStatusEnum
 from src.models.deployment_config import (
@@ -22,24 +24,50 @@ from src.models.deployment_config import (
     has_valid_deployment_config,
 )
 from src.config.deployment_runtime_config import DeploymentRuntimeConfig
+from src.utils.blocking import shutdown_blocking_executor
 from src.utils.logger import logger
+from src.utils.loop_monitor import loop_lag_monitor
+from src.utils.metrics import metrics_registry
+from src.utils.metrics_exporter import metrics_export_enabled, run_metrics_exporter
+
+
+def register_metrics_collectors(actor_queue_registry: ActorQueueRegistry):
+    """Copy actor, supervisor and event loop statistics into gauges."""
+    mailbox_depth = metrics_registry.gauge(
+        "bms_actor_mailbox_depth", "Messages waiting in an actor mailbox", ["actor"]
+    )
+    mailbox_dropped = metrics_registry.gauge(
+        "bms_actor_mailbox_dropped", "Messages dropped by a full mailbox", ["actor"]
+    )
+    actor_crashes = metrics_registry.gauge(
+        "bms_actor_crashes", "Actor crashes since the app started", ["actor"]
+    )
+    actor_recovery = metrics_registry.gauge(
+        "bms_actor_last_recovery_seconds",
+        "Time from the last crash of an actor to its restart",
+        ["actor"],
+    )
+    loop_lag = metrics_registry.gauge(
+        "bms_event_loop_lag_ms", "Event loop scheduling delay", ["stat"]
+    )
+    loop_stalls = metrics_registry.gauge(
+        "bms_event_loop_stalls", "Times the event loop was blocked past the threshold"
+    )
 
+    def collect():
+        for actor, stats in actor_queue_registry.get_mailbox_stats().items():
+            mailbox_depth.set(stats["depth"], actor=actor)
+            mailbox_dropped.set(stats["dropped"], actor=actor)
+        for actor, stats in actor_supervisor.get_stats().items():
+            actor_crashes.set(stats["crashes"], actor=actor)
+            if stats["last_recovery_seconds"] is not None:
+                actor_recovery.set(stats["last_recovery_seconds"], actor=actor)
+        lag = loop_lag_monitor.get_lag_summary()
+        for stat in ["p50_ms", "p99_ms", "max_ms"]:
+            loop_lag.set(lag[stat], stat=stat.removesuffix("_ms"))
+        loop_stalls.set(lag["stalls"])
 
-async def supervise_actor(
-    name: str, start_fn: Callable[[], Awaitable[None]], delay: int = 5
-):
-    retry_count = 0
-    while True:
-        try:
-            logger.info(f"[Supervisor] Starting {name}")
-            await start_fn()
-        except Exception as e:
-            logger.exception(f"[Supervisor] {name} crashed: {e}")
-            await asyncio.sleep(delay)
-            retry_count += 1
-            if retry_count > 3:
-                logger.error(f"[Supervisor] {name} crashed 3 times, exiting")
-                raise e
+    metrics_registry.add_collector(collect)
 
 
 async def load_deployment_config() -> DeploymentRuntimeConfig:
@@ -112,14 +140,23 @@ async def main():
     site_id = config.site_id
     iot_device_id = config.device_id
 
+    # Mailboxes are bounded; senders wait when one is full. Only the latest
+    # waiting heartbeat (or heartbeat request) matters, so those coalesce.
+    # Nothing reads the BROADCAST mailbox, so it drops instead of blocking.
     actor_queue_registry = ActorQueueRegistry()
-    actor_queue_registry.register(ActorName.MQTT)
+    actor_queue_registry.register(
+        ActorName.MQTT, coalesce_types=[ActorMessageType.HEARTBEAT_STATUS]
+    )
     actor_queue_registry.register(ActorName.BACNET)
     actor_queue_registry.register(ActorName.BACNET_WRITER)
-    actor_queue_registry.register(ActorName.BROADCAST)
+    actor_queue_registry.register(
+        ActorName.BROADCAST, overflow=OverflowPolicy.DROP_OLDEST
+    )
     actor_queue_registry.register(ActorName.UPLOADER)
     actor_queue_registry.register(ActorName.CLEANER)
-    actor_queue_registry.register(ActorName.HEARTBEAT)
+    actor_queue_registry.register(
+        ActorName.HEARTBEAT, coalesce_types=[ActorMessageType.FORCE_HEARTBEAT_REQUEST]
+    )
     actor_queue_registry.register(ActorName.SYSTEM_METRICS)
 
     mqtt_config = load_config()
@@ -175,12 +212,32 @@ async def main():
         )
         await system_metrics_actor.start()
 
-    await asyncio.gather(
-        supervise_actor("MQTTActor", start_mqtt),
-        supervise_actor("BACnetMonitoringActor", start_bacnet),
-        supervise_actor("BACnetWriterActor", start_bacnet_writer),
-        supervise_actor("UploaderActor", start_uploader),
-        supervise_actor("CleanerActor", start_cleaner),
-        supervise_actor("HeartbeatActor", start_heartbeat),
-        supervise_actor("SystemMetricsActor", start_system_metrics),
+    # Each actor is restarted on its own, so a writer crash does not
+    # re-initialize every BACnet reader. The uploader tracks acknowledgements
+    # of the MQTT client's publishes, which a new client never sends, so it
+    # restarts with the MQTT actor and republishes from the outbox.
+    actor_supervisor.add(
+        "MQTTActor",
+        start_mqtt,
+        strategy=RestartStrategy.RESTART_DEPENDENTS,
+        dependents=["UploaderActor"],
     )
+    actor_supervisor.add("BACnetMonitoringActor", start_bacnet)
+    actor_supervisor.add("BACnetWriterActor", start_bacnet_writer)
+    actor_supervisor.add("UploaderActor", start_uploader)
+    actor_supervisor.add("CleanerActor", start_cleaner)
+    actor_supervisor.add("HeartbeatActor", start_heartbeat)
+    actor_supervisor.add("SystemMetricsActor", start_system_metrics)
+    actor_supervisor.add("LoopLagMonitor", loop_lag_monitor.run)
+    register_metrics_collectors(actor_queue_registry)
+    if metrics_export_enabled():
+        actor_supervisor.add("MetricsExporter", run_metrics_exporter)
+
+    try:
+        await actor_supervisor.run()
+    finally:
+        # Persist status and samples still waiting to be written
+        await device_status_service.close()
+        await flush_sample_buffer()
+        await close_shared_rest_client()
+        shutdown_blocking_executor()
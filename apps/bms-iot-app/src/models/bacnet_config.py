@@ -1,11 +1,20 @@
-from typing import Optional, Any, List
-from sqlmodel import SQLModel, Field, select
-from sqlalchemy import JSON
+from typing import Optional, Any, AsyncIterator, Dict, List
+from sqlmodel import SQLModel, Field, select, delete, func
+from sqlalchemy import JSON, Index
 from pydantic import BaseModel
 from datetime import datetime, timezone
 
-from src.network.sqlmodel_client import get_session, with_db_retry
+from src.network.sqlmodel_client import (
+    get_session,
+    with_db_retry,
+    serialized_write,
+    WritePriority,
+)
 from src.actors.messages.message_type import BacnetReaderConfig
+from src.config.bacnet_constants import (
+    BACNET_CONFIG_UPLOAD_PAGE_SIZE,
+    BACNET_CONFIG_VERSIONS_TO_KEEP,
+)
 from src.utils.logger import logger
 
 
@@ -25,14 +34,57 @@ class BacnetDeviceInfo(BaseModel):
 
 
 class BacnetConfigModel(SQLModel, table=True):  # type: ignore[call-arg]
+    """One row per discovered config version; id is the version number."""
+
     __tablename__ = "bacnet_config"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    bacnet_devices: Optional[List[dict]] = Field(default=None, sa_type=JSON)
+    controller_count: int = Field(default=0)
+    object_count: int = Field(default=0)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class BacnetConfigControllerModel(SQLModel, table=True):  # type: ignore[call-arg]
+    __tablename__ = "bacnet_config_controllers"
+    __table_args__ = (
+        Index(
+            "ix_bacnet_config_controllers_version_controller",
+            "config_version",
+            "controller_id",
+            unique=True,
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    config_version: int = Field(foreign_key="bacnet_config.id")
+    position: int = Field(description="Order of the controller in the config")
+    controller_id: str
+    vendor_id: int
+    device_id: int
+    controller_ip_address: str
+
+
+class BacnetConfigObjectModel(SQLModel, table=True):  # type: ignore[call-arg]
+    __tablename__ = "bacnet_config_objects"
+    __table_args__ = (
+        Index(
+            "ix_bacnet_config_objects_version_controller",
+            "config_version",
+            "controller_id",
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    config_version: int = Field(foreign_key="bacnet_config.id")
+    controller_id: str
+    position: int = Field(description="Order of the object in its controller")
+    type: str
+    point_id: int
+    iot_device_point_id: str
+    properties: Optional[Any] = Field(default=None, sa_type=JSON)
+
+
 class BacnetReaderConfigModel(SQLModel, table=True):  # type: ignore[call-arg]
     __tablename__ = "bacnet_readers"
 
@@ -59,41 +111,258 @@ def json_to_bacnet_device_infos(data: List[dict]) -> List[BacnetDeviceInfo]:
     return [BacnetDeviceInfo(**d) for d in data]
 
 
-# Example async CRUD functions
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def insert_bacnet_config_json(
     devices: List[BacnetDeviceInfo],
 ) -> BacnetConfigModel:
-    json_data = bacnet_device_infos_to_json(devices)
-    config = BacnetConfigModel(bacnet_devices=json_data)
+    """
+    Store a discovered config as a new version, one row per controller and
+    per object, and prune versions beyond BACNET_CONFIG_VERSIONS_TO_KEEP.
+    """
+    config = BacnetConfigModel(
+        controller_count=len(devices),
+        object_count=sum(len(device.object_list) for device in devices),
+    )
     async with get_session() as session:
         session.add(config)
+        await session.flush()
+        version = config.id
+
+        for device_position, device in enumerate(devices):
+            session.add(
+                BacnetConfigControllerModel(
+                    config_version=version,
+                    position=device_position,
+                    controller_id=device.controller_id,
+                    vendor_id=device.vendor_id,
+                    device_id=device.device_id,
+                    controller_ip_address=device.controller_ip_address,
+                )
+            )
+            session.add_all(
+                [
+                    BacnetConfigObjectModel(
+                        config_version=version,
+                        controller_id=device.controller_id,
+                        position=object_position,
+                        type=obj.type,
+                        point_id=obj.point_id,
+                        iot_device_point_id=obj.iot_device_point_id,
+                        properties=obj.properties,
+                    )
+                    for object_position, obj in enumerate(device.object_list)
+                ]
+            )
+
+        pruned = await _prune_config_versions(session, version)
         await session.commit()
         await session.refresh(config)
-        return config
+
+    logger.info(
+        f"Saved BACnet config version {version}: {config.controller_count} controllers, "
+        f"{config.object_count} objects (pruned {pruned} old versions)"
+    )
+    return config
+
+
+async def _prune_config_versions(session, latest_version: int) -> int:
+    """Delete config versions older than the retention window"""
+    oldest_kept = latest_version - BACNET_CONFIG_VERSIONS_TO_KEEP + 1
+    stale_versions = list(
+        (
+            await session.execute(
+                select(BacnetConfigModel.id).where(
+                    BacnetConfigModel.id < oldest_kept  # type: ignore[operator]
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if not stale_versions:
+        return 0
+
+    for model in (BacnetConfigObjectModel, BacnetConfigControllerModel):
+        await session.execute(
+            delete(model).where(
+                model.config_version.in_(stale_versions)  # type: ignore[attr-defined]
+            )
+        )
+    await session.execute(
+        delete(BacnetConfigModel).where(
+            BacnetConfigModel.id.in_(stale_versions)  # type: ignore[union-attr]
+        )
+    )
+    return len(stale_versions)
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
 async def get_latest_bacnet_config_json() -> Optional[BacnetConfigModel]:
+    """Get the latest config version header (counts and timestamps only)"""
     async with get_session() as session:
         result = await session.execute(
-            select(BacnetConfigModel).order_by(BacnetConfigModel.created_at.desc())  # type: ignore
+            select(BacnetConfigModel).order_by(BacnetConfigModel.id.desc()).limit(1)  # type: ignore
         )
         config = result.scalars().first()
         if config:
             logger.info(
-                f"get_latest_bacnet_config_json: Config: {len(config.bacnet_devices)}"
+                f"get_latest_bacnet_config_json: Version {config.id} with "
+                f"{config.controller_count} controllers"
             )
         else:
             logger.info("get_latest_bacnet_config_json: No config found")
         return config
 
 
-async def get_latest_bacnet_config_json_as_list() -> Optional[List[BacnetDeviceInfo]]:
-    config = await get_latest_bacnet_config_json()
-    if not config or not config.bacnet_devices:
-        return None
-    return json_to_bacnet_device_infos(config.bacnet_devices)
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def get_latest_bacnet_config_json_as_list(
+    controller_id: Optional[str] = None,
+) -> Optional[List[BacnetDeviceInfo]]:
+    """
+    Load the latest config as BacnetDeviceInfo objects.
+
+    Args:
+        controller_id: Only load this controller and its objects
+
+    Returns:
+        Devices in discovery order, or None if there is no matching config
+    """
+    async with get_session() as session:
+        version = (
+            await session.execute(select(func.max(BacnetConfigModel.id)))
+        ).scalar()
+        if version is None:
+            return None
+
+        controller_query = (
+            select(BacnetConfigControllerModel)
+            .where(BacnetConfigControllerModel.config_version == version)
+            .order_by(BacnetConfigControllerModel.position)
+        )
+        object_query = (
+            select(BacnetConfigObjectModel)
+            .where(BacnetConfigObjectModel.config_version == version)
+            .order_by(BacnetConfigObjectModel.position)
+        )
+        if controller_id is not None:
+            controller_query = controller_query.where(
+                BacnetConfigControllerModel.controller_id == controller_id
+            )
+            object_query = object_query.where(
+                BacnetConfigObjectModel.controller_id == controller_id
+            )
+
+        controllers = (await session.execute(controller_query)).scalars().all()
+        if not controllers:
+            return None
+        objects = (await session.execute(object_query)).scalars().all()
+
+    objects_by_controller: dict[str, List[BacnetObjectInfo]] = {}
+    for obj in objects:
+        objects_by_controller.setdefault(obj.controller_id, []).append(
+            BacnetObjectInfo(
+                type=obj.type,
+                point_id=obj.point_id,
+                iot_device_point_id=obj.iot_device_point_id,
+                properties=obj.properties,
+            )
+        )
+
+    return [
+        BacnetDeviceInfo(
+            vendor_id=controller.vendor_id,
+            device_id=controller.device_id,
+            controller_ip_address=controller.controller_ip_address,
+            controller_id=controller.controller_id,
+            object_list=objects_by_controller.get(controller.controller_id, []),
+        )
+        for controller in controllers
+    ]
+
+
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def get_latest_bacnet_config_controllers() -> List[BacnetConfigControllerModel]:
+    """Controllers of the latest config version in discovery order, without objects"""
+    async with get_session() as session:
+        version = (
+            await session.execute(select(func.max(BacnetConfigModel.id)))
+        ).scalar()
+        if version is None:
+            return []
+        result = await session.execute(
+            select(BacnetConfigControllerModel)
+            .where(BacnetConfigControllerModel.config_version == version)
+            .order_by(BacnetConfigControllerModel.position)
+        )
+        return list(result.scalars().all())
+
+
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def count_bacnet_config_objects(config_version: int) -> Dict[str, int]:
+    """Number of objects per controller_id in a config version"""
+    async with get_session() as session:
+        result = await session.execute(
+            select(
+                BacnetConfigObjectModel.controller_id,
+                func.count(BacnetConfigObjectModel.id),  # type: ignore[arg-type]
+            )
+            .where(BacnetConfigObjectModel.config_version == config_version)
+            .group_by(BacnetConfigObjectModel.controller_id)
+        )
+        return {controller_id: count for controller_id, count in result.all()}
+
+
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def _get_bacnet_config_objects_page(
+    config_version: int, controller_id: str, after_id: int, limit: int
+) -> List[BacnetConfigObjectModel]:
+    async with get_session() as session:
+        result = await session.execute(
+            select(BacnetConfigObjectModel)
+            .where(
+                BacnetConfigObjectModel.config_version == config_version,
+                BacnetConfigObjectModel.controller_id == controller_id,
+                BacnetConfigObjectModel.id > after_id,  # type: ignore[operator]
+            )
+            # A version's objects are inserted in position order, so id order is
+            # position order and the (version, controller) index serves the range
+            .order_by(BacnetConfigObjectModel.id)  # type: ignore[arg-type]
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+async def iter_bacnet_config_objects(
+    config_version: int,
+    controller_id: str,
+    page_size: int = BACNET_CONFIG_UPLOAD_PAGE_SIZE,
+) -> AsyncIterator[List[BacnetConfigObjectModel]]:
+    """
+    Yield a controller's objects in discovery order, page_size at a time.
+
+    Each page is read in its own short session, so memory stays bounded and
+    no read transaction is held open while the caller sends data.
+    """
+    after_id = 0
+    while True:
+        page = await _get_bacnet_config_objects_page(
+            config_version, controller_id, after_id, page_size
+        )
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1].id or after_id
+
+
+async def get_bacnet_controller_config(
+    controller_id: str,
+) -> Optional[BacnetDeviceInfo]:
+    """Load a single controller and its objects from the latest config"""
+    devices = await get_latest_bacnet_config_json_as_list(controller_id=controller_id)
+    return devices[0] if devices else None
 
 
 # BACnet Reader Configuration Functions
@@ -135,6 +404,7 @@ def bacnet_reader_model_to_config(
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def save_bacnet_readers(
     readers: List[BacnetReaderConfig], iot_device_id: str
 ) -> bool:
@@ -203,6 +473,7 @@ async def get_all_active_readers() -> List[BacnetReaderConfig]:
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def update_reader_connection_status(
     reader_id: str, status: str, error_message: Optional[str] = None
 ) -> bool:
@@ -229,6 +500,7 @@ async def update_reader_connection_status(
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def delete_reader(reader_id: str) -> bool:
     """Delete a BACnet reader."""
     try:
@@ -131,7 +131,9 @@ class BACnetWrapper:
                 logger.error(f"[{self.instance_id}] Failed to connect BAC0: {e}")
                 raise
 
-    @performance_metrics("bacnet_read_multiple")
+    @performance_metrics(
+        "bacnet_read_multiple", label_keys={"reader": "self.reader_config.id"}
+    )
     async def read_multiple(self, command: str) -> Any:
         """Thread-safe read multiple operation."""
         if not self._bacnet_connected:
@@ -170,7 +172,9 @@ class BACnetWrapper:
         return await self.read_multiple(read_command)
 
     @performance_metrics(
-        "bacnet_read_properties", {"device": "device_ip", "count": "properties"}
+        "bacnet_read_properties",
+        {"device": "device_ip", "count": "properties"},
+        label_keys={"controller": "device_ip", "reader": "self.reader_config.id"},
     )
     async def read_properties(
         self, device_ip: str, object_type: str, object_id: int, properties: list
@@ -426,7 +430,9 @@ class BACnetWrapper:
                 self._active_operations -= 1
 
     @performance_metrics(
-        "bacnet_bulk_read", {"device": "device_ip", "count": "point_requests"}
+        "bacnet_bulk_read",
+        {"device": "device_ip", "count": "point_requests"},
+        label_keys={"controller": "device_ip", "reader": "self.reader_config.id"},
     )
     async def read_multiple_points(self, device_ip: str, point_requests: list) -> dict:
         """
@@ -1,20 +1,34 @@
-from typing import Optional, Union
-from sqlmodel import SQLModel, Field, select, update
+import math
+import time
+from typing import Any, Optional, Union
+from pydantic import field_validator, model_validator
+from sqlmodel import SQLModel, Field, select, update, delete, func
+from sqlalchemy import Index, Integer, cast
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timezone
-from sqlalchemy import Column, Computed, BigInteger
+from datetime import datetime, timedelta, timezone
 
 from src.models.bacnet_types import BacnetObjectTypeEnum
-from src.network.sqlmodel_client import get_session, with_db_retry
+from src.models.point_state import upsert_point_states
+from src.network.sqlmodel_client import (
+    OUTBOX_SCHEMA,
+    SAMPLE_DURABILITY,
+    SampleDurability,
+    get_database_file_sizes,
+    get_session,
+    with_db_retry,
+    serialized_write,
+    WritePriority,
+)
 from src.config.config import DEFAULT_CONTROLLER_PORT
+from src.config.settings import settings
 from src.utils.logger import logger
 from src.utils.performance import performance_metrics
 
 
-class ControllerPointsModel(SQLModel, table=True):  # type: ignore[call-arg]
-    __tablename__ = "controller_points"
+class PointMetadataBase(SQLModel):
+    """Point identity and slow-changing BACnet properties"""
 
-    id: Optional[int] = Field(default=None, primary_key=True)
     controller_ip_address: str = Field(description="IP address of the controller")
     controller_port: int = Field(
         default=DEFAULT_CONTROLLER_PORT,
@@ -27,30 +41,7 @@ class ControllerPointsModel(SQLModel, table=True):  # type: ignore[call-arg]
     )
     controller_id: str = Field(description="Supabase controller_id")
     units: Optional[str] = Field(default=None, description="Units of the point")
-    present_value: Union[str, None] = Field(description="Present value of the point")
     controller_device_id: str = Field(description="Device ID of the controller")
-    is_uploaded: bool = Field(
-        default=False, description="Whether the point has been uploaded"
-    )
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-    # Health monitoring fields (stored as semicolon-separated strings for SQLite compatibility)
-    status_flags: Optional[str] = Field(
-        default=None,
-        description="BACnet status flags as semicolon-separated string (e.g., 'fault;overridden')",
-    )
-    event_state: Optional[str] = Field(
-        default=None,
-        description="BACnet event state (e.g., 'normal', 'fault', 'offnormal')",
-    )
-    out_of_service: Optional[bool] = Field(
-        default=None, description="BACnet out-of-service flag"
-    )
-    reliability: Optional[str] = Field(
-        default=None,
-        description="BACnet reliability (e.g., 'noFaultDetected', 'overRange')",
-    )
 
     # ============================================================================
     # BACnet Optional Properties (24 additional properties)
@@ -137,58 +128,329 @@ class ControllerPointsModel(SQLModel, table=True):  # type: ignore[call-arg]
         default=None, description="Inhibit reliability evaluation"
     )
 
+
+class PointSampleBase(SQLModel):
+    """Per-sample live fields"""
+
+    is_uploaded: bool = Field(
+        default=False, description="Whether the point has been uploaded"
+    )
+    is_manual_write: bool = Field(
+        default=False,
+        description="Recorded by a manual write; never dropped by outbox retention",
+    )
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    # Health monitoring fields (stored as semicolon-separated strings for SQLite compatibility)
+    status_flags: Optional[str] = Field(
+        default=None,
+        description="BACnet status flags as semicolon-separated string (e.g., 'fault;overridden')",
+    )
+    event_state: Optional[str] = Field(
+        default=None,
+        description="BACnet event state (e.g., 'normal', 'fault', 'offnormal')",
+    )
+    out_of_service: Optional[bool] = Field(
+        default=None, description="BACnet out-of-service flag"
+    )
+    reliability: Optional[str] = Field(
+        default=None,
+        description="BACnet reliability (e.g., 'noFaultDetected', 'overRange')",
+    )
     error_info: Optional[str] = Field(
         default=None, description="Error information as JSON string"
     )
-    created_at_unix_milli_timestamp: int = Field(
-        sa_column=Column(
-            "created_at_unix_milli_timestamp",
-            BigInteger,
-            Computed("(strftime('%s', created_at) * 1000)", persisted=True),
-        ),
-        description="Unix milli timestamp of the point",
+
+
+class ControllerPointsModel(PointMetadataBase, PointSampleBase):
+    """
+    A point sample joined with its metadata.
+
+    This is the shape the monitor produces and the uploader publishes. It is
+    stored split across point_metadata (identity and static properties, one
+    row per point) and point_samples (value and health, one row per sample).
+    """
+
+    id: Optional[int] = Field(default=None, description="point_samples row id")
+    present_value: Union[str, None] = Field(
+        default=None, description="Present value of the point"
+    )
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at_unix_milli_timestamp: Optional[int] = Field(
+        default=None, description="Unix milli timestamp of the point"
+    )
+
+    @field_validator("controller_device_id", mode="before")
+    @classmethod
+    def _device_id_as_str(cls, value: Any) -> Any:
+        # Callers pass the controller's integer BACnet device ID
+        return str(value) if isinstance(value, int) else value
+
+    @model_validator(mode="after")
+    def _fill_unix_milli_timestamp(self) -> "ControllerPointsModel":
+        if self.created_at_unix_milli_timestamp is None:
+            created_at = self.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            # Second precision, matching the original computed column
+            self.created_at_unix_milli_timestamp = int(created_at.timestamp()) * 1000
+        return self
+
+
+class PointMetadataModel(PointMetadataBase, table=True):  # type: ignore[call-arg]
+    __tablename__ = "point_metadata"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    iot_device_point_id: str = Field(
+        unique=True,
+        index=True,
+        description="iot_device_point_id for linking supabase",
+    )
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class PointSampleModel(PointSampleBase, table=True):  # type: ignore[call-arg]
+    """Sample rows, stored in the attached outbox database"""
+
+    __tablename__ = "point_samples"
+    __table_args__ = (
+        Index("ix_point_samples_pending", "is_uploaded", "created_at"),
+        {"schema": OUTBOX_SCHEMA},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # SQLite foreign keys cannot span database files, so this is a plain column
+    point_metadata_id: int = Field(index=True, description="point_metadata.id")
+    value: Optional[float] = Field(
+        default=None, description="Numeric present value (REAL)"
+    )
+    value_text: Optional[str] = Field(
+        default=None,
+        description="Present value text when it is not a canonical float",
+    )
+
+
+# Fields stored once per point in point_metadata
+METADATA_FIELDS = tuple(PointMetadataBase.model_fields)
+# Fields stored per sample in point_samples (besides value)
+SAMPLE_FIELDS = tuple(PointSampleBase.model_fields)
+
+# iot_device_point_id -> (point_metadata.id, metadata values) for committed rows.
+# Metadata rows are never deleted, so the cache only skips redundant upserts.
+_point_metadata_cache: dict[str, tuple[int, tuple]] = {}
+
+# Stay well below SQLite's bound-parameter limit per multi-row upsert
+_METADATA_UPSERT_CHUNK = 500
+
+
+def encode_present_value(
+    present_value: Optional[str],
+) -> tuple[Optional[float], Optional[str]]:
+    """Split a present value into a REAL column and an exact-text fallback"""
+    if present_value is None:
+        return None, None
+    try:
+        numeric = float(present_value)
+    except (TypeError, ValueError):
+        return None, str(present_value)
+    if not math.isfinite(numeric):
+        return None, str(present_value)
+    if str(numeric) == present_value:
+        return numeric, None
+    return numeric, str(present_value)
+
+
+def decode_present_value(
+    value: Optional[float], value_text: Optional[str]
+) -> Optional[str]:
+    """Rebuild the original present value string"""
+    if value_text is not None:
+        return value_text
+    if value is None:
+        return None
+    return str(value)
+
+
+def _to_controller_point(
+    sample: PointSampleModel, metadata: PointMetadataModel
+) -> ControllerPointsModel:
+    fields = {name: getattr(metadata, name) for name in METADATA_FIELDS}
+    fields.update({name: getattr(sample, name) for name in SAMPLE_FIELDS})
+    return ControllerPointsModel(
+        id=sample.id,
+        present_value=decode_present_value(sample.value, sample.value_text),
+        updated_at=sample.created_at,
+        **fields,
+    )
+
+
+def _joined_points_query():
+    return select(PointSampleModel, PointMetadataModel).join(
+        PointMetadataModel,
+        PointSampleModel.point_metadata_id == PointMetadataModel.id,  # type: ignore[arg-type]
     )
 
 
+async def _resolve_point_metadata(
+    session: AsyncSession, points: list[ControllerPointsModel]
+) -> tuple[dict[str, int], dict[str, tuple[int, tuple]]]:
+    """
+    Map each point to its point_metadata id, upserting changed metadata.
+
+    Returns the id map and the cache entries to apply once the caller's
+    transaction commits (so a rollback never leaves stale ids cached).
+    """
+    pending: dict[str, tuple[dict, tuple]] = {}
+    for point in points:
+        values = tuple(getattr(point, name) for name in METADATA_FIELDS)
+        cached = _point_metadata_cache.get(point.iot_device_point_id)
+        if cached is not None and cached[1] == values:
+            continue
+        row = dict(zip(METADATA_FIELDS, values))
+        row["updated_at"] = datetime.now(timezone.utc)
+        pending[point.iot_device_point_id] = (row, values)
+
+    resolved: dict[str, tuple[int, tuple]] = {}
+    table = PointMetadataModel.__table__  # type: ignore[attr-defined]
+    keys = list(pending)
+    for start in range(0, len(keys), _METADATA_UPSERT_CHUNK):
+        chunk = keys[start : start + _METADATA_UPSERT_CHUNK]
+        stmt = sqlite_insert(table).values([pending[key][0] for key in chunk])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.iot_device_point_id],
+            set_={
+                name: stmt.excluded[name]
+                for name in (*METADATA_FIELDS, "updated_at")
+                if name != "iot_device_point_id"
+            },
+        ).returning(table.c.id, table.c.iot_device_point_id)
+        result = await session.execute(stmt)
+        for metadata_id, key in result.all():
+            resolved[key] = (metadata_id, pending[key][1])
+
+    ids = {}
+    for point in points:
+        key = point.iot_device_point_id
+        entry = resolved.get(key) or _point_metadata_cache[key]
+        ids[key] = entry[0]
+    return ids, resolved
+
+
+def _build_sample(point: ControllerPointsModel, metadata_id: int) -> PointSampleModel:
+    value, value_text = encode_present_value(point.present_value)
+    return PointSampleModel(
+        point_metadata_id=metadata_id,
+        value=value,
+        value_text=value_text,
+        **{name: getattr(point, name) for name in SAMPLE_FIELDS},
+    )
+
+
+async def _insert_points(
+    session: AsyncSession, points: list[ControllerPointsModel]
+) -> None:
+    """Insert samples, metadata and latest state, commit, and assign sample ids"""
+    metadata_ids, cache_updates = await _resolve_point_metadata(session, points)
+    samples = [
+        _build_sample(point, metadata_ids[point.iot_device_point_id])
+        for point in points
+    ]
+    session.add_all(samples)
+    await upsert_point_states(session, points)
+    await session.commit()
+
+    _point_metadata_cache.update(cache_updates)
+    for point, sample in zip(points, samples):
+        point.id = sample.id
+
+
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def insert_controller_point(
     point: ControllerPointsModel,
 ) -> ControllerPointsModel:
     async with get_session() as session:
-        session.add(point)
-        await session.commit()
-        await session.refresh(point)
+        await _insert_points(session, [point])
         return point
 
 
+class _SampleBuffer:
+    """Samples held in memory between flushes in batched durability mode"""
+
+    def __init__(self) -> None:
+        self.points: list[ControllerPointsModel] = []
+        self.flushed_at = time.monotonic()
+
+    def is_due(self) -> bool:
+        return (
+            len(self.points) >= settings.OUTBOX_FLUSH_ROWS
+            or time.monotonic() - self.flushed_at
+            >= settings.OUTBOX_FLUSH_INTERVAL_SECONDS
+        )
+
+
+_sample_buffer = _SampleBuffer()
+
+
+async def bulk_insert_controller_points(
+    points: list[ControllerPointsModel],
+) -> list[ControllerPointsModel]:
+    """
+    Store a batch of monitored samples according to SAMPLE_DURABILITY.
+
+    In batched mode the samples are buffered and written once the buffer
+    holds OUTBOX_FLUSH_ROWS rows or OUTBOX_FLUSH_INTERVAL_SECONDS have passed,
+    so their ids stay unset. Otherwise they are written immediately.
+    """
+    if SAMPLE_DURABILITY is not SampleDurability.BATCHED:
+        return await _write_controller_points(points)
+
+    _sample_buffer.points.extend(points)
+    if _sample_buffer.is_due():
+        await flush_sample_buffer()
+    return points
+
+
+async def flush_sample_buffer() -> int:
+    """Write samples buffered in batched mode. Returns the number written."""
+    _sample_buffer.flushed_at = time.monotonic()
+    if not _sample_buffer.points:
+        return 0
+    points = _sample_buffer.points
+    _sample_buffer.points = []
+    try:
+        await _write_controller_points(points)
+    except Exception:
+        # Keep them for the next flush, ahead of anything buffered meanwhile
+        _sample_buffer.points[:0] = points
+        raise
+    return len(points)
+
+
 @performance_metrics("database_bulk_insert", {"count": "points"})
 @with_db_retry(max_retries=5, base_delay=0.1)
-async def bulk_insert_controller_points(
+@serialized_write(WritePriority.BULK)
+async def _write_controller_points(
     points: list[ControllerPointsModel],
 ):
     """
     Insert multiple controller points with defensive error handling.
 
-    Session Concurrency Fixes:
-    - Defensive ID validation (prevents id=0 issues)
-    - No refresh operations (eliminates session dependency issues)
+    Point metadata is upserted only when it differs from what was last
+    stored, so steady-state batches write just the slim point_samples rows
+    plus point_state, all in one transaction.
 
     Args:
         points: List of ControllerPointsModel instances to insert
 
     Returns:
-        List of inserted points (same instances, no fetch-after-insert)
+        List of inserted points (same instances, ids set from point_samples)
 
     Performance Benefits:
         - Single database transaction instead of N transactions
-        - Reduced SQLite lock contention
-        - No unnecessary fetch-after-insert queries
+        - Static point properties written once per change, not per sample
+        - Numeric values stored as REAL instead of text
         - Retry logic protects against transient database locks
-
-    Reliability Benefits:
-        - Eliminates InvalidRequestError from session detachment
-        - Future-proof against id=0 issues
-        - Simple, fast insert-only operation
     """
     if not points:
         logger.info("No points to insert, skipping bulk insert")
@@ -205,24 +467,22 @@ async def bulk_insert_controller_points(
                 )
                 point.id = None
 
-        # Add all points and commit
-        session.add_all(points)
-        await session.commit()
+        await _insert_points(session, points)
 
         logger.info(f"Successfully bulk inserted {len(points)} controller points")
+        return points
 
 
 @with_db_retry(max_retries=3, base_delay=0.05)
 async def fetch_fresh_point(
     session: AsyncSession, point_id: int
 ) -> Optional[ControllerPointsModel]:
-    """Fetch fresh point data by ID - no session dependency
-
-    This replaces refresh operations to avoid session detachment issues.
-    Based on Phase 5 analysis: InvalidRequestError occurs when objects
-    become detached from their sessions.
-    """
-    return await session.get(ControllerPointsModel, point_id)
+    """Fetch fresh point data by sample ID - no session dependency"""
+    result = await session.execute(
+        _joined_points_query().where(PointSampleModel.id == point_id)
+    )
+    row = result.first()
+    return _to_controller_point(*row) if row else None
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
@@ -231,30 +491,30 @@ async def get_controller_points_by_controller_id(
 ) -> list[ControllerPointsModel]:
     async with get_session() as session:
         result = await session.execute(
-            select(ControllerPointsModel).where(
-                ControllerPointsModel.controller_id == controller_id
+            _joined_points_query().where(
+                PointMetadataModel.controller_id == controller_id
             )
         )
-        return list(result.scalars().all())
+        return [_to_controller_point(*row) for row in result.all()]
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.BULK)
 async def delete_uploaded_points() -> int:
     """Delete all controller points where is_uploaded is True. Returns the number of deleted rows."""
     async with get_session() as session:
         result = await session.execute(
-            select(ControllerPointsModel).where(ControllerPointsModel.is_uploaded)
+            delete(PointSampleModel).where(
+                PointSampleModel.is_uploaded  # type: ignore[arg-type]
+            )
         )
-        points_to_delete = list(result.scalars().all())
-        deleted_count = len(points_to_delete)
-        for point in points_to_delete:
-            await session.delete(point)
         await session.commit()
-        return deleted_count
+        return result.rowcount
 
 
 @performance_metrics("database_mark_uploaded", {"count": "points"})
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def mark_points_as_uploaded(points: list[ControllerPointsModel]):
     logger.info(f"Marking points as uploaded: {len(points)}")
     # Explicitly type as list[int] for mypy type safety
@@ -267,21 +527,160 @@ async def mark_points_as_uploaded(points: list[ControllerPointsModel]):
 
     async with get_session() as session:
         await session.execute(
-            update(ControllerPointsModel)
-            .where(ControllerPointsModel.id.in_(ids))  # type: ignore[union-attr]
+            update(PointSampleModel)
+            .where(PointSampleModel.id.in_(ids))  # type: ignore[union-attr]
             .values(is_uploaded=True)
         )
         await session.commit()
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
-async def get_points_to_upload() -> list[ControllerPointsModel]:
-    """Fetch all controller points where is_uploaded is False."""
+async def get_points_to_upload(
+    limit: int = 100, after_id: Optional[int] = None
+) -> list[ControllerPointsModel]:
+    """
+    Fetch pending controller points in insertion (row id) order.
+
+    after_id skips rows up to and including that id, so batches that are
+    still in flight are not fetched again.
+    """
+    query = _joined_points_query().where(
+        PointSampleModel.is_uploaded == False  # noqa: E712
+    )
+    if after_id is not None:
+        query = query.where(PointSampleModel.id > after_id)  # type: ignore[operator]
     async with get_session() as session:
         result = await session.execute(
-            select(ControllerPointsModel)
-            .where(~ControllerPointsModel.is_uploaded)
-            .order_by(ControllerPointsModel.created_at)
-            .limit(100)  # type: ignore[arg-type]
+            query.order_by(PointSampleModel.id).limit(limit)  # type: ignore[arg-type]
         )
-        return list(result.scalars().all())
+        return [_to_controller_point(*row) for row in result.all()]
+
+
+def _droppable_samples():
+    """Pending samples that retention may thin out (never manual writes)"""
+    # "= 0" rather than "NOT is_uploaded", so ix_point_samples_pending is used
+    return (
+        PointSampleModel.is_uploaded == False,  # noqa: E712
+        PointSampleModel.is_manual_write == False,  # noqa: E712
+    )
+
+
+@performance_metrics("database_outbox_retention")
+@with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.BULK)
+async def enforce_outbox_retention(
+    max_rows: int,
+    max_age_seconds: float,
+    full_resolution_seconds: float,
+    downsample_interval_seconds: int,
+) -> dict[str, int]:
+    """
+    Keep the pending outbox within its size and age bounds.
+
+    Policy, applied in order:
+    1. Expire pending samples older than max_age_seconds.
+    2. If more than max_rows remain, thin samples older than the
+       full-resolution window to one per point per downsample interval
+       (the newest sample in each bucket survives).
+    3. If still over max_rows, drop the oldest samples.
+
+    Manual-write samples are never removed. A limit of 0 disables it.
+
+    Returns:
+        Number of samples removed by each step
+    """
+    now = datetime.now(timezone.utc)
+    removed = {"expired": 0, "downsampled": 0, "dropped": 0}
+
+    async with get_session() as session:
+        if max_age_seconds > 0:
+            result = await session.execute(
+                delete(PointSampleModel).where(
+                    *_droppable_samples(),
+                    PointSampleModel.created_at  # type: ignore[arg-type]
+                    < now - timedelta(seconds=max_age_seconds),
+                )
+            )
+            removed["expired"] = result.rowcount
+
+        if max_rows > 0:
+            pending = (
+                await session.execute(select(func.count()).where(*_droppable_samples()))
+            ).scalar_one()
+
+            if pending > max_rows and downsample_interval_seconds > 0:
+                cutoff = now - timedelta(seconds=full_resolution_seconds)
+                bucket = cast(
+                    func.strftime("%s", PointSampleModel.created_at), Integer
+                ) // int(downsample_interval_seconds)
+                survivors = (
+                    select(func.max(PointSampleModel.id))
+                    .where(
+                        *_droppable_samples(),
+                        PointSampleModel.created_at < cutoff,  # type: ignore[arg-type]
+                    )
+                    .group_by(PointSampleModel.point_metadata_id, bucket)
+                )
+                result = await session.execute(
+                    delete(PointSampleModel).where(
+                        *_droppable_samples(),
+                        PointSampleModel.created_at < cutoff,  # type: ignore[arg-type]
+                        PointSampleModel.id.not_in(survivors),  # type: ignore[union-attr]
+                    )
+                )
+                removed["downsampled"] = result.rowcount
+                pending -= result.rowcount
+
+            if pending > max_rows:
+                oldest = (
+                    select(PointSampleModel.id)
+                    .where(*_droppable_samples())
+                    .order_by(PointSampleModel.created_at)
+                    .limit(pending - max_rows)
+                )
+                result = await session.execute(
+                    delete(PointSampleModel).where(
+                        PointSampleModel.id.in_(oldest)  # type: ignore[union-attr]
+                    )
+                )
+                removed["dropped"] = result.rowcount
+
+        await session.commit()
+
+    if any(removed.values()):
+        logger.warning(f"Outbox retention removed pending samples: {removed}")
+    return removed
+
+
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def get_outbox_stats() -> dict:
+    """Get pending outbox depth, oldest pending sample age and database size"""
+    async with get_session() as session:
+        pending, manual, oldest = (
+            await session.execute(
+                select(
+                    func.count(),
+                    func.coalesce(
+                        func.sum(cast(PointSampleModel.is_manual_write, Integer)), 0
+                    ),
+                    func.min(PointSampleModel.created_at),
+                ).where(
+                    PointSampleModel.is_uploaded == False  # noqa: E712
+                )
+            )
+        ).one()
+
+    oldest_age_seconds = None
+    if oldest is not None:
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        oldest_age_seconds = (datetime.now(timezone.utc) - oldest).total_seconds()
+
+    sizes = get_database_file_sizes()
+    return {
+        "pending_points": pending,
+        "pending_manual_writes": manual,
+        "oldest_pending_age_seconds": oldest_age_seconds,
+        "buffered_points": len(_sample_buffer.points),
+        "database_size_bytes": sum(sizes.values()),
+    }
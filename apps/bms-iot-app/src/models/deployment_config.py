@@ -4,7 +4,12 @@ from sqlalchemy import JSON
 from datetime import datetime, timezone
 from pydantic import BaseModel
 
-from src.network.sqlmodel_client import get_session, with_db_retry
+from src.network.sqlmodel_client import (
+    get_session,
+    with_db_retry,
+    serialized_write,
+    WritePriority,
+)
 
 
 class DeploymentConfig(BaseModel):
@@ -31,6 +36,7 @@ class DeploymentConfigModel(SQLModel, table=True):  # type: ignore[call-arg]
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.NORMAL)
 async def set_deployment_config(config: DeploymentConfig) -> DeploymentConfigModel:
     """Set/update the deployment configuration (only keeps one record)"""
     async with get_session() as session:
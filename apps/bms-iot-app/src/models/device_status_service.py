@@ -0,0 +1,139 @@
+import asyncio
+import time
+from typing import Optional
+
+from src.config.settings import settings
+from src.models.device_status_enums import ConnectionStatusEnum, MonitoringStatusEnum
+from src.models.iot_device_status import (
+    IotDeviceStatusModel,
+    STATUS_FIELDS,
+    get_latest_iot_device_status,
+    upsert_iot_device_status,
+)
+from src.utils.logger import logger
+
+# Status values that are written at once instead of waiting for the debounce
+_ERROR_VALUES = (ConnectionStatusEnum.ERROR, MonitoringStatusEnum.ERROR)
+
+
+class DeviceStatusService:
+    """
+    In-memory view of iot_device_status with debounced persistence.
+
+    Partial updates merge into the cached row and are written with one upsert
+    at most every flush_interval seconds. Transitions into ERROR and changes
+    of monitoring_status (restored on restart) are written immediately.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None):
+        self.flush_interval = (
+            settings.STATUS_FLUSH_INTERVAL_SECONDS
+            if flush_interval is None
+            else flush_interval
+        )
+        self._flush_tasks: dict[str, asyncio.Task] = {}
+        self._clear_state()
+
+    def _clear_state(self) -> None:
+        self._status: dict[str, dict] = {}
+        self._dirty: set[str] = set()
+        self._last_flush: dict[str, float] = {}
+        self._loaded: set[str] = set()
+        self.flush_count = 0
+
+    async def _ensure_loaded(self, iot_device_id: str) -> dict:
+        """Seed the cache from the database once per device."""
+        status = self._status.setdefault(iot_device_id, {})
+        if iot_device_id not in self._loaded:
+            self._loaded.add(iot_device_id)
+            record = await get_latest_iot_device_status(iot_device_id)
+            if record is not None:
+                stored = record.model_dump(include=STATUS_FIELDS)
+                # Values merged before the load are newer than the stored row
+                status.update({**stored, **status})
+        return status
+
+    def _needs_immediate_flush(self, current: dict, changes: dict) -> bool:
+        for key, value in changes.items():
+            if current.get(key) == value:
+                continue
+            if value in _ERROR_VALUES or key == "monitoring_status":
+                return True
+        return False
+
+    async def update(self, iot_device_id: str, status_data: dict) -> None:
+        """Merge a partial status update and schedule it for persistence."""
+        status = await self._ensure_loaded(iot_device_id)
+        changes = {
+            key: value for key, value in status_data.items() if key in STATUS_FIELDS
+        }
+        immediate = self._needs_immediate_flush(status, changes)
+        status.update(changes)
+        self._dirty.add(iot_device_id)
+
+        elapsed = time.monotonic() - self._last_flush.get(iot_device_id, 0.0)
+        if immediate or elapsed >= self.flush_interval:
+            await self.flush(iot_device_id)
+        else:
+            self._schedule_flush(iot_device_id, self.flush_interval - elapsed)
+
+    def _schedule_flush(self, iot_device_id: str, delay: float) -> None:
+        task = self._flush_tasks.get(iot_device_id)
+        if (
+            task is not None
+            and not task.done()
+            and task.get_loop() is asyncio.get_running_loop()
+        ):
+            return
+        self._flush_tasks[iot_device_id] = asyncio.create_task(
+            self._flush_later(iot_device_id, delay)
+        )
+
+    async def _flush_later(self, iot_device_id: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self.flush(iot_device_id)
+        except Exception as e:
+            logger.error(
+                f"[DeviceStatusService] Deferred flush failed for {iot_device_id}: {e}"
+            )
+
+    async def flush(self, iot_device_id: Optional[str] = None) -> None:
+        """Write pending status for one device, or for all devices."""
+        device_ids = [iot_device_id] if iot_device_id else list(self._dirty)
+        for device_id in device_ids:
+            if device_id not in self._dirty:
+                continue
+            # Clear first so updates arriving during the write mark it dirty again
+            self._dirty.discard(device_id)
+            self._last_flush[device_id] = time.monotonic()
+            try:
+                await upsert_iot_device_status(device_id, dict(self._status[device_id]))
+                self.flush_count += 1
+            except Exception:
+                self._dirty.add(device_id)
+                raise
+
+    async def get(self, iot_device_id: str) -> Optional[IotDeviceStatusModel]:
+        """Return the current status from memory, or None if the device is unknown."""
+        status = await self._ensure_loaded(iot_device_id)
+        if "organization_id" not in status:
+            return None
+        return IotDeviceStatusModel(iot_device_id=iot_device_id, **status)
+
+    async def close(self) -> None:
+        """Cancel pending deferred flushes and write everything still dirty."""
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        await self.flush()
+
+    def reset(self) -> None:
+        """Forget all cached state without writing it."""
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        self._clear_state()
+
+
+device_status_service = DeviceStatusService()
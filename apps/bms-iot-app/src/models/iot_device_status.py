@@ -1,11 +1,17 @@
 from typing import Optional
 from sqlmodel import SQLModel, Field, select
 from datetime import datetime, timezone
-from sqlalchemy import Column, Computed, BigInteger
+from sqlalchemy import Column, Computed, BigInteger, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import json
 
 from src.models.device_status_enums import MonitoringStatusEnum, ConnectionStatusEnum
-from src.network.sqlmodel_client import get_session, with_db_retry
+from src.network.sqlmodel_client import (
+    get_session,
+    with_db_retry,
+    serialized_write,
+    WritePriority,
+)
 
 
 class IotDeviceStatusModel(SQLModel, table=True):  # type: ignore[call-arg]
@@ -75,74 +81,60 @@ class IotDeviceStatusModel(SQLModel, table=True):  # type: ignore[call-arg]
     )
 
 
+# Columns a caller may set; id and the computed timestamp are owned by the database
+STATUS_FIELDS = frozenset(IotDeviceStatusModel.model_fields) - {
+    "id",
+    "iot_device_id",
+    "created_at",
+    "created_at_unix_milli_timestamp",
+}
+
+
 @with_db_retry(max_retries=3, base_delay=0.1)
+@serialized_write(WritePriority.HIGH)
 async def upsert_iot_device_status(
     iot_device_id: str, status_data: dict
 ) -> IotDeviceStatusModel:
-    """Upsert IoT device status. Only one row per device. Handles concurrent access safely."""
+    """
+    Upsert IoT device status with a single statement. Only one row per device.
+
+    Inserts when organization_id and site_id are given, otherwise updates the
+    existing row. Fields missing from status_data are left untouched.
+    """
+    now = datetime.now(timezone.utc)
+    values = {key: value for key, value in status_data.items() if key in STATUS_FIELDS}
+    if isinstance(values.get("payload"), dict):
+        values["payload"] = json.dumps(values["payload"])
+    values["updated_at"] = now
+    values["received_at"] = now
+
+    table = IotDeviceStatusModel.__table__  # type: ignore[attr-defined]
+    if "organization_id" in values and "site_id" in values:
+        stmt = sqlite_insert(table).values(
+            iot_device_id=iot_device_id,
+            created_at=status_data.get("created_at", now),
+            **values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.iot_device_id],
+            set_={key: stmt.excluded[key] for key in values},
+        )
+    else:
+        stmt = (
+            update(table).where(table.c.iot_device_id == iot_device_id).values(**values)
+        )
+
     async with get_session() as session:
-        # Update timestamp
-        status_data["updated_at"] = datetime.now(timezone.utc)
-        status_data["received_at"] = datetime.now(timezone.utc)
-
-        # Ensure payload is JSON string
-        if "payload" in status_data and isinstance(status_data["payload"], dict):
-            status_data["payload"] = json.dumps(status_data["payload"])
-
-        try:
-            # First, try to update existing record
-            result = await session.execute(
-                select(IotDeviceStatusModel).where(
-                    IotDeviceStatusModel.iot_device_id == iot_device_id
-                )
-            )
-            existing_status = result.scalars().first()
-
-            if existing_status:
-                # Update existing record
-                for key, value in status_data.items():
-                    if hasattr(existing_status, key):
-                        setattr(existing_status, key, value)
-                await session.commit()
-                await session.refresh(existing_status)
-                return existing_status
-            else:
-                # Create new record
-                status_data["iot_device_id"] = iot_device_id
-                if "created_at" not in status_data:
-                    status_data["created_at"] = datetime.now(timezone.utc)
-
-                new_status = IotDeviceStatusModel(**status_data)
-                session.add(new_status)
-                await session.commit()
-                await session.refresh(new_status)
-                return new_status
-
-        except Exception as e:
-            await session.rollback()
-            error_msg = str(e).lower()
-
-            # Handle concurrent insert race condition
-            if "unique constraint failed" in error_msg and "iot_device_id" in error_msg:
-                # Another concurrent operation inserted the record, try to update it
-                result = await session.execute(
-                    select(IotDeviceStatusModel).where(
-                        IotDeviceStatusModel.iot_device_id == iot_device_id
-                    )
-                )
-                existing_status = result.scalars().first()
-
-                if existing_status:
-                    # Update the record that was just created by another operation
-                    for key, value in status_data.items():
-                        if hasattr(existing_status, key) and key != "iot_device_id":
-                            setattr(existing_status, key, value)
-                    await session.commit()
-                    await session.refresh(existing_status)
-                    return existing_status
-
-            # Re-raise other exceptions
-            raise
+        result = await session.execute(stmt.returning(*table.c))
+        row = result.mappings().first()
+        await session.commit()
+
+    if row is None:
+        raise ValueError(
+            f"No status row for device {iot_device_id}; "
+            "organization_id and site_id are required to create one"
+        )
+    return IotDeviceStatusModel(**row)
 
 
 @with_db_retry(max_retries=3, base_delay=0.1)
@@ -0,0 +1,137 @@
+from typing import Optional, Sequence, Union
+from sqlmodel import SQLModel, Field, select
+from sqlalchemy import case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.network.sqlmodel_client import OUTBOX_SCHEMA, get_session, with_db_retry
+
+
+class PointStateModel(SQLModel, table=True):  # type: ignore[call-arg]
+    """Latest known value per point, kept alongside the point_samples history in the outbox"""
+
+    __tablename__ = "point_state"
+    __table_args__ = {"schema": OUTBOX_SCHEMA}
+
+    iot_device_point_id: str = Field(
+        primary_key=True, description="iot_device_point_id for linking supabase"
+    )
+    controller_id: str = Field(index=True, description="Supabase controller_id")
+    controller_device_id: str = Field(description="Device ID of the controller")
+    bacnet_object_type: BacnetObjectTypeEnum = Field(description="BACnet object type")
+    point_id: int = Field(description="Point instance ID")
+    units: Optional[str] = Field(default=None, description="Units of the point")
+    present_value: Union[str, None] = Field(
+        default=None, description="Latest present value of the point"
+    )
+
+    # Health fields from the latest sample
+    status_flags: Optional[str] = Field(default=None)
+    event_state: Optional[str] = Field(default=None)
+    out_of_service: Optional[bool] = Field(default=None)
+    reliability: Optional[str] = Field(default=None)
+    error_info: Optional[str] = Field(default=None)
+
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Timestamp of the latest sample",
+    )
+    changed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Timestamp at which present_value last changed",
+    )
+
+
+# Columns copied from a controller_points row into point_state
+_STATE_COLUMNS = (
+    "controller_id",
+    "controller_device_id",
+    "bacnet_object_type",
+    "point_id",
+    "units",
+    "present_value",
+    "status_flags",
+    "event_state",
+    "out_of_service",
+    "reliability",
+    "error_info",
+)
+
+# Rows per upsert statement; each row binds 14 parameters, so this stays well
+# below SQLite's bound-parameter limit
+_STATE_UPSERT_CHUNK = 500
+
+
+async def upsert_point_states(session: AsyncSession, points: Sequence) -> int:
+    """
+    Upsert the latest state for each point in the caller's transaction.
+
+    Must be called with the same session that inserts the history rows so
+    both commit together. Does not commit. Samples older than the stored
+    state are ignored, and changed_at only moves when present_value differs.
+
+    Args:
+        session: Open session holding the history insert
+        points: ControllerPointsModel instances (or any object with the same fields)
+
+    Returns:
+        Number of distinct points upserted
+    """
+    latest: dict[str, dict] = {}
+    for point in points:
+        sampled_at = point.created_at or datetime.now(timezone.utc)
+        current = latest.get(point.iot_device_point_id)
+        if current is not None and current["updated_at"] > sampled_at:
+            continue
+        row = {column: getattr(point, column) for column in _STATE_COLUMNS}
+        row["iot_device_point_id"] = point.iot_device_point_id
+        row["updated_at"] = sampled_at
+        row["changed_at"] = sampled_at
+        latest[point.iot_device_point_id] = row
+
+    if not latest:
+        return 0
+
+    table = PointStateModel.__table__  # type: ignore[attr-defined]
+    rows = list(latest.values())
+    for start in range(0, len(rows), _STATE_UPSERT_CHUNK):
+        stmt = sqlite_insert(table).values(rows[start : start + _STATE_UPSERT_CHUNK])
+        excluded = stmt.excluded
+        update_columns = {column: excluded[column] for column in _STATE_COLUMNS}
+        update_columns["updated_at"] = excluded.updated_at
+        update_columns["changed_at"] = case(
+            (
+                table.c.present_value.is_(excluded.present_value),
+                table.c.changed_at,
+            ),
+            else_=excluded.updated_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.iot_device_point_id],
+            set_=update_columns,
+            where=table.c.updated_at <= excluded.updated_at,
+        )
+        await session.execute(stmt)
+    return len(rows)
+
+
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def get_point_states(
+    controller_id: Optional[str] = None,
+) -> list[PointStateModel]:
+    """Fetch the latest state of every point, optionally for one controller"""
+    async with get_session() as session:
+        query = select(PointStateModel)
+        if controller_id is not None:
+            query = query.where(PointStateModel.controller_id == controller_id)
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+
+@with_db_retry(max_retries=3, base_delay=0.1)
+async def get_point_state(iot_device_point_id: str) -> Optional[PointStateModel]:
+    """Fetch the latest state of a single point by primary key"""
+    async with get_session() as session:
+        return await session.get(PointStateModel, iot_device_point_id)
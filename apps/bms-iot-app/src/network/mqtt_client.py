@@ -1,7 +1,8 @@
 import json
-import time
+import threading
 import os
-from typing import Any, Dict, Callable, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Callable, Optional, Union
 
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import CallbackAPIVersion
@@ -9,23 +10,53 @@ from paho.mqtt.properties import Properties
 from paho.mqtt.packettypes import PacketTypes
 
 from .mqtt_config import MQTTConfig, default_config, CERT_FILE_PATH
+from .offline_buffer import BufferedPublish, OfflineBuffer
+from .payload_compression import (
+    CONTENT_ENCODING_USER_PROPERTY,
+    CompressionPolicy,
+    compress_payload,
+)
+from src.utils.blocking import run_blocking
 from src.utils.performance_monitor import payload_monitor
 
 from src.utils.logger import logger
 
+# Acknowledgements that arrive before their tracked publish has registered a
+# callback; only kept while a tracked publish is in progress
+MAX_EARLY_ACKS = 256
+
 
 class MQTTClient:
     """MQTT Client for connecting to EMQX broker and publishing monitoring data."""
 
+    # How long connect() waits for the broker's CONNACK
+    CONNECT_TIMEOUT_SECONDS = 5.0
+
     def __init__(self, config: MQTTConfig = default_config):
         self.config = config
-        # Use MQTT 5.0 client with VERSION2 callbacks (clean_start is set in connect method)
+        # Use MQTT 5.0 client with VERSION2 callbacks (clean_start is set in connect method).
+        # paho does not reconnect by itself: its network thread ends when the
+        # connection is lost and the owner reconnects with backoff (see MQTTActor).
         self.client = mqtt.Client(
             callback_api_version=CallbackAPIVersion.VERSION2,
             client_id=config.client_id,
             protocol=mqtt.MQTTv5,
+            reconnect_on_failure=False,
         )
         self.connected = False
+        self._connected_event = threading.Event()
+        # Topic -> QoS, subscribed again on every connect (clean_start drops them)
+        self._subscriptions: Dict[str, int] = {}
+        self.offline_buffer = OfflineBuffer.from_settings()
+        # Delivery callbacks for tracked publishes, keyed by message id. paho
+        # calls on_publish holding its own message lock, so the lock is never
+        # held while calling into paho: a PUBACK that arrives before its
+        # callback is registered is kept in _early_acks instead.
+        self._ack_lock = threading.Lock()
+        self._ack_callbacks: Dict[int, Callable[[bool], None]] = {}
+        self._early_acks: "OrderedDict[int, bool]" = OrderedDict()
+        self._tracked_publishes_in_progress = 0
+        self.compression_policy = CompressionPolicy.from_settings()
 
         # Log warning if TLS is disabled
         if not config.use_tls:
@@ -89,6 +120,7 @@ class MQTTClient:
         """Callback for when the client receives a CONNACK response from the server (MQTT 5.0)."""
         if reason_code.value == 0:
             self.connected = True
+            self._connected_event.set()
             if self.config.use_tls:
                 logger.info(
                     f"Connected securely (TLS) to MQTT broker {self.config.broker_host}:{self.config.broker_port}"
@@ -97,6 +129,9 @@ class MQTTClient:
                 logger.info(
                     f"Connected to MQTT broker {self.config.broker_host}:{self.config.broker_port} (UNENCRYPTED)"
                 )
+            for topic, qos in list(self._subscriptions.items()):
+                self.client.subscribe(topic, qos)
+            self._drain_offline_buffer()
         else:
             error_messages = {
                 1: "Incorrect protocol version",
@@ -115,18 +150,62 @@ class MQTTClient:
     ):
         """Callback for when the client disconnects from the server (MQTT 5.0)."""
         self.connected = False
+        self._connected_event.clear()
         logger.warning(f"Disconnected from MQTT broker with code: {reason_code}")
-        # Implement reconnection logic
-        if reason_code.value != 0:
-            self._reconnect()
+        self._fail_pending_acks()
 
     def _on_publish(self, client, userdata, mid, reason_code, properties):
-        """Callback for when a message has been published (MQTT 5.0)."""
+        """
+        Callback for when a message has been published (MQTT 5.0).
+
+        For QoS 1 this is the broker's PUBACK; for QoS 0 the message has only
+        been written to the socket.
+        """
         logger.debug(f"Message published with ID: {mid}, reason_code: {reason_code}")
+        success = not reason_code.is_failure
+        with self._ack_lock:
+            callback = self._ack_callbacks.pop(mid, None)
+            if callback is None and self._tracked_publishes_in_progress:
+                self._early_acks[mid] = success
+                while len(self._early_acks) > MAX_EARLY_ACKS:
+                    self._early_acks.popitem(last=False)
+        if callback is not None:
+            self._run_ack_callback(callback, success)
+
+    def _fail_pending_acks(self):
+        """Report every unacknowledged tracked publish as failed."""
+        with self._ack_lock:
+            callbacks = list(self._ack_callbacks.values())
+            self._ack_callbacks.clear()
+        if callbacks:
+            logger.warning(f"Failing {len(callbacks)} unacknowledged publishes")
+        for callback in callbacks:
+            self._run_ack_callback(callback, False)
+
+    def _run_ack_callback(self, callback: Callable[[bool], None], success: bool):
+        try:
+            callback(success)
+        except Exception as e:
+            logger.error(f"Error in publish acknowledgement callback: {e}")
+
+    @property
+    def pending_ack_count(self) -> int:
+        """Number of tracked publishes still waiting for acknowledgement."""
+        with self._ack_lock:
+            return len(self._ack_callbacks)
+
+    def connect(self, timeout: Optional[float] = None) -> bool:
+        """
+        Connect to the MQTT broker.
 
-    def connect(self):
-        """Connect to the MQTT broker."""
+        Blocks until the broker accepts the connection or timeout seconds
+        (CONNECT_TIMEOUT_SECONDS by default) pass. From async code use
+        connect_async, which runs this in a worker thread.
+        """
         try:
+            # A previous network thread ends on its own once the connection is lost
+            self.client.loop_stop()
+            self._connected_event.clear()
             if self.config.use_tls:
                 logger.info(
                     f"Connecting securely (TLS) to MQTT broker {self.config.broker_host}:{self.config.broker_port}"
@@ -143,13 +222,18 @@ class MQTTClient:
                 clean_start=self.config.clean_session,
             )
             self.client.loop_start()
-            # Give it a moment to connect
-            time.sleep(0.5)
+            self._connected_event.wait(
+                self.CONNECT_TIMEOUT_SECONDS if timeout is None else timeout
+            )
             return self.connected
         except Exception as e:
             logger.error(f"Error connecting to MQTT broker: {e}")
             return False
 
+    async def connect_async(self, timeout: Optional[float] = None) -> bool:
+        """Connect without blocking the event loop."""
+        return await run_blocking(self.connect, timeout)
+
     def disconnect(self):
         """Disconnect from the MQTT broker."""
         if self.connected:
@@ -157,22 +241,16 @@ class MQTTClient:
             self.client.disconnect()
             logger.info("Disconnected from MQTT broker")
 
-    def _reconnect(self):
-        """Attempt to reconnect to the MQTT broker."""
-        if not self.connected:
-            logger.info(
-                f"Attempting to reconnect in {self.config.reconnect_delay} seconds..."
-            )
-            time.sleep(self.config.reconnect_delay)
-            try:
-                self.connect()
-            except Exception as e:
-                logger.error(f"Reconnection failed: {e}")
-
     def subscribe(self, topic: str, qos: int = 1) -> bool:
-        """Subscribe to a topic."""
+        """
+        Subscribe to a topic.
+
+        The subscription is remembered and renewed on every connect; while
+        disconnected it is only recorded.
+        """
+        self._subscriptions[topic] = qos
         if not self.connected:
-            logger.warning("Cannot subscribe: Not connected to MQTT broker")
+            logger.info(f"Not connected; will subscribe to {topic} on connect")
             return False
         status = self.client.subscribe(topic, qos)
         if status[0] != mqtt.MQTT_ERR_SUCCESS:
@@ -191,27 +269,97 @@ class MQTTClient:
     def publish(
         self,
         topic: str,
-        payload: Dict[str, Any],
+        payload: Union[Dict[str, Any], bytes],
         retain: bool = False,
         qos: Optional[int] = None,
         properties: Optional[Dict[str, Any]] = None,
+        point_count: Optional[int] = None,
     ) -> bool:
         """
         Publish a message to the MQTT broker.
 
         Args:
             topic: The topic to publish to (will be prefixed with config.topic_prefix)
-            payload: The message payload (will be converted to JSON)
+            payload: The message payload (will be converted to JSON), or
+                already encoded JSON bytes
             retain: Whether the message should be retained by the broker
             qos: QoS level (0, 1, or 2). If None, uses config default
-            properties: MQTT 5.0 properties (e.g., {"correlation_data": bytes})
+            properties: MQTT 5.0 properties: "correlation_data" (bytes),
+                "content_type" (str) and "user_properties" (list of pairs)
+            point_count: Points in the payload, for payload metrics
+
+        While disconnected the message is kept in the offline buffer and
+        sent on reconnect.
 
         Returns:
-            bool: True if successfully published, False otherwise
+            bool: True if published or buffered, False otherwise
         """
+        if not self.connected:
+            return self._buffer_offline(
+                topic, payload, retain, qos, properties, point_count
+            )
+        return (
+            self._publish(topic, payload, retain, qos, properties, point_count)
+            is not None
+        )
+
+    def publish_tracked(
+        self,
+        topic: str,
+        payload: Union[Dict[str, Any], bytes],
+        on_ack: Callable[[bool], None],
+        retain: bool = False,
+        qos: Optional[int] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        point_count: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Publish a message and report its delivery.
+
+        on_ack is called from the network thread with True once the broker
+        acknowledges the message, or with False if the broker rejects it or
+        the connection drops first. It is not called when publishing fails
+        immediately. Tracked publishes are never buffered offline: the caller
+        still holds the data and sends it again.
+
+        Returns:
+            The message id, or None if the message could not be queued
+        """
+        with self._ack_lock:
+            self._tracked_publishes_in_progress += 1
+        message_info = None
+        early_ack = None
+        try:
+            message_info = self._publish(
+                topic, payload, retain, qos, properties, point_count
+            )
+        finally:
+            with self._ack_lock:
+                if message_info is not None:
+                    early_ack = self._early_acks.pop(message_info.mid, None)
+                    if early_ack is None:
+                        self._ack_callbacks[message_info.mid] = on_ack
+                self._tracked_publishes_in_progress -= 1
+                if not self._tracked_publishes_in_progress:
+                    self._early_acks.clear()
+        if message_info is None:
+            return None
+        if early_ack is not None:
+            self._run_ack_callback(on_ack, early_ack)
+        return message_info.mid
+
+    def _publish(
+        self,
+        topic: str,
+        payload: Union[Dict[str, Any], bytes],
+        retain: bool = False,
+        qos: Optional[int] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        point_count: Optional[int] = None,
+    ) -> Optional[mqtt.MQTTMessageInfo]:
         if not self.connected:
             logger.warning("Cannot publish: Not connected to MQTT broker")
-            return False
+            return None
 
         full_topic = topic
         if self.config.topic_prefix is not None and self.config.topic_prefix != "":
@@ -219,18 +367,29 @@ class MQTTClient:
 
         logger.info(f"Publishing message to topic: {full_topic}")
         try:
-            # Convert payload to JSON string
-            def ensure_json_serializable(payload):
-                if hasattr(payload, "model_dump"):
-                    return payload.model_dump()
-                elif hasattr(payload, "dict"):
-                    return payload.dict()
-                return payload
-
-            message = json.dumps(ensure_json_serializable(payload))
+            message: Union[str, bytes]
+            if isinstance(payload, bytes):
+                message = encoded = payload
+            else:
+                message = self._encode_json(payload)
+                encoded = message.encode("utf-8")
+
+            # Compress per topic policy and announce it via a user property
+            algorithm = self.compression_policy.select(full_topic, len(encoded))
+            if algorithm is not None:
+                message = compress_payload(encoded, algorithm)
+                properties = dict(properties or {})
+                properties["user_properties"] = [
+                    *properties.get("user_properties", []),
+                    (CONTENT_ENCODING_USER_PROPERTY, algorithm.value),
+                ]
 
             # Monitor payload size
-            self._record_payload_metrics(payload, message)
+            self._record_payload_metrics(
+                len(encoded),
+                point_count=point_count,
+                compressed_size_bytes=len(message) if algorithm else None,
+            )
 
             # Use provided QoS or fall back to config default
             used_qos = qos if qos is not None else self.config.qos
@@ -244,6 +403,10 @@ class MQTTClient:
                     logger.info(
                         f"Publishing with correlation_data: {properties['correlation_data']}"
                     )
+                if "content_type" in properties:
+                    mqtt_properties.ContentType = properties["content_type"]
+                if "user_properties" in properties:
+                    mqtt_properties.UserProperty = list(properties["user_properties"])
 
             logger.info(f"Publishing message to topic: {full_topic}")
             result = self.client.publish(
@@ -257,105 +420,109 @@ class MQTTClient:
             logger.info(
                 f"Published message to topic: {full_topic} with result: {result.rc}"
             )
-            # result.wait_for_publish() # This is blocking and will wait for the message to be published.
             if result.rc != mqtt.MQTT_ERR_SUCCESS:
                 logger.error(
                     f"Failed to publish message: {mqtt.error_string(result.rc)}"
                 )
-                return False
+                return None
 
-            return True
+            return result
         except Exception as e:
             logger.error(f"Error publishing message: {str(e)}")
-            return False
+            return None
 
-    def _record_payload_metrics(self, payload: Dict[str, Any], message: str) -> None:
-        """
-        Record payload metrics for monitoring MQTT message sizes.
+    @staticmethod
+    def _encode_json(payload: Any) -> str:
+        if hasattr(payload, "model_dump"):
+            payload = payload.model_dump()
+        elif hasattr(payload, "dict"):
+            payload = payload.dict()
+        return json.dumps(payload)
 
-        Args:
-            payload: Original payload dictionary before JSON serialization
-            message: JSON serialized message string
-        """
+    def _buffer_offline(
+        self,
+        topic: str,
+        payload: Union[Dict[str, Any], bytes],
+        retain: bool,
+        qos: Optional[int],
+        properties: Optional[Dict[str, Any]],
+        point_count: Optional[int],
+    ) -> bool:
         try:
-            has_optional_properties = self._check_for_optional_properties(payload)
-            property_count = self._count_properties(payload)
-            payload_monitor.record_payload_size(
-                payload=message,
-                property_count=property_count,
-                has_optional_properties=has_optional_properties,
+            message = (
+                payload
+                if isinstance(payload, bytes)
+                else self._encode_json(payload).encode("utf-8")
             )
         except Exception as e:
-            # Don't let monitoring errors break publishing
-            logger.debug(f"Failed to record payload metrics: {e}")
+            logger.error(f"Error encoding message for the offline buffer: {e}")
+            return False
+        dropped = self.offline_buffer.add(
+            BufferedPublish(topic, message, retain, qos, properties, point_count)
+        )
+        logger.info(
+            f"Not connected; buffered message for {topic} "
+            f"({len(self.offline_buffer)} buffered)"
+        )
+        if dropped:
+            logger.warning(
+                f"Offline buffer full; dropped {len(dropped)} oldest messages "
+                f"({self.offline_buffer.dropped} in total)"
+            )
+        return True
 
-    def _check_for_optional_properties(self, payload: Dict[str, Any]) -> bool:
+    def _drain_offline_buffer(self):
         """
-        Check if the payload contains optional BACnet properties.
+        Send everything buffered while disconnected, oldest first.
 
-        Returns True if any optional properties are detected in the payload.
+        Stops at the first publish that fails, e.g. because the connection
+        dropped again, and puts it and the rest back in the buffer.
         """
-        # Optional property indicators - JSON strings or complex objects
-        optional_property_keys = [
-            "priority_array",
-            "limit_enable",
-            "event_enable",
-            "acked_transitions",
-            "event_time_stamps",
-            "event_message_texts",
-            "event_message_texts_config",
-            "event_algorithm_inhibit_ref",
-            "min_pres_value",
-            "max_pres_value",
-            "cov_increment",
-            "time_delay",
-            "time_delay_normal",
-            "deadband",
-            "notification_class",
-            "notify_type",
-            "high_limit",
-            "low_limit",
-        ]
-
-        def search_dict(obj, keys_to_find):
-            """Recursively search for keys in nested dictionaries."""
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if key in keys_to_find:
-                        return True
-                    if isinstance(value, (dict, list)):
-                        if search_dict(value, keys_to_find):
-                            return True
-            elif isinstance(obj, list):
-                for item in obj:
-                    if search_dict(item, keys_to_find):
-                        return True
-            return False
-
-        return search_dict(payload, optional_property_keys)
+        entries = self.offline_buffer.drain()
+        if not entries:
+            return
+        logger.info(f"Sending {len(entries)} messages buffered while disconnected")
+        for index, entry in enumerate(entries):
+            result = self._publish(
+                entry.topic,
+                entry.message,
+                entry.retain,
+                entry.qos,
+                entry.properties,
+                entry.point_count,
+            )
+            if result is None:
+                unsent = entries[index:]
+                dropped = self.offline_buffer.requeue(unsent)
+                logger.warning(
+                    f"Sending buffered messages failed; kept {len(unsent)} "
+                    f"in the offline buffer ({len(dropped)} dropped)"
+                )
+                return
 
-    def _count_properties(self, payload: Dict[str, Any]) -> int:
+    def _record_payload_metrics(
+        self,
+        message_bytes: int,
+        point_count: Optional[int] = None,
+        compressed_size_bytes: Optional[int] = None,
+    ) -> None:
         """
-        Count the number of properties in the payload.
+        Record payload metrics for monitoring MQTT message sizes.
+
+        Only sizes already known at publish time are used; the payload itself
+        is not walked or re-encoded.
 
-        For nested objects, counts top-level keys and nested keys in 'points' arrays.
+        Args:
+            message_bytes: Length of the encoded message
+            point_count: Points in the message, supplied by the serializer
+            compressed_size_bytes: Size on the wire if the message was compressed
         """
-        count = 0
-
-        def count_keys(obj):
-            nonlocal count
-            if isinstance(obj, dict):
-                count += len(obj)
-                # If this is a point with properties, count its nested properties too
-                if "properties" in obj and isinstance(obj["properties"], dict):
-                    count += len(obj["properties"])
-                # Recursively count in nested objects/lists
-                for value in obj.values():
-                    if isinstance(value, (dict, list)):
-                        count_keys(value)
-            elif isinstance(obj, list):
-                for item in obj:
-                    count_keys(item)
-
-        count_keys(payload)
-        return count
+        try:
+            payload_monitor.record_payload_size(
+                message_bytes,
+                point_count=point_count,
+                compressed_size_bytes=compressed_size_bytes,
+            )
+        except Exception as e:
+            # Don't let monitoring errors break publishing
+            logger.debug(f"Failed to record payload metrics: {e}")
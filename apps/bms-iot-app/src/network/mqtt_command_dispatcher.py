@@ -6,11 +6,14 @@ from packages.mqtt_topics.topics_loader import (
     CommandEntry,
     CommandNameEnum,
 )
+from src.config.settings import settings
 from src.network.mqtt_client import MQTTClient
+from src.network.point_bulk_encoding import PointBulkEncoding, encode_point_bulk
 import asyncio
 import paho.mqtt.client as mqtt
 from src.models.controller_points import ControllerPointsModel
 from src.dto import ControllerPointDTO
+from src.dto.controller_point_serializer import encode_points_json, serialize_points
 
 from src.utils.logger import logger
 
@@ -51,6 +54,9 @@ class MqttCommandDispatcher:
         self.controller_device_id = controller_device_id
         self.iot_device_point_id = iot_device_point_id
         self.handlers: dict[CommandNameEnum, MessageHandler] = {}
+        # Loop that runs handlers; set by attach_to_client
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handler_tasks: set[asyncio.Task] = set()
         self.update_mqtt_topics(controller_device_id, iot_device_point_id)
 
     def update_mqtt_topics(
@@ -82,6 +88,11 @@ class MqttCommandDispatcher:
         self.request_topics: List[str] = [
             entry.request.topic for entry in self._command_map.values()
         ]
+        # Routing table for incoming messages; replaced whole, so the network
+        # thread never sees a partially built mapping
+        self._topic_to_command: dict[str, CommandNameEnum] = {
+            entry.request.topic: cmd for cmd, entry in self._command_map.items()
+        }
         self.response_topics: List[str] = [
             entry.response.topic for entry in self._command_map.values()
         ]
@@ -99,26 +110,66 @@ class MqttCommandDispatcher:
             logger.info(f"Subscribing to {topic}")
             self.mqtt_client.subscribe(topic=topic, qos=1)
 
-    def attach_to_client(self):
+    def attach_to_client(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Route incoming messages to the registered handlers.
+
+        paho calls _on_message on its network thread. The message is handed
+        to the app loop (the running loop by default) with
+        call_soon_threadsafe and the handler runs there as a task, so
+        handlers share the loop that owns the actor queues.
+        """
+        app_loop = self._loop = loop or asyncio.get_running_loop()
+
         def _on_message(client, userdata, message: mqtt.MQTTMessage):
             logger.info(f"Received message: {message}")
             topic = message.topic
 
-            # Build a request topic -> command mapping once per callback
-            topic_to_command: dict[str, CommandNameEnum] = {
-                entry.request.topic: cmd for cmd, entry in self._command_map.items()
-            }
-            cmd = topic_to_command.get(topic)
+            cmd = self._topic_to_command.get(topic)
             handler = self.handlers.get(cmd) if cmd else None
 
             if handler:
                 logger.info(f"Handling message: {message}, userdata: {userdata}")
-                asyncio.run(handler(client, userdata, message))
+                try:
+                    app_loop.call_soon_threadsafe(
+                        self._start_handler, cmd, handler, client, userdata, message
+                    )
+                except RuntimeError as e:
+                    # Loop closed during shutdown
+                    logger.warning(f"Dropping message on {topic}: {e}")
             else:
                 logger.warning(f"No handler for topic: {topic}")
 
         self.mqtt_client.set_on_message(_on_message)
 
+    def _start_handler(
+        self,
+        cmd: CommandNameEnum,
+        handler: MessageHandler,
+        client: mqtt.Client,
+        userdata: Any,
+        message: mqtt.MQTTMessage,
+    ):
+        # Runs on the app loop; messages start in arrival order
+        task = asyncio.get_running_loop().create_task(
+            self._run_handler(cmd, handler, client, userdata, message)
+        )
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    async def _run_handler(
+        self,
+        cmd: CommandNameEnum,
+        handler: MessageHandler,
+        client: mqtt.Client,
+        userdata: Any,
+        message: mqtt.MQTTMessage,
+    ):
+        try:
+            await handler(client, userdata, message)
+        except Exception as e:
+            logger.error(f"Error handling {cmd} message: {e}")
+
     # --- Publish helpers ---
     def publish_response(
         self,
@@ -163,7 +214,17 @@ class MqttCommandDispatcher:
                 qos=topic_config.qos,
             )
 
-    def publish_point_bulk(self, payload: list[ControllerPointsModel]):
+    def publish_point_bulk(
+        self,
+        payload: list[ControllerPointsModel],
+        on_ack: Optional[Callable[[bool], None]] = None,
+    ):
+        """
+        Publish points to the bulk topic.
+
+        With on_ack the publish is tracked and on_ack reports whether the
+        broker acknowledged it; see MQTTClient.publish_tracked.
+        """
         logger.info(f"Publishing point bulk count: {len(payload)}")
         point_bulk_topic_config = self.mqtt_topics.data.point_bulk
         if not point_bulk_topic_config:
@@ -171,15 +232,34 @@ class MqttCommandDispatcher:
                 f"Bulk topic is not set. Please update the mqtt topics. Check mqtt_topics: {self.mqtt_topics}"
             )
 
-        payload_dict = [_serialize_point(point) for point in payload]
         logger.info(
-            f"Publishing point bulk count: {len(payload_dict)} to topic: {point_bulk_topic_config.topic}"
+            f"Publishing point bulk count: {len(payload)} to topic: {point_bulk_topic_config.topic}"
         )
+        encoding = PointBulkEncoding(settings.POINT_BULK_ENCODING)
+        if encoding == PointBulkEncoding.JSON:
+            # Pre-encoded bytes; MQTTClient sends them without json.dumps
+            message, properties = encode_points_json(payload), None
+        else:
+            message, properties = encode_point_bulk(serialize_points(payload), encoding)
+        if on_ack is not None:
+            mid = self.mqtt_client.publish_tracked(
+                point_bulk_topic_config.topic,
+                message,
+                on_ack,
+                retain=point_bulk_topic_config.retain,
+                qos=point_bulk_topic_config.qos,
+                properties=properties,
+                point_count=len(payload),
+            )
+            return mid is not None
+
         has_published = self.mqtt_client.publish(
             point_bulk_topic_config.topic,
-            {"points": payload_dict},
+            message,
             retain=point_bulk_topic_config.retain,
             qos=point_bulk_topic_config.qos,
+            properties=properties,
+            point_count=len(payload),
         )
 
         return has_published
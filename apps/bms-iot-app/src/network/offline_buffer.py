@@ -0,0 +1,108 @@
+"""
+Bounded buffer for MQTT publishes made while the broker is unreachable.
+
+Entries hold the already encoded message and are replayed in order when the
+connection comes back. When the buffer is over its message or byte limit,
+the oldest entries are dropped. A retained publish replaces an older
+buffered one on the same topic, since only the latest retained value
+matters, e.g. heartbeats.
+
+Point batches are not buffered here. Their rows stay in the outbox until a
+publish is acknowledged, and the uploader sends them again.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from src.config.settings import settings
+
+
+@dataclass
+class BufferedPublish:
+    topic: str
+    message: bytes
+    retain: bool = False
+    qos: Optional[int] = None
+    properties: Optional[Dict[str, Any]] = None
+    point_count: Optional[int] = None
+
+
+class OfflineBuffer:
+    def __init__(self, max_messages: int, max_bytes: int):
+        self.max_messages = max(0, max_messages)
+        self.max_bytes = max(0, max_bytes)
+        self._entries: Deque[BufferedPublish] = deque()
+        self._size_bytes = 0
+        # Filled from the event loop, drained from the network thread
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    @classmethod
+    def from_settings(cls) -> "OfflineBuffer":
+        return cls(
+            max_messages=settings.MQTT_OFFLINE_BUFFER_MESSAGES,
+            max_bytes=settings.MQTT_OFFLINE_BUFFER_BYTES,
+        )
+
+    def add(self, entry: BufferedPublish) -> List[BufferedPublish]:
+        """Buffer a publish; returns the entries dropped to make room."""
+        with self._lock:
+            if entry.retain:
+                for buffered in self._entries:
+                    if buffered.retain and buffered.topic == entry.topic:
+                        self._entries.remove(buffered)
+                        self._size_bytes -= len(buffered.message)
+                        break
+            self._entries.append(entry)
+            self._size_bytes += len(entry.message)
+            dropped = self._trim()
+        return dropped
+
+    def requeue(self, entries: List[BufferedPublish]) -> List[BufferedPublish]:
+        """
+        Put drained publishes that were not sent back in front, in order.
+
+        A retained publish that was buffered again in the meantime is newer,
+        so the requeued one for its topic is left out. Returns the entries
+        dropped to stay within the limits.
+        """
+        with self._lock:
+            retained_topics = {
+                buffered.topic for buffered in self._entries if buffered.retain
+            }
+            for entry in reversed(entries):
+                if entry.retain and entry.topic in retained_topics:
+                    continue
+                self._entries.appendleft(entry)
+                self._size_bytes += len(entry.message)
+            dropped = self._trim()
+        return dropped
+
+    def _trim(self) -> List[BufferedPublish]:
+        """Drop the oldest entries over the limits; call with the lock held."""
+        dropped: List[BufferedPublish] = []
+        while self._entries and (
+            len(self._entries) > self.max_messages or self._size_bytes > self.max_bytes
+        ):
+            oldest = self._entries.popleft()
+            self._size_bytes -= len(oldest.message)
+            dropped.append(oldest)
+        self.dropped += len(dropped)
+        return dropped
+
+    def drain(self) -> List[BufferedPublish]:
+        """Remove and return every buffered publish, oldest first."""
+        with self._lock:
+            entries = list(self._entries)
+            self._entries.clear()
+            self._size_bytes = 0
+        return entries
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,77 @@
+"""
+Optional compression of MQTT publish payloads.
+
+A compressed message carries a "content-encoding" MQTT 5 user property naming
+the algorithm. Consumers that see no such property receive the plain JSON as
+before. Which topics may be compressed, and above which size, is a policy
+read from settings.
+"""
+
+import fnmatch
+import gzip
+from enum import Enum
+from typing import Iterable, Optional
+
+from src.config.settings import settings
+
+CONTENT_ENCODING_USER_PROPERTY = "content-encoding"
+
+# Level 6 is zlib's default trade-off; the payloads are small and repetitive
+GZIP_COMPRESS_LEVEL = 6
+
+
+class CompressionAlgorithm(str, Enum):
+    NONE = "none"
+    GZIP = "gzip"
+
+
+def compress_payload(data: bytes, algorithm: CompressionAlgorithm) -> bytes:
+    if algorithm == CompressionAlgorithm.GZIP:
+        # mtime=0 keeps output deterministic for identical payloads
+        return gzip.compress(data, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+    return data
+
+
+def decompress_payload(data: bytes, algorithm: CompressionAlgorithm) -> bytes:
+    if algorithm == CompressionAlgorithm.GZIP:
+        return gzip.decompress(data)
+    return data
+
+
+class CompressionPolicy:
+    """
+    Decides per publish whether to compress.
+
+    topic_patterns are fnmatch patterns matched against the full topic, e.g.
+    "*/bulk" or "*/command/*/response".
+    """
+
+    def __init__(
+        self,
+        algorithm: CompressionAlgorithm = CompressionAlgorithm.NONE,
+        min_bytes: int = 0,
+        topic_patterns: Iterable[str] = (),
+    ):
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.topic_patterns = tuple(topic_patterns)
+
+    @classmethod
+    def from_settings(cls) -> "CompressionPolicy":
+        return cls(
+            algorithm=CompressionAlgorithm(settings.MQTT_COMPRESSION),
+            min_bytes=settings.MQTT_COMPRESSION_MIN_BYTES,
+            topic_patterns=[
+                pattern.strip()
+                for pattern in settings.MQTT_COMPRESSION_TOPICS.split(",")
+                if pattern.strip()
+            ],
+        )
+
+    def select(self, topic: str, size_bytes: int) -> Optional[CompressionAlgorithm]:
+        """Algorithm to use for this publish, or None to send it as is."""
+        if self.algorithm == CompressionAlgorithm.NONE or size_bytes < self.min_bytes:
+            return None
+        if any(fnmatch.fnmatchcase(topic, pattern) for pattern in self.topic_patterns):
+            return self.algorithm
+        return None
@@ -0,0 +1,107 @@
+"""
+Wire encodings for the data.point_bulk topic.
+
+The default JSON encoding sends one camelCase object per point. The columnar
+encoding sends each field name once:
+
+    {
+        "encoding": "columnar",
+        "version": 1,
+        "count": 2,
+        "constants": {"controllerId": "c-1", "isUploaded": false, ...},
+        "columns": {"pointId": [1, 2], "presentValue": ["20.5", "21.0"], ...}
+    }
+
+Fields with the same value in every point go to "constants", fields that are
+null in every point are omitted, and createdAt/updatedAt are Unix
+milliseconds. The encoding is announced with the MQTT 5 content type and an
+"encoding" user property so consumers can tell the formats apart.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+COLUMNAR_VERSION = 1
+COLUMNAR_CONTENT_TYPE = "application/vnd.openbms.point-bulk.columnar+json"
+ENCODING_USER_PROPERTY = "encoding"
+
+# Sent as integer milliseconds in the columnar layout
+TIMESTAMP_FIELDS = ("createdAt", "updatedAt")
+# Redundant once createdAt is an integer
+DROPPED_FIELDS = ("createdAtUnixMilliTimestamp",)
+
+
+class PointBulkEncoding(str, Enum):
+    JSON = "json"
+    COLUMNAR = "columnar"
+
+
+def _iso_to_millis(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def encode_columnar(points: list[dict[str, Any]]) -> dict[str, Any]:
+    """Encode serialized points (ControllerPointDTO dumps) column by column."""
+    constants: dict[str, Any] = {}
+    columns: dict[str, list[Any]] = {}
+    if points:
+        for field in points[0]:
+            if field in DROPPED_FIELDS:
+                continue
+            values = [point.get(field) for point in points]
+            if field in TIMESTAMP_FIELDS:
+                values = [_iso_to_millis(value) for value in values]
+            first = values[0]
+            if all(value == first for value in values):
+                if first is not None:
+                    constants[field] = first
+                continue
+            columns[field] = values
+
+    return {
+        "encoding": PointBulkEncoding.COLUMNAR.value,
+        "version": COLUMNAR_VERSION,
+        "count": len(points),
+        "constants": constants,
+        "columns": columns,
+    }
+
+
+def decode_columnar(payload: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Rebuild per-point dicts from the columnar layout.
+
+    Omitted fields are absent (null) and timestamps stay in milliseconds.
+    """
+    if payload.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar version: {payload.get('version')}")
+
+    points: list[dict[str, Any]] = [
+        dict(payload["constants"]) for _ in range(payload["count"])
+    ]
+    for field, values in payload["columns"].items():
+        for point, value in zip(points, values):
+            if value is not None:
+                point[field] = value
+    return points
+
+
+def encode_point_bulk(
+    points: list[dict[str, Any]], encoding: PointBulkEncoding
+) -> tuple[dict[str, Any], Optional[dict[str, Any]]]:
+    """
+    Build the point_bulk message and its MQTT properties.
+
+    JSON keeps the existing {"points": [...]} message without properties.
+    """
+    if encoding == PointBulkEncoding.COLUMNAR:
+        return encode_columnar(points), {
+            "content_type": COLUMNAR_CONTENT_TYPE,
+            "user_properties": [
+                (ENCODING_USER_PROPERTY, f"columnar/{COLUMNAR_VERSION}")
+            ],
+        }
+    return {"points": points}, None
@@ -0,0 +1,42 @@
+"""
+Jittered exponential backoff for MQTT reconnects and HTTP retries.
+
+Each failed attempt doubles the delay up to a cap. The actual wait is drawn
+from the upper part of that range, so many devices that lost the same broker
+or server do not all retry at the same instant.
+"""
+
+import random
+from typing import Callable
+
+
+class ReconnectBackoff:
+    def __init__(
+        self,
+        initial_delay: float,
+        max_delay: float,
+        jitter: float = 0.5,
+        random_fn: Callable[[], float] = random.random,
+    ):
+        """
+        Args:
+            initial_delay: Upper bound of the first wait, in seconds
+            max_delay: Cap on the upper bound, in seconds
+            jitter: Fraction of the bound that is randomised (0 disables)
+            random_fn: Source of values in [0, 1), replaceable in tests
+        """
+        self.initial_delay = max(0.0, initial_delay)
+        self.max_delay = max(self.initial_delay, max_delay)
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self._random = random_fn
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        """Delay before the next attempt; each call counts one failure."""
+        bound = min(self.max_delay, self.initial_delay * (2**self.attempts))
+        self.attempts += 1
+        return bound * (1 - self.jitter * self._random())
+
+    def reset(self) -> None:
+        """Start over after a successful connection."""
+        self.attempts = 0
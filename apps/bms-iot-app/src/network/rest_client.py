@@ -1,26 +1,64 @@
 import httpx
 from typing import Optional, Dict, Any, Union
 
+from src.config.settings import settings
+from src.utils.logger import logger
+
 
 class RestClient:
-    def __init__(self, jwt_token: Optional[str] = None, timeout: float = 10.0):
+    # Connection pool; idle keep-alive connections are reused between requests
+    POOL_LIMITS = httpx.Limits(
+        max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0
+    )
+
+    def __init__(
+        self,
+        jwt_token: Optional[str] = None,
+        timeout: float = 10.0,
+        http2: bool = False,
+    ):
         # self.base_url = base_url.rstrip('/')
         self.jwt_token = jwt_token
         self.timeout = timeout
+        self.http2 = http2
         self._client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        await self.open()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the pooled httpx client; a no-op if it is already open."""
+        if self._client is not None:
+            return
+        try:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, http2=self.http2, limits=self.POOL_LIMITS
+            )
+        except ImportError as e:
+            # http2=True needs the optional h2 package
+            logger.warning(f"HTTP/2 unavailable ({e}); using HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.POOL_LIMITS
+            )
+
+    async def close(self):
         if self._client:
             await self._client.aclose()
+            self._client = None
 
-    def _get_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    def _get_headers(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        jwt_token: Optional[str] = None,
+    ) -> Dict[str, str]:
         headers = headers.copy() if headers else {}
-        if self.jwt_token:
-            headers["Authorization"] = f"Bearer {self.jwt_token}"
+        token = jwt_token or self.jwt_token
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
         return headers
 
     async def get(
@@ -52,13 +90,30 @@ class RestClient:
         data: Optional[Any] = None,
         json: Optional[Any] = None,
         headers: Optional[Dict[str, str]] = None,
+        content: Optional[Any] = None,
+        jwt_token: Optional[str] = None,
     ) -> Union[httpx.Response, None]:
+        """
+        POST to endpoint.
+
+        content may be bytes or an async iterator of bytes, which is sent
+        chunked without being held in memory. jwt_token overrides the
+        client's token for this request, so a shared client can serve
+        requests with different tokens.
+        """
         # url = f"{self.base_url}/{endpoint.lstrip('/')}"
         url = endpoint
         if self._client is not None:
+            request_kwargs: Dict[str, Any] = {}
+            if content is not None:
+                request_kwargs["content"] = content
             try:
                 response = await self._client.post(
-                    url, data=data, json=json, headers=self._get_headers(headers)
+                    url,
+                    data=data,
+                    json=json,
+                    headers=self._get_headers(headers, jwt_token),
+                    **request_kwargs,
                 )
                 response.raise_for_status()
                 return response
@@ -71,3 +126,22 @@ class RestClient:
             except Exception as e:
                 print(f"An error occurred while requesting {url!r}: {e}")
         return None
+
+
+_shared_client: Optional[RestClient] = None
+
+
+async def get_shared_rest_client() -> RestClient:
+    """Process-wide pooled client, opened on first use and kept alive."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = RestClient(http2=settings.HTTP2_ENABLED)
+    await _shared_client.open()
+    return _shared_client
+
+
+async def close_shared_rest_client():
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
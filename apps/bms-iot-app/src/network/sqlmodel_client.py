@@ -1,7 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import text
-from ..config.paths import get_database_url
-from ..config.bacnet_constants import SQLITE_CACHE_SIZE_PAGES
+from sqlalchemy import event, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+from ..config.paths import get_database_url, get_outbox_database_file
+from ..config.settings import settings
+from ..config.bacnet_constants import (
+    SQLITE_CACHE_SIZE_PAGES,
+    SQLITE_MMAP_SIZE_BYTES,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_POOL_SIZE,
+    SQLITE_POOL_MAX_OVERFLOW,
+    SQLITE_POOL_TIMEOUT_SECONDS,
+    SQLITE_POOL_RECYCLE_SECONDS,
+    SQLITE_MAINTENANCE_TIME_BUDGET_SECONDS,
+    SQLITE_INCREMENTAL_VACUUM_PAGES,
+    SQLITE_ANALYSIS_LIMIT,
+)
 import asyncio
 import contextlib
 from functools import wraps
@@ -9,7 +23,14 @@ import sys
 import tempfile
 import os
 from collections import defaultdict
-from typing import DefaultDict
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from enum import Enum, IntEnum
+from typing import Any, Awaitable, Callable, DefaultDict, Optional
 
 from src.utils.logger import logger
 
@@ -20,11 +41,36 @@ if "pytest" in sys.modules or "PYTEST_CURRENT_TEST" in os.environ:
     test_db_path = test_db_file.name
     test_db_file.close()
     DATABASE_URL = f"sqlite+aiosqlite:///{test_db_path}"
+    OUTBOX_DATABASE_PATH = f"{os.path.splitext(test_db_path)[0]}-outbox.db"
     logger.info(f"Using test database: {test_db_path}")
 else:
     DATABASE_URL = get_database_url()
+    OUTBOX_DATABASE_PATH = get_outbox_database_file()
     logger.info(f"Using production database: {DATABASE_URL}")
 
+
+class SampleDurability(str, Enum):
+    """How point samples reach disk (config tables are always fully durable)"""
+
+    DURABLE = "durable"  # Each batch committed to the outbox file
+    BATCHED = "batched"  # Buffered in memory, flushed every N seconds or M rows
+    VOLATILE = "volatile"  # Outbox file kept in RAM, lost on reboot
+
+
+SAMPLE_DURABILITY = SampleDurability(settings.SAMPLE_DURABILITY)
+
+# Point samples and latest point state live in a separate database file,
+# attached to every connection under this schema name. Config tables stay
+# in the main file with synchronous=FULL while sample writes skip fsyncs.
+OUTBOX_SCHEMA = "outbox"
+DATABASE_SCHEMAS = ("main", OUTBOX_SCHEMA)
+
+_OUTBOX_SYNCHRONOUS = {
+    SampleDurability.DURABLE: "NORMAL",
+    SampleDurability.BATCHED: "NORMAL",  # One commit per flush
+    SampleDurability.VOLATILE: "OFF",
+}
+
 # SQLite-specific connection arguments for concurrency
 connect_args = {
     "timeout": 30,  # 30 second timeout for database locks
@@ -32,40 +78,186 @@ connect_args = {
     "check_same_thread": False,  # Allow multi-thread access
 }
 
-# Create engine with SQLite optimizations
+# Per-connection PRAGMAs. Unlike journal_mode=WAL (persisted in the database
+# file), these only apply to the connection that executes them, so they are
+# run by the pool "connect" hook for every new connection.
+SQLITE_CONNECTION_PRAGMAS = [
+    "PRAGMA main.synchronous=FULL;",  # Config and status are fully durable
+    f"PRAGMA {OUTBOX_SCHEMA}.synchronous={_OUTBOX_SYNCHRONOUS[SAMPLE_DURABILITY]};",
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};",
+    "PRAGMA temp_store=MEMORY;",  # Use memory for temp tables
+    f"PRAGMA cache_size={SQLITE_CACHE_SIZE_PAGES};",  # Increase cache size
+    f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_BYTES};",  # Memory map the database
+]
+
+# Create engine with a small persistent pool: connections (and their PRAGMA
+# setup) are reused across get_session() calls instead of reopened each time.
 engine = create_async_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    poolclass=None,  # Use NullPool for SQLite - no connection pooling
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=SQLITE_POOL_SIZE,
+    max_overflow=SQLITE_POOL_MAX_OVERFLOW,
+    pool_timeout=SQLITE_POOL_TIMEOUT_SECONDS,
+    pool_recycle=SQLITE_POOL_RECYCLE_SECONDS,
     pool_pre_ping=True,  # Verify connections before use
     echo=False,
     future=True,
 )
 
+# Dedicated single-connection engine for serialized writes (see DatabaseWriter).
+# In WAL mode readers on the main pool never block on this writer.
+write_engine = create_async_engine(
+    DATABASE_URL,
+    connect_args=connect_args,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=1,
+    # Never a second writer connection: other event loops (threads) wait for
+    # the checkout, up to pool_timeout
+    max_overflow=0,
+    pool_timeout=SQLITE_POOL_TIMEOUT_SECONDS,
+    pool_recycle=SQLITE_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
+    echo=False,
+    future=True,
+)
+
 async_session = async_sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
+async_write_session = async_sessionmaker(
+    bind=write_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+# Connection lifecycle counters for monitoring pool churn
+pool_metrics: DefaultDict[str, int] = defaultdict(int)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+@event.listens_for(write_engine.sync_engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Attach the outbox database and apply PRAGMAs to every new pooled connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(
+            f"ATTACH DATABASE ? AS {OUTBOX_SCHEMA};", (OUTBOX_DATABASE_PATH,)
+        )
+        for pragma in SQLITE_CONNECTION_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+    pool_metrics["connections_created"] += 1
+    logger.debug(
+        f"Configured new SQLite connection (total created: {pool_metrics['connections_created']})"
+    )
+
+
+@event.listens_for(engine.sync_engine, "close")
+@event.listens_for(write_engine.sync_engine, "close")
+def _on_connection_close(dbapi_connection, connection_record):
+    pool_metrics["connections_closed"] += 1
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+@event.listens_for(write_engine.sync_engine, "checkout")
+def _on_connection_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics["checkouts"] += 1
+
+
+def get_pool_stats() -> dict:
+    """Get connection pool statistics for monitoring"""
+    pool = engine.pool
+    stats: dict = {
+        "pool_class": type(pool).__name__,
+        "connections_created": pool_metrics["connections_created"],
+        "connections_closed": pool_metrics["connections_closed"],
+        "checkouts": pool_metrics["checkouts"],
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            {
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return stats
+
+
+def log_pool_stats():
+    """Log current connection pool statistics - useful for debugging"""
+    stats = get_pool_stats()
+    logger.info(
+        f"📊 Pool Stats - Checked out: {stats.get('checked_out')}, "
+        f"Checked in: {stats.get('checked_in')}, Overflow: {stats.get('overflow')}, "
+        f"Connections created: {stats['connections_created']}, Checkouts: {stats['checkouts']}"
+    )
+
 
 async def enable_wal_mode():
-    """Enable Write-Ahead Logging for better SQLite concurrency"""
+    """Enable Write-Ahead Logging for better SQLite concurrency.
+
+    journal_mode=WAL is persistent in each database file and, without a
+    schema prefix, is applied to the attached outbox as well; the remaining
+    performance PRAGMAs are applied per connection by the pool connect hook.
+    """
     async with engine.begin() as conn:
         await conn.execute(text("PRAGMA journal_mode=WAL;"))
-        await conn.execute(
-            text("PRAGMA synchronous=NORMAL;")
-        )  # Balance safety/performance
-        await conn.execute(text("PRAGMA busy_timeout=30000;"))  # 30 second timeout
-        await conn.execute(
-            text("PRAGMA temp_store=MEMORY;")
-        )  # Use memory for temp tables
-        await conn.execute(
-            text(f"PRAGMA cache_size={SQLITE_CACHE_SIZE_PAGES};")
-        )  # Increase cache size
-        await conn.execute(text("PRAGMA mmap_size=268435456;"))  # 256MB memory map
 
     logger.info("SQLite WAL mode and performance optimizations enabled")
 
 
+async def enable_incremental_auto_vacuum(convert_existing: bool = False):
+    """Switch the main and outbox databases to auto_vacuum=INCREMENTAL.
+
+    Freed pages then stay on the freelist until run_database_maintenance()
+    releases them in small steps. A new, empty database file takes the mode
+    right away. An existing one only picks it up after a full VACUUM, which
+    locks the database for as long as it runs, so that is only done with
+    convert_existing (the "db maintain" command); otherwise a warning is logged.
+    """
+    async with write_engine.connect() as conn:
+        for schema in DATABASE_SCHEMAS:
+            await conn.execute(text(f"PRAGMA {schema}.auto_vacuum=INCREMENTAL;"))
+            mode = (await conn.execute(text(f"PRAGMA {schema}.auto_vacuum;"))).scalar()
+            if mode == 2:  # INCREMENTAL
+                continue
+            if not convert_existing:
+                logger.warning(
+                    f"SQLite {schema} database is not using auto_vacuum=INCREMENTAL; "
+                    "run 'db maintain' to convert it with a one-off VACUUM"
+                )
+                continue
+            logger.info(
+                f"Converting SQLite {schema} database to auto_vacuum=INCREMENTAL "
+                "with a full VACUUM; writes wait until it finishes"
+            )
+            started = time.perf_counter()
+            await conn.execute(text(f"VACUUM {schema};"))
+            logger.info(
+                f"Converted SQLite {schema} database in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+
+async def ensure_outbox_tables():
+    """Create outbox tables missing from the attached outbox database.
+
+    Alembic tracks the schema in the main file, so an outbox that was lost
+    (volatile durability after a reboot) or moved is recreated empty here.
+    """
+    tables = [
+        table
+        for table in SQLModel.metadata.sorted_tables
+        if table.schema == OUTBOX_SCHEMA
+    ]
+    if tables:
+        async with write_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=tables)
+
+
 async def verify_database_connectivity():
     """Verify database connectivity"""
     try:
@@ -82,6 +274,13 @@ async def verify_database_connectivity():
 async def initialize_database():
     """Initialize database with optimal SQLite settings"""
 
+    # Let scheduled maintenance reclaim space incrementally; set before any
+    # table or WAL is written, so a new outbox file takes the mode for free
+    await enable_incremental_auto_vacuum()
+
+    # Recreate the sample outbox if its file is new
+    await ensure_outbox_tables()
+
     # Configure SQLite for concurrency
     await enable_wal_mode()
 
@@ -89,10 +288,62 @@ async def initialize_database():
     await verify_database_connectivity()
 
 
+def get_database_file_sizes() -> dict:
+    """Get on-disk size of the main and outbox database files and WALs in bytes"""
+    database_path = engine.url.database or ""
+    sizes = {}
+    for key, path in (
+        ("database_bytes", database_path),
+        ("wal_bytes", f"{database_path}-wal"),
+        ("outbox_bytes", OUTBOX_DATABASE_PATH),
+        ("outbox_wal_bytes", f"{OUTBOX_DATABASE_PATH}-wal"),
+    ):
+        try:
+            sizes[key] = os.path.getsize(path)
+        except OSError:
+            sizes[key] = 0
+    return sizes
+
+
+async def get_database_stats() -> dict:
+    """Get file and WAL sizes, page counts and freelist usage of both databases
+
+    Per-database keys are prefixed "database_" (main) or "outbox_";
+    freelist_pages and freelist_bytes are totals over both.
+    """
+    stats: dict = {
+        "database_file": engine.url.database or "",
+        "outbox_file": OUTBOX_DATABASE_PATH,
+        **get_database_file_sizes(),
+        "freelist_pages": 0,
+        "freelist_bytes": 0,
+    }
+    async with engine.connect() as conn:
+        for schema, prefix in zip(DATABASE_SCHEMAS, ("database", "outbox")):
+            page_size = (
+                await conn.execute(text(f"PRAGMA {schema}.page_size;"))
+            ).scalar() or 0
+            page_count = (
+                await conn.execute(text(f"PRAGMA {schema}.page_count;"))
+            ).scalar() or 0
+            freelist_pages = (
+                await conn.execute(text(f"PRAGMA {schema}.freelist_count;"))
+            ).scalar() or 0
+            stats[f"{prefix}_page_count"] = page_count
+            stats[f"{prefix}_freelist_pages"] = freelist_pages
+            stats["freelist_pages"] += freelist_pages
+            stats["freelist_bytes"] += freelist_pages * page_size
+    return stats
+
+
 def get_engine():
     return engine
 
 
+def get_write_engine():
+    return write_engine
+
+
 def _is_retryable_error(error: Exception) -> bool:
     """Determine if an error is retryable"""
     error_msg = str(error).lower()
@@ -224,6 +475,238 @@ def with_db_retry(max_retries=3, base_delay=0.1):
     return decorator
 
 
+class WritePriority(IntEnum):
+    """Priority lanes for the serialized writer (lower value runs first)"""
+
+    HIGH = 0  # Manual-write records, device status upserts
+    NORMAL = 1  # Config, reader and upload bookkeeping
+    BULK = 2  # Monitoring samples and cleanup
+
+
+# Set inside the writer task so get_session() binds to the write connection
+_in_writer_context: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "_in_writer_context", default=False
+)
+
+
+# How often a writer on another event loop checks for the writer connection
+_CROSS_LOOP_POLL_SECONDS = 0.005
+
+
+class _WriterGate:
+    """Writer slot and priority-ordered waiters for one event loop"""
+
+    def __init__(self) -> None:
+        self.waiters: list[tuple[WritePriority, int, asyncio.Future]] = []
+        self.busy = False
+
+    def release(self) -> None:
+        """Hand the writer slot to the highest-priority live waiter"""
+        while self.waiters:
+            _, _, waiter = heapq.heappop(self.waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.busy = False
+
+
+class DatabaseWriter:
+    """
+    Single-writer gate for SQLite.
+
+    Write jobs run one at a time on a dedicated connection. While a job is
+    running, new jobs wait in a priority queue ordered by WritePriority then
+    FIFO, and the next waiter is handed the writer slot when the job finishes.
+    Readers keep using the main pool concurrently thanks to WAL, so writers
+    never contend with each other for the database lock.
+    """
+
+    def __init__(self) -> None:
+        # Gate state is per event loop; futures can't cross loops
+        self._gates: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _WriterGate]"
+        ) = weakref.WeakKeyDictionary()
+        # Held by the job using the single writer connection, so the holders
+        # of the per-loop gates (threads with their own loop) take turns
+        self._connection_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self.metrics: DefaultDict[str, float] = defaultdict(float)
+
+    def _gate(self) -> _WriterGate:
+        loop = asyncio.get_running_loop()
+        gate = self._gates.get(loop)
+        if gate is None:
+            gate = _WriterGate()
+            self._gates[loop] = gate
+        return gate
+
+    async def submit(
+        self,
+        job: Callable[[], Awaitable[Any]],
+        priority: WritePriority = WritePriority.NORMAL,
+    ) -> Any:
+        """Run a write job on the serialized writer and return its result"""
+        if _in_writer_context.get():
+            # Nested write from inside a job - already serialized
+            return await job()
+
+        gate = self._gate()
+        enqueued_at = time.perf_counter()
+        if gate.busy or gate.waiters:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(gate.waiters, (priority, next(self._sequence), waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Slot was handed to us just before cancellation
+                    gate.release()
+                raise
+        else:
+            gate.busy = True
+
+        try:
+            # Only waits while a writer on another event loop has the connection
+            while not self._connection_lock.acquire(blocking=False):
+                await asyncio.sleep(_CROSS_LOOP_POLL_SECONDS)
+        except BaseException:
+            gate.release()
+            raise
+
+        wait_ms = (time.perf_counter() - enqueued_at) * 1000
+        self.metrics["max_wait_ms"] = max(self.metrics["max_wait_ms"], wait_ms)
+
+        token = _in_writer_context.set(True)
+        try:
+            result = await job()
+            self.metrics["jobs_completed"] += 1
+            return result
+        except Exception:
+            self.metrics["jobs_failed"] += 1
+            raise
+        finally:
+            _in_writer_context.reset(token)
+            self._connection_lock.release()
+            gate.release()
+
+    def get_stats(self) -> dict:
+        """Get writer queue depth and throughput metrics"""
+        gates = list(self._gates.values())
+        pending = [w for gate in gates for w in gate.waiters if not w[2].done()]
+        stats: dict = {
+            "busy": any(gate.busy for gate in gates),
+            "queue_depth": len(pending),
+        }
+        for priority in WritePriority:
+            stats[f"queued_{priority.name.lower()}"] = sum(
+                1 for w in pending if w[0] == priority
+            )
+        stats["jobs_completed"] = int(self.metrics["jobs_completed"])
+        stats["jobs_failed"] = int(self.metrics["jobs_failed"])
+        stats["max_wait_ms"] = round(self.metrics["max_wait_ms"], 2)
+        return stats
+
+
+database_writer = DatabaseWriter()
+
+
+def serialized_write(priority: WritePriority = WritePriority.NORMAL):
+    """
+    Decorator to route a database write through the serialized writer.
+
+    Callers may pass write_priority=WritePriority.X to override the default
+    priority for a single call (e.g. manual writes jump ahead of samples).
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(
+            *args, write_priority: Optional[WritePriority] = None, **kwargs
+        ):
+            return await database_writer.submit(
+                lambda: func(*args, **kwargs),
+                priority=write_priority if write_priority is not None else priority,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+async def run_database_maintenance(
+    time_budget_seconds: float = SQLITE_MAINTENANCE_TIME_BUDGET_SECONDS,
+    vacuum_pages_per_step: int = SQLITE_INCREMENTAL_VACUUM_PAGES,
+    analyze: bool = False,
+) -> dict:
+    """
+    Run one bounded round of SQLite maintenance through the serialized writer.
+
+    Releases freelist pages with incremental_vacuum in small steps, refreshes
+    planner statistics with PRAGMA optimize (or a full ANALYZE when analyze is
+    True), then truncates the WAL with a checkpoint. Vacuum and statistics
+    stop once the time budget is spent; the checkpoint always runs.
+    """
+
+    async def job() -> dict:
+        started = time.perf_counter()
+        report: dict = {"vacuumed_pages": 0, "optimized": False, "analyzed": False}
+
+        def budget_left() -> bool:
+            return time.perf_counter() - started < time_budget_seconds
+
+        async with write_engine.connect() as conn:
+
+            async def freelist_count(schema: str) -> int:
+                return (
+                    await conn.execute(text(f"PRAGMA {schema}.freelist_count;"))
+                ).scalar() or 0
+
+            # execute() steps incremental_vacuum once, which frees a single
+            # page; the driver's executescript() runs it to completion
+            driver_connection = (await conn.get_raw_connection()).driver_connection
+            for schema in DATABASE_SCHEMAS:
+                freelist_pages = await freelist_count(schema)
+                while freelist_pages and budget_left():
+                    pages = min(freelist_pages, vacuum_pages_per_step)
+                    await driver_connection.executescript(
+                        f"PRAGMA {schema}.incremental_vacuum({pages});"
+                    )
+                    remaining = await freelist_count(schema)
+                    # Nothing freed when auto_vacuum is off
+                    if remaining >= freelist_pages:
+                        break
+                    report["vacuumed_pages"] += freelist_pages - remaining
+                    freelist_pages = remaining
+
+            if budget_left():
+                await conn.execute(
+                    text(f"PRAGMA analysis_limit={SQLITE_ANALYSIS_LIMIT};")
+                )
+                if analyze:
+                    await conn.execute(text("ANALYZE;"))
+                    report["analyzed"] = True
+                else:
+                    await conn.execute(text("PRAGMA optimize;"))
+                report["optimized"] = True
+
+            busy, wal_frames, checkpointed_frames = (
+                await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
+            ).one()
+            report["checkpoint_busy"] = bool(busy)
+            report["wal_frames"] = wal_frames
+            report["checkpointed_frames"] = checkpointed_frames
+
+        report["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return report
+
+    return await database_writer.submit(job, priority=WritePriority.BULK)
+
+
+def get_writer_stats() -> dict:
+    """Get serialized writer metrics for monitoring"""
+    return database_writer.get_stats()
+
+
 def get_session_metrics() -> dict:
     """Get current session usage metrics for monitoring"""
     return dict(session_metrics)
@@ -249,8 +732,10 @@ async def get_session():
     session_metrics["total_sessions"] += 1
     session_metrics["active_sessions"] += 1
 
+    session_factory = async_write_session if _in_writer_context.get() else async_session
+
     try:
-        async with async_session() as session:
+        async with session_factory() as session:
             session_id = id(session)
             logger.debug(
                 f"Created new database session {session_id} (active: {session_metrics['active_sessions']})"
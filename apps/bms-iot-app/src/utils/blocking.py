@@ -0,0 +1,46 @@
+"""
+Thread pool for blocking calls.
+
+Every actor shares one event loop, so a call that blocks (psutil, the
+filesystem, synchronous client libraries) stalls all of them. run_blocking
+runs such calls on a bounded pool of named worker threads, which main shuts
+down on exit.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from src.config.settings import settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """The shared pool, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BLOCKING_EXECUTOR_WORKERS,
+            thread_name_prefix="bms-blocking",
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run func(*args, **kwargs) on the pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_blocking_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_blocking_executor() -> None:
+    """Stop the pool; calls not yet started are cancelled."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,103 @@
+"""
+Event loop lag monitoring.
+
+Every actor shares one event loop, so a callback that blocks it delays all
+of them: BACnet reads time out and MQTT keepalives are missed. The monitor
+sleeps for a fixed interval and records how late it wakes up (the
+scheduling delay) in a histogram. A watchdog thread notices when the loop
+has not woken up for longer than the stall threshold and logs the stack
+the loop thread is running, which points at the blocking call.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+from src.config.settings import settings
+from src.utils.logger import logger
+from src.utils.performance_monitor import StreamingHistogram
+
+
+class LoopLagMonitor:
+    """Measure event loop scheduling delay and report stalls."""
+
+    def __init__(
+        self,
+        interval: float,
+        stall_threshold: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._clock = clock
+        self.lag_ms = StreamingHistogram()
+        self.stalls = 0
+        self._last_wakeup: Optional[float] = None
+        self._reported_wakeup: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+
+    async def run(self) -> None:
+        """Measure until cancelled; the watchdog runs alongside."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_wakeup = self._clock()
+        stop = threading.Event()
+        threading.Thread(
+            target=self._watch, args=(stop,), name="bms-loop-watchdog", daemon=True
+        ).start()
+        try:
+            while True:
+                expected = self._clock() + self.interval
+                await asyncio.sleep(self.interval)
+                self._last_wakeup = self._clock()
+                self.record_lag(self._last_wakeup - expected)
+        finally:
+            stop.set()
+
+    def record_lag(self, lag_seconds: float) -> None:
+        self.lag_ms.record(max(0, int(lag_seconds * 1000)))
+
+    def _watch(self, stop: threading.Event) -> None:
+        while not stop.wait(self.interval):
+            self.check_stall()
+
+    def check_stall(self) -> bool:
+        """
+        Log the loop thread's stack if the loop is blocked right now.
+
+        Called from the watchdog thread. Each stall is reported once.
+        """
+        last_wakeup = self._last_wakeup
+        if last_wakeup is None or last_wakeup == self._reported_wakeup:
+            return False
+        blocked_for = self._clock() - last_wakeup - self.interval
+        if blocked_for < self.stall_threshold:
+            return False
+
+        self._reported_wakeup = last_wakeup
+        self.stalls += 1
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "unavailable\n"
+        logger.warning(
+            f"[LoopLagMonitor] Event loop blocked for {blocked_for * 1000:.0f} ms, "
+            f"loop thread is running:\n{stack.rstrip()}"
+        )
+        return True
+
+    def get_lag_summary(self) -> Dict[str, int]:
+        """Scheduling delay percentiles and the number of stalls."""
+        return {
+            "p50_ms": self.lag_ms.quantile(0.5),
+            "p99_ms": self.lag_ms.quantile(0.99),
+            "max_ms": self.lag_ms.max,
+            "stalls": self.stalls,
+        }
+
+
+# Global loop monitor instance, started by main
+loop_lag_monitor = LoopLagMonitor(
+    interval=settings.LOOP_LAG_INTERVAL_SECONDS,
+    stall_threshold=settings.LOOP_STALL_THRESHOLD_SECONDS,
+)
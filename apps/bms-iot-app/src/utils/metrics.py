@@ -0,0 +1,282 @@
+"""
+Process-wide metrics registry.
+
+Counters, gauges and histograms with labels, kept in memory and rendered in
+the Prometheus text exposition format. Histograms have fixed buckets, so
+their memory does not grow with the number of observations; quantiles are
+estimated by interpolating within a bucket.
+
+Components that already keep their own statistics (mailboxes, the
+supervisor, the loop lag monitor) register a collector that copies them
+into gauges just before a snapshot is taken.
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.logger import logger
+
+# Upper bounds, in milliseconds, of the duration histogram buckets
+DEFAULT_DURATION_BUCKETS_MS: Tuple[float, ...] = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels)
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """A named family of values, one per combination of label values."""
+
+    type_name = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        lock: threading.Lock,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def values(self) -> Dict[LabelValues, Any]:
+        """Current values keyed by label values, in labelnames order."""
+        with self._lock:
+            return dict(self._values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for key, value in sorted(self.values().items()):
+            lines.extend(self._render_value(list(zip(self.labelnames, key)), value))
+        return lines
+
+    def _render_value(self, labels: List[Tuple[str, str]], value: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: Any) -> Optional[float]:
+        return self._values.get(self._key(labels))
+
+
+class HistogramValue:
+    """Bucket counts of one labelled histogram."""
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "HistogramValue") -> None:
+        for index, bucket_count in enumerate(other.bucket_counts):
+            self.bucket_counts[index] += bucket_count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-th quantile (0 < q <= 1); 0 without observations."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        lock: threading.Lock,
+        buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS_MS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames, lock)
+        self.bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = self._values[key] = HistogramValue(self.bounds)
+            histogram.observe(value)
+
+    def merged(self, *by: str) -> Dict[LabelValues, HistogramValue]:
+        """Histograms summed over every label not in by, keyed by the by labels."""
+        positions = [self.labelnames.index(name) for name in by]
+        result: Dict[LabelValues, HistogramValue] = {}
+        with self._lock:
+            for key, histogram in self._values.items():
+                group = tuple(key[i] for i in positions)
+                if group not in result:
+                    result[group] = HistogramValue(self.bounds)
+                result[group].merge(histogram)
+        return result
+
+    def _render_value(
+        self, labels: List[Tuple[str, str]], value: HistogramValue
+    ) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(
+            list(self.bounds) + [math.inf], value.bucket_counts
+        ):
+            cumulative += bucket_count
+            bucket_labels = labels + [("le", _format_value(bound))]
+            lines.append(
+                f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+            )
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {value.sum!r}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {value.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics by name; asking for an existing name returns the same metric."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, lock=self._lock, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"{name} is already registered as a {metric.type_name}")
+        return metric
+
+    def counter(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS_MS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, help_text, labelnames, buckets=buckets
+        )
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run collector before every snapshot, to refresh gauges."""
+        self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"[MetricsRegistry] Collector failed: {e}")
+
+    def metrics(self) -> Iterator[Metric]:
+        return iter(list(self._metrics.values()))
+
+    def render_prometheus(self) -> str:
+        """Snapshot of every metric in the Prometheus text format."""
+        self.collect()
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,94 @@
+"""
+Prometheus text snapshots of the metrics registry.
+
+The snapshot can be written to a file at a fixed interval, which is replaced
+atomically so a reader such as the node_exporter textfile collector never
+sees a partial file, and/or served at http://127.0.0.1:<port>/metrics. The
+server binds to localhost only; nothing is exposed on the site network.
+"""
+
+import asyncio
+import os
+
+from src.config.settings import settings
+from src.utils.blocking import run_blocking
+from src.utils.logger import logger
+from src.utils.metrics import MetricsRegistry, metrics_registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+REQUEST_TIMEOUT_SECONDS = 5
+
+
+def write_metrics_file(path: str, text: str) -> None:
+    """Replace path with text in one step; blocks on disk I/O."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+async def run_metrics_file_writer(
+    registry: MetricsRegistry, path: str, interval: float
+) -> None:
+    while True:
+        await run_blocking(write_metrics_file, path, registry.render_prometheus())
+        await asyncio.sleep(interval)
+
+
+async def _read_request_line(reader: asyncio.StreamReader) -> str:
+    """The request line; the headers are read and ignored."""
+    request_line = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+        pass
+    return request_line.decode("latin-1")
+
+
+async def serve_metrics(registry: MetricsRegistry, port: int) -> None:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(
+                _read_request_line(reader), REQUEST_TIMEOUT_SECONDS
+            )
+            method, target, *_ = request_line.split() + ["", ""]
+            if method == "GET" and target.split("?")[0] == "/metrics":
+                status, body = "200 OK", registry.render_prometheus().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port)
+    logger.info(f"[MetricsExporter] Serving metrics on 127.0.0.1:{port}/metrics")
+    async with server:
+        await server.serve_forever()
+
+
+def metrics_export_enabled() -> bool:
+    return bool(settings.METRICS_FILE_PATH) or settings.METRICS_PORT > 0
+
+
+async def run_metrics_exporter(registry: MetricsRegistry = metrics_registry) -> None:
+    """Run the configured outputs until cancelled."""
+    outputs = []
+    if settings.METRICS_FILE_PATH:
+        outputs.append(
+            run_metrics_file_writer(
+                registry,
+                os.path.expanduser(settings.METRICS_FILE_PATH),
+                settings.METRICS_FILE_INTERVAL_SECONDS,
+            )
+        )
+    if settings.METRICS_PORT > 0:
+        outputs.append(serve_metrics(registry, settings.METRICS_PORT))
+    await asyncio.gather(*outputs)
@@ -2,17 +2,83 @@
 Performance metrics decorator for timing and logging function execution.
 
 This module provides a generic decorator that can be applied to any function
-to measure execution time and log performance metrics with consistent formatting.
+to measure execution time. Every call is recorded in the metrics registry
+(a duration histogram plus failure and item counters, labelled by operation,
+controller and reader) and, unless disabled, logged with consistent
+formatting.
 """
 
 import time
 import functools
 import asyncio
-from typing import Any, Callable, Optional
-from src.utils.logger import logger
-
+import inspect
+from typing import Any, Callable, Dict, Optional
 
-def performance_metrics(operation_type: str, context_keys: Optional[dict] = None):
+from src.config.settings import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics_registry
+
+METRIC_LABELS = ("operation", "controller", "reader")
+
+operation_duration_ms = metrics_registry.histogram(
+    "bms_operation_duration_ms",
+    "Duration of instrumented operations in milliseconds",
+    METRIC_LABELS,
+)
+operation_failures = metrics_registry.counter(
+    "bms_operation_failures_total",
+    "Instrumented operations that raised an exception",
+    METRIC_LABELS,
+)
+operation_items = metrics_registry.counter(
+    "bms_operation_items_total",
+    "Items (points, properties) handled by instrumented operations",
+    METRIC_LABELS,
+)
+
+
+def _bind_arguments(
+    signature: Optional[inspect.Signature], args: tuple, kwargs: dict
+) -> Dict[str, Any]:
+    """Arguments by parameter name, whether passed by position or keyword."""
+    if signature is None:
+        return dict(kwargs)
+    try:
+        return dict(signature.bind_partial(*args, **kwargs).arguments)
+    except TypeError:
+        return dict(kwargs)
+
+
+def _resolve(arguments: Dict[str, Any], path: str) -> Any:
+    """A parameter, or an attribute of one such as "self.reader_config.id"."""
+    name, *attributes = path.split(".")
+    value = arguments.get(name)
+    for attribute in attributes:
+        value = getattr(value, attribute, None)
+    return value
+
+
+def get_performance_summary() -> Dict[str, Dict[str, float]]:
+    """Calls, failures and p50/p99 duration per operation, across labels."""
+    failures: Dict[str, float] = {}
+    for (operation, *_), count in operation_failures.values().items():
+        failures[operation] = failures.get(operation, 0) + count
+    summary = {}
+    for (operation,), histogram in operation_duration_ms.merged("operation").items():
+        summary[operation] = {
+            "count": histogram.count,
+            "failures": failures.get(operation, 0),
+            "p50_ms": round(histogram.quantile(0.5), 2),
+            "p99_ms": round(histogram.quantile(0.99), 2),
+        }
+    return summary
+
+
+def performance_metrics(
+    operation_type: str,
+    context_keys: Optional[dict] = None,
+    label_keys: Optional[dict] = None,
+):
     """
     Generic decorator to measure and log performance metrics for any function.
 
@@ -20,6 +86,9 @@ def performance_metrics(operation_type: str, context_keys: Optional[dict] = None
         operation_type: Type of operation (e.g., "bulk_read", "database_insert", "api_call")
         context_keys: Dict mapping log field names to function parameter names
                      e.g., {"device": "device_ip", "count": "point_requests"}
+        label_keys: Dict mapping the "controller" and "reader" metric labels to
+                    function parameter names, or attributes of one
+                    e.g., {"controller": "device_ip", "reader": "self.reader_config.id"}
 
     Usage:
         @performance_metrics("bacnet_bulk_read", {"device": "device_ip", "count": "point_requests"})
@@ -30,127 +99,111 @@ def performance_metrics(operation_type: str, context_keys: Optional[dict] = None
     """
 
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs) -> Any:
-            start_time = time.perf_counter()
-            func_name = func.__name__
+        func_name = func.__name__
+        try:
+            signature: Optional[inspect.Signature] = inspect.signature(func)
+        except (TypeError, ValueError):
+            signature = None
+
+        def before_call(args: tuple, kwargs: dict) -> tuple:
+            arguments = _bind_arguments(signature, args, kwargs)
 
             # Extract context from function parameters
             context = {}
-            if context_keys:
-                for log_key, param_key in context_keys.items():
-                    value = kwargs.get(param_key)
-                    if value is not None:
-                        # Handle lists/collections by getting length
-                        if hasattr(value, "__len__") and not isinstance(value, str):
-                            context[log_key] = len(value)
-                        else:
-                            context[log_key] = value
+            for log_key, param_key in (context_keys or {}).items():
+                value = arguments.get(param_key)
+                if value is not None:
+                    # Handle lists/collections by getting length
+                    if hasattr(value, "__len__") and not isinstance(value, str):
+                        context[log_key] = len(value)
+                    else:
+                        context[log_key] = value
+
+            labels = {"operation": operation_type, "controller": "", "reader": ""}
+            for label, path in (label_keys or {}).items():
+                value = _resolve(arguments, path)
+                if value is not None:
+                    labels[label] = value
+            return context, labels
+
+        def on_success(context: dict, labels: dict, duration_ms: float, result: Any):
+            operation_duration_ms.observe(duration_ms, **labels)
+            if isinstance(context.get("count"), int):
+                operation_items.inc(context["count"], **labels)
+            if not settings.PERF_METRICS_LOG_ENABLED:
+                return
+
+            # Build performance log message
+            log_parts = [
+                f"[PERF_METRICS] {operation_type}",
+                f"function={func_name}",
+                f"duration_ms={duration_ms:.2f}",
+            ]
+
+            # Add context information
+            for key, value in context.items():
+                log_parts.append(f"{key}={value}")
+
+            # Add result size if applicable
+            if result is not None and hasattr(result, "__len__"):
+                log_parts.append(f"result_count={len(result)}")
+
+            # Calculate per-item timing if we have a count
+            if "count" in context and context["count"] > 0:
+                log_parts.append(
+                    f"avg_per_item_ms={duration_ms / context['count']:.2f}"
+                )
+
+            logger.info(" | ".join(log_parts))
+
+        def on_failure(context: dict, labels: dict, duration_ms: float, e: Exception):
+            operation_duration_ms.observe(duration_ms, **labels)
+            operation_failures.inc(**labels)
+
+            log_parts = [
+                f"[PERF_METRICS] {operation_type}_FAILED",
+                f"function={func_name}",
+                f"duration_ms={duration_ms:.2f}",
+                f"error={type(e).__name__}",
+            ]
+
+            # Add context even for failures
+            for key, value in context.items():
+                log_parts.append(f"{key}={value}")
+
+            logger.error(" | ".join(log_parts))
 
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            start_time = time.perf_counter()
+            context, labels = before_call(args, kwargs)
             try:
                 result = await func(*args, **kwargs)
-                end_time = time.perf_counter()
-                duration_ms = (end_time - start_time) * 1000
-
-                # Build performance log message
-                log_parts = [
-                    f"[PERF_METRICS] {operation_type}",
-                    f"function={func_name}",
-                    f"duration_ms={duration_ms:.2f}",
-                ]
-
-                # Add context information
-                for key, value in context.items():
-                    log_parts.append(f"{key}={value}")
-
-                # Add result size if applicable
-                if result is not None and hasattr(result, "__len__"):
-                    log_parts.append(f"result_count={len(result)}")
-
-                # Calculate per-item timing if we have a count
-                if "count" in context and context["count"] > 0:
-                    log_parts.append(
-                        f"avg_per_item_ms={duration_ms / context['count']:.2f}"
-                    )
-
-                logger.info(" | ".join(log_parts))
-                return result
-
             except Exception as e:
-                end_time = time.perf_counter()
-                duration_ms = (end_time - start_time) * 1000
-
-                log_parts = [
-                    f"[PERF_METRICS] {operation_type}_FAILED",
-                    f"function={func_name}",
-                    f"duration_ms={duration_ms:.2f}",
-                    f"error={type(e).__name__}",
-                ]
-
-                # Add context even for failures
-                for key, value in context.items():
-                    log_parts.append(f"{key}={value}")
-
-                logger.error(" | ".join(log_parts))
+                on_failure(
+                    context, labels, (time.perf_counter() - start_time) * 1000, e
+                )
                 raise
+            on_success(
+                context, labels, (time.perf_counter() - start_time) * 1000, result
+            )
+            return result
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> Any:
             start_time = time.perf_counter()
-            func_name = func.__name__
-
-            # Extract context from function parameters
-            context = {}
-            if context_keys:
-                for log_key, param_key in context_keys.items():
-                    value = kwargs.get(param_key)
-                    if value is not None:
-                        if hasattr(value, "__len__") and not isinstance(value, str):
-                            context[log_key] = len(value)
-                        else:
-                            context[log_key] = value
-
+            context, labels = before_call(args, kwargs)
             try:
                 result = func(*args, **kwargs)
-                end_time = time.perf_counter()
-                duration_ms = (end_time - start_time) * 1000
-
-                log_parts = [
-                    f"[PERF_METRICS] {operation_type}",
-                    f"function={func_name}",
-                    f"duration_ms={duration_ms:.2f}",
-                ]
-
-                for key, value in context.items():
-                    log_parts.append(f"{key}={value}")
-
-                if result is not None and hasattr(result, "__len__"):
-                    log_parts.append(f"result_count={len(result)}")
-
-                if "count" in context and context["count"] > 0:
-                    log_parts.append(
-                        f"avg_per_item_ms={duration_ms / context['count']:.2f}"
-                    )
-
-                logger.info(" | ".join(log_parts))
-                return result
-
             except Exception as e:
-                end_time = time.perf_counter()
-                duration_ms = (end_time - start_time) * 1000
-
-                log_parts = [
-                    f"[PERF_METRICS] {operation_type}_FAILED",
-                    f"function={func_name}",
-                    f"duration_ms={duration_ms:.2f}",
-                    f"error={type(e).__name__}",
-                ]
-
-                for key, value in context.items():
-                    log_parts.append(f"{key}={value}")
-
-                logger.error(" | ".join(log_parts))
+                on_failure(
+                    context, labels, (time.perf_counter() - start_time) * 1000, e
+                )
                 raise
+            on_success(
+                context, labels, (time.perf_counter() - start_time) * 1000, result
+            )
+            return result
 
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
 
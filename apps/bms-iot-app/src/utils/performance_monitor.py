@@ -1,103 +1,143 @@
 """
-MQTT payload size monitoring for BACnet optional properties.
+MQTT payload size monitoring.
 
 This module provides utilities to monitor MQTT payload sizes and warn about
-large payloads that could impact network performance.
+large payloads that could impact network performance. Recording is O(1) per
+publish: callers pass sizes they already have and aggregates are kept in
+fixed-size histograms instead of a history of records.
 """
 
-import json
-import sys
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, Any, List, Optional
 
 from src.config.bacnet_constants import LARGE_PAYLOAD_THRESHOLD_BYTES
 
 from src.utils.logger import logger
 
 
-class PayloadSizeMonitor:
-    """Monitor MQTT payload sizes for optional properties."""
+class StreamingHistogram:
+    """
+    Histogram over non-negative integers with power-of-two buckets.
+
+    Bucket i holds values whose bit length is i, so bucket 0 holds 0 and
+    bucket 11 holds 1024..2047. Memory is fixed regardless of how many values
+    are recorded; quantiles are reported as the upper bound of their bucket.
+    """
+
+    BUCKET_COUNT = 33  # up to 4 GiB, larger values share the last bucket
 
     def __init__(self) -> None:
-        self.payload_sizes: List[Dict[str, Any]] = []
-        self._max_history: int = 100
+        self.buckets: List[int] = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        self.buckets[min(value.bit_length(), self.BUCKET_COUNT - 1)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th quantile (0 < q <= 1)."""
+        if not self.count:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min((1 << index) - 1, self.max)
+        return self.max
 
-    def record_payload_size(
-        self, payload: Any, property_count: int, has_optional_properties: bool = False
-    ) -> None:
-        """Record MQTT payload size metrics."""
-        # Calculate payload size
-        if isinstance(payload, (dict, list)):
-            payload_json = json.dumps(payload)
-            size_bytes = len(payload_json.encode("utf-8"))
-        elif isinstance(payload, str):
-            size_bytes = len(payload.encode("utf-8"))
-        else:
-            size_bytes = sys.getsizeof(payload)
-
-        record = {
-            "timestamp": datetime.now(),
-            "size_bytes": size_bytes,
-            "property_count": property_count,
-            "has_optional_properties": has_optional_properties,
-            "size_kb": round(size_bytes / 1024, 2),
-        }
 
-        self.payload_sizes.append(record)
+class PayloadSizeMonitor:
+    """Monitor MQTT payload sizes."""
 
-        # Maintain history limit
-        if len(self.payload_sizes) > self._max_history:
-            self.payload_sizes = self.payload_sizes[-self._max_history :]
+    def __init__(self) -> None:
+        self.sizes = StreamingHistogram()
+        self.points_per_payload = StreamingHistogram()
+        self.large_payloads = 0
+        self.compressed_payloads = 0
+        self.compressed_raw_bytes = 0
+        self.compressed_wire_bytes = 0
 
-        # Log large payloads
-        if size_bytes > LARGE_PAYLOAD_THRESHOLD_BYTES:
+    def record_payload_size(
+        self,
+        size_bytes: int,
+        point_count: Optional[int] = None,
+        compressed_size_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Record one publish.
+
+        Args:
+            size_bytes: Length of the encoded message before compression
+            point_count: Points in the message, if it is a point batch
+            compressed_size_bytes: Size on the wire if the message was compressed
+        """
+        self.sizes.record(size_bytes)
+        if point_count is not None:
+            self.points_per_payload.record(point_count)
+
+        # Bytes actually sent; equal to size_bytes unless compressed
+        wire_bytes = size_bytes
+        if compressed_size_bytes is not None:
+            wire_bytes = compressed_size_bytes
+            self.compressed_payloads += 1
+            self.compressed_raw_bytes += size_bytes
+            self.compressed_wire_bytes += compressed_size_bytes
+
+        # Log large payloads (by what goes over the network)
+        if wire_bytes > LARGE_PAYLOAD_THRESHOLD_BYTES:
+            self.large_payloads += 1
             logger.warning(
-                f"Large MQTT payload: {record['size_kb']:.2f}KB with {property_count} properties "
-                f"(optional: {has_optional_properties})"
+                f"Large MQTT payload: {round(size_bytes / 1024, 2)}KB "
+                f"with {point_count} points "
+                f"(wire: {round(wire_bytes / 1024, 2)}KB)"
             )
 
-        logger.debug(
-            f"MQTT payload: {record['size_kb']}KB, properties: {property_count}, "
-            f"optional: {has_optional_properties}"
-        )
-
     def get_payload_summary(self) -> Dict[str, Any]:
         """Get payload size summary statistics."""
-        if not self.payload_sizes:
+        sizes = self.sizes
+        if not sizes.count:
             return {"message": "No payload data available"}
 
-        sizes = [p["size_bytes"] for p in self.payload_sizes]
-        optional_payloads = [
-            p for p in self.payload_sizes if p["has_optional_properties"]
-        ]
-        basic_payloads = [
-            p for p in self.payload_sizes if not p["has_optional_properties"]
-        ]
-
-        summary = {
-            "total_payloads": len(self.payload_sizes),
-            "avg_size_kb": round(sum(sizes) / len(sizes) / 1024, 2),
-            "max_size_kb": round(max(sizes) / 1024, 2),
-            "min_size_kb": round(min(sizes) / 1024, 2),
-            "large_payloads": len(
-                [s for s in sizes if s > LARGE_PAYLOAD_THRESHOLD_BYTES]
-            ),
+        summary: Dict[str, Any] = {
+            "total_payloads": sizes.count,
+            "avg_size_kb": round(sizes.mean / 1024, 2),
+            "max_size_kb": round(sizes.max / 1024, 2),
+            "min_size_kb": round((sizes.min or 0) / 1024, 2),
+            "p50_size_kb": round(sizes.quantile(0.5) / 1024, 2),
+            "p95_size_kb": round(sizes.quantile(0.95) / 1024, 2),
+            "large_payloads": self.large_payloads,
         }
 
-        if optional_payloads:
-            opt_sizes = [p["size_bytes"] for p in optional_payloads]
-            summary["with_optional_properties"] = {
-                "count": len(optional_payloads),
-                "avg_size_kb": round(sum(opt_sizes) / len(opt_sizes) / 1024, 2),
-                "max_size_kb": round(max(opt_sizes) / 1024, 2),
+        points = self.points_per_payload
+        if points.count:
+            summary["point_batches"] = {
+                "count": points.count,
+                "total_points": points.total,
+                "avg_points": round(points.mean, 1),
+                "max_points": points.max,
             }
 
-        if basic_payloads:
-            basic_sizes = [p["size_bytes"] for p in basic_payloads]
-            summary["basic_properties_only"] = {
-                "count": len(basic_payloads),
-                "avg_size_kb": round(sum(basic_sizes) / len(basic_sizes) / 1024, 2),
-                "max_size_kb": round(max(basic_sizes) / 1024, 2),
+        if self.compressed_payloads:
+            summary["compression"] = {
+                "count": self.compressed_payloads,
+                "ratio": round(
+                    self.compressed_raw_bytes / max(self.compressed_wire_bytes, 1), 2
+                ),
+                "saved_kb": round(
+                    (self.compressed_raw_bytes - self.compressed_wire_bytes) / 1024, 2
+                ),
             }
 
         return summary
@@ -5,10 +5,14 @@ Pytest configuration and fixtures for BMS IoT Application tests.
 import os
 import sys
 from unittest.mock import Mock, AsyncMock
-from sqlmodel import SQLModel, select
+from sqlmodel import SQLModel, delete
 from src.network.sqlmodel_client import get_engine, get_session, initialize_database
-from src.models.bacnet_config import BacnetConfigModel
-from src.models.controller_points import ControllerPointsModel
+from src.models.bacnet_config import (
+    BacnetConfigModel,
+    BacnetConfigControllerModel,
+    BacnetConfigObjectModel,
+)
+from src.models.controller_points import PointSampleModel
 import pytest
 import pytest_asyncio
 import asyncio
@@ -192,17 +196,13 @@ async def cleanup_database():
 
     async def _cleanup():
         async with get_session() as session:
-            # Delete all controller points
-            result = await session.execute(select(ControllerPointsModel))
-            points = result.scalars().all()
-            for point in points:
-                await session.delete(point)
-
-            # Delete all bacnet configs
-            result = await session.execute(select(BacnetConfigModel))
-            configs = result.scalars().all()
-            for config in configs:
-                await session.delete(config)
+            # Delete all controller point samples
+            await session.execute(delete(PointSampleModel))
+
+            # Delete all bacnet config versions
+            await session.execute(delete(BacnetConfigObjectModel))
+            await session.execute(delete(BacnetConfigControllerModel))
+            await session.execute(delete(BacnetConfigModel))
 
             await session.commit()
 
@@ -187,7 +187,9 @@ class TestMonitorAllDevicesIntegration:
 
         mock_bac0_instance = create_mock_bac0_instance_for_success()
 
-        with patch("BAC0.connect", return_value=mock_bac0_instance):
+        with patch(
+            "src.models.bacnet_wrapper.BAC0.connect", return_value=mock_bac0_instance
+        ):
             reader_config = BacnetReaderConfig(
                 id="reader-1",
                 ip_address="192.168.1.50",
@@ -240,7 +242,9 @@ class TestMonitorAllDevicesIntegration:
 
         mock_bac0_instance = create_mock_bac0_instance_for_bulk_failure()
 
-        with patch("BAC0.connect", return_value=mock_bac0_instance):
+        with patch(
+            "src.models.bacnet_wrapper.BAC0.connect", return_value=mock_bac0_instance
+        ):
             reader_config = BacnetReaderConfig(
                 id="reader-2",
                 ip_address="192.168.1.50",
@@ -291,7 +295,9 @@ class TestMonitorAllDevicesIntegration:
 
         mock_bac0_instance = create_mock_bac0_instance_for_complete_failure()
 
-        with patch("BAC0.connect", return_value=mock_bac0_instance):
+        with patch(
+            "src.models.bacnet_wrapper.BAC0.connect", return_value=mock_bac0_instance
+        ):
             reader_config = BacnetReaderConfig(
                 id="reader-3",
                 ip_address="192.168.1.50",
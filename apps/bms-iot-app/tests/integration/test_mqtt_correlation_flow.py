@@ -66,7 +66,9 @@ async def test_end_to_end_correlation_flow():
 
         # Mock upload_config to avoid actual HTTP call
         with patch(
-            "src.controllers.uploader.upload.upload_config", new_callable=AsyncMock
+            "src.actors.uploader_actor.upload_config",
+            new_callable=AsyncMock,
+            return_value=None,
         ):
             # Step 1: Receive request with correlation data
             await mqtt_handler.on_get_config_request(
@@ -153,7 +155,9 @@ async def test_correlation_flow_without_correlation_data():
         mock_message.properties = None  # No MQTT 5 properties
 
         with patch(
-            "src.controllers.uploader.upload.upload_config", new_callable=AsyncMock
+            "src.actors.uploader_actor.upload_config",
+            new_callable=AsyncMock,
+            return_value=None,
         ):
             # Request without correlation data
             await mqtt_handler.on_get_config_request(
@@ -305,7 +309,9 @@ async def test_correlation_preserves_through_all_actors():
 
         # Mock external dependencies
         with patch(
-            "src.controllers.uploader.upload.upload_config", new_callable=AsyncMock
+            "src.actors.uploader_actor.upload_config",
+            new_callable=AsyncMock,
+            return_value=None,
         ):
             # MQTT receives request
             await mqtt_handler.on_get_config_request(
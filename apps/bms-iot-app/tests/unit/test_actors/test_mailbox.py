@@ -0,0 +1,305 @@
+"""
+Test actor mailboxes and timers.
+
+User Story: As an operator of a fanless gateway, I want idle actors to sleep and messages handled at once
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.actors.heartbeat_actor import HeartbeatActor
+from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.mailbox import (
+    Mailbox,
+    MessagePriority,
+    OverflowPolicy,
+    PeriodicTimer,
+)
+from src.actors.messages.message_type import (
+    ActorMessage,
+    ActorMessageType,
+    ActorName,
+    ForceHeartbeatPayload,
+    HeartbeatStatusPayload,
+    ImmediateUploadTriggerPayload,
+    SetValueToPointResponsePayload,
+)
+
+
+def force_heartbeat_message() -> ActorMessage:
+    return ActorMessage(
+        sender=ActorName.BACNET,
+        receiver=ActorName.HEARTBEAT,
+        message_type=ActorMessageType.FORCE_HEARTBEAT_REQUEST,
+        payload=ForceHeartbeatPayload(reason="test"),
+    )
+
+
+def trigger_message(reason: str) -> ActorMessage:
+    return ActorMessage(
+        sender=ActorName.BACNET_WRITER,
+        receiver=ActorName.UPLOADER,
+        message_type=ActorMessageType.IMMEDIATE_UPLOAD_TRIGGER,
+        payload=ImmediateUploadTriggerPayload(reason=reason),
+    )
+
+
+def heartbeat_status_message() -> ActorMessage:
+    return ActorMessage(
+        sender=ActorName.HEARTBEAT,
+        receiver=ActorName.MQTT,
+        message_type=ActorMessageType.HEARTBEAT_STATUS,
+        payload=HeartbeatStatusPayload(),
+    )
+
+
+def set_value_response_message() -> ActorMessage:
+    return ActorMessage(
+        sender=ActorName.BACNET_WRITER,
+        receiver=ActorName.MQTT,
+        message_type=ActorMessageType.SET_VALUE_TO_POINT_RESPONSE,
+        payload=SetValueToPointResponsePayload(
+            success=True, message="ok", commandId="cmd-1"
+        ),
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMailbox:
+    """Test awaiting messages instead of polling"""
+
+    @pytest.mark.asyncio
+    async def test_receive_wakes_on_send(self):
+        """Test: A waiting receiver gets the message without polling"""
+        mailbox = Mailbox()
+        message = force_heartbeat_message()
+
+        receiver = asyncio.create_task(mailbox.receive())
+        await asyncio.sleep(0)
+        mailbox.put_nowait(message)
+
+        assert await asyncio.wait_for(receiver, timeout=1) is message
+
+    @pytest.mark.asyncio
+    async def test_receive_times_out_with_none(self):
+        """Test: No message within the timeout returns None"""
+        mailbox = Mailbox()
+
+        assert await mailbox.receive(timeout=0.01) is None
+        assert await mailbox.receive(timeout=0) is None
+
+    @pytest.mark.asyncio
+    async def test_drain_nowait_returns_waiting_messages_in_order(self):
+        """Test: Pending messages are drained oldest first"""
+        mailbox = Mailbox()
+        messages = [force_heartbeat_message() for _ in range(3)]
+        for message in messages:
+            mailbox.put_nowait(message)
+
+        assert mailbox.drain_nowait() == messages
+        assert mailbox.drain_nowait() == []
+
+    def test_registry_hands_out_mailboxes(self):
+        """Test: get_queue and get_mailbox return the same mailbox"""
+        registry = ActorQueueRegistry()
+        registry.register(ActorName.HEARTBEAT)
+
+        mailbox = registry.get_mailbox(ActorName.HEARTBEAT)
+
+        assert isinstance(mailbox, Mailbox)
+        assert registry.get_queue(ActorName.HEARTBEAT) is mailbox
+
+
+class TestBoundedMailbox:
+    """Test capacity, overflow policies and coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_room(self):
+        """Test: A full mailbox makes the sender wait until a message is taken"""
+        mailbox = Mailbox(maxsize=1)
+        await mailbox.put(trigger_message("first"))
+
+        sender = asyncio.create_task(mailbox.put(trigger_message("second")))
+        await asyncio.sleep(0.01)
+        assert not sender.done()
+
+        await mailbox.receive()
+        await asyncio.wait_for(sender, timeout=1)
+        assert mailbox.get_nowait().payload.reason == "second"
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy_never_blocks(self):
+        """Test: The oldest waiting message is dropped to make room"""
+        mailbox = Mailbox(maxsize=2, overflow=OverflowPolicy.DROP_OLDEST)
+        for reason in ["a", "b", "c"]:
+            await mailbox.put(trigger_message(reason))
+
+        assert [m.payload.reason for m in mailbox.drain_nowait()] == ["b", "c"]
+        assert mailbox.stats()["dropped"] == 1
+        assert mailbox.stats()["high_water"] == 2
+
+    @pytest.mark.asyncio
+    async def test_coalesced_type_keeps_latest_in_place(self):
+        """Test: A newer message replaces a waiting one of the same type"""
+        mailbox = Mailbox(
+            maxsize=2, coalesce_types=[ActorMessageType.IMMEDIATE_UPLOAD_TRIGGER]
+        )
+        other = force_heartbeat_message()
+        await mailbox.put(trigger_message("old"))
+        await mailbox.put(other)
+        # Replaces the waiting trigger, so it needs no room
+        await asyncio.wait_for(mailbox.put(trigger_message("new")), timeout=1)
+
+        messages = mailbox.drain_nowait()
+        assert len(messages) == 2 and other in messages
+        assert messages[1].payload.reason == "new"
+        assert mailbox.stats()["coalesced"] == 1
+
+    def test_registry_capacity_from_settings(self):
+        """Test: Mailboxes are bounded by default"""
+        registry = ActorQueueRegistry()
+        with patch("src.config.settings.settings.ACTOR_MAILBOX_CAPACITY", 7):
+            registry.register(ActorName.MQTT)
+
+        assert registry.get_mailbox(ActorName.MQTT).maxsize == 7
+        assert registry.get_mailbox_depths() == {"MQTT": 0}
+        assert registry.get_mailbox_stats()["MQTT"]["capacity"] == 7
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_one_immutable_message(self):
+        """Test: Every receiver gets the same instance; BROADCAST is skipped"""
+        registry = ActorQueueRegistry()
+        for name in [ActorName.MQTT, ActorName.UPLOADER, ActorName.BROADCAST]:
+            registry.register(name)
+
+        await registry.broadcast_from(
+            sender=ActorName.BACNET,
+            type=ActorMessageType.FORCE_HEARTBEAT_REQUEST,
+            payload=ForceHeartbeatPayload(reason="test"),
+        )
+
+        mqtt_message = registry.get_mailbox(ActorName.MQTT).get_nowait()
+        assert registry.get_mailbox(ActorName.UPLOADER).get_nowait() is mqtt_message
+        assert mqtt_message.receiver == ActorName.BROADCAST
+        assert registry.get_mailbox(ActorName.BROADCAST).empty()
+        with pytest.raises(Exception):
+            mqtt_message.receiver = ActorName.MQTT
+
+
+class TestPriorityMailbox:
+    """Test that interactive messages overtake bulk traffic"""
+
+    def test_interactive_overtakes_bulk_backlog(self):
+        """Test: A write response is received before waiting heartbeats"""
+        mailbox = Mailbox()
+        backlog = [heartbeat_status_message() for _ in range(3)]
+        for message in backlog:
+            mailbox.put_nowait(message)
+        trigger = trigger_message("normal")
+        response = set_value_response_message()
+        mailbox.put_nowait(trigger)
+        mailbox.put_nowait(response)
+
+        assert mailbox.qsize() == 5
+        assert mailbox.drain_nowait() == [response, trigger, *backlog]
+        assert mailbox.empty()
+
+    def test_queue_time_recorded_per_class(self):
+        """Test: Time spent waiting is measured from send to receive"""
+        clock = FakeClock()
+        mailbox = Mailbox(clock=clock)
+        mailbox.put_nowait(heartbeat_status_message())
+        clock.now += 0.5
+        mailbox.put_nowait(set_value_response_message())
+        clock.now += 0.1
+
+        mailbox.drain_nowait()
+
+        queue_time = mailbox.stats()["queue_time"]
+        assert queue_time["INTERACTIVE"]["max_ms"] == pytest.approx(100)
+        assert queue_time["BULK"]["mean_ms"] == pytest.approx(600)
+        assert queue_time["NORMAL"]["count"] == 0
+
+    def test_full_drop_oldest_drops_bulk_first(self):
+        """Test: Overflow discards bulk traffic before commands"""
+        mailbox = Mailbox(maxsize=2, overflow=OverflowPolicy.DROP_OLDEST)
+        response = set_value_response_message()
+        mailbox.put_nowait(response)
+        mailbox.put_nowait(heartbeat_status_message())
+        trigger = trigger_message("new")
+        mailbox.put_nowait(trigger)
+
+        assert mailbox.drain_nowait() == [response, trigger]
+
+    @pytest.mark.asyncio
+    async def test_waiting_receiver_gets_message_of_any_class(self):
+        """Test: Lanes do not change how a waiting receiver is woken"""
+        mailbox = Mailbox()
+        receiver = asyncio.create_task(mailbox.receive())
+        await asyncio.sleep(0)
+
+        message = heartbeat_status_message()
+        await mailbox.put(message)
+
+        assert await asyncio.wait_for(receiver, timeout=1) is message
+        assert mailbox.priority_of(message) == MessagePriority.BULK
+
+
+class TestPeriodicTimer:
+    """Test timer deadlines used as receive timeouts"""
+
+    def test_due_remaining_and_reset(self):
+        """Test: The timer starts due and counts down after reset"""
+        clock = FakeClock()
+        timer = PeriodicTimer(30, clock=clock)
+
+        assert timer.due() and timer.remaining() == 0
+
+        timer.reset()
+        clock.now += 10
+        assert not timer.due()
+        assert timer.remaining() == 20
+
+        clock.now += 20
+        assert timer.due()
+
+    def test_start_not_due(self):
+        """Test: start_due=False waits one interval first"""
+        timer = PeriodicTimer(5, start_due=False, clock=FakeClock())
+
+        assert timer.remaining() == 5
+
+
+class TestActorLoops:
+    """Test that actors react to messages without waiting for a poll"""
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_actor_handles_force_between_heartbeats(self):
+        """Test: A forced heartbeat is sent at once, not on the next poll"""
+        registry = ActorQueueRegistry()
+        registry.register(ActorName.HEARTBEAT)
+        actor = HeartbeatActor(registry, "org", "site", "device")
+
+        with (
+            patch.object(actor, "_send_heartbeat", new_callable=AsyncMock) as send,
+            patch.object(actor, "_force_heartbeat", new_callable=AsyncMock) as force,
+        ):
+            loop_task = asyncio.create_task(actor._run_heartbeat_loop())
+            try:
+                await asyncio.sleep(0.01)
+                await registry.send(force_heartbeat_message())
+                await asyncio.sleep(0.01)
+            finally:
+                loop_task.cancel()
+
+        send.assert_awaited_once()  # the first heartbeat, then sleeps 30 s
+        force.assert_awaited_once_with("test")
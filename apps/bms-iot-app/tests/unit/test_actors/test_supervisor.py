@@ -0,0 +1,154 @@
+"""
+Test actor supervision.
+
+User Story: As an operator, I want transient actor faults to recover quickly without restarting the whole gateway
+"""
+
+import asyncio
+import itertools
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import DefaultDict
+
+import pytest
+
+from src.actors.supervisor import RestartStrategy, Supervisor
+
+# Upper bound on waiting for an event; only reached if the supervisor hangs
+EVENT_TIMEOUT = 5
+
+
+def make_supervisor(max_restarts: int = 3, window_seconds: float = 60) -> Supervisor:
+    # No backoff, and a clock that advances one second per read
+    return Supervisor(
+        max_restarts=max_restarts,
+        window_seconds=window_seconds,
+        initial_delay=0,
+        max_delay=0,
+        clock=itertools.count().__next__,
+    )
+
+
+class FakeActor:
+    """Crashes on its first `crash_times` starts, then runs until cancelled"""
+
+    def __init__(self, crash_times: int = 0):
+        self.crash_times = crash_times
+        self.starts = 0
+        self.cancelled = 0
+        self._started: DefaultDict[int, asyncio.Event] = defaultdict(asyncio.Event)
+
+    def started(self, start: int) -> asyncio.Event:
+        """Set once the actor has been started `start` times and is running"""
+        return self._started[start]
+
+    async def start(self):
+        self.starts += 1
+        if self.starts <= self.crash_times:
+            await asyncio.sleep(0)
+            raise RuntimeError(f"crash {self.starts}")
+        self._started[self.starts].set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+async def wait_started(actor: FakeActor, start: int) -> None:
+    await asyncio.wait_for(actor.started(start).wait(), EVENT_TIMEOUT)
+
+
+@asynccontextmanager
+async def running(supervisor: Supervisor):
+    task = asyncio.create_task(supervisor.run())
+    try:
+        yield task
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestRestarts:
+    """Test restart strategies"""
+
+    @pytest.mark.asyncio
+    async def test_one_for_one_restarts_only_crashed_child(self):
+        """Test: A crash restarts that actor alone and records recovery time"""
+        supervisor = make_supervisor()
+        flaky, steady = FakeActor(crash_times=2), FakeActor()
+        supervisor.add("flaky", flaky.start)
+        supervisor.add("steady", steady.start)
+
+        async with running(supervisor):
+            await wait_started(flaky, 3)
+            await wait_started(steady, 1)
+
+        stats = supervisor.get_stats()
+        assert (flaky.starts, steady.starts) == (3, 1)
+        assert stats["flaky"]["crashes"] == 2
+        # One clock read at the crash, the next at the restart
+        assert stats["flaky"]["last_recovery_seconds"] == 1
+        assert stats["steady"]["crashes"] == 0
+        assert supervisor.get_crash_counts() == {"flaky": 2, "steady": 0}
+
+    @pytest.mark.asyncio
+    async def test_restart_dependents(self):
+        """Test: Dependents restart after the crashed child is back"""
+        supervisor = make_supervisor()
+        provider, dependent, other = FakeActor(crash_times=1), FakeActor(), FakeActor()
+        supervisor.add(
+            "provider",
+            provider.start,
+            strategy=RestartStrategy.RESTART_DEPENDENTS,
+            dependents=["dependent"],
+        )
+        supervisor.add("dependent", dependent.start)
+        supervisor.add("other", other.start)
+
+        async with running(supervisor):
+            await wait_started(provider, 2)
+            await wait_started(dependent, 2)
+            await wait_started(other, 1)
+
+        stats = supervisor.get_stats()
+        assert dependent.starts == 2
+        assert stats["dependent"]["dependency_restarts"] == 1
+        assert stats["dependent"]["crashes"] == 0
+        assert other.starts == 1
+
+
+class TestCrashBudget:
+    """Test the sliding-window crash budget"""
+
+    @pytest.mark.asyncio
+    async def test_crash_loop_escalates(self):
+        """Test: Too many crashes in the window stop the supervisor"""
+        supervisor = make_supervisor(max_restarts=2)
+        looping, steady = FakeActor(crash_times=100), FakeActor()
+        supervisor.add("looping", looping.start)
+        supervisor.add("steady", steady.start)
+
+        with pytest.raises(RuntimeError, match="crash 3"):
+            await asyncio.wait_for(supervisor.run(), EVENT_TIMEOUT)
+
+        assert steady.cancelled == 1
+
+    def test_old_crashes_leave_window_and_reset_backoff(self):
+        """Test: Crashes outside the window do not count; backoff starts over"""
+        supervisor = make_supervisor(max_restarts=2, window_seconds=10)
+        supervisor.add("actor", FakeActor().start)
+        child = supervisor._children["actor"]
+        error = RuntimeError("boom")
+
+        supervisor._on_crash(child, 0, error)
+        supervisor._on_crash(child, 1, error)
+        assert child.backoff.attempts == 2
+
+        supervisor._on_crash(child, 20, error)
+        assert child.backoff.attempts == 1
+        assert supervisor.get_stats()["actor"]["crashes_in_window"] == 1
+
+        supervisor._on_crash(child, 21, error)
+        with pytest.raises(RuntimeError):
+            supervisor._on_crash(child, 22, error)
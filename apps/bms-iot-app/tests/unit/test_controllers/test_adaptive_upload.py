@@ -0,0 +1,211 @@
+"""
+Test the adaptive-batch point uploader.
+
+User Story: As an operator, I want upload capacity to follow the broker link instead of a fixed batch size
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.message_type import (
+    ActorMessageType,
+    ActorName,
+)
+from src.actors.uploader_actor import UploaderActor
+from src.controllers.uploader.adaptive_batch import (
+    AdaptiveBatchSizer,
+    DrainRateMeter,
+)
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import (
+    ControllerPointsModel,
+    bulk_insert_controller_points,
+)
+
+
+def make_point(index: int) -> ControllerPointsModel:
+    return ControllerPointsModel(
+        controller_ip_address="192.168.1.100",
+        bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+        point_id=index,
+        iot_device_point_id=f"upload-{index}",
+        controller_id="upload-controller",
+        controller_device_id="device_1",
+        present_value=str(float(index)),
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def make_uploader() -> tuple[ActorQueueRegistry, UploaderActor]:
+    registry = ActorQueueRegistry()
+    registry.register(ActorName.UPLOADER)
+    registry.register(ActorName.MQTT)
+    return registry, UploaderActor(registry)
+
+
+def drain_mqtt_queue(registry: ActorQueueRegistry) -> list:
+    queue = registry.get_queue(ActorName.MQTT)
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+class TestAdaptiveBatchSizer:
+    """Test batch sizing from payload size and publish latency"""
+
+    def test_fast_full_batches_grow_until_payload_cap(self):
+        """Test: Quick acknowledgements grow the batch, bounded by target bytes"""
+        sizer = AdaptiveBatchSizer(
+            target_payload_bytes=100_000,
+            target_latency_seconds=1.0,
+            max_batch_points=10_000,
+        )
+        sizer.record_point_bytes(200)
+
+        for _ in range(10):
+            requested = sizer.next_batch_size
+            sizer.record_ack(requested, requested, latency_seconds=0.01)
+
+        assert sizer.next_batch_size == 500
+
+    def test_partial_batches_do_not_grow(self):
+        """Test: A short backlog says nothing about spare capacity"""
+        sizer = AdaptiveBatchSizer(target_latency_seconds=1.0)
+        before = sizer.next_batch_size
+
+        sizer.record_ack(5, before, latency_seconds=0.01)
+
+        assert sizer.next_batch_size == before
+
+    def test_slow_acknowledgements_and_timeouts_shrink(self):
+        """Test: Latency above target and lost responses reduce the batch"""
+        sizer = AdaptiveBatchSizer(target_latency_seconds=1.0)
+        before = sizer.next_batch_size
+
+        sizer.record_ack(before, before, latency_seconds=4.0)
+        slowed = sizer.next_batch_size
+        sizer.record_timeout()
+
+        assert slowed == before // 2
+        assert sizer.next_batch_size == slowed // 2
+
+
+class TestDrainRateMeter:
+    """Test the sliding-window drain rate"""
+
+    def test_rate_covers_window_only(self):
+        """Test: Old acknowledgements fall out of the rate but not the total"""
+        meter = DrainRateMeter(window_seconds=10)
+        meter.record(100, now=0.0)
+        meter.record(50, now=5.0)
+
+        assert meter.rate(now=6.0) == 15.0
+        assert meter.rate(now=12.0) == 5.0
+        assert meter.total_points == 150
+
+
+class TestUploaderActorDrain:
+    """Test continuous draining of the outbox"""
+
+    @pytest.mark.asyncio
+    async def test_backlog_drains_without_idle_sleeps(self, cleanup_database):
+        """Test: Each acknowledgement immediately triggers the next batch"""
+        await bulk_insert_controller_points([make_point(i) for i in range(25)])
+
+        registry, uploader = make_uploader()
+        uploader.batch_sizer = AdaptiveBatchSizer(
+            max_batch_points=10, min_batch_points=10
+        )
+        uploader.IDLE_POLL_SECONDS = 60
+
+        async def fake_mqtt():
+            mqtt_queue = registry.get_queue(ActorName.MQTT)
+            while True:
+                message = await mqtt_queue.get()
+                assert message.message_type == ActorMessageType.POINT_PUBLISH_REQUEST
+                await registry.send_from(
+                    sender=ActorName.MQTT,
+                    receiver=ActorName.UPLOADER,
+                    type=ActorMessageType.POINT_PUBLISH_RESPONSE,
+                    payload=message.payload,
+                )
+
+        mqtt_task = asyncio.create_task(fake_mqtt())
+        uploader_task = asyncio.create_task(uploader.start())
+        try:
+            for _ in range(100):
+                stats = await uploader.get_stats()
+                if stats["backlog_points"] == 0:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            uploader.keep_running = False
+            uploader_task.cancel()
+            mqtt_task.cancel()
+
+        assert stats["backlog_points"] == 0
+        assert stats["batch_size"] == 10
+        assert uploader.drain_rate_meter.total_points >= 25
+
+    @pytest.mark.asyncio
+    async def test_window_sends_disjoint_batches(self, cleanup_database):
+        """Test: Unacknowledged batches fill the window without overlapping rows"""
+        await bulk_insert_controller_points([make_point(i) for i in range(25)])
+        registry, uploader = make_uploader()
+        uploader.batch_sizer = AdaptiveBatchSizer(
+            max_batch_points=10, min_batch_points=10
+        )
+        uploader.inflight_window = 2
+
+        await uploader._fill_window()
+
+        requests = drain_mqtt_queue(registry)
+        assert len(requests) == 2
+        first, second = (
+            {point.id for point in request.payload.points} for request in requests
+        )
+        assert len(first) == len(second) == 10
+        assert not first & second
+        assert uploader._wait_timeout() > uploader.IDLE_POLL_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_batch_is_resent(self):
+        """Test: A batch stays in flight and is resent until the broker acknowledges it"""
+        registry, uploader = make_uploader()
+        uploader.ack_timeout_seconds = 0
+
+        with (
+            patch(
+                "src.actors.uploader_actor.get_points_to_publish",
+                new_callable=AsyncMock,
+                return_value=[make_point(1)],
+            ),
+            patch(
+                "src.actors.uploader_actor.mark_points_as_uploaded_in_db",
+                new_callable=AsyncMock,
+            ) as mock_mark,
+        ):
+            before = uploader.batch_sizer.next_batch_size
+            assert await uploader.publish_points() == 1
+            assert uploader._wait_timeout() == 0
+
+            await uploader._resend_overdue()
+            first, resent = drain_mqtt_queue(registry)
+            assert first.payload.batch_id == resent.payload.batch_id
+
+            # A negative acknowledgement keeps the rows pending
+            await uploader.on_point_publish_response(
+                resent.payload.model_copy(update={"success": False})
+            )
+            mock_mark.assert_not_called()
+            assert uploader.batch_sizer.next_batch_size < before
+            assert len(uploader._in_flight) == 1
+
+            await uploader.on_point_publish_response(resent.payload)
+            mock_mark.assert_called_once()
+            assert uploader._in_flight == {}
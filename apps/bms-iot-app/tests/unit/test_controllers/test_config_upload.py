@@ -0,0 +1,294 @@
+"""
+Test chunked, resumable config uploads.
+
+User Story: As an operator of a large site, I want config uploads to succeed in bounded-size requests
+"""
+
+import gzip
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.message_type import (
+    ActorName,
+    ConfigUploadPayload,
+    ConfigUploadProgress,
+    ConfigUploadResponsePayload,
+)
+from src.actors.uploader_actor import UploaderActor
+from src.controllers.uploader.upload import (
+    count_config_chunks,
+    iter_config_chunks,
+    upload_config,
+)
+from src.models.bacnet_config import (
+    BacnetDeviceInfo,
+    BacnetObjectInfo,
+    count_bacnet_config_objects,
+    get_latest_bacnet_config_controllers,
+    insert_bacnet_config_json,
+)
+from src.network.rest_client import RestClient
+
+UPLOAD_URL = "https://example.com/upload"
+STARTED_AT = "2024-01-01T00:00:00.000Z"
+
+
+def make_device(controller_id: str, object_count: int) -> BacnetDeviceInfo:
+    return BacnetDeviceInfo(
+        vendor_id=7,
+        device_id=1000 + object_count,
+        controller_ip_address="192.168.1.10",
+        controller_id=controller_id,
+        object_list=[
+            BacnetObjectInfo(
+                type="analogInput",
+                point_id=i,
+                iot_device_point_id=f"{controller_id}-point-{i}",
+                properties={"units": "degreesCelsius", "presentValue": float(i)},
+            )
+            for i in range(object_count)
+        ],
+    )
+
+
+class ChunkServer:
+    """Acknowledges chunks like the designer webhook; can fail some attempts"""
+
+    def __init__(self, fail_attempts: int = 0, fail_sequence: int = 1):
+        self.fail_attempts = fail_attempts
+        self.fail_sequence = fail_sequence
+        self.requests: list[httpx.Request] = []
+        self.bodies: list[dict] = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(gzip.decompress(await request.aread()))
+        self.requests.append(request)
+        self.bodies.append(body)
+        upload = body["upload"]
+        if upload["sequence"] == self.fail_sequence and self.fail_attempts:
+            self.fail_attempts -= 1
+            return httpx.Response(503)
+        ack = {
+            "id": upload["id"],
+            "sequence": upload["sequence"],
+            "startedAt": upload.get("startedAt", STARTED_AT),
+        }
+        return httpx.Response(200, json={"success": True, "data": {"upload": ack}})
+
+
+@pytest.fixture
+def chunk_server():
+    server = ChunkServer()
+    rest_client = RestClient()
+    rest_client._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(server.handle)
+    )
+    with (
+        patch(
+            "src.controllers.uploader.upload.get_shared_rest_client",
+            new_callable=AsyncMock,
+            return_value=rest_client,
+        ),
+        patch("src.controllers.uploader.upload.asyncio.sleep", new_callable=AsyncMock),
+        patch("src.config.settings.settings.CONFIG_UPLOAD_GZIP", True),
+        patch("src.config.settings.settings.CONFIG_UPLOAD_CHUNK_POINTS", 2),
+        patch("src.config.settings.settings.CONFIG_UPLOAD_CHUNK_RETRIES", 2),
+    ):
+        yield server
+
+
+def make_uploader() -> tuple[UploaderActor, ActorQueueRegistry]:
+    registry = ActorQueueRegistry()
+    registry.register(ActorName.UPLOADER)
+    registry.register(ActorName.MQTT)
+    return UploaderActor(registry), registry
+
+
+def upload_request(correlation_data=None) -> ConfigUploadPayload:
+    return ConfigUploadPayload(
+        urlToUploadConfig=UPLOAD_URL,
+        jwtToken="jwt",
+        iotDeviceControllers=[],
+        correlationData=correlation_data,
+    )
+
+
+class TestConfigChunks:
+    """Test how the stored config is split into chunks"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_page_controllers_in_order(self, cleanup_database):
+        """Test: Large controllers span chunks; empty ones still get one"""
+        await insert_bacnet_config_json(
+            [make_device("ctrl-a", 5), make_device("ctrl-empty", 0)]
+        )
+        controllers = await get_latest_bacnet_config_controllers()
+        counts = await count_bacnet_config_objects(controllers[0].config_version)
+
+        chunks = [chunk async for chunk in iter_config_chunks(controllers, counts, 2)]
+
+        assert counts == {"ctrl-a": 5}
+        assert [chunk.sequence for chunk in chunks] == [0, 1, 2, 3]
+        assert [
+            (chunk.controller.controller_id, len(chunk.objects), chunk.complete)
+            for chunk in chunks
+        ] == [
+            ("ctrl-a", 2, False),
+            ("ctrl-a", 2, False),
+            ("ctrl-a", 1, True),
+            ("ctrl-empty", 0, True),
+        ]
+        assert [obj.point_id for chunk in chunks for obj in chunk.objects] == list(
+            range(5)
+        )
+        assert count_config_chunks(5, 2) + count_config_chunks(0, 2) == len(chunks)
+
+
+class TestUploadConfig:
+    """Test the requests sent by upload_config"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_carry_session_and_sequence(
+        self, cleanup_database, chunk_server
+    ):
+        """Test: Every chunk is gzip, authenticated and tagged with the upload"""
+        await insert_bacnet_config_json([make_device("ctrl-a", 3)])
+        on_progress = AsyncMock()
+
+        progress = await upload_config(UPLOAD_URL, "jwt", on_progress=on_progress)
+
+        assert progress.chunksUploaded == progress.totalChunks == 2
+        assert progress.pointsUploaded == progress.totalPoints == 3
+        uploads = [body["upload"] for body in chunk_server.bodies]
+        assert [upload["sequence"] for upload in uploads] == [0, 1]
+        assert {upload["id"] for upload in uploads} == {progress.uploadId}
+        assert "startedAt" not in uploads[0]
+        assert uploads[1]["startedAt"] == STARTED_AT
+        assert [body["config"][0]["complete"] for body in chunk_server.bodies] == [
+            False,
+            True,
+        ]
+        for request in chunk_server.requests:
+            assert request.headers["content-encoding"] == "gzip"
+            assert request.headers["authorization"] == "Bearer jwt"
+        # The last chunk is reported by the final response, not as progress
+        on_progress.assert_awaited_once()
+        assert on_progress.await_args[0][0].chunksUploaded == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_resumes_without_resending_earlier_ones(
+        self, cleanup_database, chunk_server
+    ):
+        """Test: A failing chunk is retried on its own"""
+        await insert_bacnet_config_json([make_device("ctrl-a", 5)])
+        chunk_server.fail_attempts = 2
+
+        progress = await upload_config(UPLOAD_URL, "jwt")
+
+        sequences = [body["upload"]["sequence"] for body in chunk_server.bodies]
+        assert sequences == [0, 1, 1, 1, 2]
+        assert progress.chunksUploaded == progress.totalChunks == 3
+
+    @pytest.mark.asyncio
+    async def test_upload_stops_when_retries_run_out(
+        self, cleanup_database, chunk_server
+    ):
+        """Test: Later chunks are not sent once a chunk exhausts its retries"""
+        await insert_bacnet_config_json([make_device("ctrl-a", 5)])
+        chunk_server.fail_attempts = 10
+
+        progress = await upload_config(UPLOAD_URL, "jwt")
+
+        sequences = [body["upload"]["sequence"] for body in chunk_server.bodies]
+        assert sequences == [0, 1, 1, 1]
+        assert (progress.chunksUploaded, progress.totalChunks) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_no_config_skips_upload(self, cleanup_database, chunk_server):
+        """Test: Nothing is posted without a stored config"""
+        assert await upload_config(UPLOAD_URL, "jwt") is None
+        assert chunk_server.requests == []
+
+
+class TestUploaderConfigResponses:
+    """Test CONFIG_UPLOAD_RESPONSE messages sent by the uploader"""
+
+    @pytest.mark.asyncio
+    async def test_progress_then_final_response(self):
+        """Test: Progress responses precede the final one, all correlated"""
+        uploader, registry = make_uploader()
+        final = ConfigUploadProgress(
+            uploadId="u1",
+            chunksUploaded=2,
+            totalChunks=2,
+            pointsUploaded=3,
+            totalPoints=3,
+        )
+
+        async def fake_upload(url, jwt_token, on_progress):
+            await on_progress(final.model_copy(update={"chunksUploaded": 1}))
+            return final
+
+        with patch("src.actors.uploader_actor.upload_config", side_effect=fake_upload):
+            await uploader.on_upload_request(upload_request(b"corr"))
+            await uploader._config_upload_task
+
+        queue = registry.get_queue(ActorName.MQTT)
+        responses = [queue.get_nowait().payload, queue.get_nowait().payload]
+        assert [(r.success, r.inProgress) for r in responses] == [
+            (True, True),
+            (True, False),
+        ]
+        assert responses[0].progress.chunksUploaded == 1
+        assert {r.correlationData for r in responses} == {b"corr"}
+
+    @pytest.mark.asyncio
+    async def test_incomplete_upload_reports_failure(self):
+        """Test: Running out of retries is reported, not hidden"""
+        uploader, registry = make_uploader()
+        partial = ConfigUploadProgress(
+            uploadId="u1",
+            chunksUploaded=1,
+            totalChunks=3,
+            pointsUploaded=2,
+            totalPoints=5,
+        )
+
+        with patch(
+            "src.actors.uploader_actor.upload_config",
+            new_callable=AsyncMock,
+            return_value=partial,
+        ):
+            await uploader.on_upload_request(upload_request())
+            await uploader._config_upload_task
+
+        response = registry.get_queue(ActorName.MQTT).get_nowait().payload
+        assert response.success is False
+        assert response.model_dump(mode="json")["progress"]["chunksUploaded"] == 1
+
+    def test_plain_response_keeps_wire_format(self):
+        """Test: Responses without progress serialize as before"""
+        assert ConfigUploadResponsePayload(success=True).model_dump() == {
+            "success": True
+        }
+
+
+class TestPooledRestClient:
+    """Test the long-lived client"""
+
+    @pytest.mark.asyncio
+    async def test_open_is_idempotent_and_http2_falls_back(self):
+        """Test: One pool is reused; HTTP/2 without h2 degrades to HTTP/1.1"""
+        client = RestClient(http2=True)
+
+        await client.open()
+        pool = client._client
+        await client.open()
+
+        assert pool is not None and client._client is pool
+        await client.close()
+        assert client._client is None
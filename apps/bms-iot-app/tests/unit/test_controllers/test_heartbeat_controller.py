@@ -64,7 +64,7 @@ class TestHeartbeatController:
         mock_status_record.bacnet_points_monitored = 125
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = mock_status_record
 
@@ -91,7 +91,7 @@ class TestHeartbeatController:
     async def test_collect_heartbeat_data_with_no_status_record(self):
         """Test: Heartbeat data collection when no database record exists"""
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = None
 
@@ -107,11 +107,79 @@ class TestHeartbeatController:
             assert result.monitoring_status is None
             assert result.mqtt_connection_status is None
 
+    @pytest.mark.asyncio
+    async def test_collect_heartbeat_data_includes_outbox_stats(self):
+        """Test: Heartbeat carries outbox depth and database size"""
+        outbox_stats = {
+            "pending_points": 1200,
+            "pending_manual_writes": 2,
+            "oldest_pending_age_seconds": 3600.0,
+            "database_size_bytes": 4096000,
+        }
+        with (
+            patch(
+                "src.controllers.heartbeat_controller.heartbeat.device_status_service.get",
+                return_value=None,
+            ),
+            patch(
+                "src.controllers.heartbeat_controller.heartbeat.get_outbox_stats",
+                return_value=outbox_stats,
+            ),
+        ):
+            result = await self.controller.collect_heartbeat_data()
+
+            assert result.outbox_pending_points == 1200
+            assert result.outbox_oldest_age_seconds == 3600.0
+            assert result.database_size_bytes == 4096000
+
+    @pytest.mark.asyncio
+    async def test_collect_heartbeat_data_includes_database_stats(self):
+        """Test: Heartbeat carries WAL and freelist sizes"""
+        database_stats = {
+            "database_bytes": 4096000,
+            "wal_bytes": 8192,
+            "freelist_pages": 3,
+            "freelist_bytes": 12288,
+        }
+        with (
+            patch(
+                "src.controllers.heartbeat_controller.heartbeat.device_status_service.get",
+                return_value=None,
+            ),
+            patch(
+                "src.controllers.heartbeat_controller.heartbeat.get_database_stats",
+                return_value=database_stats,
+            ),
+        ):
+            result = await self.controller.collect_heartbeat_data()
+
+            assert result.database_wal_bytes == 8192
+            assert result.database_freelist_bytes == 12288
+
+    @pytest.mark.asyncio
+    async def test_collect_heartbeat_data_survives_outbox_stats_error(self):
+        """Test: Outbox stats failures do not break the heartbeat"""
+        with (
+            patch(
+                "src.controllers.heartbeat_controller.heartbeat.device_status_service.get",
+                return_value=None,
+            ),
+            patch(
+                "src.controllers.heartbeat_controller.heartbeat.get_outbox_stats",
+                side_effect=Exception("database is locked"),
+            ),
+        ):
+            result = await self.controller.collect_heartbeat_data()
+
+            assert isinstance(result, HeartbeatStatusPayload)
+            assert result.mqtt_connection_status is None  # Not the error fallback
+            assert result.outbox_pending_points is None
+
     @pytest.mark.asyncio
     async def test_collect_heartbeat_data_with_database_error(self):
         """Test: Heartbeat data collection handles database errors gracefully"""
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.side_effect = Exception("Database connection error")
 
@@ -143,7 +211,7 @@ class TestHeartbeatController:
         mock_status_record.bacnet_points_monitored = 0
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = mock_status_record
 
@@ -250,7 +318,7 @@ class TestHeartbeatControllerIntegration:
         mock_status_record.bacnet_points_monitored = 250
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = mock_status_record
 
@@ -310,7 +378,7 @@ class TestHeartbeatControllerIntegration:
             mock_status.bacnet_points_monitored = len(device_id) * 10
 
             with patch(
-                "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+                "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
             ) as mock_get_status:
                 mock_get_status.return_value = mock_status
 
@@ -340,7 +408,7 @@ class TestHeartbeatControllerIntegration:
         mock_status.bacnet_points_monitored = 50
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = mock_status
 
@@ -376,7 +444,7 @@ class TestHeartbeatControllerErrorScenarios:
     async def test_database_timeout_error(self):
         """Test: HeartbeatController handles database timeout errors"""
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.side_effect = asyncio.TimeoutError("Database query timeout")
 
@@ -391,7 +459,7 @@ class TestHeartbeatControllerErrorScenarios:
     async def test_database_connection_error(self):
         """Test: HeartbeatController handles database connection errors"""
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.side_effect = ConnectionError(
                 "Failed to connect to database"
@@ -416,7 +484,7 @@ class TestHeartbeatControllerErrorScenarios:
         mock_status_record.bacnet_devices_connected = -1  # Negative value
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = mock_status_record
 
@@ -436,7 +504,7 @@ class TestHeartbeatControllerErrorScenarios:
         controller = HeartbeatController("org", "site", "")
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = None
 
@@ -467,7 +535,7 @@ class TestHeartbeatControllerErrorScenarios:
         mock_status_record.bacnet_points_monitored = None
 
         with patch(
-            "src.controllers.heartbeat_controller.heartbeat.get_latest_iot_device_status"
+            "src.controllers.heartbeat_controller.heartbeat.device_status_service.get"
         ) as mock_get_status:
             mock_get_status.return_value = mock_status_record
 
@@ -0,0 +1,106 @@
+"""
+Test the batch serializer used by publish_point_bulk.
+
+It must produce exactly what ControllerPointDTO.from_model(...).model_dump() does.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.dto import ControllerPointDTO
+from src.dto.controller_point_serializer import (
+    encode_point_json,
+    encode_points_json,
+    serialize_points,
+)
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import ControllerPointsModel
+
+FULL_PROPERTIES = {
+    "status_flags": "[0, 1, 0, 1]",
+    "priority_array": json.dumps([None] * 8 + [50] + [None] * 7),
+    "limit_enable": json.dumps({"lowLimitEnable": True, "highLimitEnable": False}),
+    "event_enable": json.dumps(
+        {"toFault": True, "toNormal": True, "toOffnormal": False}
+    ),
+    "acked_transitions": json.dumps(
+        {"toFault": False, "toNormal": True, "toOffnormal": True}
+    ),
+    "event_time_stamps": json.dumps(["2024-01-01T10:00:00Z", None, None]),
+    "event_message_texts": json.dumps(["High", "Normal", "Low"]),
+    "event_message_texts_config": json.dumps(["", "", ""]),
+    "event_algorithm_inhibit_ref": json.dumps(
+        {"objectIdentifier": "analogInput:1", "propertyIdentifier": "presentValue"}
+    ),
+    "high_limit": 30.0,
+    "time_delay": 5,
+    "out_of_service": False,
+    "error_info": "timeout",
+}
+
+
+def make_point(**overrides) -> ControllerPointsModel:
+    fields = {
+        "id": 7,
+        "controller_ip_address": "192.168.1.100",
+        "bacnet_object_type": BacnetObjectTypeEnum.ANALOG_VALUE,
+        "point_id": 1,
+        "iot_device_point_id": "point-1",
+        "controller_id": "controller-1",
+        "controller_device_id": "device-1",
+        "present_value": "21.5",
+        "created_at": datetime(2024, 1, 1, 10, 0, 0, 123456, tzinfo=timezone.utc),
+    }
+    fields.update(overrides)
+    return ControllerPointsModel(**fields)
+
+
+def reference(point: ControllerPointsModel) -> dict:
+    return ControllerPointDTO.from_model(point).model_dump()
+
+
+class TestBatchSerializer:
+    """Test equivalence with the DTO path"""
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {},
+            FULL_PROPERTIES,
+            {"status_flags": "[]", "limit_enable": "{}", "units": "percent"},
+            {"updated_at": datetime(2024, 1, 2, 8, 30, 0)},
+        ],
+        ids=["basic", "all-properties", "empty-json", "naive-updated-at"],
+    )
+    def test_matches_dto_model_dump(self, overrides):
+        """Test: Every field and value matches ControllerPointDTO"""
+        point = make_point(**overrides)
+
+        assert json.loads(encode_point_json(point)) == reference(point)
+
+    def test_invalid_json_becomes_null_with_warning(self):
+        """Test: Unparseable stored JSON is nulled like from_model does"""
+        point = make_point(
+            priority_array="invalid json {{{", limit_enable="not json at all"
+        )
+
+        with patch("src.dto.controller_point_serializer.logger.warning") as warning:
+            serialized = json.loads(encode_point_json(point))
+
+        assert serialized["priorityArray"] is None
+        assert serialized["limitEnable"] is None
+        assert warning.call_count == 2
+
+    def test_batch_message_and_dicts(self):
+        """Test: The batch is the {"points": [...]} message in input order"""
+        points = [make_point(id=index, point_id=index) for index in range(3)]
+        points.append(make_point(id=3, **FULL_PROPERTIES))
+
+        message = json.loads(encode_points_json(points))
+
+        assert message == {"points": [reference(point) for point in points]}
+        assert serialize_points(points) == message["points"]
+        assert json.loads(encode_points_json([])) == {"points": []}
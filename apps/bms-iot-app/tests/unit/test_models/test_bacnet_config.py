@@ -0,0 +1,107 @@
+"""
+Test versioned BACnet config storage.
+
+User Story: As a developer, I want config reads to load only the rows they need
+"""
+
+import pytest
+from sqlmodel import select, func
+
+from src.config.bacnet_constants import BACNET_CONFIG_VERSIONS_TO_KEEP
+from src.models.bacnet_config import (
+    BacnetConfigModel,
+    BacnetConfigObjectModel,
+    BacnetDeviceInfo,
+    BacnetObjectInfo,
+    get_bacnet_controller_config,
+    get_latest_bacnet_config_json,
+    get_latest_bacnet_config_json_as_list,
+    insert_bacnet_config_json,
+)
+from src.network.sqlmodel_client import get_session
+
+
+def make_device(controller_id: str, object_count: int = 2) -> BacnetDeviceInfo:
+    return BacnetDeviceInfo(
+        vendor_id=7,
+        device_id=1000 + len(controller_id),
+        controller_ip_address="192.168.1.10",
+        controller_id=controller_id,
+        object_list=[
+            BacnetObjectInfo(
+                type="analogInput",
+                point_id=i,
+                iot_device_point_id=f"{controller_id}-point-{i}",
+                properties={"units": "degreesCelsius", "presentValue": float(i)},
+            )
+            for i in range(object_count)
+        ],
+    )
+
+
+class TestVersionedBacnetConfig:
+    """Test per-controller, per-object config versions"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_order_and_properties(self, cleanup_database):
+        """Test: Saved config loads back identically"""
+        devices = [make_device("ctrl-b", 3), make_device("ctrl-a", 1)]
+
+        config = await insert_bacnet_config_json(devices)
+
+        assert config.controller_count == 2
+        assert config.object_count == 4
+        loaded = await get_latest_bacnet_config_json_as_list()
+        assert [d.model_dump() for d in loaded] == [d.model_dump() for d in devices]
+
+    @pytest.mark.asyncio
+    async def test_partial_load_for_one_controller(self, cleanup_database):
+        """Test: A single controller and its objects can be loaded on their own"""
+        await insert_bacnet_config_json([make_device("ctrl-a"), make_device("ctrl-b")])
+
+        controller = await get_bacnet_controller_config("ctrl-b")
+
+        assert controller.controller_id == "ctrl-b"
+        assert [obj.iot_device_point_id for obj in controller.object_list] == [
+            "ctrl-b-point-0",
+            "ctrl-b-point-1",
+        ]
+        assert await get_bacnet_controller_config("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_latest_version_wins_and_old_versions_are_pruned(
+        self, cleanup_database
+    ):
+        """Test: Only the newest versions are kept and read"""
+        for round_number in range(BACNET_CONFIG_VERSIONS_TO_KEEP + 2):
+            await insert_bacnet_config_json([make_device(f"ctrl-{round_number}")])
+
+        latest = await get_latest_bacnet_config_json()
+        loaded = await get_latest_bacnet_config_json_as_list()
+        assert [d.controller_id for d in loaded] == [
+            f"ctrl-{BACNET_CONFIG_VERSIONS_TO_KEEP + 1}"
+        ]
+
+        async with get_session() as session:
+            versions = (
+                (await session.execute(select(BacnetConfigModel.id))).scalars().all()
+            )
+            object_versions = (
+                (
+                    await session.execute(
+                        select(func.distinct(BacnetConfigObjectModel.config_version))
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+        assert len(versions) == BACNET_CONFIG_VERSIONS_TO_KEEP
+        assert max(versions) == latest.id
+        assert sorted(object_versions) == sorted(versions)
+
+    @pytest.mark.asyncio
+    async def test_no_config_returns_none(self, cleanup_database):
+        """Test: Reads return None before any discovery"""
+        assert await get_latest_bacnet_config_json() is None
+        assert await get_latest_bacnet_config_json_as_list() is None
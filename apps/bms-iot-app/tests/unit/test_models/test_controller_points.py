@@ -4,11 +4,17 @@ Test controller points data model.
 User Story: As a developer, I want controller points model to work correctly
 """
 
+import uuid
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 from src.models.controller_points import (
     ControllerPointsModel,
+    PointMetadataModel,
+    PointSampleModel,
+    _point_metadata_cache,
+    decode_present_value,
+    encode_present_value,
     insert_controller_point,
     bulk_insert_controller_points,
     get_controller_points_by_controller_id,
@@ -19,6 +25,33 @@ from src.models.controller_points import (
 from src.models.bacnet_types import BacnetObjectTypeEnum
 
 
+def make_metadata(controller_id: str = "ctrl_1") -> PointMetadataModel:
+    return PointMetadataModel(
+        id=1,
+        controller_ip_address="192.168.1.100",
+        bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+        point_id=1,
+        iot_device_point_id="point_1",
+        controller_id=controller_id,
+        controller_device_id="device_1",
+    )
+
+
+def make_sample(
+    sample_id: int,
+    metadata: PointMetadataModel,
+    value: float | None = None,
+    value_text: str | None = None,
+) -> PointSampleModel:
+    return PointSampleModel(
+        id=sample_id,
+        point_metadata_id=metadata.id,
+        value=value,
+        value_text=value_text,
+        created_at=datetime(2024, 1, 1, 12, 0, 0),
+    )
+
+
 class TestControllerPointsModel:
     """Test ControllerPointsModel data structure"""
 
@@ -42,6 +75,19 @@ class TestControllerPointsModel:
         assert point.controller_port == 47808  # DEFAULT_CONTROLLER_PORT
         assert point.is_uploaded is False
 
+    def test_controller_point_from_int_device_id(self):
+        """Test: The monitor and writer pass the BACnet device ID as an int"""
+        point = ControllerPointsModel(
+            controller_ip_address="192.168.1.100",
+            bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+            point_id=1,
+            iot_device_point_id="point_123",
+            controller_id="ctrl_456",
+            controller_device_id=123,
+        )
+
+        assert point.controller_device_id == "123"
+
     def test_controller_point_with_optional_fields(self):
         """Test: Controller point with optional health monitoring fields"""
         point = ControllerPointsModel(
@@ -96,41 +142,36 @@ class TestControllerPointsDatabaseOperations:
 
     @pytest.mark.asyncio
     async def test_insert_controller_point_success(self):
-        """Test: Successful point insertion"""
-        with patch("src.models.controller_points.get_session") as mock_get_session:
-            mock_session = AsyncMock()
-
-            # Create async context manager mock
-            mock_context_manager = AsyncMock()
-            mock_context_manager.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-
-            mock_get_session.return_value = mock_context_manager
-
-            point = ControllerPointsModel(
-                controller_ip_address="192.168.1.100",
-                bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
-                point_id=1,
-                iot_device_point_id="point_123",
-                controller_id="ctrl_456",
-                controller_device_id="device_789",
-            )
-            point.id = 1  # Simulate database assignment
+        """Test: Successful point insertion round-trips through metadata and samples"""
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        point = ControllerPointsModel(
+            controller_ip_address="192.168.1.100",
+            bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+            point_id=1,
+            iot_device_point_id=f"point-{uuid.uuid4()}",
+            controller_id=controller_id,
+            controller_device_id="device_789",
+            present_value="21.5",
+            units="degreesCelsius",
+            priority_array="[null, 50.0]",
+        )
 
-            mock_session.add = Mock()
-            mock_session.commit = AsyncMock()
-            mock_session.refresh = AsyncMock()
+        result = await insert_controller_point(point)
 
-            result = await insert_controller_point(point)
+        assert result is point
+        assert point.id is not None
 
-            mock_session.add.assert_called_once_with(point)
-            mock_session.commit.assert_called_once()
-            mock_session.refresh.assert_called_once_with(point)
-            assert result == point
+        stored = await get_controller_points_by_controller_id(controller_id)
+        assert len(stored) == 1
+        assert stored[0].id == point.id
+        assert stored[0].present_value == "21.5"
+        assert stored[0].units == "degreesCelsius"
+        assert stored[0].priority_array == "[null, 50.0]"
+        assert stored[0].created_at_unix_milli_timestamp is not None
 
     @pytest.mark.asyncio
     async def test_get_controller_points_by_controller_id(self):
-        """Test: Fetch points by controller ID"""
+        """Test: Fetch points by controller ID joins samples with metadata"""
         with patch("src.models.controller_points.get_session") as mock_get_session:
             mock_session = AsyncMock()
 
@@ -141,25 +182,21 @@ class TestControllerPointsDatabaseOperations:
 
             mock_get_session.return_value = mock_context_manager
 
-            # Create mock points
-            mock_point1 = Mock(spec=ControllerPointsModel)
-            mock_point1.controller_id = "ctrl_123"
-            mock_point2 = Mock(spec=ControllerPointsModel)
-            mock_point2.controller_id = "ctrl_123"
-
-            # Mock query result
+            metadata = make_metadata(controller_id="ctrl_123")
             mock_result = Mock()
-            mock_result.scalars.return_value.all.return_value = [
-                mock_point1,
-                mock_point2,
+            mock_result.all.return_value = [
+                (make_sample(1, metadata, value=20.0), metadata),
+                (make_sample(2, metadata, value_text="active"), metadata),
             ]
             mock_session.execute = AsyncMock(return_value=mock_result)
 
             result = await get_controller_points_by_controller_id("ctrl_123")
 
             assert len(result) == 2
-            assert result[0] == mock_point1
-            assert result[1] == mock_point2
+            assert [point.id for point in result] == [1, 2]
+            assert all(point.controller_id == "ctrl_123" for point in result)
+            assert result[0].present_value == "20.0"
+            assert result[1].present_value == "active"
             mock_session.execute.assert_called_once()
 
     @pytest.mark.asyncio
@@ -284,25 +321,21 @@ class TestControllerPointsDatabaseOperations:
 
             mock_get_session.return_value = mock_context_manager
 
-            # Create mock points not yet uploaded
-            mock_point1 = Mock(spec=ControllerPointsModel)
-            mock_point1.is_uploaded = False
-            mock_point2 = Mock(spec=ControllerPointsModel)
-            mock_point2.is_uploaded = False
-
-            # Mock query result
+            # Mock query result of (sample, metadata) rows not yet uploaded
+            metadata = make_metadata()
             mock_result = Mock()
-            mock_result.scalars.return_value.all.return_value = [
-                mock_point1,
-                mock_point2,
+            mock_result.all.return_value = [
+                (make_sample(1, metadata, value=1.0), metadata),
+                (make_sample(2, metadata, value=2.0), metadata),
             ]
             mock_session.execute = AsyncMock(return_value=mock_result)
 
             result = await get_points_to_upload()
 
             assert len(result) == 2
-            assert result[0] == mock_point1
-            assert result[1] == mock_point2
+            assert all(isinstance(point, ControllerPointsModel) for point in result)
+            assert all(point.is_uploaded is False for point in result)
+            assert result[0].iot_device_point_id == metadata.iot_device_point_id
             mock_session.execute.assert_called_once()
 
     @pytest.mark.asyncio
@@ -420,51 +453,34 @@ class TestBulkInsertControllerPoints:
     @pytest.mark.asyncio
     async def test_bulk_insert_success(self):
         """Test: Successful bulk insertion of multiple points"""
-        with patch("src.models.controller_points.get_session") as mock_get_session:
-            mock_session = AsyncMock()
-
-            # Create async context manager mock
-            mock_context_manager = AsyncMock()
-            mock_context_manager.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-
-            mock_get_session.return_value = mock_context_manager
-
-            # Create test points
-            points = [
-                ControllerPointsModel(
-                    controller_ip_address="192.168.1.100",
-                    bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
-                    point_id=1,
-                    iot_device_point_id="point_123",
-                    controller_id="ctrl_456",
-                    controller_device_id="device_789",
-                ),
-                ControllerPointsModel(
-                    controller_ip_address="192.168.1.100",
-                    bacnet_object_type=BacnetObjectTypeEnum.ANALOG_OUTPUT,
-                    point_id=2,
-                    iot_device_point_id="point_234",
-                    controller_id="ctrl_456",
-                    controller_device_id="device_789",
-                ),
-            ]
-
-            # Mock successful session operations (simplified: no fetch-after-insert)
-            mock_session.add_all = Mock()
-            mock_session.commit = AsyncMock()
-
-            # Set up points with IDs after commit (simulate database ID assignment)
-            points[0].id = 1
-            points[1].id = 2
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        points = [
+            ControllerPointsModel(
+                controller_ip_address="192.168.1.100",
+                bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+                point_id=1,
+                iot_device_point_id=f"point-{uuid.uuid4()}",
+                controller_id=controller_id,
+                controller_device_id="device_789",
+                present_value="1.5",
+            ),
+            ControllerPointsModel(
+                controller_ip_address="192.168.1.100",
+                bacnet_object_type=BacnetObjectTypeEnum.ANALOG_OUTPUT,
+                point_id=2,
+                iot_device_point_id=f"point-{uuid.uuid4()}",
+                controller_id=controller_id,
+                controller_device_id="device_789",
+                present_value="2",
+            ),
+        ]
 
-            await bulk_insert_controller_points(points)
+        await bulk_insert_controller_points(points)
 
-            # Verify session operations (simplified version)
-            mock_session.add_all.assert_called_once_with(points)
-            mock_session.commit.assert_called_once()
-            # Verify points were modified in place (database would assign IDs)
-            assert all(point.id is not None for point in points)
+        # Sample ids are assigned in place
+        assert all(point.id is not None for point in points)
+        stored = await get_controller_points_by_controller_id(controller_id)
+        assert sorted(point.present_value for point in stored) == ["1.5", "2"]
 
     @pytest.mark.asyncio
     async def test_bulk_insert_database_error(self):
@@ -479,19 +495,22 @@ class TestBulkInsertControllerPoints:
 
             mock_get_session.return_value = mock_context_manager
 
-            # Create test points
+            iot_device_point_id = f"point-{uuid.uuid4()}"
             points = [
                 ControllerPointsModel(
                     controller_ip_address="192.168.1.100",
                     bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
                     point_id=1,
-                    iot_device_point_id="point_123",
+                    iot_device_point_id=iot_device_point_id,
                     controller_id="ctrl_456",
                     controller_device_id="device_789",
                 )
             ]
 
-            # Mock database error
+            # Metadata upsert returns an id, then the commit fails
+            mock_session.execute = AsyncMock(
+                return_value=Mock(all=Mock(return_value=[(7, iot_device_point_id)]))
+            )
             mock_session.add_all = Mock()
             mock_session.commit = AsyncMock(side_effect=Exception("Database error"))
             mock_session.rollback = AsyncMock()
@@ -501,9 +520,12 @@ class TestBulkInsertControllerPoints:
                 await bulk_insert_controller_points(points)
 
             # Verify session operations were attempted
-            mock_session.add_all.assert_called_once_with(points)
+            mock_session.add_all.assert_called_once()
+            samples = mock_session.add_all.call_args[0][0]
+            assert [sample.point_metadata_id for sample in samples] == [7]
             mock_session.commit.assert_called_once()
-            # Note: rollback is handled automatically by async context manager
+            # Failed transactions must not populate the metadata cache
+            assert iot_device_point_id not in _point_metadata_cache
 
     @pytest.mark.asyncio
     async def test_bulk_insert_session_failure(self):
@@ -535,88 +557,72 @@ class TestBulkInsertControllerPoints:
     @pytest.mark.asyncio
     async def test_bulk_insert_large_batch(self):
         """Test: Bulk insert handles large batches efficiently"""
-        with patch("src.models.controller_points.get_session") as mock_get_session:
-            mock_session = AsyncMock()
-
-            # Create async context manager mock
-            mock_context_manager = AsyncMock()
-            mock_context_manager.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-
-            mock_get_session.return_value = mock_context_manager
-
-            # Create 100 test points
-            points = []
-            for i in range(100):
-                points.append(
-                    ControllerPointsModel(
-                        controller_ip_address="192.168.1.100",
-                        bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
-                        point_id=i,
-                        iot_device_point_id=f"point_{i}",
-                        controller_id="ctrl_456",
-                        controller_device_id="device_789",
-                    )
-                )
-
-            # Mock successful session operations (simplified: no fetch-after-insert)
-            mock_session.add_all = Mock()
-            mock_session.commit = AsyncMock()
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        points = [
+            ControllerPointsModel(
+                controller_ip_address="192.168.1.100",
+                bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+                point_id=i,
+                iot_device_point_id=f"point-{i}-{controller_id}",
+                controller_id=controller_id,
+                controller_device_id="device_789",
+                present_value=str(float(i)),
+            )
+            for i in range(100)
+        ]
 
-            # Set up points with IDs after commit (simulate database ID assignment)
-            for i, point in enumerate(points):
-                point.id = i + 1
+        await bulk_insert_controller_points(points)
 
-            await bulk_insert_controller_points(points)
-
-            # Verify single add_all call with all points (simplified version)
-            mock_session.add_all.assert_called_once_with(points)
-            mock_session.commit.assert_called_once()
-            # Verify points were modified in place (database would assign IDs)
-            assert all(point.id is not None for point in points)
+        assert len({point.id for point in points}) == 100
+        stored = await get_controller_points_by_controller_id(controller_id)
+        assert len(stored) == 100
 
     @pytest.mark.asyncio
     async def test_bulk_insert_with_health_properties(self):
         """Test: Bulk insert preserves health monitoring properties"""
-        with patch("src.models.controller_points.get_session") as mock_get_session:
-            mock_session = AsyncMock()
-
-            # Create async context manager mock
-            mock_context_manager = AsyncMock()
-            mock_context_manager.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-
-            mock_get_session.return_value = mock_context_manager
-
-            # Create point with health properties
-            point = ControllerPointsModel(
-                controller_ip_address="192.168.1.100",
-                bacnet_object_type=BacnetObjectTypeEnum.BINARY_OUTPUT,
-                point_id=1,
-                iot_device_point_id="point_123",
-                controller_id="ctrl_456",
-                controller_device_id="device_789",
-                present_value="1",
-                units="degrees_celsius",
-                status_flags="fault;overridden",
-                event_state="normal",
-                out_of_service=False,
-                reliability="noFaultDetected",
-                error_info='{"error": "none"}',
-            )
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        point = ControllerPointsModel(
+            controller_ip_address="192.168.1.100",
+            bacnet_object_type=BacnetObjectTypeEnum.BINARY_OUTPUT,
+            point_id=1,
+            iot_device_point_id=f"point-{uuid.uuid4()}",
+            controller_id=controller_id,
+            controller_device_id="device_789",
+            present_value="1",
+            units="degrees_celsius",
+            status_flags="fault;overridden",
+            event_state="normal",
+            out_of_service=False,
+            reliability="noFaultDetected",
+            error_info='{"error": "none"}',
+        )
 
-            # Mock successful session operations
-            mock_session.add_all = Mock()
-            mock_session.commit = AsyncMock()
-            mock_session.refresh = AsyncMock()
-
-            await bulk_insert_controller_points([point])
-
-            # Verify all properties are preserved in the original point
-            assert point.present_value == "1"
-            assert point.units == "degrees_celsius"
-            assert point.status_flags == "fault;overridden"
-            assert point.event_state == "normal"
-            assert point.out_of_service is False
-            assert point.reliability == "noFaultDetected"
-            assert point.error_info == '{"error": "none"}'
+        await bulk_insert_controller_points([point])
+
+        [stored] = await get_controller_points_by_controller_id(controller_id)
+        assert stored.present_value == "1"
+        assert stored.units == "degrees_celsius"
+        assert stored.status_flags == "fault;overridden"
+        assert stored.event_state == "normal"
+        assert stored.out_of_service is False
+        assert stored.reliability == "noFaultDetected"
+        assert stored.error_info == '{"error": "none"}'
+
+
+class TestPresentValueEncoding:
+    """Test REAL/text split of present values"""
+
+    @pytest.mark.parametrize(
+        "present_value,expected",
+        [
+            ("21.5", (21.5, None)),
+            ("25", (25.0, "25")),
+            ("active", (None, "active")),
+            ("nan", (None, "nan")),
+            (None, (None, None)),
+        ],
+    )
+    def test_encode_present_value(self, present_value, expected):
+        """Test: Canonical floats drop the text copy, everything else keeps it"""
+        assert encode_present_value(present_value) == expected
+        assert decode_present_value(*expected) == present_value
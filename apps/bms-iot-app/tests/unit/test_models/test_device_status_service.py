@@ -0,0 +1,110 @@
+"""
+Test the in-memory device status service.
+
+User Story: As an operator, I want status bookkeeping to stop producing a write per update
+"""
+
+import asyncio
+import uuid
+import pytest
+import pytest_asyncio
+
+from src.models.device_status_enums import ConnectionStatusEnum, MonitoringStatusEnum
+from src.models.device_status_service import DeviceStatusService
+from src.models.iot_device_status import (
+    get_latest_iot_device_status,
+    upsert_iot_device_status,
+)
+
+
+@pytest_asyncio.fixture
+async def service():
+    status_service = DeviceStatusService(flush_interval=60)
+    yield status_service
+    status_service.reset()
+
+
+def initial_status() -> dict:
+    return {
+        "organization_id": "test-org",
+        "site_id": "test-site",
+        "monitoring_status": MonitoringStatusEnum.ACTIVE,
+    }
+
+
+class TestDeviceStatusService:
+    """Test merging, debouncing and immediate ERROR flushes"""
+
+    @pytest.mark.asyncio
+    async def test_updates_merge_in_memory_and_are_debounced(self, service):
+        """Test: Only the first update writes, later ones wait for the interval"""
+        device_id = f"status-{uuid.uuid4()}"
+
+        await service.update(device_id, {**initial_status(), "cpu_usage_percent": 1.0})
+        await service.update(device_id, {"cpu_usage_percent": 2.0})
+        await service.update(device_id, {"memory_usage_percent": 50.0})
+
+        current = await service.get(device_id)
+        assert current.cpu_usage_percent == 2.0
+        assert current.memory_usage_percent == 50.0
+        assert current.organization_id == "test-org"
+        assert service.flush_count == 1
+
+        stored = await get_latest_iot_device_status(device_id)
+        assert stored.cpu_usage_percent == 1.0
+
+        await service.flush()
+        stored = await get_latest_iot_device_status(device_id)
+        assert stored.cpu_usage_percent == 2.0
+        assert stored.memory_usage_percent == 50.0
+        assert service.flush_count == 2
+
+    @pytest.mark.asyncio
+    async def test_error_transition_flushes_immediately(self, service):
+        """Test: A connection moving to ERROR is written without waiting"""
+        device_id = f"status-{uuid.uuid4()}"
+        await service.update(device_id, initial_status())
+
+        await service.update(
+            device_id, {"mqtt_connection_status": ConnectionStatusEnum.ERROR}
+        )
+
+        stored = await get_latest_iot_device_status(device_id)
+        assert stored.mqtt_connection_status == ConnectionStatusEnum.ERROR
+        assert service.flush_count == 2
+
+        # Repeating the same ERROR is not a transition
+        await service.update(
+            device_id, {"mqtt_connection_status": ConnectionStatusEnum.ERROR}
+        )
+        assert service.flush_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deferred_flush_runs_after_interval(self):
+        """Test: Pending updates reach the database once the interval passes"""
+        service = DeviceStatusService(flush_interval=0.05)
+        device_id = f"status-{uuid.uuid4()}"
+        try:
+            await service.update(device_id, initial_status())
+            await service.update(device_id, {"load_average": 0.5})
+
+            await asyncio.sleep(0.2)
+
+            stored = await get_latest_iot_device_status(device_id)
+            assert stored.load_average == 0.5
+        finally:
+            await service.close()
+
+    @pytest.mark.asyncio
+    async def test_get_seeds_from_database(self, service):
+        """Test: Status written before start-up is served from memory"""
+        device_id = f"status-{uuid.uuid4()}"
+        await upsert_iot_device_status(
+            device_id, {**initial_status(), "bacnet_points_monitored": 42}
+        )
+
+        current = await service.get(device_id)
+
+        assert current.bacnet_points_monitored == 42
+        assert current.monitoring_status == MonitoringStatusEnum.ACTIVE
+        assert await service.get(f"missing-{uuid.uuid4()}") is None
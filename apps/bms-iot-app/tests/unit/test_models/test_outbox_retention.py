@@ -0,0 +1,191 @@
+"""
+Test bounded outbox retention for controller point samples.
+
+User Story: As an operator, I want the outbox to stay bounded during long broker outages
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
+
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import (
+    ControllerPointsModel,
+    bulk_insert_controller_points,
+    enforce_outbox_retention,
+    get_outbox_stats,
+    get_points_to_upload,
+)
+from src.network.sqlmodel_client import get_engine, get_write_engine
+
+
+def make_sample(
+    iot_device_point_id: str,
+    created_at: datetime,
+    present_value: str = "1.0",
+    is_manual_write: bool = False,
+) -> ControllerPointsModel:
+    return ControllerPointsModel(
+        controller_ip_address="192.168.1.100",
+        bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+        point_id=1,
+        iot_device_point_id=iot_device_point_id,
+        controller_id="retention-controller",
+        controller_device_id="device_1",
+        present_value=present_value,
+        is_manual_write=is_manual_write,
+        created_at=created_at,
+    )
+
+
+async def count_pending() -> int:
+    return (await get_outbox_stats())["pending_points"]
+
+
+class TestOutboxRetention:
+    """Test age expiry, downsampling and drop-oldest policies"""
+
+    @pytest.mark.asyncio
+    async def test_expires_old_samples_but_keeps_manual_writes(self, cleanup_database):
+        """Test: Samples beyond max age are removed, manual writes survive"""
+        now = datetime.now(timezone.utc)
+        await bulk_insert_controller_points(
+            [
+                make_sample("retention-a", now - timedelta(hours=3)),
+                make_sample(
+                    "retention-a", now - timedelta(hours=3), is_manual_write=True
+                ),
+                make_sample("retention-a", now),
+            ]
+        )
+
+        removed = await enforce_outbox_retention(
+            max_rows=0,
+            max_age_seconds=3600,
+            full_resolution_seconds=0,
+            downsample_interval_seconds=0,
+        )
+
+        assert removed == {"expired": 1, "downsampled": 0, "dropped": 0}
+        remaining = await get_points_to_upload()
+        assert len(remaining) == 2
+        assert any(point.is_manual_write for point in remaining)
+
+    @pytest.mark.asyncio
+    async def test_downsamples_older_samples_per_point(self, cleanup_database):
+        """Test: Old samples thin to one per point per interval, recent ones stay"""
+        now = datetime.now(timezone.utc)
+        base = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
+        old_samples = [
+            make_sample(point, base + timedelta(seconds=10 * i), str(float(i)))
+            for point in ("retention-a", "retention-b")
+            for i in range(6)  # All within one 5-minute bucket
+        ]
+        recent_samples = [
+            make_sample("retention-a", now - timedelta(seconds=i)) for i in range(3)
+        ]
+        await bulk_insert_controller_points(old_samples + recent_samples)
+
+        removed = await enforce_outbox_retention(
+            max_rows=10,
+            max_age_seconds=0,
+            full_resolution_seconds=3600,
+            downsample_interval_seconds=300,
+        )
+
+        assert removed["downsampled"] == 10
+        assert removed["dropped"] == 0
+        remaining = await get_points_to_upload()
+        old_values = {
+            (point.iot_device_point_id, point.present_value)
+            for point in remaining
+            if point.created_at.replace(tzinfo=timezone.utc) < now - timedelta(hours=1)
+        }
+        # Newest sample of each bucket survives
+        assert old_values == {("retention-a", "5.0"), ("retention-b", "5.0")}
+        assert len(remaining) == 5
+
+    @pytest.mark.asyncio
+    async def test_drops_oldest_when_still_over_limit(self, cleanup_database):
+        """Test: Oldest non-manual samples are dropped down to max_rows"""
+        now = datetime.now(timezone.utc)
+        samples = [
+            make_sample("retention-a", now - timedelta(seconds=i), str(float(i)))
+            for i in range(10)
+        ]
+        samples.append(
+            make_sample("retention-a", now - timedelta(days=1), is_manual_write=True)
+        )
+        await bulk_insert_controller_points(samples)
+
+        removed = await enforce_outbox_retention(
+            max_rows=4,
+            max_age_seconds=0,
+            full_resolution_seconds=3600,
+            downsample_interval_seconds=300,
+        )
+
+        assert removed["dropped"] == 6
+        remaining = await get_points_to_upload()
+        values = sorted(p.present_value for p in remaining if not p.is_manual_write)
+        assert values == ["0.0", "1.0", "2.0", "3.0"]
+        assert await count_pending() == 5
+
+    @pytest.mark.asyncio
+    async def test_outbox_stats_shape(self, cleanup_database):
+        """Test: Stats report depth, manual writes, oldest age and database size"""
+        now = datetime.now(timezone.utc)
+        await bulk_insert_controller_points(
+            [
+                make_sample("retention-a", now - timedelta(minutes=5)),
+                make_sample("retention-a", now, is_manual_write=True),
+            ]
+        )
+
+        stats = await get_outbox_stats()
+
+        assert stats["pending_points"] == 2
+        assert stats["pending_manual_writes"] == 1
+        assert stats["oldest_pending_age_seconds"] >= 300
+        assert stats["database_size_bytes"] > 0
+
+    @pytest.mark.asyncio
+    async def test_pending_scans_use_pending_index(self, cleanup_database):
+        """Test: Every pending-row filter is answered from ix_point_samples_pending"""
+        now = datetime.now(timezone.utc)
+        await bulk_insert_controller_points(
+            [make_sample("retention-a", now - timedelta(seconds=i)) for i in range(5)]
+        )
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "is_uploaded = " in statement and not executemany:
+                statements.append((statement, parameters))
+
+        engines = [get_engine().sync_engine, get_write_engine().sync_engine]
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", capture)
+        try:
+            await enforce_outbox_retention(
+                max_rows=1,
+                max_age_seconds=3600,
+                full_resolution_seconds=0,
+                # One sample per bucket, so dropping the oldest runs too
+                downsample_interval_seconds=1,
+            )
+            await get_points_to_upload()
+            await get_outbox_stats()
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", capture)
+
+        assert len(statements) >= 6
+        async with get_write_engine().connect() as conn:
+            for statement, parameters in statements:
+                plan = (
+                    await conn.exec_driver_sql(
+                        f"EXPLAIN QUERY PLAN {statement}", parameters
+                    )
+                ).all()
+                details = " | ".join(row[-1] for row in plan)
+                assert "ix_point_samples_pending" in details, (statement, details)
@@ -0,0 +1,155 @@
+"""
+Test point_state latest-value table.
+
+User Story: As a developer, I want the current value of every point without scanning history
+"""
+
+import asyncio
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from src.cli import app
+
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import (
+    ControllerPointsModel,
+    bulk_insert_controller_points,
+    insert_controller_point,
+)
+from src.models.point_state import (
+    get_point_state,
+    get_point_states,
+)
+
+
+def make_point(
+    iot_device_point_id: str,
+    controller_id: str,
+    present_value: str,
+    created_at: datetime,
+) -> ControllerPointsModel:
+    return ControllerPointsModel(
+        controller_ip_address="192.168.1.100",
+        bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+        point_id=1,
+        iot_device_point_id=iot_device_point_id,
+        controller_id=controller_id,
+        present_value=present_value,
+        controller_device_id="device_1",
+        units="degreesCelsius",
+        created_at=created_at,
+    )
+
+
+class TestPointState:
+    """Test latest-value upserts written alongside history inserts"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_keeps_one_row_per_point(self):
+        """Test: Several samples of one point collapse into its latest value"""
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        point_a, point_b = f"a-{uuid.uuid4()}", f"b-{uuid.uuid4()}"
+        now = datetime.now(timezone.utc)
+
+        await bulk_insert_controller_points(
+            [
+                make_point(point_a, controller_id, "20.0", now),
+                make_point(point_a, controller_id, "21.5", now + timedelta(seconds=1)),
+                make_point(point_b, controller_id, "1", now),
+            ]
+        )
+
+        states = await get_point_states(controller_id)
+        values = {state.iot_device_point_id: state.present_value for state in states}
+        assert values == {point_a: "21.5", point_b: "1"}
+
+    @pytest.mark.asyncio
+    async def test_batch_larger_than_one_upsert_chunk(self):
+        """Test: Batches are upserted in chunks, so none exceeds SQLite's variable limit"""
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        now = datetime.now(timezone.utc)
+        points = [
+            make_point(f"p{i}-{uuid.uuid4()}", controller_id, str(i), now)
+            for i in range(5)
+        ]
+
+        with patch("src.models.point_state._STATE_UPSERT_CHUNK", 2):
+            await bulk_insert_controller_points(points)
+
+        states = await get_point_states(controller_id)
+        assert {state.iot_device_point_id: state.present_value for state in states} == {
+            point.iot_device_point_id: point.present_value for point in points
+        }
+
+    @pytest.mark.asyncio
+    async def test_changed_at_only_moves_on_value_change(self):
+        """Test: Repeated identical values refresh updated_at but not changed_at"""
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        point_id = f"p-{uuid.uuid4()}"
+        start = datetime.now(timezone.utc)
+
+        await insert_controller_point(make_point(point_id, controller_id, "5", start))
+        await insert_controller_point(
+            make_point(point_id, controller_id, "5", start + timedelta(seconds=10))
+        )
+        state = await get_point_state(point_id)
+        assert state is not None
+        assert state.changed_at.replace(tzinfo=None) == start.replace(tzinfo=None)
+        assert state.updated_at > state.changed_at
+
+        await insert_controller_point(
+            make_point(point_id, controller_id, "6", start + timedelta(seconds=20))
+        )
+        state = await get_point_state(point_id)
+        assert state.present_value == "6"
+        assert state.changed_at == state.updated_at
+
+    @pytest.mark.asyncio
+    async def test_older_sample_does_not_overwrite_state(self):
+        """Test: A late-arriving older sample is kept in history only"""
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        point_id = f"p-{uuid.uuid4()}"
+        now = datetime.now(timezone.utc)
+
+        await insert_controller_point(make_point(point_id, controller_id, "new", now))
+        await insert_controller_point(
+            make_point(point_id, controller_id, "old", now - timedelta(minutes=1))
+        )
+
+        state = await get_point_state(point_id)
+        assert state.present_value == "new"
+
+    @pytest.mark.asyncio
+    async def test_unknown_point_returns_none(self):
+        """Test: Missing points return None"""
+        assert await get_point_state(f"missing-{uuid.uuid4()}") is None
+
+    @pytest.mark.asyncio
+    async def test_db_points_command_lists_latest_values(self):
+        """Test: db points shows one row per point of the controller"""
+        controller_id = f"ctrl-{uuid.uuid4()}"
+        point_id = f"p-{uuid.uuid4()}"
+        now = datetime.now(timezone.utc)
+        await bulk_insert_controller_points(
+            [
+                make_point(point_id, controller_id, "20.0", now),
+                make_point(point_id, controller_id, "21.5", now + timedelta(seconds=1)),
+            ]
+        )
+
+        # The command runs its own event loop
+        result = await asyncio.to_thread(
+            CliRunner().invoke,
+            app,
+            ["db", "points", "--controller", controller_id],
+            env={"COLUMNS": "250"},
+        )
+
+        assert result.exit_code == 0, result.output
+        assert point_id in result.output
+        assert "21.5" in result.output
+        assert "20.0" not in result.output
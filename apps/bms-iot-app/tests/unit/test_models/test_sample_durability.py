@@ -0,0 +1,123 @@
+"""
+Test sample durability modes and the separate outbox database.
+
+User Story: As an operator, I want to trade a few seconds of sample loss for less SD-card wear
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from sqlalchemy import text
+
+from src.config.settings import default_outbox_database_path
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import (
+    ControllerPointsModel,
+    bulk_insert_controller_points,
+    flush_sample_buffer,
+    get_outbox_stats,
+)
+from src.network.sqlmodel_client import SampleDurability, get_session
+
+
+def make_sample(index: int) -> ControllerPointsModel:
+    return ControllerPointsModel(
+        controller_ip_address="192.168.1.100",
+        bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+        point_id=index,
+        iot_device_point_id=f"durability-{index}",
+        controller_id="durability-controller",
+        controller_device_id="device_1",
+        present_value=str(float(index)),
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def batched_mode():
+    with (
+        patch(
+            "src.models.controller_points.SAMPLE_DURABILITY",
+            SampleDurability.BATCHED,
+        ),
+        patch("src.config.settings.settings.OUTBOX_FLUSH_ROWS", 3),
+        patch("src.config.settings.settings.OUTBOX_FLUSH_INTERVAL_SECONDS", 3600),
+    ):
+        yield
+
+
+class TestOutboxDatabase:
+    """Test that samples and config live in separate files"""
+
+    @pytest.mark.asyncio
+    async def test_sample_tables_live_in_outbox(self):
+        """Test: point_samples and point_state are in the attached outbox only"""
+        async with get_session() as session:
+            outbox_tables = {
+                row[0]
+                for row in await session.execute(
+                    text("SELECT name FROM outbox.sqlite_master WHERE type='table'")
+                )
+            }
+            main_tables = {
+                row[0]
+                for row in await session.execute(
+                    text("SELECT name FROM main.sqlite_master WHERE type='table'")
+                )
+            }
+
+        assert {"point_samples", "point_state"} <= outbox_tables
+        assert not {"point_samples", "point_state"} & main_tables
+        assert "point_metadata" in main_tables
+
+    @pytest.mark.asyncio
+    async def test_config_database_is_fully_synchronous(self):
+        """Test: main file uses synchronous=FULL, outbox uses NORMAL by default"""
+        async with get_session() as session:
+            main_sync = (
+                await session.execute(text("PRAGMA main.synchronous"))
+            ).scalar()
+            outbox_sync = (
+                await session.execute(text("PRAGMA outbox.synchronous"))
+            ).scalar()
+
+        assert main_sync == 2  # FULL
+        assert outbox_sync == 1  # NORMAL
+
+    def test_volatile_outbox_defaults_to_ram(self):
+        """Test: Volatile durability places the outbox outside the data directory"""
+        durable = default_outbox_database_path("/data/bms-iot.db", "durable")
+        volatile = default_outbox_database_path("/data/bms-iot.db", "volatile")
+
+        assert durable == "/data/bms-iot-outbox.db"
+        assert not volatile.startswith("/data/")
+
+
+class TestBatchedDurability:
+    """Test in-memory buffering of samples between flushes"""
+
+    @pytest.mark.asyncio
+    async def test_samples_buffer_until_row_threshold(
+        self, cleanup_database, batched_mode
+    ):
+        """Test: Samples are written once the buffer reaches OUTBOX_FLUSH_ROWS"""
+        await bulk_insert_controller_points([make_sample(1), make_sample(2)])
+
+        stats = await get_outbox_stats()
+        assert stats["pending_points"] == 0
+        assert stats["buffered_points"] == 2
+
+        await bulk_insert_controller_points([make_sample(3)])
+
+        stats = await get_outbox_stats()
+        assert stats["pending_points"] == 3
+        assert stats["buffered_points"] == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_remaining_samples(self, cleanup_database, batched_mode):
+        """Test: An explicit flush writes whatever is buffered"""
+        await bulk_insert_controller_points([make_sample(1)])
+
+        assert await flush_sample_buffer() == 1
+        assert await flush_sample_buffer() == 0
+        assert (await get_outbox_stats())["pending_points"] == 1
@@ -1,3 +1,6 @@
+import asyncio
+import json
+import threading
 import pytest
 from unittest.mock import Mock, AsyncMock
 
@@ -121,7 +124,8 @@ class TestMqttCommandDispatcher:
         with pytest.raises(AttributeError, match="No handler slot for command"):
             dispatcher.register_handler("invalid_command", mock_handler)
 
-    def test_handler_dispatch_based_on_topic(self, dispatcher, mock_mqtt_client):
+    @pytest.mark.asyncio
+    async def test_handler_dispatch_based_on_topic(self, dispatcher, mock_mqtt_client):
         """Test that correct handler is dispatched based on incoming topic."""
         # Register mock handlers
         get_config_handler = AsyncMock()
@@ -143,14 +147,23 @@ class TestMqttCommandDispatcher:
         )
         mock_message.payload = b'{"test": "data"}'
 
-        # Simulate message receipt
-        on_message_callback(mock_mqtt_client, None, mock_message)
+        # Simulate message receipt on paho's network thread
+        receiver = threading.Thread(
+            target=on_message_callback, args=(mock_mqtt_client, None, mock_message)
+        )
+        receiver.start()
+        receiver.join()
+        await asyncio.sleep(0)  # hand-off callback
+        await asyncio.sleep(0)  # handler task
 
-        # Verify get_config handler was called
-        get_config_handler.assert_called_once()
+        # Verify get_config handler was awaited on this loop
+        get_config_handler.assert_awaited_once()
         reboot_handler.assert_not_called()
 
-    def test_handler_not_called_when_not_registered(self, dispatcher, mock_mqtt_client):
+    @pytest.mark.asyncio
+    async def test_handler_not_called_when_not_registered(
+        self, dispatcher, mock_mqtt_client
+    ):
         """Test that no handler is called when command is not registered."""
         # Register a handler for a different command to verify it's NOT called
         reboot_handler = AsyncMock()
@@ -168,10 +181,46 @@ class TestMqttCommandDispatcher:
 
         # Call the callback
         on_message_callback(mock_mqtt_client, None, mock_message)
+        await asyncio.sleep(0)
 
         # Verify the registered handler was NOT called since it's for a different command
         reboot_handler.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_burst_runs_on_app_loop_in_order(self, dispatcher, mock_mqtt_client):
+        """Test a burst from the network thread is handled in order on the app loop."""
+        handled = []
+
+        async def reboot_handler(client, userdata, message):
+            handled.append((message.payload, threading.get_ident()))
+            if message.payload == b"1":
+                raise ValueError("bad command")
+
+        dispatcher.register_handler(CommandNameEnum.reboot, reboot_handler)
+        dispatcher.attach_to_client()
+        on_message_callback = mock_mqtt_client.set_on_message.call_args[0][0]
+
+        def receive_burst():
+            for index in range(20):
+                message = Mock(spec=mqtt.MQTTMessage)
+                message.topic = (
+                    "iot/global/test-org/test-site/test-device/command/reboot/request"
+                )
+                message.payload = str(index).encode()
+                on_message_callback(mock_mqtt_client, None, message)
+
+        receiver = threading.Thread(target=receive_burst)
+        receiver.start()
+        receiver.join()
+        while len(handled) < 20:
+            await asyncio.sleep(0)
+
+        # A failing handler does not stop later messages
+        assert [payload for payload, _ in handled] == [
+            str(index).encode() for index in range(20)
+        ]
+        assert {thread_id for _, thread_id in handled} == {threading.get_ident()}
+
     def test_publish_response_with_correct_topic_retain_qos(
         self, dispatcher, mock_mqtt_client
     ):
@@ -260,7 +309,7 @@ class TestMqttCommandDispatcher:
 
         call_args = mock_mqtt_client.publish.call_args
         topic = call_args[0][0]  # First positional argument
-        payload = call_args[0][1]  # Second positional argument
+        payload = json.loads(call_args[0][1])  # Pre-encoded JSON bytes
         retain = call_args[1]["retain"]  # Keyword argument
         qos = call_args[1]["qos"]  # Keyword argument
 
@@ -268,9 +317,9 @@ class TestMqttCommandDispatcher:
         expected_topic = "iot/global/test-org/test-site/test-device/bulk"
         assert topic == expected_topic
 
-        # Verify bulk uses retain=False and QoS=0
+        # Verify bulk uses retain=False and QoS=1 (delivery is tracked by PUBACK)
         assert retain is False
-        assert qos == 0
+        assert qos == 1
 
         # Verify payload structure
         assert "points" in payload
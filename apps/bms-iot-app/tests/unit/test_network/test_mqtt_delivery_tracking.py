@@ -0,0 +1,170 @@
+"""
+Test PUBACK-driven delivery tracking for point batches.
+
+User Story: As an operator, I want samples marked uploaded only once the broker has them
+"""
+
+import asyncio
+import threading
+from unittest.mock import Mock
+
+import paho.mqtt.client as mqtt
+import pytest
+
+from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.message_type import (
+    ActorMessageType,
+    ActorName,
+    PointPublishPayload,
+)
+from src.controllers.mqtt.mqtt_controller import MQTTHandler
+from src.network.mqtt_client import MQTTClient
+from src.network.mqtt_config import MQTTConfig
+
+
+@pytest.fixture
+def tracked_client():
+    client = MQTTClient(MQTTConfig(broker="test", port=1883, use_tls=False))
+    client.connected = True
+    client.client = Mock()
+    client.client.publish = Mock(
+        return_value=Mock(rc=mqtt.MQTT_ERR_SUCCESS, mid=7),
+    )
+    return client
+
+
+def reason_code(failure: bool) -> Mock:
+    return Mock(is_failure=failure)
+
+
+class TestTrackedPublish:
+    """Test MQTTClient acknowledgement callbacks"""
+
+    def test_callback_fires_on_puback(self, tracked_client):
+        """Test: The callback for a message id runs once when the broker acknowledges"""
+        acks = []
+
+        mid = tracked_client.publish_tracked("topic", {"points": []}, acks.append)
+        assert mid == 7
+        assert tracked_client.pending_ack_count == 1
+
+        tracked_client._on_publish(None, None, 7, reason_code(False), None)
+        tracked_client._on_publish(None, None, 7, reason_code(False), None)
+
+        assert acks == [True]
+        assert tracked_client.pending_ack_count == 0
+
+    def test_rejected_and_disconnected_publishes_fail(self, tracked_client):
+        """Test: Broker rejections and dropped connections report failure"""
+        acks = []
+        tracked_client.publish_tracked("topic", {}, acks.append)
+        tracked_client._on_publish(None, None, 7, reason_code(True), None)
+
+        tracked_client.client.publish.return_value = Mock(
+            rc=mqtt.MQTT_ERR_SUCCESS, mid=8
+        )
+        tracked_client.publish_tracked("topic", {}, acks.append)
+        tracked_client._on_disconnect(None, None, None, Mock(value=0), None)
+
+        assert acks == [False, False]
+        assert tracked_client.pending_ack_count == 0
+
+    def test_ack_during_publish_runs_callback_once_registered(self, tracked_client):
+        """Test: A PUBACK that beats registration is delivered, without holding the lock in paho"""
+        acks = []
+
+        def publish(*args, **kwargs):
+            assert tracked_client._ack_lock.acquire(blocking=False)
+            tracked_client._ack_lock.release()
+            tracked_client._on_publish(None, None, 7, reason_code(False), None)
+            return Mock(rc=mqtt.MQTT_ERR_SUCCESS, mid=7)
+
+        tracked_client.client.publish = Mock(side_effect=publish)
+
+        assert tracked_client.publish_tracked("topic", {}, acks.append) == 7
+        assert acks == [True]
+        assert tracked_client.pending_ack_count == 0
+
+    def test_untracked_acks_are_not_kept(self, tracked_client):
+        """Test: Acks outside a tracked publish cannot satisfy a later reused id"""
+        acks = []
+        tracked_client._on_publish(None, None, 7, reason_code(False), None)
+
+        tracked_client.publish_tracked("topic", {}, acks.append)
+
+        assert acks == []
+        assert tracked_client.pending_ack_count == 1
+
+    def test_immediate_failure_registers_nothing(self, tracked_client):
+        """Test: A publish that cannot be queued returns None"""
+        tracked_client.connected = False
+
+        assert tracked_client.publish_tracked("topic", {}, Mock()) is None
+        assert tracked_client.pending_ack_count == 0
+
+
+class TestPublishPointBulkResponse:
+    """Test that POINT_PUBLISH_RESPONSE waits for the acknowledgement"""
+
+    @pytest.fixture
+    def handler(self):
+        registry = ActorQueueRegistry()
+        registry.register(ActorName.UPLOADER)
+        handler = MQTTHandler(
+            mqtt_config=MQTTConfig(broker="test", port=1883),
+            organization_id="org",
+            site_id="site",
+            iot_device_id="device",
+        )
+        handler.actor_queue_registry = registry
+        handler.actor_name = ActorName.MQTT
+        handler.dispatcher = Mock()
+        handler.mqtt_client = Mock(connected=True)
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_response_sent_from_network_thread_ack(self, handler):
+        """Test: The uploader hears back only after the PUBACK callback runs"""
+        callbacks = []
+        handler.dispatcher.publish_point_bulk = Mock(
+            side_effect=lambda points, on_ack: callbacks.append(on_ack) or True
+        )
+        queue = handler.actor_queue_registry.get_queue(ActorName.UPLOADER)
+
+        await handler.publish_point_bulk(PointPublishPayload(points=[], batch_id=3))
+        await asyncio.sleep(0)
+        assert queue.empty()
+
+        network_thread = threading.Thread(target=callbacks[0], args=(True,))
+        network_thread.start()
+        network_thread.join()
+
+        message = await asyncio.wait_for(queue.get(), timeout=1)
+        assert message.message_type == ActorMessageType.POINT_PUBLISH_RESPONSE
+        assert message.payload.batch_id == 3
+        assert message.payload.success is True
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_responds_with_failure(self, handler):
+        """Test: A publish that cannot be queued is reported as not delivered"""
+        handler.dispatcher.publish_point_bulk = Mock(return_value=False)
+        queue = handler.actor_queue_registry.get_queue(ActorName.UPLOADER)
+
+        assert await handler.publish_point_bulk(PointPublishPayload(points=[])) is False
+
+        message = queue.get_nowait()
+        assert message.payload.success is False
+        assert message.payload.offline is False
+
+    @pytest.mark.asyncio
+    async def test_offline_batch_is_not_published(self, handler):
+        """Test: While disconnected the batch is answered as offline and left in the outbox"""
+        handler.mqtt_client.connected = False
+        queue = handler.actor_queue_registry.get_queue(ActorName.UPLOADER)
+
+        assert await handler.publish_point_bulk(PointPublishPayload(points=[])) is False
+
+        handler.dispatcher.publish_point_bulk.assert_not_called()
+        message = queue.get_nowait()
+        assert message.payload.success is False
+        assert message.payload.offline is True
@@ -0,0 +1,231 @@
+"""
+Test MQTT reconnect backoff and offline publish buffering.
+
+User Story: As an operator, I want broker blips to cost seconds, not actor restarts and lost heartbeats
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import paho.mqtt.client as mqtt
+import pytest
+
+from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.messages.message_type import (
+    MQTT_CONNECTED_UPLOAD_REASON,
+    ActorName,
+    ImmediateUploadTriggerPayload,
+)
+from src.actors.uploader_actor import UploaderActor
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import ControllerPointsModel
+from src.network.mqtt_client import MQTTClient
+from src.network.mqtt_config import MQTTConfig
+from src.network.offline_buffer import BufferedPublish, OfflineBuffer
+from src.network.reconnect_backoff import ReconnectBackoff
+
+HEARTBEAT_TOPIC = "status/heartbeat"
+
+
+@pytest.fixture
+def offline_client():
+    client = MQTTClient(MQTTConfig(use_tls=False, topic_prefix=""))
+    client.client = Mock()
+    client.client.publish = Mock(return_value=Mock(rc=mqtt.MQTT_ERR_SUCCESS, mid=1))
+    client.offline_buffer = OfflineBuffer(max_messages=3, max_bytes=10_000)
+    return client
+
+
+def connack(success: bool = True) -> Mock:
+    return Mock(value=0 if success else 5)
+
+
+class TestReconnectBackoff:
+    """Test jittered exponential delays"""
+
+    def test_delays_double_up_to_cap_and_reset(self):
+        """Test: Without jitter the bound doubles, is capped and resets"""
+        backoff = ReconnectBackoff(initial_delay=1, max_delay=5, jitter=0)
+
+        assert [backoff.next_delay() for _ in range(5)] == [1, 2, 4, 5, 5]
+
+        backoff.reset()
+        assert backoff.next_delay() == 1
+
+    def test_jitter_stays_within_upper_half(self):
+        """Test: Jitter spreads delays between half the bound and the bound"""
+        low = ReconnectBackoff(initial_delay=4, max_delay=60, random_fn=lambda: 0.999)
+        high = ReconnectBackoff(initial_delay=4, max_delay=60, random_fn=lambda: 0.0)
+
+        assert low.next_delay() == pytest.approx(2, abs=0.01)
+        assert high.next_delay() == 4
+
+
+class TestOfflineBuffer:
+    """Test bounds and retained-topic coalescing"""
+
+    def test_oldest_dropped_over_limits(self):
+        """Test: Message and byte limits drop the oldest entries"""
+        buffer = OfflineBuffer(max_messages=2, max_bytes=10)
+
+        buffer.add(BufferedPublish("a", b"1234"))
+        buffer.add(BufferedPublish("b", b"1234"))
+        dropped = buffer.add(BufferedPublish("c", b"1234"))
+
+        assert [entry.topic for entry in dropped] == ["a"]
+
+        dropped = buffer.add(BufferedPublish("d", b"123456789"))
+
+        assert [entry.topic for entry in dropped] == ["b", "c"]
+        assert [entry.topic for entry in buffer.drain()] == ["d"]
+        assert buffer.dropped == 3
+
+    def test_retained_publish_replaces_older_on_same_topic(self):
+        """Test: Only the latest heartbeat is kept"""
+        buffer = OfflineBuffer(max_messages=10, max_bytes=1000)
+
+        buffer.add(BufferedPublish(HEARTBEAT_TOPIC, b"old", retain=True))
+        buffer.add(BufferedPublish("response", b"r"))
+        buffer.add(BufferedPublish(HEARTBEAT_TOPIC, b"new", retain=True))
+
+        assert [(entry.topic, entry.message) for entry in buffer.drain()] == [
+            ("response", b"r"),
+            (HEARTBEAT_TOPIC, b"new"),
+        ]
+        assert buffer.size_bytes == 0
+
+    def test_requeue_puts_unsent_back_in_front(self):
+        """Test: Requeued entries keep their order ahead of newer ones"""
+        buffer = OfflineBuffer(max_messages=10, max_bytes=1000)
+        buffer.add(BufferedPublish(HEARTBEAT_TOPIC, b"new", retain=True))
+        buffer.add(BufferedPublish("c", b"3"))
+
+        buffer.requeue(
+            [
+                BufferedPublish("a", b"1"),
+                BufferedPublish(HEARTBEAT_TOPIC, b"old", retain=True),
+                BufferedPublish("b", b"2"),
+            ]
+        )
+
+        assert [(entry.topic, entry.message) for entry in buffer.drain()] == [
+            ("a", b"1"),
+            ("b", b"2"),
+            (HEARTBEAT_TOPIC, b"new"),
+            ("c", b"3"),
+        ]
+
+
+class TestOfflinePublishing:
+    """Test that the client buffers while disconnected and drains on connect"""
+
+    def test_publishes_buffer_and_drain_on_connect(self, offline_client):
+        """Test: Buffered messages and subscriptions go out when the broker is back"""
+        assert offline_client.publish(HEARTBEAT_TOPIC, {"n": 1}, retain=True, qos=1)
+        assert offline_client.publish("response", {"ok": True})
+        assert offline_client.subscribe("command/request", qos=1) is False
+        offline_client.client.publish.assert_not_called()
+
+        offline_client._on_connect(None, None, None, connack(), None)
+
+        offline_client.client.subscribe.assert_called_once_with("command/request", 1)
+        sent = [
+            (call[0][0], json.loads(call[0][1]), call[1]["retain"])
+            for call in offline_client.client.publish.call_args_list
+        ]
+        assert sent == [
+            (HEARTBEAT_TOPIC, {"n": 1}, True),
+            ("response", {"ok": True}, False),
+        ]
+        assert len(offline_client.offline_buffer) == 0
+
+    def test_connection_drop_mid_drain_keeps_unsent_messages(self, offline_client):
+        """Test: A failed publish and everything after it stay buffered, in order"""
+        for n in range(3):
+            assert offline_client.publish(f"response/{n}", {"n": n})
+
+        def publish(topic, message, **kwargs):
+            if topic == "response/1":
+                offline_client.connected = False
+                return Mock(rc=mqtt.MQTT_ERR_NO_CONN, mid=0)
+            return Mock(rc=mqtt.MQTT_ERR_SUCCESS, mid=1)
+
+        offline_client.client.publish = Mock(side_effect=publish)
+        offline_client._on_connect(None, None, None, connack(), None)
+
+        assert [
+            (entry.topic, json.loads(entry.message))
+            for entry in offline_client.offline_buffer.drain()
+        ] == [("response/1", {"n": 1}), ("response/2", {"n": 2})]
+
+    def test_tracked_publishes_are_not_buffered(self, offline_client):
+        """Test: Point batches fail fast so they stay in the outbox"""
+        assert offline_client.publish_tracked("bulk", b"{}", Mock()) is None
+        assert len(offline_client.offline_buffer) == 0
+
+    def test_disconnect_does_not_block_or_reconnect(self, offline_client):
+        """Test: The network-thread callback only records the disconnect"""
+        offline_client.connected = True
+
+        offline_client._on_disconnect(None, None, None, Mock(value=7), None)
+
+        assert offline_client.connected is False
+        offline_client.client.connect.assert_not_called()
+        offline_client.client.reconnect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connect_async_waits_for_connack_off_loop(self, offline_client):
+        """Test: connect_async returns once CONNACK arrives, without a fixed sleep"""
+        offline_client.client.connect = Mock(
+            side_effect=lambda **kwargs: offline_client._on_connect(
+                None, None, None, connack(), None
+            )
+        )
+
+        assert await offline_client.connect_async(timeout=5) is True
+        offline_client.client.loop_start.assert_called_once()
+
+
+class TestUploaderOfflineBatches:
+    """Test that offline batches wait for the reconnect instead of shrinking"""
+
+    @pytest.mark.asyncio
+    async def test_offline_batch_resent_on_reconnect_trigger(self):
+        """Test: Offline failures keep the batch size and resend on reconnect"""
+        registry = ActorQueueRegistry()
+        registry.register(ActorName.UPLOADER)
+        registry.register(ActorName.MQTT)
+        uploader = UploaderActor(registry)
+        point = ControllerPointsModel(
+            id=1,
+            controller_ip_address="192.168.1.100",
+            bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+            point_id=1,
+            iot_device_point_id="point-1",
+            controller_id="controller-1",
+            controller_device_id="device-1",
+        )
+        mqtt_queue = registry.get_queue(ActorName.MQTT)
+
+        with patch(
+            "src.actors.uploader_actor.get_points_to_publish",
+            new_callable=AsyncMock,
+            side_effect=[[point], [], []],
+        ):
+            await uploader.publish_points()
+            request = mqtt_queue.get_nowait()
+            before = uploader.batch_sizer.next_batch_size
+
+            await uploader.on_point_publish_response(
+                request.payload.model_copy(update={"success": False, "offline": True})
+            )
+            assert uploader.batch_sizer.next_batch_size == before
+            batch = uploader._in_flight[request.payload.batch_id]
+            assert batch.deadline - batch.sent_at > uploader.RESEND_DELAY_SECONDS
+
+            await uploader.on_immediate_upload_trigger(
+                ImmediateUploadTriggerPayload(reason=MQTT_CONNECTED_UPLOAD_REASON)
+            )
+
+        resent = mqtt_queue.get_nowait()
+        assert resent.payload.batch_id == request.payload.batch_id
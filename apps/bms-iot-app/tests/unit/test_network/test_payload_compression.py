@@ -0,0 +1,109 @@
+"""
+Test optional compression of MQTT publishes.
+
+User Story: As an operator on a metered link, I want large repetitive payloads compressed
+"""
+
+import json
+from unittest.mock import Mock
+
+import paho.mqtt.client as mqtt
+import pytest
+
+from src.network.mqtt_client import MQTTClient
+from src.network.mqtt_config import MQTTConfig
+from src.network.payload_compression import (
+    CompressionAlgorithm,
+    CompressionPolicy,
+    decompress_payload,
+)
+from src.utils.performance_monitor import PayloadSizeMonitor
+
+BULK_TOPIC = "iot/global/org/site/device/bulk"
+HEARTBEAT_TOPIC = "iot/global/org/site/device/status/heartbeat"
+
+
+def bulk_payload(count: int) -> dict:
+    return {
+        "points": [
+            {"pointId": index, "controllerId": "controller-1", "presentValue": "21.5"}
+            for index in range(count)
+        ]
+    }
+
+
+@pytest.fixture
+def client():
+    mqtt_client = MQTTClient(MQTTConfig(use_tls=False))
+    mqtt_client.connected = True
+    mqtt_client.client = Mock()
+    mqtt_client.client.publish = Mock(return_value=Mock(rc=mqtt.MQTT_ERR_SUCCESS))
+    mqtt_client.compression_policy = CompressionPolicy(
+        algorithm=CompressionAlgorithm.GZIP,
+        min_bytes=1024,
+        topic_patterns=["*/bulk"],
+    )
+    return mqtt_client
+
+
+class TestCompressionPolicy:
+    """Test per-topic and size-threshold selection"""
+
+    def test_select_by_topic_and_size(self):
+        """Test: Only matching topics above the threshold are compressed"""
+        policy = CompressionPolicy(CompressionAlgorithm.GZIP, 1024, ["*/bulk"])
+
+        assert policy.select(BULK_TOPIC, 4096) == CompressionAlgorithm.GZIP
+        assert policy.select(BULK_TOPIC, 100) is None
+        assert policy.select(HEARTBEAT_TOPIC, 4096) is None
+
+    def test_disabled_by_default(self):
+        """Test: The default settings keep the existing wire format"""
+        policy = CompressionPolicy.from_settings()
+
+        assert policy.select(BULK_TOPIC, 10_000_000) is None
+
+
+class TestCompressedPublish:
+    """Test that compressed publishes are flagged and measured"""
+
+    def test_large_bulk_publish_is_gzipped_and_flagged(self, client):
+        """Test: The payload is gzip and carries the content-encoding user property"""
+        payload = bulk_payload(200)
+
+        assert client.publish(BULK_TOPIC, payload, properties={"content_type": "x"})
+
+        args, kwargs = client.client.publish.call_args
+        wire = args[1]
+        assert isinstance(wire, bytes)
+        assert json.loads(decompress_payload(wire, CompressionAlgorithm.GZIP)) == (
+            payload
+        )
+        assert kwargs["properties"].UserProperty == [("content-encoding", "gzip")]
+        assert kwargs["properties"].ContentType == "x"
+
+    def test_small_and_unmatched_publishes_stay_plain(self, client):
+        """Test: Heartbeats and small batches are sent as JSON text"""
+        client.publish(HEARTBEAT_TOPIC, bulk_payload(200))
+        client.publish(BULK_TOPIC, bulk_payload(1))
+
+        for call in client.client.publish.call_args_list:
+            assert isinstance(call[0][1], str)
+            assert call[1]["properties"] is None
+
+
+class TestCompressionMetrics:
+    """Test compression ratio reporting in PayloadSizeMonitor"""
+
+    def test_summary_reports_ratio_and_savings(self):
+        """Test: Compressed payloads are summarised separately"""
+        monitor = PayloadSizeMonitor()
+        monitor.record_payload_size(10_000, 10, compressed_size_bytes=1_000)
+        monitor.record_payload_size(500, 5)
+
+        summary = monitor.get_payload_summary()
+
+        assert summary["compression"]["count"] == 1
+        assert summary["compression"]["ratio"] == 10.0
+        assert summary["compression"]["saved_kb"] == round(9_000 / 1024, 2)
+        assert summary["total_payloads"] == 2
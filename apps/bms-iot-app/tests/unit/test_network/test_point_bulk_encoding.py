@@ -0,0 +1,142 @@
+"""
+Test the compact columnar encoding for point_bulk payloads.
+
+User Story: As an operator on a cellular link, I want point batches to use fewer bytes
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import paho.mqtt.client as mqtt
+
+from src.dto import ControllerPointDTO
+from src.models.bacnet_types import BacnetObjectTypeEnum
+from src.models.controller_points import ControllerPointsModel
+from src.network.mqtt_client import MQTTClient
+from src.network.mqtt_command_dispatcher import MqttCommandDispatcher
+from src.network.mqtt_config import MQTTConfig
+from src.network.point_bulk_encoding import (
+    COLUMNAR_CONTENT_TYPE,
+    PointBulkEncoding,
+    decode_columnar,
+    encode_point_bulk,
+)
+
+
+def make_points(count: int) -> list[ControllerPointsModel]:
+    start = datetime(2024, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+    return [
+        ControllerPointsModel(
+            id=index,
+            controller_id="controller-1",
+            controller_ip_address="192.168.1.100",
+            bacnet_object_type=BacnetObjectTypeEnum.ANALOG_INPUT,
+            point_id=index,
+            iot_device_point_id=f"point-{index}",
+            controller_device_id="device-1",
+            units="degrees-celsius",
+            present_value=str(20.0 + index / 10),
+            status_flags="[0, 0, 0, 0]",
+            created_at=start + timedelta(seconds=index),
+            updated_at=start + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def serialize(points: list[ControllerPointsModel]) -> list[dict]:
+    return [ControllerPointDTO.from_model(point).model_dump() for point in points]
+
+
+class TestColumnarEncoding:
+    """Test layout, size and round trip"""
+
+    def test_round_trip_restores_non_null_fields(self):
+        """Test: Decoding gives back every non-null field with integer timestamps"""
+        rows = serialize(make_points(5))
+
+        message, _ = encode_point_bulk(rows, PointBulkEncoding.COLUMNAR)
+        decoded = decode_columnar(json.loads(json.dumps(message)))
+
+        assert len(decoded) == 5
+        for original, point in zip(rows, decoded):
+            assert point["createdAt"] == original["createdAtUnixMilliTimestamp"]
+            assert "createdAtUnixMilliTimestamp" not in point
+            for field, value in original.items():
+                if value is None:
+                    assert field not in point
+                elif field not in (
+                    "createdAt",
+                    "updatedAt",
+                    "createdAtUnixMilliTimestamp",
+                ):
+                    assert point[field] == value
+
+    def test_shared_and_null_fields_are_sent_once(self):
+        """Test: Same-valued fields are constants and all-null fields are dropped"""
+        message, properties = encode_point_bulk(
+            serialize(make_points(3)), PointBulkEncoding.COLUMNAR
+        )
+
+        assert message["constants"]["controllerId"] == "controller-1"
+        assert message["constants"]["statusFlags"] == [0, 0, 0, 0]
+        assert set(message["columns"]) >= {"pointId", "presentValue", "createdAt"}
+        assert "priorityArray" not in message["constants"]
+        assert "priorityArray" not in message["columns"]
+        assert properties["content_type"] == COLUMNAR_CONTENT_TYPE
+
+    def test_bytes_per_point_drop_at_least_threefold(self):
+        """Test: A typical batch is several times smaller than plain JSON"""
+        rows = serialize(make_points(200))
+
+        plain, plain_properties = encode_point_bulk(rows, PointBulkEncoding.JSON)
+        columnar, _ = encode_point_bulk(rows, PointBulkEncoding.COLUMNAR)
+
+        assert plain_properties is None
+        assert len(json.dumps(plain)) >= 3 * len(json.dumps(columnar))
+
+
+class TestColumnarPublish:
+    """Test that the encoding is selected by settings and announced to consumers"""
+
+    def test_dispatcher_publishes_columnar_with_properties(self):
+        """Test: Columnar batches carry the content type and encoding user property"""
+        mqtt_client = Mock(spec=MQTTClient)
+        mqtt_client.publish = Mock(return_value=True)
+        dispatcher = MqttCommandDispatcher(
+            mqtt_client=mqtt_client,
+            organization_id="org",
+            site_id="site",
+            iot_device_id="device",
+        )
+
+        with patch("src.config.settings.settings.POINT_BULK_ENCODING", "columnar"):
+            dispatcher.publish_point_bulk(make_points(2))
+
+        message = mqtt_client.publish.call_args[0][1]
+        properties = mqtt_client.publish.call_args[1]["properties"]
+        assert message["encoding"] == "columnar"
+        assert message["count"] == 2
+        assert properties["content_type"] == COLUMNAR_CONTENT_TYPE
+        assert ("encoding", "columnar/1") in properties["user_properties"]
+
+    def test_client_sets_mqtt5_properties(self):
+        """Test: Content type and user properties reach the PUBLISH packet"""
+        client = MQTTClient(MQTTConfig(use_tls=False))
+        client.connected = True
+        client.client = Mock()
+        client.client.publish = Mock(return_value=Mock(rc=mqtt.MQTT_ERR_SUCCESS))
+
+        client.publish(
+            "topic",
+            {"count": 0},
+            properties={
+                "content_type": COLUMNAR_CONTENT_TYPE,
+                "user_properties": [("encoding", "columnar/1")],
+            },
+        )
+
+        mqtt_properties = client.client.publish.call_args[1]["properties"]
+        assert mqtt_properties.ContentType == COLUMNAR_CONTENT_TYPE
+        assert mqtt_properties.UserProperty == [("encoding", "columnar/1")]
@@ -0,0 +1,171 @@
+"""
+Test scheduled SQLite maintenance in sqlmodel_client.
+Validates incremental vacuum, WAL checkpointing and database statistics.
+"""
+
+import os
+
+import aiosqlite
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import text
+from typer.testing import CliRunner
+
+from src.actors.cleaner_actor import CleanerActor
+from src.cli import app
+from src.network.sqlmodel_client import (
+    OUTBOX_DATABASE_PATH,
+    enable_incremental_auto_vacuum,
+    get_database_stats,
+    get_session,
+    get_write_engine,
+    run_database_maintenance,
+)
+
+
+async def churn_scratch_table() -> None:
+    """Fill and empty a scratch table so the freelist has pages"""
+    async with get_session() as session:
+        await session.execute(
+            text("CREATE TABLE IF NOT EXISTS maintenance_scratch (data BLOB)")
+        )
+        await session.execute(
+            text(
+                "INSERT INTO maintenance_scratch "
+                "SELECT randomblob(4000) FROM (WITH RECURSIVE c(x) AS "
+                "(SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 200) SELECT x FROM c)"
+            )
+        )
+        await session.commit()
+        await session.execute(text("DROP TABLE maintenance_scratch"))
+        await session.commit()
+
+
+class TestSQLiteMaintenance:
+    """Test bounded maintenance rounds"""
+
+    @pytest.mark.asyncio
+    async def test_existing_database_only_converted_on_request(self):
+        """Test: Startup skips the full VACUUM; convert_existing runs it"""
+        async with get_write_engine().connect() as conn:
+            await conn.execute(text("PRAGMA main.auto_vacuum=NONE"))
+            await conn.execute(text("VACUUM main"))
+
+        await enable_incremental_auto_vacuum()
+        async with get_write_engine().connect() as conn:
+            assert (await conn.execute(text("PRAGMA auto_vacuum"))).scalar() == 0
+
+        await enable_incremental_auto_vacuum(convert_existing=True)
+        async with get_write_engine().connect() as conn:
+            assert (await conn.execute(text("PRAGMA auto_vacuum"))).scalar() == 2
+
+    @pytest.mark.asyncio
+    async def test_stats_cover_main_and_outbox_databases(self):
+        """Test: Stats report each database file with its WAL and page counts"""
+        stats = await get_database_stats()
+
+        assert stats["outbox_file"] == OUTBOX_DATABASE_PATH
+        assert stats["outbox_page_count"] > 0
+        assert stats["database_page_count"] > 0
+        assert stats["freelist_pages"] == (
+            stats["database_freelist_pages"] + stats["outbox_freelist_pages"]
+        )
+        assert "outbox_wal_bytes" in stats
+
+    def test_db_stats_command_shows_outbox(self):
+        """Test: The db stats command prints the outbox database too"""
+        result = CliRunner().invoke(app, ["db", "stats"])
+
+        assert result.exit_code == 0, result.output
+        assert "Outbox file:" in result.output
+        assert os.path.basename(OUTBOX_DATABASE_PATH) in result.output.replace("\n", "")
+
+    @pytest.mark.asyncio
+    async def test_maintenance_releases_freelist_and_truncates_wal(self):
+        """Test: Free pages are vacuumed and the WAL is checkpointed"""
+        await enable_incremental_auto_vacuum(convert_existing=True)
+        async with get_write_engine().connect() as conn:
+            assert (await conn.execute(text("PRAGMA auto_vacuum"))).scalar() == 2
+
+        await churn_scratch_table()
+        before = await get_database_stats()
+        assert before["freelist_pages"] > 0
+
+        report = await run_database_maintenance(time_budget_seconds=5)
+
+        async with get_write_engine().connect() as conn:
+            for schema in ("main", "outbox"):
+                freelist_count = await conn.execute(
+                    text(f"PRAGMA {schema}.freelist_count")
+                )
+                assert freelist_count.scalar() == 0
+        after = await get_database_stats()
+        assert report["vacuumed_pages"] == before["freelist_pages"]
+        assert report["optimized"] is True
+        if not report["checkpoint_busy"]:
+            assert after["wal_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_each_step_frees_the_requested_pages(self):
+        """Test: One incremental_vacuum step releases a full step of pages"""
+        await enable_incremental_auto_vacuum(convert_existing=True)
+        await run_database_maintenance()
+        await churn_scratch_table()
+        before = await get_database_stats()
+
+        with patch.object(
+            aiosqlite.Connection,
+            "executescript",
+            autospec=True,
+            side_effect=aiosqlite.Connection.executescript,
+        ) as executescript:
+            report = await run_database_maintenance(
+                time_budget_seconds=5, vacuum_pages_per_step=50
+            )
+
+        assert report["vacuumed_pages"] == before["freelist_pages"]
+        assert executescript.call_count == sum(
+            -(-before[f"{prefix}_freelist_pages"] // 50)
+            for prefix in ("database", "outbox")
+        )
+
+    @pytest.mark.asyncio
+    async def test_zero_budget_still_checkpoints(self):
+        """Test: Vacuum and statistics are skipped when no budget is left"""
+        await churn_scratch_table()
+
+        report = await run_database_maintenance(time_budget_seconds=0, analyze=True)
+
+        assert report["vacuumed_pages"] == 0
+        assert report["optimized"] is False
+        assert report["analyzed"] is False
+        assert "checkpointed_frames" in report
+
+    @pytest.mark.asyncio
+    async def test_cleaner_postpones_maintenance_while_writes_queued(self):
+        """Test: CleanerActor only runs maintenance at quiet points"""
+        cleaner = CleanerActor(actor_queue_registry=None)
+        with (
+            patch(
+                "src.actors.cleaner_actor.get_writer_stats",
+                return_value={"queue_depth": 3},
+            ),
+            patch(
+                "src.actors.cleaner_actor.run_database_maintenance",
+                new_callable=AsyncMock,
+            ) as mock_maintenance,
+        ):
+            await cleaner.run_database_maintenance()
+            mock_maintenance.assert_not_called()
+
+        with patch(
+            "src.actors.cleaner_actor.run_database_maintenance",
+            new_callable=AsyncMock,
+            return_value={},
+        ) as mock_maintenance:
+            await cleaner.run_database_maintenance()
+            await cleaner.run_database_maintenance()
+
+        # First round of the day runs a full ANALYZE
+        assert mock_maintenance.call_args_list[0].kwargs == {"analyze": True}
+        assert mock_maintenance.call_args_list[1].kwargs == {"analyze": False}
@@ -0,0 +1,74 @@
+"""
+Test pooled SQLite engine configuration in sqlmodel_client.
+Validates per-connection PRAGMA setup and pool statistics.
+"""
+
+import asyncio
+import pytest
+from sqlalchemy import text
+
+from src.config.bacnet_constants import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_PAGES,
+    SQLITE_POOL_SIZE,
+)
+from src.network.sqlmodel_client import get_pool_stats, get_session, log_pool_stats
+
+
+class TestSQLitePool:
+    """Test the persistent SQLite connection pool"""
+
+    @pytest.mark.asyncio
+    async def test_pragmas_applied_to_every_connection(self):
+        """Test that concurrent sessions all see the tuned PRAGMAs"""
+
+        async def read_pragmas():
+            async with get_session() as session:
+                cache_size = (await session.execute(text("PRAGMA cache_size"))).scalar()
+                busy_timeout = (
+                    await session.execute(text("PRAGMA busy_timeout"))
+                ).scalar()
+                temp_store = (await session.execute(text("PRAGMA temp_store"))).scalar()
+                await asyncio.sleep(0.05)  # Hold connection to force several
+                return cache_size, busy_timeout, temp_store
+
+        results = await asyncio.gather(*[read_pragmas() for _ in range(3)])
+
+        for cache_size, busy_timeout, temp_store in results:
+            assert cache_size == SQLITE_CACHE_SIZE_PAGES
+            assert busy_timeout == SQLITE_BUSY_TIMEOUT_MS
+            assert temp_store == 2  # MEMORY
+
+    @pytest.mark.asyncio
+    async def test_sequential_sessions_reuse_connections(self):
+        """Test that sequential sessions do not open new connections"""
+        async with get_session() as session:
+            await session.execute(text("SELECT 1"))
+
+        created_before = get_pool_stats()["connections_created"]
+
+        for _ in range(20):
+            async with get_session() as session:
+                await session.execute(text("SELECT 1"))
+
+        stats = get_pool_stats()
+        assert stats["connections_created"] == created_before
+        assert stats["checked_out"] == 0
+
+    def test_pool_stats_shape(self):
+        """Test that pool stats expose sizing and churn counters"""
+        stats = get_pool_stats()
+
+        assert stats["pool_class"] == "AsyncAdaptedQueuePool"
+        assert stats["pool_size"] == SQLITE_POOL_SIZE
+        for key in [
+            "connections_created",
+            "connections_closed",
+            "checkouts",
+            "checked_in",
+            "checked_out",
+            "overflow",
+        ]:
+            assert key in stats
+
+        log_pool_stats()  # Should complete without error
@@ -0,0 +1,158 @@
+"""
+Test the serialized SQLite writer in sqlmodel_client.
+Validates priority ordering, mutual exclusion and nested write handling.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.network.sqlmodel_client import (
+    DatabaseWriter,
+    WritePriority,
+    get_write_engine,
+    get_writer_stats,
+    serialized_write,
+)
+
+
+class TestDatabaseWriter:
+    """Test the single-writer priority gate"""
+
+    @pytest.mark.asyncio
+    async def test_jobs_never_overlap(self):
+        """Test that concurrent submissions run one at a time"""
+        writer = DatabaseWriter()
+        active = 0
+        max_active = 0
+
+        async def job():
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(*[writer.submit(job) for _ in range(5)])
+
+        assert max_active == 1
+        assert writer.get_stats()["jobs_completed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_high_priority_runs_before_queued_bulk(self):
+        """Test that HIGH jobs jump ahead of BULK jobs waiting for the writer"""
+        writer = DatabaseWriter()
+        order = []
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        def recorder(name):
+            async def job():
+                order.append(name)
+
+            return job
+
+        first = asyncio.create_task(writer.submit(blocker))
+        await asyncio.sleep(0)
+        bulk = asyncio.create_task(
+            writer.submit(recorder("bulk"), priority=WritePriority.BULK)
+        )
+        high = asyncio.create_task(
+            writer.submit(recorder("high"), priority=WritePriority.HIGH)
+        )
+        await asyncio.sleep(0)
+
+        stats = writer.get_stats()
+        assert stats["busy"] is True
+        assert stats["queue_depth"] == 2
+        assert stats["queued_high"] == 1
+        assert stats["queued_bulk"] == 1
+
+        release.set()
+        await asyncio.gather(first, bulk, high)
+
+        assert order == ["high", "bulk"]
+        assert writer.get_stats()["busy"] is False
+
+    @pytest.mark.asyncio
+    async def test_nested_submit_does_not_deadlock(self):
+        """Test that a write issued from inside a write job runs inline"""
+        writer = DatabaseWriter()
+
+        async def inner():
+            return "inner"
+
+        async def outer():
+            return await writer.submit(inner)
+
+        result = await asyncio.wait_for(writer.submit(outer), timeout=1)
+        assert result == "inner"
+
+    @pytest.mark.asyncio
+    async def test_failed_job_releases_writer(self):
+        """Test that an exception in a job frees the writer for the next one"""
+        writer = DatabaseWriter()
+
+        async def failing():
+            raise ValueError("boom")
+
+        async def ok():
+            return 42
+
+        with pytest.raises(ValueError):
+            await writer.submit(failing)
+
+        assert await writer.submit(ok) == 42
+        stats = writer.get_stats()
+        assert stats["jobs_failed"] == 1
+        assert stats["jobs_completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_serialized_write_decorator_accepts_priority_override(self):
+        """Test that the decorator strips write_priority before calling through"""
+
+        @serialized_write(WritePriority.BULK)
+        async def write(value):
+            return value * 2
+
+        assert await write(3) == 6
+        assert await write(4, write_priority=WritePriority.HIGH) == 8
+        assert "queue_depth" in get_writer_stats()
+
+    def test_jobs_on_different_event_loops_never_overlap(self):
+        """Test that writers on separate threads' loops take turns"""
+        writer = DatabaseWriter()
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        async def job():
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            with lock:
+                active -= 1
+
+        def run_loop():
+            asyncio.run(asyncio.wait_for(writer.submit(job), timeout=5))
+
+        threads = [threading.Thread(target=run_loop) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max_active == 1
+        assert writer.get_stats()["jobs_completed"] == 3
+
+    def test_write_engine_has_a_single_connection(self):
+        """Test that the writer pool can never open a second connection"""
+        pool = get_write_engine().pool
+
+        assert pool.size() == 1
+        assert pool._max_overflow == 0
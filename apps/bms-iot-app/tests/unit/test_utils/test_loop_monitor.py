@@ -0,0 +1,107 @@
+"""
+Test blocking-call offload and event loop lag monitoring.
+
+User Story: As an operator, I want the event loop kept free of blocking calls and told which call blocked it
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.actors.messages.actor_queue_registry import ActorQueueRegistry
+from src.actors.system_metrics_actor import SystemMetricsActor
+from src.utils.blocking import run_blocking
+from src.utils.loop_monitor import LoopLagMonitor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRunBlocking:
+    """Test the executor for blocking calls"""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_named_worker_thread(self):
+        """Test: The call runs off the loop thread and its result is returned"""
+        result = await run_blocking(
+            lambda x, y=0: (threading.current_thread(), x + y), 1, y=2
+        )
+
+        thread, total = result
+        assert total == 3
+        assert thread is not threading.current_thread()
+        assert thread.name.startswith("bms-blocking")
+
+    @pytest.mark.asyncio
+    async def test_system_metrics_collected_off_loop_without_sleeping(self):
+        """Test: psutil runs in the pool and CPU usage is not sampled for a second"""
+        actor = SystemMetricsActor(ActorQueueRegistry(), "org", "site", "device")
+        threads = []
+
+        def cpu_percent(interval=None):
+            threads.append(threading.current_thread().name)
+            assert interval is None
+            return 12.5
+
+        with patch("src.actors.system_metrics_actor.psutil.cpu_percent", cpu_percent):
+            metrics = await actor._collect_system_metrics()
+
+        assert metrics["cpu_usage_percent"] == 12.5
+        assert threads[0].startswith("bms-blocking")
+
+
+class TestLoopLagMonitor:
+    """Test lag measurement and stall reports"""
+
+    def test_summary_from_recorded_lag(self):
+        """Test: Lag is recorded in milliseconds; negative lag counts as none"""
+        monitor = LoopLagMonitor(interval=0.5, stall_threshold=0.25)
+        for lag in [0.001, 0.002, 0.003, -0.001, 0.9]:
+            monitor.record_lag(lag)
+
+        summary = monitor.get_lag_summary()
+        assert summary["max_ms"] == 900
+        assert summary["p50_ms"] <= 3
+        assert summary["stalls"] == 0
+
+    def test_stall_reported_once(self):
+        """Test: A blocked loop is logged once per stall"""
+        clock = FakeClock()
+        monitor = LoopLagMonitor(interval=0.5, stall_threshold=0.25, clock=clock)
+        monitor._last_wakeup = clock.now
+
+        clock.now += 0.6
+        assert monitor.check_stall() is False
+
+        clock.now += 0.5
+        with patch("src.utils.loop_monitor.logger.warning") as warning:
+            assert monitor.check_stall() is True
+            assert monitor.check_stall() is False
+
+        warning.assert_called_once()
+        assert monitor.stalls == 1
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_logged_with_its_stack(self):
+        """Test: The watchdog logs the loop thread's stack while it is blocked"""
+        monitor = LoopLagMonitor(interval=0.05, stall_threshold=0.1)
+
+        with patch("src.utils.loop_monitor.logger.warning") as warning:
+            task = asyncio.create_task(monitor.run())
+            await asyncio.sleep(0.1)
+            time.sleep(0.4)  # blocks the loop
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert monitor.stalls == 1
+        assert "time.sleep(0.4)" in warning.call_args[0][0]
+        assert monitor.get_lag_summary()["max_ms"] >= 300
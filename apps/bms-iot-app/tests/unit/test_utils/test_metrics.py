@@ -0,0 +1,161 @@
+"""
+Test the metrics registry, its Prometheus output and the decorator feeding it.
+
+User Story: As an operator, I want p50/p99 latencies without grepping device logs
+"""
+
+import asyncio
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.metrics import MetricsRegistry
+from src.utils.metrics_exporter import serve_metrics, write_metrics_file
+from src.utils.performance import (
+    get_performance_summary,
+    operation_duration_ms,
+    operation_failures,
+    operation_items,
+    performance_metrics,
+)
+
+
+class FakeReader:
+    class reader_config:
+        id = "reader-1"
+
+    @performance_metrics(
+        "test_metrics_bulk_read",
+        {"count": "point_requests"},
+        label_keys={"controller": "device_ip", "reader": "self.reader_config.id"},
+    )
+    async def read(self, device_ip, point_requests):
+        if not point_requests:
+            raise ValueError("nothing to read")
+        return point_requests
+
+
+class TestMetricsRegistry:
+    """Test metric types and labels"""
+
+    def test_counter_gauge_and_labels(self):
+        """Test: Values are kept per label combination"""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["route"])
+        requests.inc(route="a")
+        requests.inc(2, route="a")
+        registry.gauge("depth", "Depth").set(5)
+
+        assert requests.value(route="a") == 3
+        assert registry.counter("requests_total", "Requests", ["route"]) is requests
+        assert registry.gauge("depth", "Depth").value() == 5
+        with pytest.raises(ValueError):
+            requests.inc(other="x")
+        with pytest.raises(ValueError):
+            registry.gauge("requests_total", "Requests")
+
+    def test_histogram_quantiles_with_fixed_buckets(self):
+        """Test: Quantiles are interpolated within fixed buckets"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_ms", "Latency", buckets=[10, 100])
+        for value in [5] * 50 + [50] * 49 + [500]:
+            latency.observe(value)
+
+        (histogram,) = latency.values().values()
+        assert histogram.bucket_counts == [50, 49, 1]
+        assert histogram.quantile(0.5) == pytest.approx(10)
+        assert 10 < histogram.quantile(0.9) <= 100
+        assert histogram.quantile(1.0) == 500
+
+    def test_prometheus_text_format(self):
+        """Test: Histograms render cumulative buckets; label values are escaped"""
+        registry = MetricsRegistry()
+        registry.histogram("op_ms", "Op duration", ["op"], buckets=[1, 10]).observe(
+            5, op='say "hi"'
+        )
+        registry.add_collector(lambda: registry.gauge("up", "Up").set(1))
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE op_ms histogram" in text
+        assert 'op_ms_bucket{op="say \\"hi\\"",le="1"} 0' in text
+        assert 'op_ms_bucket{op="say \\"hi\\"",le="10"} 1' in text
+        assert 'op_ms_bucket{op="say \\"hi\\"",le="+Inf"} 1' in text
+        assert 'op_ms_count{op="say \\"hi\\""} 1' in text
+        assert "up 1" in text
+
+
+class TestPerformanceDecoratorMetrics:
+    """Test that performance_metrics feeds the registry"""
+
+    @pytest.mark.asyncio
+    async def test_calls_recorded_with_labels(self):
+        """Test: Positional arguments and attributes of self become labels"""
+        reader = FakeReader()
+        labels = {
+            "operation": "test_metrics_bulk_read",
+            "controller": "192.168.1.10",
+            "reader": "reader-1",
+        }
+
+        with patch("src.config.settings.settings.PERF_METRICS_LOG_ENABLED", False):
+            with patch("src.utils.performance.logger") as mock_logger:
+                await reader.read("192.168.1.10", [1, 2, 3])
+                with pytest.raises(ValueError):
+                    await reader.read("192.168.1.10", [])
+
+        mock_logger.info.assert_not_called()
+        mock_logger.error.assert_called_once()
+        histogram = operation_duration_ms.values()[tuple(labels.values())]
+        assert histogram.count == 2
+        assert operation_items.value(**labels) == 3
+        assert operation_failures.value(**labels) == 1
+
+        summary = get_performance_summary()["test_metrics_bulk_read"]
+        assert summary["count"] == 2
+        assert summary["failures"] == 1
+        assert summary["p99_ms"] >= summary["p50_ms"]
+
+
+class TestMetricsExport:
+    """Test the file and localhost outputs"""
+
+    def test_metrics_file_replaced(self, tmp_path):
+        """Test: The snapshot file is written without leaving a temp file"""
+        path = tmp_path / "metrics" / "bms.prom"
+
+        write_metrics_file(str(path), "up 1\n")
+        write_metrics_file(str(path), "up 2\n")
+
+        assert path.read_text() == "up 2\n"
+        assert [p.name for p in path.parent.iterdir()] == ["bms.prom"]
+
+    @pytest.mark.asyncio
+    async def test_serves_metrics_on_localhost(self):
+        """Test: GET /metrics returns the snapshot; other paths 404"""
+        registry = MetricsRegistry()
+        registry.gauge("up", "Up").set(1)
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        server = asyncio.create_task(serve_metrics(registry, port))
+        await asyncio.sleep(0.05)
+
+        async def get(path: str) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            response = await reader.read()
+            writer.close()
+            return response
+
+        try:
+            metrics = await get("/metrics")
+            missing = await get("/other")
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+        assert metrics.startswith(b"HTTP/1.1 200 OK")
+        assert metrics.endswith(b"up 1\n")
+        assert missing.startswith(b"HTTP/1.1 404")
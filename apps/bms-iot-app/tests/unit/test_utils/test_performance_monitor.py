@@ -0,0 +1,91 @@
+"""
+Test MQTT payload size monitoring.
+"""
+
+from unittest.mock import Mock, patch
+
+import paho.mqtt.client as mqtt
+
+from src.network.mqtt_client import MQTTClient
+from src.network.mqtt_config import MQTTConfig
+from src.utils.performance_monitor import PayloadSizeMonitor, StreamingHistogram
+
+
+class TestStreamingHistogram:
+    """Test the fixed-size histogram"""
+
+    def test_aggregates_and_quantiles(self):
+        """Test: Count, mean, extremes and bucketed quantiles"""
+        histogram = StreamingHistogram()
+        for value in [100] * 90 + [5000] * 10:
+            histogram.record(value)
+
+        assert histogram.count == 100
+        assert histogram.mean == 590.0
+        assert (histogram.min, histogram.max) == (100, 5000)
+        assert histogram.quantile(0.5) == 127  # bucket 64..127
+        assert histogram.quantile(0.95) == 5000  # capped at max
+        assert len(histogram.buckets) == StreamingHistogram.BUCKET_COUNT
+
+    def test_memory_is_fixed(self):
+        """Test: Recording many values does not grow the histogram"""
+        histogram = StreamingHistogram()
+        for value in range(0, 10_000_000, 997):
+            histogram.record(value)
+
+        assert len(histogram.buckets) == StreamingHistogram.BUCKET_COUNT
+        assert sum(histogram.buckets) == histogram.count
+
+
+class TestPayloadSizeMonitor:
+    """Test payload summaries"""
+
+    def test_summary(self):
+        """Test: Sizes, point batches and large payloads are summarised"""
+        monitor = PayloadSizeMonitor()
+        monitor.record_payload_size(2048, point_count=10)
+        monitor.record_payload_size(50_000, point_count=200)
+        monitor.record_payload_size(512)
+
+        summary = monitor.get_payload_summary()
+
+        assert summary["total_payloads"] == 3
+        assert summary["max_size_kb"] == round(50_000 / 1024, 2)
+        assert summary["min_size_kb"] == 0.5
+        assert summary["large_payloads"] == 1
+        assert summary["point_batches"] == {
+            "count": 2,
+            "total_points": 210,
+            "avg_points": 105.0,
+            "max_points": 200,
+        }
+        assert "compression" not in summary
+
+    def test_empty_summary(self):
+        """Test: No publishes yet"""
+        assert PayloadSizeMonitor().get_payload_summary() == {
+            "message": "No payload data available"
+        }
+
+
+class TestPublishMetrics:
+    """Test that MQTTClient records metrics from sizes it already has"""
+
+    def test_publish_records_encoded_length_and_point_count(self):
+        """Test: The monitor gets the byte length and the caller's point count"""
+        client = MQTTClient(MQTTConfig(use_tls=False))
+        client.connected = True
+        client.client = Mock()
+        client.client.publish = Mock(return_value=Mock(rc=mqtt.MQTT_ERR_SUCCESS))
+        message = b'{"points":[]}'
+
+        with patch(
+            "src.network.mqtt_client.payload_monitor.record_payload_size"
+        ) as record:
+            client.publish("topic", message, point_count=0)
+            client.publish("topic", {"status": "ok"})
+
+        assert record.call_args_list[0][0] == (len(message),)
+        assert record.call_args_list[0][1]["point_count"] == 0
+        assert record.call_args_list[1][0] == (len('{"status": "ok"}'),)
+        assert record.call_args_list[1][1]["point_count"] is None
@@ -74,4 +74,38 @@ describe('ConfigUploadSchema', () => {
     const result = ConfigUploadSchema.safeParse(payloadWithOptionals)
     expect(result.success).toBe(true)
   })
+
+  it('should accept a chunk of a chunked upload', () => {
+    const chunk = {
+      upload: {
+        id: 'upload_1',
+        sequence: 1,
+        totalChunks: 3,
+        startedAt: '2024-01-01T00:00:00.000Z',
+      },
+      config: [
+        {
+          vendor_id: 123,
+          device_id: 1001,
+          controller_id: 'ctrl_1',
+          controller_ip_address: '192.168.1.101',
+          object_list: [],
+          complete: false,
+        },
+      ],
+    }
+
+    const result = ConfigUploadSchema.safeParse(chunk)
+    expect(result.success).toBe(true)
+  })
+
+  it('should reject a chunk with a negative sequence', () => {
+    const chunk = {
+      upload: { id: 'upload_1', sequence: -1, totalChunks: 3 },
+      config: [],
+    }
+
+    const result = ConfigUploadSchema.safeParse(chunk)
+    expect(result.success).toBe(false)
+  })
 })
@@ -14,6 +14,8 @@ function normalizePointType(pointType: string): string {
 }
 
 export async function POST(request: NextRequest): Promise<NextResponse> {
+  // Taken before any upsert, so it can mark the start of a chunked upload
+  const receivedAt = new Date().toISOString()
   try {
     console.log('Received config upload request')
     // 1. Extract and validate JWT (jwtVerify validates signature, expiration, format)
@@ -36,8 +38,13 @@ export async function POST(request: NextRequest): Promise<NextResponse> {
       )
     }
 
-    // 2. Parse and validate request body
-    const body = await request.json()
+    // 2. Parse and validate request body (devices gzip large configs)
+    const body =
+      request.headers.get('content-encoding') === 'gzip' && request.body
+        ? await new Response(
+            request.body.pipeThrough(new DecompressionStream('gzip'))
+          ).json()
+        : await request.json()
     console.log('Config upload received body JSON', JSON.stringify(body))
 
     const validated = ConfigUploadSchema.parse(body)
@@ -46,6 +53,8 @@ export async function POST(request: NextRequest): Promise<NextResponse> {
     const organization_id = jwtPayload.orgId
     const site_id = jwtPayload.siteId
     const iot_device_id = jwtPayload.iotDeviceId
+    const upload = validated.upload
+    const uploadStartedAt = upload?.startedAt ?? receivedAt
 
     // 4. Process each config item (controller)
     for (const cfg of validated.config) {
@@ -88,16 +97,18 @@ export async function POST(request: NextRequest): Promise<NextResponse> {
         device_id: cfg.device_id,
       })
 
-      // Get IDs of points in current config
-      const configPointIds = cfg.object_list.map(
-        (obj) => obj.iot_device_point_id
-      )
+      if (!upload) {
+        // Get IDs of points in current config
+        const configPointIds = cfg.object_list.map(
+          (obj) => obj.iot_device_point_id
+        )
 
-      // Soft delete points not in current config
-      await controllerPointsRepository.softDeleteNotInList(
-        cfg.controller_id,
-        configPointIds
-      )
+        // Soft delete points not in current config
+        await controllerPointsRepository.softDeleteNotInList(
+          cfg.controller_id,
+          configPointIds
+        )
+      }
 
       // Upsert each point (will restore if previously deleted)
       for (const obj of cfg.object_list) {
@@ -119,6 +130,15 @@ export async function POST(request: NextRequest): Promise<NextResponse> {
             : undefined,
         })
       }
+
+      // Chunked upload: once the controller's last chunk is in, every point
+      // still in the config has been upserted since the upload started
+      if (upload && cfg.complete !== false) {
+        await controllerPointsRepository.softDeleteNotUpdatedSince(
+          cfg.controller_id,
+          uploadStartedAt
+        )
+      }
     }
 
     // 5. Return success
@@ -129,6 +149,14 @@ export async function POST(request: NextRequest): Promise<NextResponse> {
         (sum, c) => sum + c.object_list.length,
         0
       ),
+      // Acknowledges the chunk; the device resumes from the next sequence
+      ...(upload && {
+        upload: {
+          id: upload.id,
+          sequence: upload.sequence,
+          startedAt: uploadStartedAt,
+        },
+      }),
     }
 
     console.log('Successfully uploaded config')
@@ -25,12 +25,25 @@ export const ConfigItemSchema = z.object({
   controller_id: z.string(),
   controller_ip_address: z.string(),
   object_list: z.array(BacnetObjectSchema),
+  // Chunked uploads: false while later chunks carry more of its points
+  complete: z.boolean().optional(),
+})
+
+// Present when a large config is uploaded in chunks, one request per chunk
+export const ConfigUploadChunkSchema = z.object({
+  id: z.string(),
+  sequence: z.number().int().nonnegative(),
+  totalChunks: z.number().int().positive(),
+  // Server time of the first chunk, echoed back by the device on later chunks
+  startedAt: z.string().optional(),
 })
 
 export const ConfigUploadSchema = z.object({
   config: z.array(ConfigItemSchema),
+  upload: ConfigUploadChunkSchema.optional(),
 })
 
 export type ConfigUpload = z.infer<typeof ConfigUploadSchema>
+export type ConfigUploadChunk = z.infer<typeof ConfigUploadChunkSchema>
 export type ConfigItem = z.infer<typeof ConfigItemSchema>
 export type BacnetObject = z.infer<typeof BacnetObjectSchema>
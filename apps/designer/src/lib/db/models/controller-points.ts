@@ -1,6 +1,6 @@
 import 'server-only'
 
-import { eq, and, notInArray } from 'drizzle-orm'
+import { eq, and, lt, notInArray } from 'drizzle-orm'
 import { getDatabase } from '../client'
 import {
   controllerPoints,
@@ -200,6 +200,28 @@ export class ControllerPointsRepository {
       .run()
   }
 
+  // Points of a chunked upload are upserted across requests, so points missing
+  // from the config are the ones not touched since the upload started
+  async softDeleteNotUpdatedSince(
+    controllerId: string,
+    since: string
+  ): Promise<void> {
+    await this.db
+      .update(controllerPoints)
+      .set({
+        is_deleted: true,
+        updated_at: new Date().toISOString(),
+      })
+      .where(
+        and(
+          eq(controllerPoints.controller_id, controllerId),
+          eq(controllerPoints.is_deleted, false),
+          lt(controllerPoints.updated_at, since)
+        )
+      )
+      .run()
+  }
+
   async upsert(
     data: InsertControllerPoint & { id: string }
   ): Promise<ControllerPoint> {
@@ -237,11 +237,16 @@ export class MqttBusCore {
     const req = cmd.request
     const res = cmd.response
 
+    // Long-running commands (e.g. a chunked get_config upload) send
+    // inProgress responses first; each one restarts the timeout
     const response$ = this.messages$.pipe(
       filter((m) => m.topic === res.topic && m.correlationId === correlationId),
+      timeout({ each: timeoutMs }),
+      filter(
+        (m) => !(m.payload as { inProgress?: boolean } | null)?.inProgress
+      ),
       map((m) => m.payload as T),
-      take(1),
-      timeout({ each: timeoutMs })
+      take(1)
     )
 
     this.client.publish(req.topic, JSON.stringify(payload), {
@@ -59,7 +59,7 @@ describe('topics_loader', () => {
       expect(result.command.get_config.response.qos).toBe(1);
       expect(result.status.heartbeat.qos).toBe(1);
       expect(result.data.point?.qos).toBe(1);
-      expect(result.data.point_bulk.qos).toBe(0);
+      expect(result.data.point_bulk.qos).toBe(1);
 
       // Test retain values
       expect(result.command.get_config.request.retain).toBe(false);